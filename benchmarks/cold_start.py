@@ -0,0 +1,124 @@
+"""
+콜드 스타트 벤치마크: 프로세스 시작부터 메인 창 첫 페인트까지 걸리는 시간
+
+사용법:
+    python benchmarks/cold_start.py [--runs 10] [--offscreen] [--keep-home] [--importtime]
+
+매 실행마다 새 파이썬 프로세스를 띄워 단계별 시간을 측정하고 중앙값을 출력한다.
+기본적으로 빈 임시 HOME에서 실행해 이전 세션 복원의 영향을 받지 않는다.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PHASES = ('import_torrent_client', 'import_main', 'qapplication', 'window_created', 'first_paint')
+
+
+def run_child():
+    """자식 프로세스: 단계별 경과 시간을 JSON으로 출력"""
+    start = time.perf_counter()
+    marks = {}
+
+    def mark(name):
+        marks[name] = time.perf_counter() - start
+
+    sys.path.insert(0, ROOT)
+    import torrent_client  # noqa: F401
+    mark('import_torrent_client')
+    import main
+    mark('import_main')
+
+    from PySide6.QtCore import QEvent, QObject, QTimer
+    from PySide6.QtWidgets import QApplication
+
+    app = QApplication(sys.argv[:1])
+    mark('qapplication')
+    window = main.TorrentMainWindow()
+    mark('window_created')
+
+    class FirstPaintFilter(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Paint and 'first_paint' not in marks:
+                mark('first_paint')
+                QTimer.singleShot(0, app.quit)
+            return False
+
+    paint_filter = FirstPaintFilter()
+    window.installEventFilter(paint_filter)
+    window.show()
+    # 페인트 이벤트가 오지 않는 환경에서도 끝나도록
+    QTimer.singleShot(10000, app.quit)
+    app.exec()
+
+    window.torrent_client.stop()
+    print(json.dumps(marks))
+
+
+def run_once(args, home):
+    env = dict(os.environ, HOME=home)
+    if args.offscreen:
+        env['QT_QPA_PLATFORM'] = 'offscreen'
+    command = [sys.executable]
+    if args.importtime:
+        command += ['-X', 'importtime']
+    command += [os.path.abspath(__file__), '--child']
+
+    completed = subprocess.run(command, env=env, capture_output=True, text=True, timeout=120)
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip())
+    if args.importtime:
+        print_import_times(completed.stderr, args.top)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def print_import_times(stderr, top):
+    """-X importtime 출력에서 누적 시간이 큰 모듈 출력"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((int(cumulative_us), int(self_us), name.strip()))
+    print(f"{'누적(ms)':>10} {'자체(ms)':>10}  모듈")
+    for cumulative_us, self_us, name in sorted(rows, reverse=True)[:top]:
+        print(f"{cumulative_us / 1000:>10.1f} {self_us / 1000:>10.1f}  {name}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ltorrent 콜드 스타트 벤치마크")
+    parser.add_argument('--runs', type=int, default=10, help="측정 횟수")
+    parser.add_argument('--offscreen', action='store_true', help="화면 없이 실행 (QT_QPA_PLATFORM=offscreen)")
+    parser.add_argument('--keep-home', action='store_true', help="현재 HOME 사용 (저장된 세션 포함)")
+    parser.add_argument('--importtime', action='store_true', help="첫 실행의 모듈별 import 시간 출력")
+    parser.add_argument('--top', type=int, default=25, help="--importtime 출력 모듈 수")
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child()
+        return
+
+    results = []
+    with tempfile.TemporaryDirectory() as temp_home:
+        home = os.path.expanduser('~') if args.keep_home else temp_home
+        for i in range(args.runs):
+            results.append(run_once(args, home))
+            args.importtime = False  # import 시간은 첫 실행만 출력
+
+    print(f"{'단계':<24} {'중앙값(ms)':>10} {'최소(ms)':>10} {'최대(ms)':>10}")
+    for phase in PHASES:
+        values = [r[phase] * 1000 for r in results if phase in r]
+        if values:
+            print(f"{phase:<24} {statistics.median(values):>10.1f} {min(values):>10.1f} {max(values):>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
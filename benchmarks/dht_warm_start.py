@@ -0,0 +1,136 @@
+"""
+DHT 웜 스타트 벤치마크: 재시작 후 마그넷의 첫 피어/메타데이터까지 걸리는 시간
+
+사용법:
+    python benchmarks/dht_warm_start.py --magnet "magnet:?xt=urn:btih:..." [--runs 5] [--timeout 300]
+
+각 실행은 빈 임시 HOME에서 새 파이썬 프로세스로 TorrentClient를 띄워 마그넷을 추가하고,
+종료 시 저장된 DHT 상태(~/.ltorrent/dht.state)만 다음 실행으로 넘긴다.
+  - 콜드: DHT 상태 없이 시작 (부트스트랩 노드부터)
+  - 웜: 직전 실행이 저장한 DHT 상태로 시작
+메타데이터 캐시는 넘기지 않으며, DHT만 측정하도록 기본적으로 마그넷의 트래커(tr=)를 뺀다.
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import parse_qsl, quote, urlencode
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+METRICS = ('first_peer', 'metadata', 'dht_nodes')
+
+
+def strip_trackers(magnet):
+    """마그넷 링크에서 트래커(tr=) 제거"""
+    query = magnet.split('?', 1)[1] if '?' in magnet else ''
+    params = [(key, value) for key, value in parse_qsl(query) if key != 'tr']
+    return 'magnet:?' + urlencode(params, safe=':', quote_via=quote)
+
+
+def run_child(magnet, timeout):
+    """자식 프로세스: 마그넷 추가 후 첫 피어/메타데이터 시각을 JSON으로 출력"""
+    sys.path.insert(0, ROOT)
+    from torrent_client import TorrentClient
+
+    client = TorrentClient()
+    download_dir = tempfile.mkdtemp()
+    start = time.perf_counter()
+    torrent_hash = client.add_magnet_link(magnet, download_dir)
+    handle = client.torrents[torrent_hash]['handle']
+
+    result = {}
+    while time.perf_counter() - start < timeout:
+        status = handle.status()
+        elapsed = time.perf_counter() - start
+        if 'first_peer' not in result and status.num_peers > 0:
+            result['first_peer'] = elapsed
+        if 'metadata' not in result and status.has_metadata:
+            result['metadata'] = elapsed
+        if 'dht_nodes' not in result and elapsed >= 10 and client.last_session_stats:
+            result['dht_nodes'] = client.last_session_stats.get('dht.dht_nodes', 0)
+        if 'first_peer' in result and 'metadata' in result and 'dht_nodes' in result:
+            break
+        time.sleep(0.1)
+
+    # 종료 시 DHT 상태 저장 (다음 웜 실행이 사용)
+    client.remove_torrent(torrent_hash, True)
+    client.stop()
+    shutil.rmtree(download_dir, ignore_errors=True)
+    print(json.dumps(result))
+
+
+def run_once(args, magnet, dht_state):
+    """임시 HOME에서 한 번 실행, (결과, 저장된 DHT 상태 바이트) 반환"""
+    with tempfile.TemporaryDirectory() as home:
+        config_dir = os.path.join(home, '.ltorrent')
+        os.makedirs(config_dir)
+        state_path = os.path.join(config_dir, 'dht.state')
+        if dht_state:
+            with open(state_path, 'wb') as f:
+                f.write(dht_state)
+
+        command = [sys.executable, os.path.abspath(__file__), '--child',
+                   '--magnet', magnet, '--timeout', str(args.timeout)]
+        completed = subprocess.run(command, env=dict(os.environ, HOME=home),
+                                   capture_output=True, text=True, timeout=args.timeout + 60)
+        if completed.returncode != 0:
+            raise RuntimeError(completed.stderr.strip())
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+
+        saved_state = None
+        if os.path.exists(state_path):
+            with open(state_path, 'rb') as f:
+                saved_state = f.read()
+        return result, saved_state
+
+
+def print_results(title, results):
+    print(f"[{title}] {len(results)}회")
+    for metric in METRICS:
+        values = [r[metric] for r in results if metric in r]
+        missed = len(results) - len(values)
+        if not values:
+            print(f"  {metric:<12} 측정 안 됨")
+            continue
+        unit = '' if metric == 'dht_nodes' else 's'
+        suffix = f" (시간 초과 {missed}회)" if missed else ""
+        print(f"  {metric:<12} 중앙값 {statistics.median(values):>8.1f}{unit}"
+              f"  최소 {min(values):>8.1f}{unit}  최대 {max(values):>8.1f}{unit}{suffix}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ltorrent DHT 웜 스타트 벤치마크")
+    parser.add_argument('--magnet', required=True, help="측정할 마그넷 링크")
+    parser.add_argument('--runs', type=int, default=5, help="콜드/웜 각각 측정 횟수")
+    parser.add_argument('--timeout', type=float, default=300, help="실행당 최대 대기 시간 (초)")
+    parser.add_argument('--keep-trackers', action='store_true', help="마그넷의 트래커를 그대로 사용")
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    magnet = args.magnet if args.keep_trackers or args.child else strip_trackers(args.magnet)
+    if args.child:
+        run_child(magnet, args.timeout)
+        return
+
+    cold = [run_once(args, magnet, None)[0] for _ in range(args.runs)]
+
+    # 웜: 한 번 실행해 DHT 상태를 만든 뒤, 매번 직전 실행이 저장한 상태로 시작
+    _, dht_state = run_once(args, magnet, None)
+    warm = []
+    for _ in range(args.runs):
+        result, saved_state = run_once(args, magnet, dht_state)
+        warm.append(result)
+        dht_state = saved_state or dht_state
+
+    print_results("콜드 (DHT 상태 없음)", cold)
+    print_results("웜 (저장된 DHT 상태)", warm)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+"""
+웹 시드 로컬 벤치마크: 로컬 HTTP 서버 하나만 있는 토렌트를 처음부터 받는 시간과 연결 재사용
+
+사용법:
+    python benchmarks/web_seed_local.py [--size-mb 256] [--files 4] [--runs 3] [--connections 4] [--pipeline 8]
+
+임시 디렉터리에 무작위 데이터를 만들어 HTTP/1.1(keep-alive, Range 지원) 서버로 제공하고,
+그 서버를 URL 시드(BEP 19)로 넣은 토렌트를 만든 뒤 빈 임시 HOME의 TorrentClient로 받는다.
+피어는 없으므로 모든 데이터가 웹 시드에서 오며, 서버가 받은 요청 수와 연 연결 수로
+연결 하나에서 처리한 요청 수(재사용 정도)를 본다.
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class RangeRequestHandler(SimpleHTTPRequestHandler):
+    """keep-alive와 단일 Range 요청을 지원하고 연결/요청 수를 세는 파일 핸들러"""
+    protocol_version = 'HTTP/1.1'
+    counters = None  # {'connections', 'requests'}, 서버마다 설정
+    counters_lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with self.counters_lock:
+            self.counters['connections'] += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        with self.counters_lock:
+            self.counters['requests'] += 1
+        path = self.translate_path(self.path)
+        if not os.path.isfile(path):
+            self.send_error(404)
+            return
+
+        size = os.path.getsize(path)
+        start, end = 0, size - 1
+        range_header = self.headers.get('Range', '')
+        if range_header.startswith('bytes='):
+            first, _, last = range_header[6:].split(',')[0].partition('-')
+            if first:
+                start = int(first)
+                end = min(int(last), size - 1) if last else size - 1
+            else:
+                start = max(0, size - int(last))
+            if start > end:
+                self.send_response(416)
+                self.send_header('Content-Range', f'bytes */{size}')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+        else:
+            self.send_response(200)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Content-Length', str(end - start + 1))
+        self.send_header('Accept-Ranges', 'bytes')
+        self.end_headers()
+
+        with open(path, 'rb') as f:
+            f.seek(start)
+            remaining = end - start + 1
+            while remaining:
+                chunk = f.read(min(remaining, 1024 * 1024))
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+                remaining -= len(chunk)
+
+
+def make_content(root, size_mb, files):
+    """root/content 아래 무작위 데이터 파일 files개 (합계 size_mb MiB)"""
+    content = os.path.join(root, 'content')
+    os.makedirs(content)
+    file_size = size_mb * 1024 * 1024 // files
+    for i in range(files):
+        with open(os.path.join(content, f'part{i:02d}.bin'), 'wb') as f:
+            for offset in range(0, file_size, 1024 * 1024):
+                f.write(os.urandom(min(1024 * 1024, file_size - offset)))
+    return content
+
+
+def run_child(torrent_path, timeout, connections, pipeline):
+    """자식 프로세스: 토렌트를 빈 디렉터리로 받아 완료 시각을 JSON으로 출력"""
+    sys.path.insert(0, ROOT)
+    from torrent_client import TorrentClient
+
+    client = TorrentClient()
+    client.set_web_seed_settings(max_web_seed_connections=connections, urlseed_pipeline_size=pipeline)
+    download_dir = tempfile.mkdtemp()
+    start = time.perf_counter()
+    torrent_hash = client.add_torrent(torrent_path, download_dir)
+    handle = client.torrents[torrent_hash]['handle']
+
+    result = {}
+    while time.perf_counter() - start < timeout:
+        status = handle.status()
+        if status.is_seeding:
+            result['seconds'] = time.perf_counter() - start
+            result['bytes'] = status.total_wanted
+            break
+        time.sleep(0.05)
+
+    client.remove_torrent(torrent_hash, True)
+    client.stop()
+    shutil.rmtree(download_dir, ignore_errors=True)
+    print(json.dumps(result))
+
+
+def run_once(args, torrent_path, counters):
+    """임시 HOME에서 한 번 받기, 결과에 서버가 센 연결/요청 수를 더해 반환"""
+    before = dict(counters)
+    with tempfile.TemporaryDirectory() as home:
+        command = [sys.executable, os.path.abspath(__file__), '--child', '--torrent', torrent_path,
+                   '--timeout', str(args.timeout), '--connections', str(args.connections),
+                   '--pipeline', str(args.pipeline)]
+        completed = subprocess.run(command, env=dict(os.environ, HOME=home),
+                                   capture_output=True, text=True, timeout=args.timeout + 60)
+        if completed.returncode != 0:
+            raise RuntimeError(completed.stderr.strip())
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result['connections'] = counters['connections'] - before['connections']
+    result['requests'] = counters['requests'] - before['requests']
+    return result
+
+
+def print_results(results):
+    done = [r for r in results if 'seconds' in r]
+    print(f"[웹 시드 로컬] {len(results)}회 (시간 초과 {len(results) - len(done)}회)")
+    if not done:
+        return
+    seconds = [r['seconds'] for r in done]
+    throughput = [r['bytes'] / r['seconds'] / 1024 ** 2 for r in done]
+    reuse = [r['requests'] / r['connections'] for r in done if r['connections']]
+    print(f"  완료 시간     중앙값 {statistics.median(seconds):>8.2f}s  최소 {min(seconds):>8.2f}s  최대 {max(seconds):>8.2f}s")
+    print(f"  처리량        중앙값 {statistics.median(throughput):>8.1f}MiB/s")
+    print(f"  요청 수       중앙값 {statistics.median(r['requests'] for r in done):>8.0f}")
+    print(f"  연결 수       중앙값 {statistics.median(r['connections'] for r in done):>8.0f}")
+    if reuse:
+        print(f"  연결당 요청   중앙값 {statistics.median(reuse):>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ltorrent 웹 시드 로컬 벤치마크")
+    parser.add_argument('--size-mb', type=int, default=256, help="전체 데이터 크기 (MiB)")
+    parser.add_argument('--files', type=int, default=4, help="파일 수")
+    parser.add_argument('--runs', type=int, default=3, help="측정 횟수")
+    parser.add_argument('--connections', type=int, default=4, help="웹 시드당 연결 수")
+    parser.add_argument('--pipeline', type=int, default=8, help="연결당 요청 파이프라인 크기")
+    parser.add_argument('--timeout', type=float, default=300, help="실행당 최대 대기 시간 (초)")
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--torrent', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.torrent, args.timeout, args.connections, args.pipeline)
+        return
+
+    sys.path.insert(0, ROOT)
+    from torrent_creator import TorrentCreator
+
+    with tempfile.TemporaryDirectory() as root:
+        content = make_content(root, args.size_mb, args.files)
+        counters = {'connections': 0, 'requests': 0}
+        handler = type('Handler', (RangeRequestHandler,), {'counters': counters})
+        server = ThreadingHTTPServer(('127.0.0.1', 0), partial(handler, directory=root))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        # URL 시드는 다중 파일 토렌트면 토렌트 이름 디렉터리의 상위 URL ('/'로 끝남)
+        url_seed = f"http://127.0.0.1:{server.server_address[1]}/"
+        torrent_path = os.path.join(root, 'web_seed.torrent')
+        with open(torrent_path, 'wb') as f:
+            f.write(TorrentCreator(content, 'hybrid', url_seeds=[url_seed]).create())
+
+        try:
+            results = [run_once(args, torrent_path, counters) for _ in range(args.runs)]
+        finally:
+            server.shutdown()
+            server.server_close()
+    print_results(results)
+
+
+if __name__ == '__main__':
+    main()
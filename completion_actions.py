@@ -0,0 +1,236 @@
+"""
+다운로드 완료 후 작업 (저장소 이동, 하드링크, 검증, 훅 실행) - 제한된 워커 큐에서 재시도와 함께 실행
+"""
+import errno
+import json
+import os
+import queue
+import threading
+import time
+
+from fast_recheck import pieces_for_files, verify_pieces
+
+
+ACTION_TYPES = ('move', 'hardlink', 'verify', 'hook')
+HOOK_TIMEOUT = 300  # 훅 명령 최대 실행 시간 (초)
+MOVE_TIMEOUT = 6 * 3600  # move_storage 완료 알림 대기 최대 시간 (초)
+
+
+class ActionError(Exception):
+    """완료 작업 실패 (retry=False면 재시도하지 않음)"""
+
+    def __init__(self, message, retry=True):
+        super().__init__(message)
+        self.retry = retry
+
+
+def load_actions(path):
+    """저장된 완료 작업 목록 로드"""
+    try:
+        with open(path) as f:
+            actions = json.load(f)
+    except FileNotFoundError:
+        return []
+    return [action for action in actions if action.get('type') in ACTION_TYPES]
+
+
+def save_actions(path, actions):
+    """완료 작업 목록 저장"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(actions, f, indent=2, ensure_ascii=False)
+    os.replace(path + '.tmp', path)
+
+
+def hardlink_files(file_storage, save_path, target_dir):
+    """토렌트 파일을 target_dir 아래 같은 상대 경로로 하드링크, 만든 링크 수 반환"""
+    linked = 0
+    for index in range(file_storage.num_files()):
+        relative_path = file_storage.file_path(index)
+        source = os.path.join(save_path, relative_path)
+        if not os.path.exists(source):
+            # 받지 않은 파일/패딩 파일
+            continue
+
+        target = os.path.join(target_dir, relative_path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        if os.path.exists(target):
+            if os.path.samefile(source, target):
+                continue
+            raise ActionError(f"대상 파일이 이미 있습니다: {target}", retry=False)
+        try:
+            os.link(source, target)
+        except OSError as e:
+            if e.errno == errno.EXDEV:
+                raise ActionError(f"다른 볼륨에는 하드링크를 만들 수 없습니다: {target_dir}", retry=False)
+            raise
+        linked += 1
+    return linked
+
+
+class CompletionPipeline:
+    """완료된 토렌트마다 작업 목록을 순서대로 실행
+
+    동시에 실행되는 작업 수는 워커 수로 제한되고, 이동(move_storage)은 완료 알림을
+    기다리는 동안 워커를 점유하지 않는다.
+    """
+
+    def __init__(self, client, actions=None, workers=2, max_retries=3, retry_delay=30):
+        self.client = client
+        self.actions = list(actions or [])
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+
+        self._queue = queue.Queue()  # (torrent_hash, 작업 목록, 단계, 시도 횟수)
+        self._lock = threading.Lock()
+        self._waiting_moves = {}  # hash -> (작업 목록, 단계, 시도 횟수, 시작 시각)
+        self._pending = 0  # 큐/실행/이동 대기 중인 토렌트 수
+        self._running = True
+        self._workers = [threading.Thread(target=self._worker, daemon=True) for _ in range(max(1, workers))]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, torrent_hash):
+        """완료된 토렌트의 작업 시작 (알림 스레드에서 호출, 바로 반환)"""
+        if not self.actions:
+            return False
+        with self._lock:
+            self._pending += 1
+        # 실행 중 설정이 바뀌어도 이 토렌트는 제출 시점 목록으로 처리
+        self._queue.put((torrent_hash, list(self.actions), 0, 0))
+        return True
+
+    def pending_count(self):
+        """처리 중인 토렌트 수"""
+        with self._lock:
+            return self._pending
+
+    def on_storage_moved(self, torrent_hash, success, message=''):
+        """storage_moved_alert / storage_moved_failed_alert 처리 (알림 스레드)"""
+        with self._lock:
+            waiting = self._waiting_moves.pop(torrent_hash, None)
+        if waiting is None:
+            return
+        actions, step, attempt, _ = waiting
+        if success:
+            self._report(torrent_hash, actions[step], True, message)
+            self._queue.put((torrent_hash, actions, step + 1, 0))
+        else:
+            self._retry(torrent_hash, actions, step, attempt, ActionError(message))
+
+    def check_timeouts(self):
+        """이동 완료 알림이 오지 않는 작업 정리 (업데이트 루프에서 호출)"""
+        now = time.monotonic()
+        with self._lock:
+            expired = [h for h, w in self._waiting_moves.items() if now - w[3] > MOVE_TIMEOUT]
+        for torrent_hash in expired:
+            self.on_storage_moved(torrent_hash, False, "저장소 이동 시간 초과")
+
+    def stop(self):
+        """워커 종료 (대기 중인 작업은 버림)"""
+        self._running = False
+        for _ in self._workers:
+            self._queue.put(None)
+
+    def _worker(self):
+        while self._running:
+            job = self._queue.get()
+            if job is None:
+                break
+            torrent_hash, actions, step, attempt = job
+
+            if step >= len(actions) or torrent_hash not in self.client.torrents:
+                self._finish(torrent_hash)
+                continue
+
+            action = actions[step]
+            try:
+                result = self._run_action(torrent_hash, action, actions, step, attempt)
+            except Exception as e:
+                self._retry(torrent_hash, actions, step, attempt, e)
+                continue
+
+            if result is None:
+                # move_storage 진행 중, 완료 알림에서 다음 단계로
+                continue
+            self._report(torrent_hash, action, True, result)
+            self._queue.put((torrent_hash, actions, step + 1, 0))
+
+    def _run_action(self, torrent_hash, action, actions, step, attempt):
+        """작업 하나 실행, 결과 메시지 반환 (비동기 이동이면 None)"""
+        torrent_data = self.client.torrents[torrent_hash]
+        handle = torrent_data['handle']
+        action_type = action['type']
+
+        if action_type == 'move':
+            target = os.path.expanduser(action['path'])
+            if os.path.abspath(target) == os.path.abspath(torrent_data['path']):
+                return "이미 대상 경로에 있음"
+            os.makedirs(target, exist_ok=True)
+            with self._lock:
+                self._waiting_moves[torrent_hash] = (actions, step, attempt, time.monotonic())
+            handle.move_storage(target)
+            return None
+
+        if action_type == 'hardlink':
+            target = os.path.expanduser(action['path'])
+            linked = hardlink_files(handle.torrent_file().files(), torrent_data['path'], target)
+            return f"하드링크 {linked}개 생성: {target}"
+
+        if action_type == 'verify':
+            return self._verify(torrent_hash, handle, torrent_data['path'])
+
+        if action_type == 'hook':
+            import subprocess
+            env = dict(os.environ,
+                       TORRENT_HASH=torrent_hash,
+                       TORRENT_NAME=torrent_data['name'],
+                       TORRENT_PATH=torrent_data['path'])
+            command = action['command']
+            completed = subprocess.run(command, shell=isinstance(command, str), env=env,
+                                       capture_output=True, timeout=HOOK_TIMEOUT)
+            if completed.returncode != 0:
+                raise ActionError(f"훅 종료 코드 {completed.returncode}: "
+                                  f"{completed.stderr.decode('utf-8', 'replace').strip()[:200]}")
+            return "훅 실행 완료"
+
+        raise ActionError(f"알 수 없는 작업: {action_type}", retry=False)
+
+    def _verify(self, torrent_hash, handle, save_path):
+        """받은 데이터 검증 (v1 피스 해시, v2 전용이면 머클 루트)"""
+        torrent_info = handle.torrent_file()
+        pieces = {piece for piece in range(torrent_info.num_pieces()) if handle.have_piece(piece)}
+        if handle.info_hashes().has_v1():
+            passed = verify_pieces(torrent_info, save_path, pieces, self.client.recheck_scheduler.budget)
+            failed = pieces - passed
+        else:
+            priorities = handle.get_file_priorities()
+            files = [i for i in range(torrent_info.files().num_files()) if priorities[i] > 0]
+            bad_files = [i for i in files if not self.client.verify_torrent_file(torrent_hash, i)]
+            failed = pieces & set(pieces_for_files(torrent_info.files(), torrent_info.piece_length(), bad_files))
+        if failed:
+            # 손상된 피스는 받지 않은 것으로 표시해 다시 받음 (재시도해도 결과가 같음)
+            self.client.mark_pieces_missing(torrent_hash, sorted(failed))
+            raise ActionError(f"검증 실패 피스 {len(failed)}개, 다시 받는 중", retry=False)
+        return "검증 통과"
+
+    def _retry(self, torrent_hash, actions, step, attempt, error):
+        retry = getattr(error, 'retry', True) and attempt + 1 < self.max_retries
+        self._report(torrent_hash, actions[step], False,
+                     f"{error} ({'재시도 예정' if retry else '중단'})")
+        if not retry:
+            self._finish(torrent_hash)
+            return
+
+        # 재시도 간격만큼 기다린 뒤 다시 큐에 넣음 (워커를 점유하지 않음)
+        timer = threading.Timer(self.retry_delay * (attempt + 1), self._queue.put,
+                                args=((torrent_hash, actions, step, attempt + 1),))
+        timer.daemon = True
+        timer.start()
+
+    def _finish(self, torrent_hash):
+        with self._lock:
+            self._pending = max(0, self._pending - 1)
+
+    def _report(self, torrent_hash, action, success, message):
+        self.client.completion_action_finished.emit(torrent_hash, action['type'], success, message)
@@ -0,0 +1,129 @@
+"""
+볼륨별 디스크 공간 계산: 받는 중인 토렌트의 남은 바이트를 볼륨(st_dev)마다 증분 합산
+
+토렌트 상태가 바뀔 때 그 토렌트의 남은 바이트만 갱신하므로 전체를 다시 훑지 않고,
+여유 공간(statvfs)은 볼륨마다 주기적으로 한 번만 읽는다.
+"""
+import os
+import threading
+import time
+
+
+DEFAULT_MIN_FREE = 2 * 1024 ** 3  # 이보다 적게 남으면 받기 일시정지 / 새 토렌트 대기 (바이트)
+DEFAULT_RESUME_FREE = 4 * 1024 ** 3  # 이만큼 다시 확보되면 재개 (바이트)
+FREE_SPACE_INTERVAL = 5  # 여유 공간 확인 주기 (초)
+DISK_FULL_POLICIES = ('queue', 'reject')  # 공간이 모자란 새 토렌트: 대기열에 넣음 / 거부
+
+
+class DiskSpaceError(Exception):
+    """새 토렌트를 받을 공간이 없음"""
+
+
+def existing_path(path):
+    """경로 또는 존재하는 가장 가까운 상위 디렉터리 (아직 만들지 않은 다운로드 경로용)"""
+    path = os.path.abspath(os.path.expanduser(path))
+    while not os.path.exists(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+    return path
+
+
+def free_bytes(path):
+    """사용자가 쓸 수 있는 여유 공간 (바이트)"""
+    stat = os.statvfs(path)
+    return stat.f_bavail * stat.f_frsize
+
+
+class VolumeAccounting:
+    """볼륨별 남은 바이트 합계와 여유 공간
+
+    남은 바이트는 완료되지 않은 토렌트(사용자가 일시정지한 것 포함)의 받을 양으로,
+    새 토렌트를 받아들일 때 이미 약속된 공간으로 본다.
+    """
+
+    def __init__(self, min_free=DEFAULT_MIN_FREE, resume_free=DEFAULT_RESUME_FREE):
+        self.min_free = min_free
+        self.resume_free = resume_free
+        self.lock = threading.Lock()
+        self._volumes = {}  # 경로 -> 장치 번호 (캐시)
+        self._paths = {}  # 장치 번호 -> 여유 공간을 읽을 경로
+        self._torrents = {}  # hash -> (장치 번호, 남은 바이트)
+        self._remaining = {}  # 장치 번호 -> {hash: 남은 바이트}
+        self._totals = {}  # 장치 번호 -> 남은 바이트 합계
+        self._free = {}  # 장치 번호 -> 마지막으로 읽은 여유 공간
+        self._last_refresh = 0
+
+    def volume(self, path):
+        """경로가 있는 볼륨의 장치 번호 (경로별 캐시)"""
+        dev = self._volumes.get(path)
+        if dev is None:
+            existing = existing_path(path)
+            dev = self._volumes[path] = os.stat(existing).st_dev
+            self._paths.setdefault(dev, existing)
+        return dev
+
+    def set_remaining(self, torrent_hash, path, remaining):
+        """토렌트의 남은 바이트 갱신 (O(1), 0이면 합계에서 뺌)"""
+        with self.lock:
+            dev = self.volume(path)
+            previous_dev, previous = self._torrents.get(torrent_hash, (dev, 0))
+            if previous_dev == dev and previous == remaining:
+                return
+            if previous:
+                self._totals[previous_dev] -= previous
+                self._remaining[previous_dev].pop(torrent_hash, None)
+            if remaining > 0:
+                self._torrents[torrent_hash] = (dev, remaining)
+                self._totals[dev] = self._totals.get(dev, 0) + remaining
+                self._remaining.setdefault(dev, {})[torrent_hash] = remaining
+            else:
+                self._torrents.pop(torrent_hash, None)
+
+    def remove(self, torrent_hash):
+        with self.lock:
+            dev, remaining = self._torrents.pop(torrent_hash, (None, 0))
+            if remaining:
+                self._totals[dev] -= remaining
+                self._remaining[dev].pop(torrent_hash, None)
+
+    def refresh(self, force=False):
+        """볼륨마다 여유 공간 읽기, {장치 번호: 여유 공간} (주기가 안 됐으면 None)"""
+        now = time.monotonic()
+        with self.lock:
+            if not force and now - self._last_refresh < FREE_SPACE_INTERVAL:
+                return None
+            self._last_refresh = now
+            for dev, path in self._paths.items():
+                try:
+                    self._free[dev] = free_bytes(path)
+                except OSError:
+                    pass
+            return dict(self._free)
+
+    def fits(self, path, size):
+        """size 바이트를 더 받아도 최소 여유 공간이 남는지 (이미 받기로 한 바이트 포함)"""
+        with self.lock:
+            dev = self.volume(path)
+            if dev not in self._free:
+                self._free[dev] = free_bytes(self._paths[dev])
+            return self._free[dev] - self._totals.get(dev, 0) - size >= self.min_free
+
+    def downloading(self, dev):
+        """볼륨에서 받을 것이 남은 토렌트 해시"""
+        with self.lock:
+            return list(self._remaining.get(dev, ()))
+
+    def status(self):
+        """볼륨별 {'path', 'free', 'remaining', 'torrents'}"""
+        with self.lock:
+            return {
+                dev: {
+                    'path': path,
+                    'free': self._free.get(dev),
+                    'remaining': self._totals.get(dev, 0),
+                    'torrents': len(self._remaining.get(dev, ())),
+                }
+                for dev, path in self._paths.items()
+            }
@@ -0,0 +1,140 @@
+"""
+빠른 재검사: 파일 식별 정보(크기, mtime_ns, inode)가 바뀐 파일의 피스만 해싱
+"""
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from torrent_creator import read_torrent_range, is_pad_file
+
+
+READ_BATCH_BYTES = 16 * 1024 * 1024  # 연속 피스를 한 번에 읽는 크기
+
+
+def file_identity(path):
+    """파일 식별 정보 (없으면 None)"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+
+
+def snapshot_identities(file_storage, save_path):
+    """토렌트의 모든 파일 식별 정보 {파일 경로: [size, mtime_ns, inode]}"""
+    identities = {}
+    for index in range(file_storage.num_files()):
+        if is_pad_file(file_storage, index):
+            continue
+        relative_path = file_storage.file_path(index)
+        identities[relative_path] = file_identity(os.path.join(save_path, relative_path))
+    return identities
+
+
+def changed_files(file_storage, save_path, recorded):
+    """기록과 식별 정보가 달라진 파일 인덱스 목록"""
+    changed = []
+    for index in range(file_storage.num_files()):
+        if is_pad_file(file_storage, index) or file_storage.file_size(index) == 0:
+            continue
+        relative_path = file_storage.file_path(index)
+        current = file_identity(os.path.join(save_path, relative_path))
+        if current is None or recorded.get(relative_path) != current:
+            changed.append(index)
+    return changed
+
+
+def pieces_for_files(file_storage, piece_length, file_indices):
+    """파일들에 걸친 피스 번호 집합"""
+    pieces = set()
+    for index in file_indices:
+        size = file_storage.file_size(index)
+        if size == 0:
+            continue
+        offset = file_storage.file_offset(index)
+        pieces.update(range(offset // piece_length, (offset + size - 1) // piece_length + 1))
+    return pieces
+
+
+def contiguous_runs(pieces, max_count):
+    """정렬된 피스 번호를 연속 구간 (first, count) 으로 묶음"""
+    runs = []
+    for piece in sorted(pieces):
+        if runs and runs[-1][0] + runs[-1][1] == piece and runs[-1][1] < max_count:
+            runs[-1][1] += 1
+        else:
+            runs.append([piece, 1])
+    return runs
+
+
+class IOBudget:
+    """모든 재검사 작업이 공유하는 디스크 읽기 속도 제한 (토큰 버킷)"""
+
+    def __init__(self, bytes_per_second):
+        self.bytes_per_second = bytes_per_second
+        self._lock = threading.Lock()
+        self._available = float(bytes_per_second)
+        self._last = time.monotonic()
+
+    def consume(self, amount):
+        """amount 바이트를 읽을 수 있을 때까지 대기 (0이면 무제한)"""
+        if self.bytes_per_second <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._available = min(self.bytes_per_second,
+                                  self._available + (now - self._last) * self.bytes_per_second)
+            self._last = now
+            self._available -= amount
+            wait_time = -self._available / self.bytes_per_second if self._available < 0 else 0
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+
+def verify_pieces(torrent_info, save_path, pieces, budget):
+    """v1 SHA-1 피스 해시로 피스를 검증, 통과한 피스 집합 반환"""
+    file_storage = torrent_info.files()
+    piece_length = torrent_info.piece_length()
+    passed = set()
+
+    for first, count in contiguous_runs(pieces, max(1, READ_BATCH_BYTES // piece_length)):
+        last = first + count - 1
+        length = (count - 1) * piece_length + torrent_info.piece_size(last)
+        budget.consume(length)
+        data = memoryview(read_torrent_range(file_storage, save_path, first, length, allow_missing=True))
+
+        for i in range(count):
+            piece = first + i
+            start = i * piece_length
+            digest = hashlib.sha1(data[start:start + torrent_info.piece_size(piece)]).digest()
+            if digest == bytes(torrent_info.hash_for_piece(piece)):
+                passed.add(piece)
+    return passed
+
+
+class RecheckScheduler:
+    """여러 토렌트의 재검사를 I/O 예산 안에서 병렬로 실행"""
+
+    def __init__(self, max_parallel=2, io_budget_mbps=200):
+        self.max_parallel = max_parallel
+        self.budget = IOBudget(int(io_budget_mbps * 1024 * 1024))
+        self.executor = ThreadPoolExecutor(max_workers=max_parallel)
+
+    def set_limits(self, max_parallel=None, io_budget_mbps=None):
+        """동시 작업 수와 I/O 예산 변경"""
+        if io_budget_mbps is not None:
+            self.budget.bytes_per_second = int(io_budget_mbps * 1024 * 1024)
+        if max_parallel is not None and max_parallel != self.max_parallel:
+            # 진행 중인 작업은 기존 풀에서 마무리
+            self.executor.shutdown(wait=False)
+            self.max_parallel = max_parallel
+            self.executor = ThreadPoolExecutor(max_workers=max_parallel)
+
+    def submit(self, job, *args):
+        """재검사 작업 제출"""
+        return self.executor.submit(job, *args)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
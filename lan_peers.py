@@ -0,0 +1,139 @@
+"""
+LAN 피어: 지정한 주소 구간의 피어를 전역 속도 제한 밖의 피어 클래스로 두고 로컬/원격 전송량을 나눠 집계
+
+같은 랙/데이터센터의 머신끼리 복제할 때 전역 업/다운로드 제한에 묶이지 않게 한다.
+전송량은 전송 중인 토렌트의 피어 목록을 몇 개씩 돌아가며 읽어 피어별 누적 바이트의 차이로 센다.
+
+암호화 정책은 libtorrent에서 세션 전체에 적용되므로 LAN 피어만 따로 암호화를 끌 수는 없다.
+"""
+import bisect
+import ipaddress
+import threading
+
+from session_state import parse_blocklist_line
+
+
+# 사설/링크 로컬 주소 (libtorrent 기본 로컬 피어 클래스와 같은 범위)
+DEFAULT_LAN_RANGES = ['10.0.0.0/8', '172.16.0.0/12', '192.168.0.0/16', 'fc00::/7', 'fe80::/10']
+LAN_SAMPLE_INTERVAL = 5  # 피어별 전송량 확인 주기 (초)
+LAN_SAMPLE_TORRENTS = 8  # 한 번에 피어 목록을 읽을 전송 중인 토렌트 수 (돌아가며)
+
+# LAN 피어 클래스 설정 (libtorrent peer_class_info)
+LAN_PEER_CLASS_INFO = {
+    'label': 'lan',
+    'upload_limit': 0,  # 무제한 (전역 제한은 전역 클래스에만 걸림)
+    'download_limit': 0,
+    'ignore_unchoke_slots': True,  # 언초크 슬롯 수와 상관없이 항상 언초크
+    'connection_limit_factor': 100,
+    'upload_priority': 2,  # 클래스 간 대역폭 배분 가중치 (기본 1)
+    'download_priority': 2,
+}
+
+
+def parse_lan_ranges(entries):
+    """CIDR/구간/단일 주소 목록 검증 -> 정규화된 문자열 목록 (잘못된 항목은 ValueError)"""
+    ranges = []
+    for entry in entries:
+        entry = entry.strip()
+        if not entry:
+            continue
+        if parse_blocklist_line(entry) is None:
+            raise ValueError(f"잘못된 LAN 주소 구간: {entry}")
+        ranges.append(entry)
+    return ranges
+
+
+class LanRanges:
+    """LAN 주소 구간 판정 (주소 종류별 정렬된 시작 주소에서 이진 탐색)"""
+
+    def __init__(self, entries):
+        self.entries = list(entries)
+        merged = {4: [], 6: []}
+        for start, end in sorted((r for r in map(parse_blocklist_line, self.entries) if r is not None),
+                                 key=lambda r: (r[0].version, int(r[0]))):
+            items = merged[start.version]
+            if items and int(start) <= items[-1][1] + 1:
+                items[-1][1] = max(items[-1][1], int(end))
+            else:
+                items.append([int(start), int(end)])
+        self._ranges = merged
+        self._starts = {version: [start for start, _ in items] for version, items in merged.items()}
+
+    def __bool__(self):
+        return any(self._ranges.values())
+
+    def contains(self, address):
+        """주소(문자열 또는 ipaddress 주소)가 LAN 구간에 있는지"""
+        try:
+            address = ipaddress.ip_address(address)
+        except ValueError:
+            return False
+        value = int(address)
+        starts = self._starts[address.version]
+        index = bisect.bisect_right(starts, value) - 1
+        return index >= 0 and value <= self._ranges[address.version][index][1]
+
+    def rules(self):
+        """(시작, 끝) 주소 문자열 (ip_filter.add_rule에 바로 넘김)"""
+        for start, end in filter(None, map(parse_blocklist_line, self.entries)):
+            yield str(start), str(end)
+
+
+class PeerTraffic:
+    """피어별 누적 전송량 차이로 로컬(LAN)/원격 바이트 집계
+
+    처음 보는 피어는 누적값 전체를 더하므로, 빠지는 것은 두 확인 사이에 끊긴 피어의 마지막 몇 초뿐이다.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.local_download = 0
+        self.local_upload = 0
+        self._last = {}  # hash -> {(ip, port): (받은 바이트, 보낸 바이트)}
+        self._peer_counts = {}  # hash -> 마지막 확인에서 연결된 LAN 피어 수
+
+    def sample(self, torrent_hash, peers, is_local):
+        """토렌트의 피어 목록 반영 (peers: (ip, port, 받은 누적, 보낸 누적)), 연결된 LAN 피어 수 반환"""
+        previous = self._last.get(torrent_hash, {})
+        current = {}
+        local_peers = 0
+        download = upload = 0
+        for ip, port, total_download, total_upload in peers:
+            if not is_local(ip):
+                continue
+            local_peers += 1
+            last_download, last_upload = previous.get((ip, port), (0, 0))
+            # 재연결로 누적값이 줄었으면 새 연결로 보고 전체를 더함
+            download += total_download - last_download if total_download >= last_download else total_download
+            upload += total_upload - last_upload if total_upload >= last_upload else total_upload
+            current[(ip, port)] = (total_download, total_upload)
+        with self.lock:
+            self.local_download += download
+            self.local_upload += upload
+        if current:
+            self._last[torrent_hash] = current
+            self._peer_counts[torrent_hash] = local_peers
+        else:
+            self._last.pop(torrent_hash, None)
+            self._peer_counts.pop(torrent_hash, None)
+        return local_peers
+
+    def retain(self, torrent_hashes):
+        """전송 중인 토렌트만 LAN 피어 수에 남김 (누적값은 다시 전송을 시작할 때 차이 계산에 씀)"""
+        keep = set(torrent_hashes)
+        for torrent_hash in list(self._peer_counts):
+            if torrent_hash not in keep:
+                del self._peer_counts[torrent_hash]
+
+    def peer_count(self):
+        """연결된 LAN 피어 수 (토렌트마다 마지막 확인 기준)"""
+        return sum(self._peer_counts.values())
+
+    def forget(self, torrent_hash):
+        self._last.pop(torrent_hash, None)
+        self._peer_counts.pop(torrent_hash, None)
+
+    def totals(self):
+        """(LAN 받은 바이트, LAN 보낸 바이트)"""
+        with self.lock:
+            return self.local_download, self.local_upload
@@ -1,18 +1,74 @@
 import sys
 import os
-import subprocess
+import argparse
 from PySide6.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, 
                                QWidget, QPushButton, QTableWidget, QTableWidgetItem,
-                               QFileDialog, QInputDialog, QMessageBox, QProgressBar,
+                               QFileDialog, QInputDialog, QMessageBox,
                                QLabel, QHeaderView, QMenu, QMenuBar, QStatusBar,
                                QSplitter, QGroupBox, QGridLayout, QLineEdit, QSpinBox,
-                               QCheckBox, QSlider, QTextEdit, QTabWidget, QComboBox)
+                               QCheckBox, QSlider, QTextEdit, QTabWidget, QComboBox,
+                               QTableView, QDoubleSpinBox)
 from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QAction, QIcon, QFont
-from torrent_client import TorrentClient
+from torrent_client import TorrentClient, FILE_PRIORITIES
+from torrent_list import (TorrentListModel, TorrentFilterProxy, ProgressDelegate,
+                          COLUMN_PROGRESS, STATE_LABELS)
+from rate_graph import RateGraph
+
+
+class SortableItem(QTableWidgetItem):
+    """표시 텍스트와 별도로 정렬 키(숫자)를 갖는 테이블 항목"""
+    
+    def __init__(self, text, sort_key):
+        super().__init__(text)
+        self.sort_key = sort_key
+    
+    def __lt__(self, other):
+        if isinstance(other, SortableItem):
+            return self.sort_key < other.sort_key
+        return super().__lt__(other)
 
 
 class TorrentMainWindow(QMainWindow):
+    # 파일 우선순위 표시 이름
+    FILE_PRIORITY_LABELS = {
+        'skip': "받지 않음",
+        'low': "낮음",
+        'normal': "보통",
+        'high': "높음",
+    }
+    
+    # 성능 프로필 표시 이름
+    SESSION_PROFILE_LABELS = {
+        'default': "기본 (데스크톱)",
+        'seedbox': "고성능 시딩 (시드박스)",
+    }
+    
+    # 시딩 목표 작업 (작업 -> 표시 이름)
+    SEEDING_GOAL_ACTIONS = {
+        'pause': "일시정지",
+        'remove': "목록에서 제거",
+        'remove_delete': "파일과 함께 제거",
+        'move': "이동 후 일시정지",
+    }
+    
+    # 프록시 종류 (표시 이름 -> TorrentClient 프록시 종류)
+    PROXY_TYPE_LABELS = {
+        "HTTP": "http",
+        "SOCKS4": "socks4",
+        "SOCKS5": "socks5",
+        "HTTP (인증)": "http_pw",
+        "SOCKS5 (인증)": "socks5_pw",
+    }
+    
+    # 그래프 범위 (표시 이름, 초) - 범위에 맞는 해상도(1초/1분/15분)만 읽음
+    GRAPH_SPANS = (
+        ("최근 10분", 600),
+        ("최근 1시간", 3600),
+        ("최근 24시간", 86400),
+        ("최근 30일", 30 * 86400),
+    )
+    
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Ltorrent - 토렌트 클라이언트")
@@ -24,28 +80,61 @@ class TorrentMainWindow(QMainWindow):
         self.torrent_client.progress_updated.connect(self.on_progress_updated)
         self.torrent_client.torrent_finished.connect(self.on_torrent_finished)
         self.torrent_client.security_alert.connect(self.on_security_alert)
+        self.torrent_client.metadata_resolved.connect(self.on_metadata_resolved)
+        self.torrent_client.torrent_creation_progress.connect(self.on_torrent_creation_progress)
+        self.torrent_client.torrent_created.connect(self.on_torrent_created)
+        self.torrent_client.completion_action_finished.connect(self.on_completion_action_finished)
+        self.torrent_client.torrent_updated.connect(self.on_torrent_updated)
+        self.torrent_client.seeding_goal_reached.connect(self.on_seeding_goal_reached)
         
         # UI 설정
         self.setup_ui()
         self.setup_menu()
         self.setup_status_bar()
         
-        # 토렌트 데이터 저장
-        self.torrent_rows = {}  # hash -> row 매핑
+        self.stats_update_pending = False  # 전체 통계 갱신 예약 여부 (진행률 신호를 모아 한 번에)
         
         # 자동 종료 옵션
         self.auto_shutdown_enabled = False
         
-        # 업데이트 타이머
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self.check_auto_shutdown)
-        self.update_timer.start(5000)  # 5초마다 확인
+        # 모든 다운로드 완료 시 알림 (폴링 없이 완료 추적 카운터로 판단)
+        self.torrent_client.all_torrents_completed.connect(self.check_auto_shutdown)
         
         # Tor 상태 확인 타이머
         self.tor_check_timer = QTimer()
         self.tor_check_timer.timeout.connect(self.check_tor_status)
-        self.tor_check_timer.start(10000)  # 10초마다 Tor 상태 확인
-        self.check_tor_status()  # 시작 시 한 번 확인
+        self.tor_check_timer.start(10000)  # 10초마다 Tor 상태 확인 (보안 탭이 보일 때만)
+        
+        # 파일 탭 갱신 타이머 (탭이 보일 때만 갱신)
+        self.files_timer = QTimer()
+        self.files_timer.timeout.connect(self.refresh_files_tab)
+        self.files_timer.start(2000)
+        self.torrent_table.selectionModel().selectionChanged.connect(self.refresh_files_tab)
+        self.info_widget.currentChanged.connect(self.refresh_files_tab)
+        
+        # 피어 탭 갱신 타이머 (보고 있는 토렌트 하나만 조회)
+        self.peers_timer = QTimer()
+        self.peers_timer.timeout.connect(self.refresh_peers_tab)
+        self.peers_timer.start(2000)
+        self.torrent_table.selectionModel().selectionChanged.connect(self.refresh_peers_tab)
+        self.info_widget.currentChanged.connect(self.refresh_peers_tab)
+        
+        # 트래커 탭 갱신 타이머
+        self.trackers_timer = QTimer()
+        self.trackers_timer.timeout.connect(self.refresh_trackers_tab)
+        self.trackers_timer.start(5000)
+        self.torrent_table.selectionModel().selectionChanged.connect(self.refresh_trackers_tab)
+        self.info_widget.currentChanged.connect(self.refresh_trackers_tab)
+        
+        # 그래프 탭 갱신 타이머
+        self.graph_timer = QTimer()
+        self.graph_timer.timeout.connect(self.refresh_graph_tab)
+        self.graph_timer.start(2000)
+        self.torrent_table.selectionModel().selectionChanged.connect(self.refresh_graph_tab)
+        self.info_widget.currentChanged.connect(self.refresh_graph_tab)
+        
+        # 이전 세션 토렌트 복원은 창이 그려진 뒤에 (첫 화면 표시를 늦추지 않도록)
+        QTimer.singleShot(0, self.torrent_client.restore_torrents)
         
     def setup_ui(self):
         """UI 구성"""
@@ -85,22 +174,61 @@ class TorrentMainWindow(QMainWindow):
         # 스플리터로 상하 분할
         splitter = QSplitter(Qt.Vertical)
         
-        # 토렌트 테이블
-        self.torrent_table = QTableWidget()
-        self.torrent_table.setColumnCount(7)
-        self.torrent_table.setHorizontalHeaderLabels([
-            "이름", "진행률", "다운로드 속도", "업로드 속도", "시드", "피어", "상태"
-        ])
+        # 필터 막대 (이름, 상태, 태그, 트래커, 최소 비율)
+        filter_layout = QHBoxLayout()
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("이름 검색")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.textChanged.connect(self.apply_torrent_filter)
+        filter_layout.addWidget(self.search_input, 2)
+        
+        self.state_filter_combo = QComboBox()
+        self.state_filter_combo.addItem("모든 상태", None)
+        for state, label in STATE_LABELS.items():
+            self.state_filter_combo.addItem(label, state)
+        self.state_filter_combo.currentIndexChanged.connect(self.apply_torrent_filter)
+        filter_layout.addWidget(self.state_filter_combo)
+        
+        self.tag_filter_combo = QComboBox()
+        self.tag_filter_combo.addItem("모든 태그", None)
+        self.tag_filter_combo.currentIndexChanged.connect(self.apply_torrent_filter)
+        filter_layout.addWidget(self.tag_filter_combo)
+        
+        self.tracker_filter_combo = QComboBox()
+        self.tracker_filter_combo.addItem("모든 트래커", None)
+        self.tracker_filter_combo.currentIndexChanged.connect(self.apply_torrent_filter)
+        filter_layout.addWidget(self.tracker_filter_combo)
+        
+        filter_layout.addWidget(QLabel("최소 비율:"))
+        self.ratio_filter_spin = QDoubleSpinBox()
+        self.ratio_filter_spin.setRange(0, 100)
+        self.ratio_filter_spin.setSingleStep(0.5)
+        self.ratio_filter_spin.setSpecialValueText("전체")
+        self.ratio_filter_spin.valueChanged.connect(self.apply_torrent_filter)
+        filter_layout.addWidget(self.ratio_filter_spin)
+        
+        self.torrent_count_label = QLabel("0 / 0")
+        filter_layout.addWidget(self.torrent_count_label)
+        main_layout.addLayout(filter_layout)
+        
+        # 토렌트 테이블 (해시로 식별하는 모델 + 정렬/필터 프록시)
+        self.torrent_model = TorrentListModel(self.format_bytes, self)
+        self.torrent_proxy = TorrentFilterProxy(self.torrent_model, self)
+        # 프록시는 원본 행이 지워지기 전에 행을 빼므로 개수는 원본 신호 뒤에 셈
+        self.torrent_model.rowsInserted.connect(self.update_torrent_count)
+        self.torrent_model.rowsRemoved.connect(self.update_torrent_count)
+        self.torrent_proxy.filter_refreshed.connect(self.update_torrent_count)
+        
+        self.torrent_table = QTableView()
+        self.torrent_table.setModel(self.torrent_proxy)
+        self.torrent_table.setItemDelegateForColumn(COLUMN_PROGRESS, ProgressDelegate(self.torrent_table))
+        self.torrent_table.setSortingEnabled(True)
+        self.torrent_table.sortByColumn(-1, Qt.AscendingOrder)  # 추가 순서로 시작
         
         # 헤더 설정
         header = self.torrent_table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.Fixed)
         header.setSectionResizeMode(0, QHeaderView.Stretch)  # 이름 컬럼 확장
-        header.setSectionResizeMode(1, QHeaderView.Fixed)
-        header.setSectionResizeMode(2, QHeaderView.Fixed)
-        header.setSectionResizeMode(3, QHeaderView.Fixed)
-        header.setSectionResizeMode(4, QHeaderView.Fixed)
-        header.setSectionResizeMode(5, QHeaderView.Fixed)
-        header.setSectionResizeMode(6, QHeaderView.Fixed)
         
         self.torrent_table.setColumnWidth(1, 100)  # 진행률
         self.torrent_table.setColumnWidth(2, 120)  # 다운로드 속도
@@ -108,16 +236,21 @@ class TorrentMainWindow(QMainWindow):
         self.torrent_table.setColumnWidth(4, 60)   # 시드
         self.torrent_table.setColumnWidth(5, 60)   # 피어
         self.torrent_table.setColumnWidth(6, 100)  # 상태
+        self.torrent_table.setColumnWidth(7, 60)   # 비율
+        self.torrent_table.setColumnWidth(8, 120)  # 태그
         
-        self.torrent_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.torrent_table.setSelectionBehavior(QTableView.SelectRows)
+        self.torrent_table.setSelectionMode(QTableView.ExtendedSelection)  # Shift/Ctrl 다중 선택
         self.torrent_table.setAlternatingRowColors(True)
         self.torrent_table.setMinimumHeight(500)  # 최소 높이 설정으로 더 많은 행 표시
         self.torrent_table.verticalHeader().setDefaultSectionSize(25)  # 행 높이를 25px로 설정
+        self.torrent_table.verticalHeader().hide()
         
         splitter.addWidget(self.torrent_table)
         
         # 정보 패널 (탭으로 구성)
-        info_widget = QTabWidget()
+        self.info_widget = QTabWidget()
+        info_widget = self.info_widget
         
         # 통계 탭
         stats_tab = QWidget()
@@ -145,7 +278,7 @@ class TorrentMainWindow(QMainWindow):
         speed_layout.addWidget(QLabel("업로드 제한 (KB/s):"), 0, 0)
         self.upload_limit_spinbox = QSpinBox()
         self.upload_limit_spinbox.setRange(0, 99999)
-        self.upload_limit_spinbox.setValue(0)
+        self.upload_limit_spinbox.setValue(self.torrent_client.upload_limit_kbps)
         self.upload_limit_spinbox.setSpecialValueText("무제한")
         self.upload_limit_spinbox.valueChanged.connect(self.on_upload_limit_changed)
         speed_layout.addWidget(self.upload_limit_spinbox, 0, 1)
@@ -154,7 +287,7 @@ class TorrentMainWindow(QMainWindow):
         speed_layout.addWidget(QLabel("다운로드 제한 (KB/s):"), 1, 0)
         self.download_limit_spinbox = QSpinBox()
         self.download_limit_spinbox.setRange(0, 99999)
-        self.download_limit_spinbox.setValue(0)
+        self.download_limit_spinbox.setValue(self.torrent_client.download_limit_kbps)
         self.download_limit_spinbox.setSpecialValueText("무제한")
         self.download_limit_spinbox.valueChanged.connect(self.on_download_limit_changed)
         speed_layout.addWidget(self.download_limit_spinbox, 1, 1)
@@ -171,12 +304,427 @@ class TorrentMainWindow(QMainWindow):
         
         stats_tab_layout.addWidget(shutdown_group, 1, 0, 1, 2)
         
+        # 메트릭 엔드포인트
+        metrics_group = QGroupBox("모니터링")
+        metrics_layout = QHBoxLayout(metrics_group)
+        
+        self.metrics_checkbox = QCheckBox("메트릭 엔드포인트 활성화 (Prometheus)")
+        self.metrics_checkbox.toggled.connect(self.on_metrics_toggled)
+        metrics_layout.addWidget(self.metrics_checkbox)
+        
+        metrics_layout.addWidget(QLabel("포트:"))
+        self.metrics_port_spinbox = QSpinBox()
+        self.metrics_port_spinbox.setRange(1024, 65535)
+        self.metrics_port_spinbox.setValue(9464)
+        metrics_layout.addWidget(self.metrics_port_spinbox)
+        metrics_layout.addStretch()
+        
+        stats_tab_layout.addWidget(metrics_group, 2, 0, 1, 2)
+        
+        # 수신/발신 인터페이스
+        network_group = QGroupBox("네트워크")
+        network_layout = QGridLayout(network_group)
+        listen_status = self.torrent_client.get_listen_status()
+        
+        network_layout.addWidget(QLabel("수신 인터페이스:"), 0, 0)
+        self.listen_interfaces_input = QLineEdit(", ".join(listen_status['interfaces']))
+        self.listen_interfaces_input.setPlaceholderText("예: 0.0.0.0, [::], eth0")
+        network_layout.addWidget(self.listen_interfaces_input, 0, 1)
+        
+        network_layout.addWidget(QLabel("수신 포트:"), 0, 2)
+        self.listen_port_spinbox = QSpinBox()
+        self.listen_port_spinbox.setRange(0, 65535)
+        self.listen_port_spinbox.setSpecialValueText("무작위")
+        self.listen_port_spinbox.setValue(listen_status['port'])
+        network_layout.addWidget(self.listen_port_spinbox, 0, 3)
+        
+        network_layout.addWidget(QLabel("발신 인터페이스:"), 1, 0)
+        self.outgoing_interfaces_input = QLineEdit(", ".join(listen_status['outgoing_interfaces']))
+        self.outgoing_interfaces_input.setPlaceholderText("비워 두면 기본 경로 사용")
+        network_layout.addWidget(self.outgoing_interfaces_input, 1, 1)
+        
+        self.listen_apply_button = QPushButton("적용")
+        self.listen_apply_button.clicked.connect(self.on_listen_apply_clicked)
+        network_layout.addWidget(self.listen_apply_button, 1, 3)
+        
+        # 트래커 알림 주기 (트래커 하나에 토렌트가 많을 때 속도 제한 회피)
+        network_layout.addWidget(QLabel("최소 트래커 알림 간격 (초):"), 2, 0)
+        self.announce_interval_spinbox = QSpinBox()
+        self.announce_interval_spinbox.setRange(0, 86400)
+        self.announce_interval_spinbox.setValue(self.torrent_client.tracker_settings['min_announce_interval'])
+        self.announce_interval_spinbox.editingFinished.connect(self.on_announce_settings_changed)
+        network_layout.addWidget(self.announce_interval_spinbox, 2, 1)
+        
+        network_layout.addWidget(QLabel("동시 알림 수:"), 2, 2)
+        self.concurrent_announce_spinbox = QSpinBox()
+        self.concurrent_announce_spinbox.setRange(1, 1000)
+        self.concurrent_announce_spinbox.setValue(self.torrent_client.tracker_settings['max_concurrent_http_announces'])
+        self.concurrent_announce_spinbox.editingFinished.connect(self.on_announce_settings_changed)
+        network_layout.addWidget(self.concurrent_announce_spinbox, 2, 3)
+        
+        # DHT 부트스트랩 노드 (저장된 라우팅 테이블이 없거나 오래됐을 때 사용)
+        network_layout.addWidget(QLabel("DHT 부트스트랩 노드:"), 3, 0)
+        self.dht_bootstrap_input = QLineEdit(", ".join(self.torrent_client.dht_bootstrap_nodes))
+        self.dht_bootstrap_input.setPlaceholderText("host:port, 비워 두면 기본값")
+        network_layout.addWidget(self.dht_bootstrap_input, 3, 1, 1, 2)
+        
+        self.dht_bootstrap_apply_button = QPushButton("적용")
+        self.dht_bootstrap_apply_button.clicked.connect(self.on_dht_bootstrap_apply_clicked)
+        network_layout.addWidget(self.dht_bootstrap_apply_button, 3, 3)
+        
+        # 웹 시드 (연결마다 요청을 파이프라인으로 이어 보내 연결을 재사용)
+        network_layout.addWidget(QLabel("웹 시드당 연결 수:"), 4, 0)
+        self.web_seed_connections_spinbox = QSpinBox()
+        self.web_seed_connections_spinbox.setRange(1, 64)
+        self.web_seed_connections_spinbox.setValue(self.torrent_client.web_seed_settings['max_web_seed_connections'])
+        self.web_seed_connections_spinbox.editingFinished.connect(self.on_web_seed_settings_changed)
+        network_layout.addWidget(self.web_seed_connections_spinbox, 4, 1)
+        
+        network_layout.addWidget(QLabel("연결당 요청 파이프라인:"), 4, 2)
+        self.web_seed_pipeline_spinbox = QSpinBox()
+        self.web_seed_pipeline_spinbox.setRange(1, 64)
+        self.web_seed_pipeline_spinbox.setValue(self.torrent_client.web_seed_settings['urlseed_pipeline_size'])
+        self.web_seed_pipeline_spinbox.editingFinished.connect(self.on_web_seed_settings_changed)
+        network_layout.addWidget(self.web_seed_pipeline_spinbox, 4, 3)
+        
+        stats_tab_layout.addWidget(network_group, 3, 0, 1, 2)
+        
+        # 성능 프로필
+        profile_group = QGroupBox("성능 프로필")
+        profile_layout = QHBoxLayout(profile_group)
+        
+        self.profile_combo = QComboBox()
+        for profile, label in self.SESSION_PROFILE_LABELS.items():
+            self.profile_combo.addItem(label, profile)
+        self.profile_combo.setCurrentIndex(self.profile_combo.findData(self.torrent_client.session_profile))
+        profile_layout.addWidget(self.profile_combo)
+        
+        self.profile_apply_button = QPushButton("적용")
+        self.profile_apply_button.clicked.connect(self.on_profile_apply_clicked)
+        profile_layout.addWidget(self.profile_apply_button)
+        
+        self.peer_memory_button = QPushButton("피어 메모리 측정")
+        self.peer_memory_button.clicked.connect(self.refresh_peer_memory)
+        profile_layout.addWidget(self.peer_memory_button)
+        
+        self.peer_memory_label = QLabel("")
+        profile_layout.addWidget(self.peer_memory_label)
+        profile_layout.addStretch()
+        
+        stats_tab_layout.addWidget(profile_group, 4, 0, 1, 2)
+        
+        # 완료 후 작업
+        completion_group = QGroupBox("완료 후 작업 (순서대로 실행)")
+        completion_layout = QGridLayout(completion_group)
+        actions = {action['type']: action for action in self.torrent_client.get_completion_actions()}
+        
+        self.completion_move_checkbox = QCheckBox("보관 위치로 이동:")
+        self.completion_move_checkbox.setChecked('move' in actions)
+        completion_layout.addWidget(self.completion_move_checkbox, 0, 0)
+        self.completion_move_input = QLineEdit(actions.get('move', {}).get('path', ''))
+        completion_layout.addWidget(self.completion_move_input, 0, 1)
+        
+        self.completion_hardlink_checkbox = QCheckBox("하드링크 생성:")
+        self.completion_hardlink_checkbox.setChecked('hardlink' in actions)
+        completion_layout.addWidget(self.completion_hardlink_checkbox, 1, 0)
+        self.completion_hardlink_input = QLineEdit(actions.get('hardlink', {}).get('path', ''))
+        completion_layout.addWidget(self.completion_hardlink_input, 1, 1)
+        
+        self.completion_verify_checkbox = QCheckBox("받은 데이터 검증")
+        self.completion_verify_checkbox.setChecked('verify' in actions)
+        completion_layout.addWidget(self.completion_verify_checkbox, 2, 0, 1, 2)
+        
+        self.completion_hook_checkbox = QCheckBox("명령 실행:")
+        self.completion_hook_checkbox.setChecked('hook' in actions)
+        completion_layout.addWidget(self.completion_hook_checkbox, 3, 0)
+        self.completion_hook_input = QLineEdit(actions.get('hook', {}).get('command', ''))
+        self.completion_hook_input.setPlaceholderText("환경 변수 TORRENT_HASH, TORRENT_NAME, TORRENT_PATH 사용 가능")
+        completion_layout.addWidget(self.completion_hook_input, 3, 1)
+        
+        self.completion_apply_button = QPushButton("적용")
+        self.completion_apply_button.clicked.connect(self.on_completion_apply_clicked)
+        completion_layout.addWidget(self.completion_apply_button, 4, 1, Qt.AlignRight)
+        
+        stats_tab_layout.addWidget(completion_group, 5, 0, 1, 2)
+        
+        # 시딩 목표 (한도 중 하나라도 닿으면 작업 실행, 0 = 사용 안 함)
+        seeding_goal_group = QGroupBox("시딩 목표")
+        seeding_goal_layout = QGridLayout(seeding_goal_group)
+        
+        seeding_goal_layout.addWidget(QLabel("대상:"), 0, 0)
+        self.seeding_scope_combo = QComboBox()
+        self.seeding_scope_combo.addItem("기본 (모든 토렌트)", ('default', None))
+        self.seeding_scope_combo.addItem("선택한 토렌트", ('torrent', None))
+        self.seeding_scope_combo.currentIndexChanged.connect(self.load_seeding_goal_fields)
+        seeding_goal_layout.addWidget(self.seeding_scope_combo, 0, 1)
+        
+        seeding_goal_layout.addWidget(QLabel("공유 비율:"), 0, 2)
+        self.seeding_ratio_spinbox = QDoubleSpinBox()
+        self.seeding_ratio_spinbox.setRange(0, 1000)
+        self.seeding_ratio_spinbox.setSingleStep(0.5)
+        self.seeding_ratio_spinbox.setSpecialValueText("없음")
+        seeding_goal_layout.addWidget(self.seeding_ratio_spinbox, 0, 3)
+        
+        seeding_goal_layout.addWidget(QLabel("시딩 시간 (시간):"), 1, 0)
+        self.seeding_time_spinbox = QSpinBox()
+        self.seeding_time_spinbox.setRange(0, 100000)
+        self.seeding_time_spinbox.setSpecialValueText("없음")
+        seeding_goal_layout.addWidget(self.seeding_time_spinbox, 1, 1)
+        
+        seeding_goal_layout.addWidget(QLabel("유휴 시간 (시간):"), 1, 2)
+        self.seeding_idle_spinbox = QSpinBox()
+        self.seeding_idle_spinbox.setRange(0, 100000)
+        self.seeding_idle_spinbox.setSpecialValueText("없음")
+        seeding_goal_layout.addWidget(self.seeding_idle_spinbox, 1, 3)
+        
+        seeding_goal_layout.addWidget(QLabel("작업:"), 2, 0)
+        self.seeding_action_combo = QComboBox()
+        for action, label in self.SEEDING_GOAL_ACTIONS.items():
+            self.seeding_action_combo.addItem(label, action)
+        seeding_goal_layout.addWidget(self.seeding_action_combo, 2, 1)
+        self.seeding_move_input = QLineEdit()
+        self.seeding_move_input.setPlaceholderText("이동할 경로 (이동 작업)")
+        seeding_goal_layout.addWidget(self.seeding_move_input, 2, 2, 1, 2)
+        
+        self.seeding_goal_apply_button = QPushButton("적용")
+        self.seeding_goal_apply_button.clicked.connect(self.on_seeding_goal_apply_clicked)
+        seeding_goal_layout.addWidget(self.seeding_goal_apply_button, 3, 3, Qt.AlignRight)
+        
+        stats_tab_layout.addWidget(seeding_goal_group, 6, 0, 1, 2)
+        
+        # 디스크 공간 (볼륨별 여유 공간 - 받기로 한 바이트)
+        disk_group = QGroupBox("디스크 공간")
+        disk_layout = QGridLayout(disk_group)
+        disk_status = self.torrent_client.get_disk_status()
+        
+        disk_layout.addWidget(QLabel("최소 여유 공간 (GiB):"), 0, 0)
+        self.disk_min_free_spinbox = QDoubleSpinBox()
+        self.disk_min_free_spinbox.setRange(0, 100000)
+        self.disk_min_free_spinbox.setValue(disk_status['min_free'] / 1024 ** 3)
+        disk_layout.addWidget(self.disk_min_free_spinbox, 0, 1)
+        
+        disk_layout.addWidget(QLabel("재개 기준 (GiB):"), 0, 2)
+        self.disk_resume_free_spinbox = QDoubleSpinBox()
+        self.disk_resume_free_spinbox.setRange(0, 100000)
+        self.disk_resume_free_spinbox.setValue(disk_status['resume_free'] / 1024 ** 3)
+        disk_layout.addWidget(self.disk_resume_free_spinbox, 0, 3)
+        
+        disk_layout.addWidget(QLabel("공간이 모자란 새 토렌트:"), 1, 0)
+        self.disk_policy_combo = QComboBox()
+        self.disk_policy_combo.addItem("대기열에 넣기", 'queue')
+        self.disk_policy_combo.addItem("추가 거부", 'reject')
+        self.disk_policy_combo.setCurrentIndex(self.disk_policy_combo.findData(disk_status['policy']))
+        disk_layout.addWidget(self.disk_policy_combo, 1, 1)
+        
+        self.disk_apply_button = QPushButton("적용")
+        self.disk_apply_button.clicked.connect(self.on_disk_apply_clicked)
+        disk_layout.addWidget(self.disk_apply_button, 1, 3, Qt.AlignRight)
+        
+        self.disk_status_label = QLabel("")
+        disk_layout.addWidget(self.disk_status_label, 2, 0, 1, 4)
+        
+        stats_tab_layout.addWidget(disk_group, 7, 0, 1, 2)
+        
+        # LAN 피어 (같은 랙/데이터센터 머신 사이 전송은 전역 속도 제한 제외)
+        lan_group = QGroupBox("LAN 피어")
+        lan_layout = QGridLayout(lan_group)
+        lan_status = self.torrent_client.get_lan_status()
+        
+        lan_layout.addWidget(QLabel("LAN 주소 구간:"), 0, 0)
+        self.lan_ranges_input = QLineEdit(", ".join(lan_status['ranges']))
+        self.lan_ranges_input.setPlaceholderText("예: 10.0.0.0/8, 203.0.113.0-203.0.113.255")
+        lan_layout.addWidget(self.lan_ranges_input, 0, 1, 1, 3)
+        
+        self.lan_unthrottled_checkbox = QCheckBox("LAN 피어는 속도 제한 제외 (항상 언초크)")
+        self.lan_unthrottled_checkbox.setChecked(lan_status['unthrottled'])
+        lan_layout.addWidget(self.lan_unthrottled_checkbox, 1, 0, 1, 2)
+        
+        self.lsd_checkbox = QCheckBox("로컬 피어 찾기 (LSD, 익명 모드에서는 꺼짐)")
+        self.lsd_checkbox.setChecked(lan_status['lsd_enabled'])
+        lan_layout.addWidget(self.lsd_checkbox, 1, 2, 1, 2)
+        
+        lan_layout.addWidget(QLabel("LSD 알림 주기 (초):"), 2, 0)
+        self.lsd_interval_spinbox = QSpinBox()
+        self.lsd_interval_spinbox.setRange(1, 3600)
+        self.lsd_interval_spinbox.setValue(lan_status['lsd_interval'])
+        lan_layout.addWidget(self.lsd_interval_spinbox, 2, 1)
+        
+        self.lan_apply_button = QPushButton("적용")
+        self.lan_apply_button.clicked.connect(self.on_lan_apply_clicked)
+        lan_layout.addWidget(self.lan_apply_button, 2, 3, Qt.AlignRight)
+        
+        self.lan_status_label = QLabel("")
+        lan_layout.addWidget(self.lan_status_label, 3, 0, 1, 4)
+        
+        stats_tab_layout.addWidget(lan_group, 8, 0, 1, 2)
+        self.refresh_seeding_scopes()
+        
         # 통계 탭 추가
         info_widget.addTab(stats_tab, "통계 & 설정")
         
-        # 보안 탭
-        security_tab = QWidget()
-        security_layout = QGridLayout(security_tab)
+        # 파일 탭
+        self.files_tab = QWidget()
+        files_layout = QVBoxLayout(self.files_tab)
+        
+        self.files_table = QTableWidget()
+        self.files_table.setColumnCount(4)
+        self.files_table.setHorizontalHeaderLabels(["파일", "크기", "진행률", "우선순위"])
+        self.files_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.files_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.files_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.files_table.verticalHeader().setDefaultSectionSize(22)
+        files_layout.addWidget(self.files_table)
+        
+        files_controls_layout = QHBoxLayout()
+        self.file_priority_combo = QComboBox()
+        self.file_priority_combo.addItems(list(self.FILE_PRIORITY_LABELS.values()))
+        files_controls_layout.addWidget(self.file_priority_combo)
+        
+        self.file_priority_button = QPushButton("선택 파일에 적용")
+        self.file_priority_button.clicked.connect(self.on_file_priority_clicked)
+        files_controls_layout.addWidget(self.file_priority_button)
+        
+        files_controls_layout.addWidget(QLabel("패턴:"))
+        self.file_rule_input = QLineEdit()
+        self.file_rule_input.setPlaceholderText("예: *.mkv; subs/*.srt")
+        files_controls_layout.addWidget(self.file_rule_input)
+        
+        self.file_rule_button = QPushButton("패턴 일치 파일만 받기")
+        self.file_rule_button.clicked.connect(self.on_file_rule_clicked)
+        files_controls_layout.addWidget(self.file_rule_button)
+        
+        files_layout.addLayout(files_controls_layout)
+        info_widget.addTab(self.files_tab, "파일")
+        
+        # 피어 탭
+        self.peers_tab = QWidget()
+        peers_layout = QVBoxLayout(self.peers_tab)
+        
+        peers_filter_layout = QHBoxLayout()
+        peers_filter_layout.addWidget(QLabel("필터:"))
+        self.peer_filter_input = QLineEdit()
+        self.peer_filter_input.setPlaceholderText("IP, 클라이언트, 플래그 또는 국가")
+        self.peer_filter_input.textChanged.connect(self.apply_peer_filter)
+        peers_filter_layout.addWidget(self.peer_filter_input)
+        self.peer_count_label = QLabel("")
+        peers_filter_layout.addWidget(self.peer_count_label)
+        peers_layout.addLayout(peers_filter_layout)
+        
+        self.peers_table = QTableWidget()
+        self.peers_table.setColumnCount(8)
+        self.peers_table.setHorizontalHeaderLabels(
+            ["IP", "클라이언트", "다운로드 속도", "업로드 속도", "진행률", "플래그", "국가", "받은 양"]
+        )
+        self.peers_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.peers_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.peers_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.peers_table.verticalHeader().setDefaultSectionSize(22)
+        self.peers_table.setSortingEnabled(True)
+        self.peers_table.sortByColumn(2, Qt.DescendingOrder)
+        peers_layout.addWidget(self.peers_table)
+        
+        info_widget.addTab(self.peers_tab, "피어")
+        
+        # 트래커 탭
+        self.trackers_tab = QWidget()
+        trackers_layout = QVBoxLayout(self.trackers_tab)
+        
+        self.trackers_table = QTableWidget()
+        self.trackers_table.setColumnCount(7)
+        self.trackers_table.setHorizontalHeaderLabels(
+            ["URL", "티어", "상태", "시더", "리처", "완료", "다음 알림"]
+        )
+        self.trackers_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.trackers_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.trackers_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.trackers_table.verticalHeader().setDefaultSectionSize(22)
+        trackers_layout.addWidget(self.trackers_table)
+        
+        trackers_controls_layout = QHBoxLayout()
+        self.tracker_url_input = QLineEdit()
+        self.tracker_url_input.setPlaceholderText("트래커 URL")
+        trackers_controls_layout.addWidget(self.tracker_url_input)
+        
+        trackers_controls_layout.addWidget(QLabel("티어:"))
+        self.tracker_tier_spinbox = QSpinBox()
+        self.tracker_tier_spinbox.setRange(0, 99)
+        trackers_controls_layout.addWidget(self.tracker_tier_spinbox)
+        
+        self.tracker_add_button = QPushButton("추가/티어 변경")
+        self.tracker_add_button.clicked.connect(self.on_tracker_add_clicked)
+        trackers_controls_layout.addWidget(self.tracker_add_button)
+        
+        self.tracker_remove_button = QPushButton("선택 트래커 제거")
+        self.tracker_remove_button.clicked.connect(self.on_tracker_remove_clicked)
+        trackers_controls_layout.addWidget(self.tracker_remove_button)
+        
+        self.tracker_scrape_button = QPushButton("스크레이프")
+        self.tracker_scrape_button.clicked.connect(self.on_tracker_scrape_clicked)
+        trackers_controls_layout.addWidget(self.tracker_scrape_button)
+        trackers_layout.addLayout(trackers_controls_layout)
+        
+        # 트래커 호스트별 집계
+        self.tracker_hosts_table = QTableWidget()
+        self.tracker_hosts_table.setColumnCount(6)
+        self.tracker_hosts_table.setHorizontalHeaderLabels(
+            ["트래커 호스트", "알림", "응답", "오류", "평균 응답 시간", "마지막 오류"]
+        )
+        self.tracker_hosts_table.horizontalHeader().setSectionResizeMode(5, QHeaderView.Stretch)
+        self.tracker_hosts_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.tracker_hosts_table.verticalHeader().setDefaultSectionSize(22)
+        self.tracker_hosts_table.setMaximumHeight(150)
+        trackers_layout.addWidget(self.tracker_hosts_table)
+        
+        info_widget.addTab(self.trackers_tab, "트래커")
+        
+        # 그래프 탭
+        self.graph_tab = QWidget()
+        graph_layout = QVBoxLayout(self.graph_tab)
+        
+        graph_controls_layout = QHBoxLayout()
+        self.graph_span_combo = QComboBox()
+        for label, span in self.GRAPH_SPANS:
+            self.graph_span_combo.addItem(label, span)
+        self.graph_span_combo.setCurrentIndex(1)
+        self.graph_span_combo.currentIndexChanged.connect(self.refresh_graph_tab)
+        graph_controls_layout.addWidget(self.graph_span_combo)
+        self.graph_target_combo = QComboBox()
+        self.graph_target_combo.addItems(["세션 전체", "선택한 토렌트"])
+        self.graph_target_combo.currentIndexChanged.connect(self.refresh_graph_tab)
+        graph_controls_layout.addWidget(self.graph_target_combo)
+        self.graph_status_label = QLabel("")
+        graph_controls_layout.addWidget(self.graph_status_label)
+        graph_controls_layout.addStretch()
+        graph_layout.addLayout(graph_controls_layout)
+        
+        self.rate_graph = RateGraph(self.format_bytes)
+        graph_layout.addWidget(self.rate_graph)
+        
+        info_widget.addTab(self.graph_tab, "그래프")
+        
+        # 보안 탭 (처음 볼 때 구성)
+        self.security_tab = QWidget()
+        self.security_tab_built = False
+        info_widget.addTab(self.security_tab, "보안")
+        info_widget.currentChanged.connect(self.on_info_tab_changed)
+        
+        splitter.addWidget(info_widget)
+        splitter.setStretchFactor(0, 6)  # 테이블이 훨씬 더 큰 공간 차지 (6:1 비율)
+        splitter.setStretchFactor(1, 1)
+        
+        main_layout.addWidget(splitter)
+        
+    def on_info_tab_changed(self, index):
+        """보안 탭을 처음 열 때 구성, 보안 탭이 보일 때만 Tor 상태 확인"""
+        if self.info_widget.widget(index) is not self.security_tab:
+            return
+        if not self.security_tab_built:
+            self.build_security_tab()
+        self.check_tor_status()
+    
+    def build_security_tab(self):
+        """보안/익명성 탭 구성 (시작 시간을 줄이기 위해 처음 볼 때 한 번만)"""
+        security_layout = QGridLayout(self.security_tab)
         
         # 보안 설정
         security_settings_group = QGroupBox("보안 설정")
@@ -184,13 +732,13 @@ class TorrentMainWindow(QMainWindow):
         
         # 암호화 설정
         self.encryption_checkbox = QCheckBox("피어 간 통신 암호화")
-        self.encryption_checkbox.setChecked(True)
+        self.encryption_checkbox.setChecked(self.torrent_client.encryption_enabled)
         self.encryption_checkbox.toggled.connect(self.on_encryption_toggled)
         security_settings_layout.addWidget(self.encryption_checkbox, 0, 0)
         
         # DHT 설정
         self.dht_checkbox = QCheckBox("DHT 사용 (비활성화 시 익명성 향상)")
-        self.dht_checkbox.setChecked(True)
+        self.dht_checkbox.setChecked(self.torrent_client.dht_enabled)
         self.dht_checkbox.toggled.connect(self.on_dht_toggled)
         security_settings_layout.addWidget(self.dht_checkbox, 1, 0)
         
@@ -204,6 +752,21 @@ class TorrentMainWindow(QMainWindow):
         self.block_ip_button.clicked.connect(self.on_block_ip_clicked)
         security_settings_layout.addWidget(self.block_ip_button, 2, 2)
         
+        # 차단 목록 파일 (가져올 때 한 번 파싱해 세션 상태에 저장)
+        security_settings_layout.addWidget(QLabel("차단 목록:"), 3, 0)
+        self.blocklist_label = QLabel("")
+        security_settings_layout.addWidget(self.blocklist_label, 3, 1)
+        
+        blocklist_buttons_layout = QHBoxLayout()
+        self.blocklist_import_button = QPushButton("가져오기...")
+        self.blocklist_import_button.clicked.connect(self.on_blocklist_import_clicked)
+        blocklist_buttons_layout.addWidget(self.blocklist_import_button)
+        self.blocklist_clear_button = QPushButton("제거")
+        self.blocklist_clear_button.clicked.connect(self.on_blocklist_clear_clicked)
+        blocklist_buttons_layout.addWidget(self.blocklist_clear_button)
+        security_settings_layout.addLayout(blocklist_buttons_layout, 3, 2)
+        self.update_blocklist_label()
+        
         security_layout.addWidget(security_settings_group, 0, 0)
         
         # 익명성 설정
@@ -212,13 +775,14 @@ class TorrentMainWindow(QMainWindow):
         
         # 익명 모드
         self.anonymous_checkbox = QCheckBox("익명 모드 (DHT/LSD 비활성화, User-Agent 변경)")
+        self.anonymous_checkbox.setChecked(self.torrent_client.anonymous_mode)
         self.anonymous_checkbox.toggled.connect(self.on_anonymous_toggled)
         anonymity_layout.addWidget(self.anonymous_checkbox, 0, 0, 1, 3)
         
         # 프록시 설정
         anonymity_layout.addWidget(QLabel("프록시 타입:"), 1, 0)
         self.proxy_type_combo = QComboBox()
-        self.proxy_type_combo.addItems(["없음", "HTTP", "SOCKS4", "SOCKS5", "HTTP (인증)", "SOCKS5 (인증)"])
+        self.proxy_type_combo.addItems(["없음"] + list(self.PROXY_TYPE_LABELS))
         self.proxy_type_combo.currentTextChanged.connect(self.on_proxy_type_changed)
         anonymity_layout.addWidget(self.proxy_type_combo, 1, 1, 1, 2)
         
@@ -276,6 +840,17 @@ class TorrentMainWindow(QMainWindow):
         self.tor_status_label = QLabel("Tor: 연결 안됨")
         anonymity_layout.addWidget(self.tor_status_label, 5, 0, 1, 3)
         
+        # 저장된 프록시 설정 표시
+        anonymity_status = self.torrent_client.get_anonymity_status()
+        if anonymity_status['proxy_type']:
+            labels = {value: label for label, value in self.PROXY_TYPE_LABELS.items()}
+            self.proxy_type_combo.setCurrentText(labels[anonymity_status['proxy_type']])
+            self.proxy_host_input.setText(anonymity_status['proxy_host'])
+            self.proxy_port_input.setText(str(anonymity_status['proxy_port']))
+            self.proxy_username_input.setText(self.torrent_client.proxy_username)
+            self.proxy_password_input.setText(self.torrent_client.proxy_password)
+            self.proxy_disable_button.setEnabled(True)
+        
         security_layout.addWidget(anonymity_group, 0, 1)
         
         # 보안 통계
@@ -321,15 +896,10 @@ class TorrentMainWindow(QMainWindow):
         security_log_layout.addLayout(log_buttons_layout)
         security_layout.addWidget(security_log_group, 2, 0, 1, 2)
         
-        # 보안 탭 추가
-        info_widget.addTab(security_tab, "보안")
-        
-        splitter.addWidget(info_widget)
-        splitter.setStretchFactor(0, 6)  # 테이블이 훨씬 더 큰 공간 차지 (6:1 비율)
-        splitter.setStretchFactor(1, 1)
-        
-        main_layout.addWidget(splitter)
-        
+        self.security_tab_built = True
+        self.refresh_security_log()
+        self.update_security_stats()
+    
     def setup_menu(self):
         """메뉴바 설정"""
         menubar = self.menuBar()
@@ -347,6 +917,15 @@ class TorrentMainWindow(QMainWindow):
         add_magnet_action.triggered.connect(self.add_magnet_link)
         file_menu.addAction(add_magnet_action)
         
+        resolve_metadata_action = QAction('마그넷 메타데이터만 받기...', self)
+        resolve_metadata_action.triggered.connect(self.resolve_magnet_metadata)
+        file_menu.addAction(resolve_metadata_action)
+        
+        create_torrent_action = QAction('토렌트 만들기...', self)
+        create_torrent_action.setShortcut('Ctrl+N')
+        create_torrent_action.triggered.connect(self.create_torrent)
+        file_menu.addAction(create_torrent_action)
+        
         file_menu.addSeparator()
         
         exit_action = QAction('종료', self)
@@ -369,6 +948,40 @@ class TorrentMainWindow(QMainWindow):
         remove_action.triggered.connect(self.remove_selected)
         torrent_menu.addAction(remove_action)
         
+        torrent_menu.addSeparator()
+        
+        streaming_action = QAction('순차 다운로드 (스트리밍) 전환', self)
+        streaming_action.triggered.connect(self.toggle_streaming_selected)
+        torrent_menu.addAction(streaming_action)
+        
+        stream_url_action = QAction('스트리밍 URL 복사...', self)
+        stream_url_action.triggered.connect(self.copy_stream_url_selected)
+        torrent_menu.addAction(stream_url_action)
+        
+        torrent_menu.addSeparator()
+        
+        replace_tracker_action = QAction('트래커 일괄 교체...', self)
+        replace_tracker_action.triggered.connect(self.replace_tracker_bulk)
+        torrent_menu.addAction(replace_tracker_action)
+        
+        recheck_action = QAction('빠른 재검사', self)
+        recheck_action.triggered.connect(self.fast_recheck_selected)
+        torrent_menu.addAction(recheck_action)
+        
+        tags_action = QAction('태그 편집...', self)
+        tags_action.setShortcut('Ctrl+T')
+        tags_action.triggered.connect(self.edit_tags_selected)
+        torrent_menu.addAction(tags_action)
+        
+        web_seeds_action = QAction('웹 시드 편집...', self)
+        web_seeds_action.triggered.connect(self.edit_web_seeds_selected)
+        torrent_menu.addAction(web_seeds_action)
+        
+        find_action = QAction('검색', self)
+        find_action.setShortcut('Ctrl+F')
+        find_action.triggered.connect(self.search_input.setFocus)
+        torrent_menu.addAction(find_action)
+        
     def setup_status_bar(self):
         """상태바 설정"""
         self.status_bar = QStatusBar()
@@ -389,11 +1002,16 @@ class TorrentMainWindow(QMainWindow):
             )
             
             if download_path:
-                torrent_hash = self.torrent_client.add_torrent(torrent_file, download_path)
+                selection_rules = self.ask_selection_rules()
+                if selection_rules is None:
+                    return
+                torrent_hash = self.torrent_client.add_torrent(
+                    torrent_file, download_path, selection_rules=selection_rules
+                )
                 if torrent_hash:
                     self.status_bar.showMessage(f"토렌트가 추가되었습니다: {os.path.basename(torrent_file)}")
                 else:
-                    QMessageBox.warning(self, "오류", "토렌트 파일을 추가할 수 없습니다.")
+                    QMessageBox.warning(self, "오류", f"토렌트 파일을 추가할 수 없습니다.\n{self.torrent_client.last_add_error}")
     
     def add_magnet_link(self):
         """마그넷 링크 추가"""
@@ -408,60 +1026,191 @@ class TorrentMainWindow(QMainWindow):
             )
             
             if download_path:
-                torrent_hash = self.torrent_client.add_magnet_link(magnet_uri, download_path)
+                selection_rules = self.ask_selection_rules()
+                if selection_rules is None:
+                    return
+                torrent_hash = self.torrent_client.add_magnet_link(
+                    magnet_uri, download_path, selection_rules=selection_rules
+                )
                 if torrent_hash:
                     self.status_bar.showMessage("마그넷 링크가 추가되었습니다.")
                 else:
-                    QMessageBox.warning(self, "오류", "마그넷 링크를 추가할 수 없습니다.")
+                    QMessageBox.warning(self, "오류", f"마그넷 링크를 추가할 수 없습니다.\n{self.torrent_client.last_add_error}")
+    
+    def create_torrent(self):
+        """디렉터리로 토렌트 만들기"""
+        source_path = QFileDialog.getExistingDirectory(
+            self, "토렌트로 만들 폴더 선택", os.path.expanduser("~")
+        )
+        if not source_path:
+            return
+        
+        type_labels = {
+            "하이브리드 (v1 + v2)": 'hybrid',
+            "v2 전용": 'v2',
+            "v1 전용": 'v1',
+        }
+        type_label, ok = QInputDialog.getItem(
+            self, "토렌트 종류", "종류:", list(type_labels.keys()), 0, False
+        )
+        if not ok:
+            return
+        
+        trackers_text, ok = QInputDialog.getMultiLineText(
+            self, "트래커", "트래커 URL (한 줄에 하나씩, 없으면 비워두기):"
+        )
+        if not ok:
+            return
+        trackers = [line.strip() for line in trackers_text.splitlines() if line.strip()]
+        
+        web_seeds_text, ok = QInputDialog.getMultiLineText(
+            self, "웹 시드", "웹 시드 URL (한 줄에 하나씩, 파일을 그대로 올려둔 HTTP 서버 주소, 없으면 비워두기):"
+        )
+        if not ok:
+            return
+        url_seeds = [line.strip() for line in web_seeds_text.splitlines() if line.strip()]
+        
+        output_path, _ = QFileDialog.getSaveFileName(
+            self, "토렌트 파일 저장",
+            os.path.join(os.path.dirname(source_path), os.path.basename(source_path) + ".torrent"),
+            "Torrent Files (*.torrent)"
+        )
+        if not output_path:
+            return
+        
+        self.torrent_client.create_torrent(source_path, output_path, type_labels[type_label],
+                                           trackers=trackers, url_seeds=url_seeds)
+        self.status_bar.showMessage(f"토렌트 생성 중: {os.path.basename(source_path)}")
+    
+    def on_torrent_creation_progress(self, done_bytes, total_bytes):
+        """토렌트 생성 진행률 표시"""
+        percent = done_bytes * 100 / total_bytes if total_bytes else 100
+        self.status_bar.showMessage(
+            f"토렌트 생성 중: {percent:.1f}% ({self.format_bytes(done_bytes)} / {self.format_bytes(total_bytes)})"
+        )
+    
+    def on_torrent_created(self, output_path, torrent_hash):
+        """토렌트 생성 완료"""
+        if torrent_hash:
+            self.status_bar.showMessage(f"토렌트가 생성되어 시드 중입니다: {os.path.basename(output_path)}")
+        else:
+            QMessageBox.warning(self, "오류", f"토렌트를 생성할 수 없습니다.\n{self.torrent_client.last_create_error}")
+    
+    def resolve_magnet_metadata(self):
+        """여러 마그넷 링크의 메타데이터만 받아 캐시"""
+        text, ok = QInputDialog.getMultiLineText(
+            self, "메타데이터만 받기", "마그넷 링크 (한 줄에 하나씩):"
+        )
+        if ok and text.strip():
+            magnet_uris = [line for line in text.splitlines() if line.strip()]
+            queued = self.torrent_client.resolve_metadata(magnet_uris)
+            self.status_bar.showMessage(f"메타데이터 요청: {queued}개")
+    
+    def on_metadata_resolved(self, torrent_hash, success):
+        """메타데이터만 받기 결과"""
+        running, waiting = self.torrent_client.get_metadata_job_count()
+        result = "완료" if success else "시간 초과"
+        self.status_bar.showMessage(
+            f"메타데이터 {result}: {torrent_hash[:12]}… (진행 중 {running}, 대기 {waiting})"
+        )
+    
+    def parse_selection_rules(self, text):
+        """'; '로 구분된 패턴을 선택 규칙으로 변환 (일치하지 않는 파일은 건너뜀)"""
+        patterns = [p.strip() for p in text.split(';') if p.strip()]
+        if not patterns:
+            return []
+        return [('*', 'skip')] + [(pattern, 'normal') for pattern in patterns]
+    
+    def ask_selection_rules(self):
+        """추가 시 받을 파일 패턴 입력 (취소 시 None)"""
+        text, ok = QInputDialog.getText(
+            self, "파일 선택", "받을 파일 패턴 (';'로 구분, 비우면 전체):"
+        )
+        if not ok:
+            return None
+        return self.parse_selection_rules(text)
     
     def pause_selected(self):
         """선택된 토렌트 일시정지"""
-        current_row = self.torrent_table.currentRow()
-        if current_row >= 0:
-            torrent_hash = self.get_torrent_hash_from_row(current_row)
-            if torrent_hash:
-                self.torrent_client.pause_torrent(torrent_hash)
+        torrent_hashes = self.selected_torrent_hashes()
+        if torrent_hashes:
+            count = self.torrent_client.pause_many(torrent_hashes)
+            self.status_bar.showMessage(f"토렌트 {count}개를 일시정지했습니다.")
     
     def resume_selected(self):
         """선택된 토렌트 재개"""
-        current_row = self.torrent_table.currentRow()
-        if current_row >= 0:
-            torrent_hash = self.get_torrent_hash_from_row(current_row)
-            if torrent_hash:
-                self.torrent_client.resume_torrent(torrent_hash)
+        torrent_hashes = self.selected_torrent_hashes()
+        if torrent_hashes:
+            count = self.torrent_client.resume_many(torrent_hashes)
+            self.status_bar.showMessage(f"토렌트 {count}개를 재개했습니다.")
     
     def remove_selected(self):
         """선택된 토렌트 제거"""
-        current_row = self.torrent_table.currentRow()
-        if current_row >= 0:
-            torrent_hash = self.get_torrent_hash_from_row(current_row)
-            if torrent_hash:
-                reply = QMessageBox.question(
-                    self, "토렌트 제거", 
-                    "토렌트를 제거하시겠습니까?\n\n파일도 함께 삭제하시겠습니까?",
-                    QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel
-                )
-                
-                if reply == QMessageBox.Yes:
-                    self.torrent_client.remove_torrent(torrent_hash, True)
-                elif reply == QMessageBox.No:
-                    self.torrent_client.remove_torrent(torrent_hash, False)
-                
-                if reply != QMessageBox.Cancel:
-                    self.torrent_table.removeRow(current_row)
-                    # 행 매핑 업데이트
-                    for hash_key, row in list(self.torrent_rows.items()):
-                        if row == current_row:
-                            del self.torrent_rows[hash_key]
-                        elif row > current_row:
-                            self.torrent_rows[hash_key] = row - 1
+        torrent_hashes = self.selected_torrent_hashes()
+        if not torrent_hashes:
+            return
+        
+        target = "토렌트를" if len(torrent_hashes) == 1 else f"토렌트 {len(torrent_hashes)}개를"
+        reply = QMessageBox.question(
+            self, "토렌트 제거", 
+            f"{target} 제거하시겠습니까?\n\n파일도 함께 삭제하시겠습니까?",
+            QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel
+        )
+        if reply == QMessageBox.Cancel:
+            return
+        
+        removed = self.torrent_client.remove_many(torrent_hashes, reply == QMessageBox.Yes)
+        self.remove_torrent_rows(removed)
+        self.status_bar.showMessage(f"토렌트 {len(removed)}개를 제거했습니다.")
+    
+    def remove_torrent_rows(self, torrent_hashes):
+        """여러 토렌트 행을 한 번에 제거"""
+        self.torrent_model.remove_torrents(torrent_hashes)
+        self.refresh_filter_choices()
+    
+    def toggle_streaming_selected(self):
+        """선택된 토렌트의 순차 다운로드 모드 전환"""
+        torrent_hash = self.selected_torrent_hash()
+        if torrent_hash:
+            enabled = not self.torrent_client.is_streaming(torrent_hash)
+            self.torrent_client.set_streaming_mode(torrent_hash, enabled)
+            if enabled:
+                self.status_bar.showMessage("순차 다운로드 모드 활성화 (스트리밍)")
+            else:
+                self.status_bar.showMessage("순차 다운로드 모드 비활성화")
+    
+    def fast_recheck_selected(self):
+        """선택된 토렌트 빠른 재검사"""
+        torrent_hash = self.selected_torrent_hash()
+        if torrent_hash and self.torrent_client.fast_recheck(torrent_hash):
+            self.status_bar.showMessage("재검사를 시작했습니다.")
+    
+    def copy_stream_url_selected(self):
+        """선택된 토렌트의 파일 스트리밍 URL을 클립보드에 복사"""
+        torrent_hash = self.selected_torrent_hash()
+        if not torrent_hash:
+            return
+        
+        files = self.torrent_client.get_torrent_files(torrent_hash)
+        if not files:
+            QMessageBox.warning(self, "오류", "메타데이터를 아직 받지 못했습니다.")
+            return
+        
+        items = [f"{f['index']}: {f['path']} ({self.format_bytes(f['size'])})" for f in files]
+        item, ok = QInputDialog.getItem(self, "스트리밍 파일 선택", "파일:", items, 0, False)
+        if not ok:
+            return
+        
+        url = self.torrent_client.get_stream_url(torrent_hash, items.index(item))
+        if url:
+            QApplication.clipboard().setText(url)
+            self.status_bar.showMessage(f"스트리밍 URL이 복사되었습니다: {url}")
+        else:
+            QMessageBox.warning(self, "오류", "스트리밍 서버를 시작할 수 없습니다.")
     
     def get_torrent_hash_from_row(self, row):
-        """행 번호로부터 토렌트 해시 얻기"""
-        for torrent_hash, torrent_row in self.torrent_rows.items():
-            if torrent_row == row:
-                return torrent_hash
-        return None
+        """(정렬/필터된) 표시 행 번호로부터 토렌트 해시 얻기"""
+        return self.torrent_proxy.hash_at(row)
     
     def format_bytes(self, bytes_value):
         """바이트를 읽기 쉬운 형태로 변환"""
@@ -479,77 +1228,475 @@ class TorrentMainWindow(QMainWindow):
     
     def on_torrent_added(self, torrent_hash, name):
         """토렌트 추가 시 호출"""
-        row = self.torrent_table.rowCount()
-        self.torrent_table.insertRow(row)
-        
-        # 토렌트 정보 추가
-        self.torrent_table.setItem(row, 0, QTableWidgetItem(name))
-        self.torrent_table.setItem(row, 1, QTableWidgetItem("0%"))
-        self.torrent_table.setItem(row, 2, QTableWidgetItem("0 B/s"))
-        self.torrent_table.setItem(row, 3, QTableWidgetItem("0 B/s"))
-        self.torrent_table.setItem(row, 4, QTableWidgetItem("0"))
-        self.torrent_table.setItem(row, 5, QTableWidgetItem("0"))
-        self.torrent_table.setItem(row, 6, QTableWidgetItem("대기중"))
-        
-        # 진행률 바 추가
-        progress_bar = QProgressBar()
-        progress_bar.setRange(0, 100)
-        progress_bar.setValue(0)
-        self.torrent_table.setCellWidget(row, 1, progress_bar)
-        
-        self.torrent_rows[torrent_hash] = row
+        self.torrent_model.add_torrent(
+            torrent_hash, name,
+            tags=self.torrent_client.get_torrent_tags(torrent_hash),
+            trackers=self.torrent_client.get_tracker_hosts(torrent_hash),
+        )
+        self.torrent_proxy.note_changed(self.torrent_model.search_index.FACETS)
+        self.refresh_filter_choices()
     
     def on_progress_updated(self, torrent_hash, progress, down_rate, up_rate, seeds, peers):
         """진행률 업데이트 시 호출"""
-        if torrent_hash in self.torrent_rows:
-            row = self.torrent_rows[torrent_hash]
-            
-            # 진행률 업데이트
-            progress_bar = self.torrent_table.cellWidget(row, 1)
-            if progress_bar:
-                progress_bar.setValue(int(progress * 100))
-            
-            # 속도 및 기타 정보 업데이트
-            self.torrent_table.setItem(row, 2, QTableWidgetItem(f"{self.format_bytes(down_rate)}/s"))
-            self.torrent_table.setItem(row, 3, QTableWidgetItem(f"{self.format_bytes(up_rate)}/s"))
-            self.torrent_table.setItem(row, 4, QTableWidgetItem(str(seeds)))
-            self.torrent_table.setItem(row, 5, QTableWidgetItem(str(peers)))
-            
-            # 상태 업데이트
-            if progress >= 1.0:
-                self.torrent_table.setItem(row, 6, QTableWidgetItem("완료"))
-            elif down_rate > 0:
-                self.torrent_table.setItem(row, 6, QTableWidgetItem("다운로드중"))
-            else:
-                self.torrent_table.setItem(row, 6, QTableWidgetItem("대기중"))
+        self.torrent_client.metrics.inc('ltorrent_signals_delivered_total')
+        
+        status = self.torrent_client.get_torrent_status(torrent_hash)
+        if status:
+            # 모델 값만 바꾸고, 표시 문자열은 보이는 행을 그릴 때 만듦
+            changed = self.torrent_model.update_torrent(
+                torrent_hash,
+                name=status['name'],
+                progress=progress,
+                download_rate=down_rate,
+                upload_rate=up_rate,
+                num_seeds=seeds,
+                num_peers=peers,
+                state=status['completion_state'],
+                ratio=status['ratio'],
+            )
+            if changed:
+                self.torrent_proxy.note_changed(changed)
         
-        self.update_statistics()
+        # 신호마다 전체를 다시 합산하지 않도록 모아서 갱신
+        if not self.stats_update_pending:
+            self.stats_update_pending = True
+            QTimer.singleShot(500, self.update_statistics)
     
     def on_torrent_finished(self, torrent_hash):
         """토렌트 완료 시 호출"""
-        if torrent_hash in self.torrent_rows:
-            row = self.torrent_rows[torrent_hash]
-            self.torrent_table.setItem(row, 6, QTableWidgetItem("완료"))
-            
+        changed = self.torrent_model.update_torrent(torrent_hash, state='finished')
+        self.torrent_proxy.note_changed(changed)
         self.status_bar.showMessage("토렌트 다운로드가 완료되었습니다!")
     
+    def on_torrent_updated(self, torrent_hash):
+        """태그/트래커 변경 시 인덱스 갱신"""
+        changed = self.torrent_model.update_torrent(
+            torrent_hash, tags=self.torrent_client.get_torrent_tags(torrent_hash)
+        )
+        if self.torrent_model.set_trackers(torrent_hash, self.torrent_client.get_tracker_hosts(torrent_hash)):
+            changed.add('trackers')
+        if changed:
+            self.torrent_proxy.note_changed(changed)
+            self.refresh_filter_choices()
+    
+    def apply_torrent_filter(self):
+        """필터 막대 조건으로 토렌트 목록 거르기"""
+        self.torrent_proxy.set_criteria(
+            text=self.search_input.text(),
+            state=self.state_filter_combo.currentData(),
+            tag=self.tag_filter_combo.currentData(),
+            tracker=self.tracker_filter_combo.currentData(),
+            min_ratio=self.ratio_filter_spin.value(),
+        )
+    
+    def refresh_filter_choices(self):
+        """태그/트래커 필터 선택 목록을 인덱스 키에 맞춤 (바뀐 경우에만)"""
+        search_index = self.torrent_model.search_index
+        for combo, facet in ((self.tag_filter_combo, 'tags'), (self.tracker_filter_combo, 'trackers')):
+            keys = search_index.keys(facet)
+            if keys == [combo.itemData(i) for i in range(1, combo.count())]:
+                continue
+            current = combo.currentData()
+            combo.blockSignals(True)
+            while combo.count() > 1:
+                combo.removeItem(1)
+            for key in keys:
+                combo.addItem(key, key)
+            combo.setCurrentIndex(max(0, combo.findData(current)) if current is not None else 0)
+            combo.blockSignals(False)
+            if combo.currentData() != current:
+                self.apply_torrent_filter()
+    
+    def update_torrent_count(self):
+        """표시 중인 토렌트 수 / 전체 수"""
+        self.torrent_count_label.setText(f"{self.torrent_proxy.rowCount()} / {self.torrent_model.rowCount()}")
+    
+    def edit_tags_selected(self):
+        """선택된 토렌트들의 태그 설정 (쉼표로 구분)"""
+        torrent_hashes = self.selected_torrent_hashes()
+        if not torrent_hashes:
+            return
+        current = ", ".join(sorted(self.torrent_client.get_torrent_tags(torrent_hashes[0])))
+        text, ok = QInputDialog.getText(
+            self, "태그 편집", f"태그 ({len(torrent_hashes)}개 토렌트, 쉼표로 구분, 비우면 제거):", text=current
+        )
+        if ok:
+            changed = self.torrent_client.set_tags_many(torrent_hashes, text.split(','))
+            self.status_bar.showMessage(f"토렌트 {changed}개의 태그를 변경했습니다.")
+            self.refresh_seeding_scopes()
+    
+    def edit_web_seeds_selected(self):
+        """선택된 토렌트의 URL 시드 편집 (한 줄에 하나씩, 지운 줄은 제거)"""
+        torrent_hashes = self.selected_torrent_hashes()
+        if not torrent_hashes:
+            return
+        current = self.torrent_client.get_web_seeds(torrent_hashes[0])['url_seeds']
+        text, ok = QInputDialog.getMultiLineText(
+            self, "웹 시드 편집", f"웹 시드 URL ({len(torrent_hashes)}개 토렌트, 한 줄에 하나씩):", "\n".join(current)
+        )
+        if not ok:
+            return
+        url_seeds = [line.strip() for line in text.splitlines() if line.strip()]
+        for torrent_hash in torrent_hashes:
+            existing = self.torrent_client.get_web_seeds(torrent_hash)['url_seeds']
+            for url in existing:
+                if url not in url_seeds:
+                    self.torrent_client.remove_web_seed(torrent_hash, url)
+            added = [url for url in url_seeds if url not in existing]
+            if added:
+                self.torrent_client.add_web_seeds(torrent_hash, url_seeds=added)
+        self.status_bar.showMessage(f"토렌트 {len(torrent_hashes)}개의 웹 시드를 변경했습니다.")
+    
+    def refresh_seeding_scopes(self):
+        """시딩 목표 대상 목록에 현재 태그 반영 (기본/선택한 토렌트 다음)"""
+        tags = sorted(self.torrent_client.get_all_tags())
+        if tags == [self.seeding_scope_combo.itemData(i)[1] for i in range(2, self.seeding_scope_combo.count())]:
+            self.load_seeding_goal_fields()
+            return
+        current = self.seeding_scope_combo.currentData()
+        self.seeding_scope_combo.blockSignals(True)
+        while self.seeding_scope_combo.count() > 2:
+            self.seeding_scope_combo.removeItem(2)
+        for tag in tags:
+            self.seeding_scope_combo.addItem(f"태그: {tag}", ('tag', tag))
+        self.seeding_scope_combo.setCurrentIndex(max(0, self.seeding_scope_combo.findData(current)))
+        self.seeding_scope_combo.blockSignals(False)
+        self.load_seeding_goal_fields()
+    
+    def load_seeding_goal_fields(self):
+        """선택한 대상의 시딩 목표를 입력란에 표시"""
+        scope, tag = self.seeding_scope_combo.currentData()
+        goals = self.torrent_client.get_seeding_goals()
+        if scope == 'default':
+            goal = goals['default']
+        elif scope == 'tag':
+            goal = goals['tags'].get(tag)
+        else:
+            torrent_hash = self.selected_torrent_hash()
+            goal = goals['torrents'].get(torrent_hash) if torrent_hash else None
+        goal = goal or {}
+        self.seeding_ratio_spinbox.setValue(goal.get('ratio', 0))
+        self.seeding_time_spinbox.setValue(round(goal.get('seed_time', 0) / 3600))
+        self.seeding_idle_spinbox.setValue(round(goal.get('idle_time', 0) / 3600))
+        self.seeding_action_combo.setCurrentIndex(self.seeding_action_combo.findData(goal.get('action', 'pause')))
+        self.seeding_move_input.setText(goal.get('path', ''))
+    
+    def on_seeding_goal_apply_clicked(self):
+        """시딩 목표 적용 (한도를 모두 '없음'으로 두면 목표 제거)"""
+        scope, tag = self.seeding_scope_combo.currentData()
+        torrent_hashes = None
+        if scope == 'torrent':
+            torrent_hashes = self.selected_torrent_hashes()
+            if not torrent_hashes:
+                QMessageBox.warning(self, "오류", "시딩 목표를 설정할 토렌트를 선택하세요.")
+                return
+        
+        goal = {
+            'ratio': self.seeding_ratio_spinbox.value(),
+            'seed_time': self.seeding_time_spinbox.value() * 3600,
+            'idle_time': self.seeding_idle_spinbox.value() * 3600,
+            'action': self.seeding_action_combo.currentData(),
+            'path': self.seeding_move_input.text().strip(),
+        }
+        try:
+            self.torrent_client.set_seeding_goal(goal, tag=tag, torrent_hashes=torrent_hashes)
+        except ValueError as e:
+            QMessageBox.warning(self, "오류", str(e))
+            return
+        self.status_bar.showMessage(f"시딩 목표를 저장했습니다: {self.seeding_scope_combo.currentText()}")
+    
+    def on_seeding_goal_reached(self, torrent_hash, action, reason):
+        """시딩 목표 도달 처리 (제거된 토렌트는 목록에서 뺌)"""
+        if action in ('remove', 'remove_delete'):
+            self.remove_torrent_rows([torrent_hash])
+        self.status_bar.showMessage(f"시딩 목표 도달 ({self.SEEDING_GOAL_ACTIONS[action]}): {reason}")
+    
+    def on_completion_apply_clicked(self):
+        """완료 후 작업 설정 적용"""
+        actions = []
+        if self.completion_move_checkbox.isChecked():
+            actions.append({'type': 'move', 'path': self.completion_move_input.text().strip()})
+        if self.completion_hardlink_checkbox.isChecked():
+            actions.append({'type': 'hardlink', 'path': self.completion_hardlink_input.text().strip()})
+        if self.completion_verify_checkbox.isChecked():
+            actions.append({'type': 'verify'})
+        if self.completion_hook_checkbox.isChecked():
+            actions.append({'type': 'hook', 'command': self.completion_hook_input.text().strip()})
+        
+        try:
+            self.torrent_client.set_completion_actions(actions)
+            self.status_bar.showMessage("완료 후 작업을 저장했습니다.")
+        except ValueError as e:
+            QMessageBox.warning(self, "오류", str(e))
+    
+    def on_completion_action_finished(self, torrent_hash, action, success, message):
+        """완료 후 작업 결과 표시"""
+        name = self.torrent_client.torrents.get(torrent_hash, {}).get('name', torrent_hash[:8])
+        self.status_bar.showMessage(f"[{action}] {name}: {message}")
+        if not success:
+            self.torrent_client.log_security_event("COMPLETION", f"{name} {action} 실패: {message}")
+    
+    def refresh_files_tab(self):
+        """선택된 토렌트의 파일 목록/진행률 갱신 (파일 탭이 보일 때만)"""
+        if self.info_widget.currentWidget() is not self.files_tab:
+            return
+        
+        torrent_hash = self.selected_torrent_hash()
+        file_status = self.torrent_client.get_file_status(torrent_hash) if torrent_hash else []
+        
+        priority_names = {value: self.FILE_PRIORITY_LABELS[key]
+                          for key, value in FILE_PRIORITIES.items()}
+        
+        self.files_table.setUpdatesEnabled(False)
+        self.files_table.setRowCount(len(file_status))
+        for row, info in enumerate(file_status):
+            self.files_table.setItem(row, 0, QTableWidgetItem(info['path']))
+            self.files_table.setItem(row, 1, QTableWidgetItem(self.format_bytes(info['size'])))
+            self.files_table.setItem(row, 2, QTableWidgetItem(f"{info['progress'] * 100:.1f}%"))
+            self.files_table.setItem(row, 3, QTableWidgetItem(
+                priority_names.get(info['priority'], str(info['priority']))
+            ))
+        self.files_table.setUpdatesEnabled(True)
+    
+    def refresh_peers_tab(self):
+        """선택된 토렌트의 피어 목록 갱신 (피어 탭이 보일 때만)"""
+        if self.info_widget.currentWidget() is not self.peers_tab:
+            return
+        
+        torrent_hash = self.selected_torrent_hash()
+        peers = self.torrent_client.get_peer_info(torrent_hash) if torrent_hash else []
+        
+        # 채우는 동안 정렬을 끄고 마지막에 한 번만 정렬
+        self.peers_table.setUpdatesEnabled(False)
+        self.peers_table.setSortingEnabled(False)
+        self.peers_table.setRowCount(len(peers))
+        for row, peer in enumerate(peers):
+            self.peers_table.setItem(row, 0, QTableWidgetItem(f"{peer['ip']}:{peer['port']}"))
+            self.peers_table.setItem(row, 1, QTableWidgetItem(peer['client']))
+            self.peers_table.setItem(row, 2, SortableItem(f"{self.format_bytes(peer['down_rate'])}/s", peer['down_rate']))
+            self.peers_table.setItem(row, 3, SortableItem(f"{self.format_bytes(peer['up_rate'])}/s", peer['up_rate']))
+            self.peers_table.setItem(row, 4, SortableItem(f"{peer['progress'] * 100:.1f}%", peer['progress']))
+            self.peers_table.setItem(row, 5, QTableWidgetItem(peer['flags']))
+            self.peers_table.setItem(row, 6, QTableWidgetItem(peer['country'] or "-"))
+            self.peers_table.setItem(row, 7, SortableItem(self.format_bytes(peer['total_download']), peer['total_download']))
+        self.peers_table.setSortingEnabled(True)
+        self.apply_peer_filter()
+        self.peers_table.setUpdatesEnabled(True)
+    
+    def apply_peer_filter(self):
+        """필터 문자열과 일치하지 않는 피어 행 숨기기"""
+        text = self.peer_filter_input.text().strip().lower()
+        visible = 0
+        for row in range(self.peers_table.rowCount()):
+            match = not text or any(
+                text in self.peers_table.item(row, column).text().lower()
+                for column in (0, 1, 5, 6)
+                if self.peers_table.item(row, column)
+            )
+            self.peers_table.setRowHidden(row, not match)
+            visible += match
+        self.peer_count_label.setText(f"피어 {visible}/{self.peers_table.rowCount()}")
+    
+    def refresh_graph_tab(self):
+        """전송 속도 그래프 갱신 (그래프 탭이 보일 때만)"""
+        if self.info_widget.currentWidget() is not self.graph_tab:
+            return
+        
+        span = self.graph_span_combo.currentData()
+        if self.graph_target_combo.currentIndex() == 0:
+            history = self.torrent_client.get_rate_history(span)
+            self.graph_status_label.setText("")
+        else:
+            torrent_hash = self.selected_torrent_hash()
+            history = self.torrent_client.get_rate_history(span, torrent_hash) if torrent_hash else None
+            self.graph_status_label.setText("" if history else "기록 없음 (최근 활동한 토렌트만 기록)")
+        self.rate_graph.set_series(history)
+    
+    def selected_torrent_hashes(self):
+        """선택된 모든 토렌트 해시 (표시 순서)"""
+        rows = sorted(index.row() for index in self.torrent_table.selectionModel().selectedRows())
+        return [torrent_hash for torrent_hash in map(self.torrent_proxy.hash_at, rows) if torrent_hash]
+    
+    def selected_torrent_hash(self):
+        """현재 선택된 토렌트 해시 (없으면 None)"""
+        current_index = self.torrent_table.currentIndex()
+        return self.torrent_proxy.hash_at(current_index.row()) if current_index.isValid() else None
+    
+    def refresh_trackers_tab(self):
+        """선택된 토렌트의 트래커와 호스트별 집계 갱신 (트래커 탭이 보일 때만)"""
+        if self.info_widget.currentWidget() is not self.trackers_tab:
+            return
+        
+        torrent_hash = self.selected_torrent_hash()
+        trackers = self.torrent_client.get_trackers(torrent_hash) if torrent_hash else []
+        
+        def count_text(value):
+            return str(value) if value >= 0 else "-"
+        
+        self.trackers_table.setUpdatesEnabled(False)
+        self.trackers_table.setRowCount(len(trackers))
+        for row, tracker in enumerate(trackers):
+            if tracker['updating']:
+                state = "알림 중"
+            elif tracker['message']:
+                state = tracker['message']
+            else:
+                state = "정상" if tracker['fails'] == 0 else f"실패 {tracker['fails']}회"
+            next_announce = tracker['next_announce']
+            if hasattr(next_announce, 'strftime'):
+                next_announce = next_announce.strftime("%H:%M:%S")
+            
+            self.trackers_table.setItem(row, 0, QTableWidgetItem(tracker['url']))
+            self.trackers_table.setItem(row, 1, QTableWidgetItem(str(tracker['tier'])))
+            self.trackers_table.setItem(row, 2, QTableWidgetItem(state))
+            self.trackers_table.setItem(row, 3, QTableWidgetItem(count_text(tracker['seeders'])))
+            self.trackers_table.setItem(row, 4, QTableWidgetItem(count_text(tracker['leechers'])))
+            self.trackers_table.setItem(row, 5, QTableWidgetItem(count_text(tracker['completed'])))
+            self.trackers_table.setItem(row, 6, QTableWidgetItem(str(next_announce or "-")))
+        self.trackers_table.setUpdatesEnabled(True)
+        
+        host_stats = sorted(self.torrent_client.get_tracker_host_stats().items())
+        self.tracker_hosts_table.setUpdatesEnabled(False)
+        self.tracker_hosts_table.setRowCount(len(host_stats))
+        for row, (host, stats) in enumerate(host_stats):
+            average = stats['response_time_total'] / stats['replies'] if stats['replies'] else None
+            self.tracker_hosts_table.setItem(row, 0, QTableWidgetItem(host))
+            self.tracker_hosts_table.setItem(row, 1, QTableWidgetItem(str(stats['announces'])))
+            self.tracker_hosts_table.setItem(row, 2, QTableWidgetItem(str(stats['replies'])))
+            self.tracker_hosts_table.setItem(row, 3, QTableWidgetItem(str(stats['errors'])))
+            self.tracker_hosts_table.setItem(row, 4, QTableWidgetItem(f"{average:.2f}초" if average is not None else "-"))
+            self.tracker_hosts_table.setItem(row, 5, QTableWidgetItem(stats['last_error']))
+        self.tracker_hosts_table.setUpdatesEnabled(True)
+    
+    def on_tracker_add_clicked(self):
+        """선택된 토렌트에 트래커 추가 (있으면 티어 변경)"""
+        torrent_hash = self.selected_torrent_hash()
+        url = self.tracker_url_input.text().strip()
+        if not torrent_hash or not url:
+            return
+        self.torrent_client.add_tracker(torrent_hash, url, self.tracker_tier_spinbox.value())
+        self.tracker_url_input.clear()
+        self.refresh_trackers_tab()
+    
+    def on_tracker_remove_clicked(self):
+        """선택된 트래커 제거"""
+        torrent_hash = self.selected_torrent_hash()
+        if not torrent_hash:
+            return
+        rows = sorted({index.row() for index in self.trackers_table.selectedIndexes()})
+        for row in rows:
+            self.torrent_client.remove_tracker(torrent_hash, self.trackers_table.item(row, 0).text())
+        self.refresh_trackers_tab()
+    
+    def on_tracker_scrape_clicked(self):
+        """선택된 토렌트의 트래커 스크레이프"""
+        torrent_hash = self.selected_torrent_hash()
+        if torrent_hash:
+            self.torrent_client.scrape_trackers(torrent_hash)
+            self.status_bar.showMessage("스크레이프를 요청했습니다.")
+    
+    def replace_tracker_bulk(self):
+        """모든 토렌트의 트래커 일괄 교체"""
+        old, ok = QInputDialog.getText(self, "트래커 일괄 교체", "바꿀 트래커 URL 또는 호스트:")
+        if not ok or not old.strip():
+            return
+        new_url, ok = QInputDialog.getText(self, "트래커 일괄 교체", "새 트래커 URL:")
+        if not ok or not new_url.strip():
+            return
+        
+        replaced = self.torrent_client.replace_tracker_bulk(old.strip(), new_url.strip())
+        self.status_bar.showMessage(f"{replaced}개 토렌트의 트래커를 교체했습니다.")
+        self.refresh_trackers_tab()
+    
+    def on_file_priority_clicked(self):
+        """선택한 파일들의 우선순위 변경"""
+        torrent_hash = self.selected_torrent_hash()
+        if not torrent_hash:
+            return
+        
+        level = list(self.FILE_PRIORITY_LABELS.keys())[self.file_priority_combo.currentIndex()]
+        rows = {index.row() for index in self.files_table.selectionModel().selectedRows()}
+        if rows:
+            self.torrent_client.set_file_priorities(torrent_hash, {row: level for row in rows})
+            self.refresh_files_tab()
+    
+    def on_file_rule_clicked(self):
+        """패턴과 일치하는 파일만 받도록 설정"""
+        torrent_hash = self.selected_torrent_hash()
+        selection_rules = self.parse_selection_rules(self.file_rule_input.text())
+        if torrent_hash and selection_rules:
+            self.torrent_client.apply_selection_rules(torrent_hash, selection_rules)
+            self.refresh_files_tab()
+    
     def update_statistics(self):
         """전체 통계 업데이트"""
+        self.stats_update_pending = False
         total_down = 0
         total_up = 0
         active_count = 0
         
-        for torrent_hash in self.torrent_rows.keys():
-            status = self.torrent_client.get_torrent_status(torrent_hash)
-            if status:
-                total_down += status['download_rate']
-                total_up += status['upload_rate']
-                if status['download_rate'] > 0 or status['upload_rate'] > 0:
-                    active_count += 1
+        for record in self.torrent_model.records.values():
+            total_down += record['download_rate']
+            total_up += record['upload_rate']
+            if record['download_rate'] > 0 or record['upload_rate'] > 0:
+                active_count += 1
         
         self.total_down_label.setText(f"총 다운로드: {self.format_bytes(total_down)}/s")
         self.total_up_label.setText(f"총 업로드: {self.format_bytes(total_up)}/s")
         self.active_torrents_label.setText(f"활성 토렌트: {active_count}")
+        self.update_disk_status()
+        self.update_lan_status()
+    
+    def update_disk_status(self):
+        """볼륨별 여유 공간과 대기열/일시정지 수 표시"""
+        status = self.torrent_client.get_disk_status()
+        parts = [
+            f"{volume['path']}: 여유 {self.format_bytes(volume['free'] or 0)}, "
+            f"받을 양 {self.format_bytes(volume['remaining'])} ({volume['torrents']}개)"
+            for volume in status['volumes']
+        ]
+        if status['queued'] or status['paused']:
+            parts.append(f"대기 {status['queued']}개, 공간 부족 일시정지 {status['paused']}개")
+        self.disk_status_label.setText(" | ".join(parts))
+    
+    def update_lan_status(self):
+        """LAN/원격 누적 전송량 표시"""
+        status = self.torrent_client.get_lan_status()
+        self.lan_status_label.setText(
+            f"LAN 피어 {status['local_peers']}개 | "
+            f"LAN 받음 {self.format_bytes(status['local_download'])}, 보냄 {self.format_bytes(status['local_upload'])} | "
+            f"원격 받음 {self.format_bytes(status['remote_download'])}, 보냄 {self.format_bytes(status['remote_upload'])}"
+        )
+    
+    def on_lan_apply_clicked(self):
+        """LAN 주소 구간/속도 제한 제외/LSD 적용"""
+        try:
+            self.torrent_client.set_lan_settings(
+                ranges=self.lan_ranges_input.text().split(','),
+                unthrottled=self.lan_unthrottled_checkbox.isChecked(),
+                lsd_enabled=self.lsd_checkbox.isChecked(),
+                lsd_interval=self.lsd_interval_spinbox.value(),
+            )
+        except ValueError as e:
+            QMessageBox.warning(self, "오류", str(e))
+            return
+        self.lan_ranges_input.setText(", ".join(self.torrent_client.lan_ranges.entries))
+        self.status_bar.showMessage("LAN 피어 설정을 적용했습니다.")
+    
+    def on_disk_apply_clicked(self):
+        """디스크 공간 기준 적용"""
+        try:
+            self.torrent_client.set_disk_space_limits(
+                min_free=self.disk_min_free_spinbox.value() * 1024 ** 3,
+                resume_free=self.disk_resume_free_spinbox.value() * 1024 ** 3,
+                policy=self.disk_policy_combo.currentData(),
+            )
+        except ValueError as e:
+            QMessageBox.warning(self, "오류", str(e))
+            return
+        self.disk_resume_free_spinbox.setValue(self.torrent_client.disk_space.resume_free / 1024 ** 3)
+        self.update_disk_status()
+        self.status_bar.showMessage("디스크 공간 기준을 저장했습니다.")
     
     def on_upload_limit_changed(self, value):
         """업로드 속도 제한 변경"""
@@ -572,16 +1719,88 @@ class TorrentMainWindow(QMainWindow):
         self.auto_shutdown_enabled = checked
         if checked:
             self.status_bar.showMessage("자동 종료 활성화: 모든 다운로드 완료 시 컴퓨터가 종료됩니다")
+            # 이미 모두 완료된 상태면 완료 알림이 다시 오지 않으므로 바로 확인
+            self.check_auto_shutdown()
         else:
             self.status_bar.showMessage("자동 종료 비활성화")
     
+    def on_metrics_toggled(self, checked):
+        """메트릭 엔드포인트 토글"""
+        if checked:
+            port = self.metrics_port_spinbox.value()
+            if self.torrent_client.start_metrics_server(port=port):
+                self.metrics_port_spinbox.setEnabled(False)
+                self.status_bar.showMessage(f"메트릭 엔드포인트: http://127.0.0.1:{port}/metrics")
+            else:
+                self.metrics_checkbox.setChecked(False)
+                QMessageBox.warning(self, "오류", "메트릭 엔드포인트를 시작할 수 없습니다.")
+        else:
+            self.torrent_client.stop_metrics_server()
+            self.metrics_port_spinbox.setEnabled(True)
+            self.status_bar.showMessage("메트릭 엔드포인트 비활성화")
+    
+    def on_listen_apply_clicked(self):
+        """수신/발신 인터페이스 설정 적용"""
+        interfaces = self.listen_interfaces_input.text().split(',')
+        outgoing = self.outgoing_interfaces_input.text().split(',')
+        self.torrent_client.set_listen_interfaces(
+            interfaces=interfaces,
+            port=self.listen_port_spinbox.value(),
+            outgoing_interfaces=outgoing
+        )
+        
+        listen_status = self.torrent_client.get_listen_status()
+        self.listen_interfaces_input.setText(", ".join(listen_status['interfaces']))
+        self.listen_port_spinbox.setValue(listen_status['port'])
+        self.status_bar.showMessage(f"수신 포트 {listen_status['port']} 적용됨 (포트 포워딩 설정에 사용)")
+    
+    def on_dht_bootstrap_apply_clicked(self):
+        """DHT 부트스트랩 노드 적용"""
+        self.torrent_client.set_dht_bootstrap_nodes(self.dht_bootstrap_input.text().split(','))
+        self.dht_bootstrap_input.setText(", ".join(self.torrent_client.dht_bootstrap_nodes))
+        self.status_bar.showMessage("DHT 부트스트랩 노드가 적용되었습니다.")
+    
+    def on_announce_settings_changed(self):
+        """트래커 알림 주기/동시 알림 수 적용"""
+        self.torrent_client.set_tracker_settings(
+            min_announce_interval=self.announce_interval_spinbox.value(),
+            max_concurrent_http_announces=self.concurrent_announce_spinbox.value()
+        )
+    
+    def on_web_seed_settings_changed(self):
+        """웹 시드 연결 수/파이프라인 적용"""
+        self.torrent_client.set_web_seed_settings(
+            max_web_seed_connections=self.web_seed_connections_spinbox.value(),
+            urlseed_pipeline_size=self.web_seed_pipeline_spinbox.value()
+        )
+    
+    def on_profile_apply_clicked(self):
+        """선택한 성능 프로필 적용"""
+        profile = self.profile_combo.currentData()
+        if self.torrent_client.set_session_profile(profile):
+            self.status_bar.showMessage(f"성능 프로필 적용: {self.SESSION_PROFILE_LABELS[profile]}")
+        else:
+            QMessageBox.warning(self, "오류", "성능 프로필을 적용할 수 없어 이전 설정을 유지합니다.")
+        self.refresh_peer_memory()
+    
+    def refresh_peer_memory(self):
+        """피어당 메모리 사용량 표시"""
+        report = self.torrent_client.get_peer_memory_report()
+        measured = report['measured_per_peer']
+        measured_text = self.format_bytes(measured) if measured is not None else "-"
+        self.peer_memory_label.setText(
+            f"피어 {report['connected_peers']}/{report['connections_limit']}, "
+            f"피어당 측정 {measured_text}, 버퍼 최대 {self.format_bytes(report['buffer_per_peer'])} "
+            f"(한도까지 {self.format_bytes(report['buffer_at_limit'])})"
+        )
+    
     def check_auto_shutdown(self):
         """자동 종료 조건 확인"""
         if not self.auto_shutdown_enabled:
             return
         
-        # 토렌트가 있고 모든 토렌트가 완료되었는지 확인
-        if self.torrent_client.torrents and self.torrent_client.are_all_torrents_completed():
+        # 받는 중인 토렌트가 없고 완료된 토렌트가 있는지 확인 (카운터 조회)
+        if self.torrent_client.are_all_torrents_completed():
             reply = QMessageBox.question(
                 self, "자동 종료", 
                 "모든 다운로드가 완료되었습니다.\n지금 컴퓨터를 종료하시겠습니까?",
@@ -598,6 +1817,8 @@ class TorrentMainWindow(QMainWindow):
     
     def shutdown_computer(self):
         """컴퓨터 종료"""
+        import subprocess
+        
         try:
             # macOS에서 컴퓨터 종료
             subprocess.run(["sudo", "shutdown", "-h", "now"], check=True)
@@ -639,6 +1860,39 @@ class TorrentMainWindow(QMainWindow):
         else:
             QMessageBox.warning(self, "오류", "IP 주소를 입력해주세요.")
     
+    def on_blocklist_import_clicked(self):
+        """차단 목록 파일 가져오기"""
+        path, _ = QFileDialog.getOpenFileName(
+            self, "차단 목록 선택", "", "차단 목록 (*.p2p *.dat *.txt *.gz);;모든 파일 (*)"
+        )
+        if not path:
+            return
+        try:
+            count = self.torrent_client.import_ip_blocklist(path)
+        except Exception as e:
+            QMessageBox.warning(self, "오류", f"차단 목록을 가져올 수 없습니다: {e}")
+            return
+        self.update_blocklist_label()
+        self.status_bar.showMessage(f"차단 목록을 가져왔습니다: {count}개 범위")
+        self.update_security_stats()
+    
+    def on_blocklist_clear_clicked(self):
+        """가져온 차단 목록 제거"""
+        self.torrent_client.clear_ip_blocklist()
+        self.update_blocklist_label()
+        self.status_bar.showMessage("차단 목록을 제거했습니다.")
+        self.update_security_stats()
+    
+    def update_blocklist_label(self):
+        """가져온 차단 목록 파일 이름과 범위 수 표시"""
+        stats = self.torrent_client.get_security_stats()
+        if stats['blocklist_ranges']:
+            source = os.path.basename(self.torrent_client.ip_blocklist_source)
+            self.blocklist_label.setText(f"{source} ({stats['blocklist_ranges']}개 범위)")
+        else:
+            self.blocklist_label.setText("없음")
+        self.blocklist_clear_button.setEnabled(bool(stats['blocklist_ranges']))
+    
     def on_security_alert(self, event_type, message):
         """보안 알림 처리"""
         # 중요한 보안 이벤트는 팝업으로 표시
@@ -651,6 +1905,8 @@ class TorrentMainWindow(QMainWindow):
     
     def refresh_security_log(self):
         """보안 로그 새로고침"""
+        if not self.security_tab_built:
+            return
         logs = self.torrent_client.get_security_log(30)  # 최근 30개 이벤트
         self.security_log_text.clear()
         if logs:
@@ -719,16 +1975,7 @@ class TorrentMainWindow(QMainWindow):
             QMessageBox.warning(self, "오류", "올바른 포트 번호를 입력해주세요.")
             return
         
-        # 프록시 타입 매핑
-        proxy_type_map = {
-            "HTTP": "http",
-            "SOCKS4": "socks4", 
-            "SOCKS5": "socks5",
-            "HTTP (인증)": "http_pw",
-            "SOCKS5 (인증)": "socks5_pw"
-        }
-        
-        proxy_type = proxy_type_map.get(proxy_type_text)
+        proxy_type = self.PROXY_TYPE_LABELS.get(proxy_type_text)
         if not proxy_type:
             return
         
@@ -823,6 +2070,10 @@ class TorrentMainWindow(QMainWindow):
     
     def check_tor_status(self):
         """Tor 상태 확인 (백그라운드)"""
+        # 보안 탭이 보일 때만 확인 (1초 연결 대기로 UI가 멈추지 않도록)
+        if not self.security_tab_built or self.info_widget.currentWidget() is not self.security_tab:
+            return
+        
         try:
             import socket
             
@@ -854,6 +2105,8 @@ class TorrentMainWindow(QMainWindow):
 
     def update_security_stats(self):
         """보안 통계 업데이트"""
+        if not self.security_tab_built:
+            return
         try:
             stats = self.torrent_client.get_security_stats()
             self.encryption_status_label.setText(f"암호화: {'활성화' if stats['encryption_enabled'] else '비활성화'}")
@@ -875,14 +2128,21 @@ class TorrentMainWindow(QMainWindow):
     
     def closeEvent(self, event):
         """앱 종료 시 토렌트 클라이언트 정리"""
-        self.update_timer.stop()
         self.tor_check_timer.stop()
+        self.files_timer.stop()
+        self.peers_timer.stop()
+        self.trackers_timer.stop()
         self.torrent_client.stop()
         event.accept()
 
 
 def main():
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser(description="Simple Torrent Client")
+    parser.add_argument('--shards', type=int, default=0,
+                        help="토렌트를 N개 워커 프로세스에 나눠 돌리는 샤딩 모드 (기능 제한, README 참고)")
+    args, qt_args = parser.parse_known_args()
+    
+    app = QApplication(sys.argv[:1] + qt_args)
     app.setApplicationName("Simple Torrent Client")
     
     # 다크 테마 스타일 적용
@@ -1026,7 +2286,11 @@ def main():
         }
     """)
     
-    window = TorrentMainWindow()
+    if args.shards > 0:
+        from sharded_window import ShardedMainWindow
+        window = ShardedMainWindow(args.shards)
+    else:
+        window = TorrentMainWindow()
     window.show()
     
     sys.exit(app.exec())
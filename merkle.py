@@ -0,0 +1,90 @@
+"""
+BitTorrent v2 (BEP 52) 머클 트리 계산
+"""
+import hashlib
+
+
+BLOCK_SIZE = 16 * 1024  # 머클 트리 리프 블록 크기
+ZERO_HASH = bytes(32)
+READ_SIZE = 4 * 1024 * 1024  # 디스크 순차 읽기 단위
+
+
+def next_power_of_two(n):
+    """n 이상인 가장 작은 2의 거듭제곱"""
+    return 1 << (max(1, n) - 1).bit_length()
+
+
+def pad_hash(level):
+    """높이 level인 빈(0) 서브트리의 해시"""
+    digest = ZERO_HASH
+    for _ in range(level):
+        digest = hashlib.sha256(digest + digest).digest()
+    return digest
+
+
+class MerkleBuilder:
+    """리프 해시를 순서대로 받아 O(log n) 메모리로 루트를 계산"""
+
+    def __init__(self):
+        self._stack = []  # (level, hash), 아래에서 위로 level 감소
+        self.leaf_count = 0
+
+    def add_leaf(self, digest):
+        level = 0
+        while self._stack and self._stack[-1][0] == level:
+            _, left = self._stack.pop()
+            digest = hashlib.sha256(left + digest).digest()
+            level += 1
+        self._stack.append((level, digest))
+        self.leaf_count += 1
+
+    def root(self, num_leaves=None):
+        """num_leaves(2의 거듭제곱)까지 0 해시로 채운 루트 반환"""
+        if not self._stack:
+            return None
+
+        target = (num_leaves or next_power_of_two(self.leaf_count)).bit_length() - 1
+        stack = list(self._stack)
+        level, digest = stack.pop()
+        while stack or level < target:
+            if stack and stack[-1][0] == level:
+                _, left = stack.pop()
+                digest = hashlib.sha256(left + digest).digest()
+            else:
+                digest = hashlib.sha256(digest + pad_hash(level)).digest()
+            level += 1
+        return digest
+
+
+def merkle_root(leaves, num_leaves=None):
+    """리프 해시 목록의 머클 루트"""
+    builder = MerkleBuilder()
+    for leaf in leaves:
+        builder.add_leaf(leaf)
+    return builder.root(num_leaves)
+
+
+def block_hashes(data):
+    """데이터를 16 KiB 블록으로 나눈 리프 해시 목록"""
+    view = memoryview(data)
+    return [hashlib.sha256(view[i:i + BLOCK_SIZE]).digest() for i in range(0, len(view), BLOCK_SIZE)]
+
+
+def file_pieces_root(path, size):
+    """파일의 v2 pieces root 계산 (대용량 순차 읽기, 메모리 O(log n))"""
+    if size == 0:
+        return None
+
+    builder = MerkleBuilder()
+    remaining = size
+    with open(path, 'rb') as f:
+        while remaining > 0:
+            chunk = f.read(min(READ_SIZE, remaining))
+            if not chunk:
+                raise IOError(f"파일이 예상보다 짧습니다: {path}")
+            for leaf in block_hashes(chunk):
+                builder.add_leaf(leaf)
+            remaining -= len(chunk)
+
+    num_blocks = (size + BLOCK_SIZE - 1) // BLOCK_SIZE
+    return builder.root(next_power_of_two(num_blocks))
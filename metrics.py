@@ -0,0 +1,113 @@
+"""
+Ltorrent 메트릭 레지스트리 (Prometheus 텍스트 형식 출력)
+"""
+import bisect
+import threading
+
+
+# 틱 소요 시간 히스토그램 버킷 (초)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+def escape_label_value(value):
+    """라벨 값 이스케이프 (역슬래시, 큰따옴표, 줄바꿈)"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def escape_help(text):
+    """HELP 설명 이스케이프 (역슬래시, 줄바꿈)"""
+    return text.replace('\\', '\\\\').replace('\n', '\\n')
+
+
+class MetricsRegistry:
+    """가벼운 메트릭 레지스트리 (counter / gauge / histogram)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._meta = {}  # name -> (type, help)
+        self._values = {}  # name -> {labels tuple: value}
+        self._histograms = {}  # name -> [buckets, counts, sum, count]
+        self._callbacks = []
+
+    def declare(self, name, metric_type, help_text=""):
+        """메트릭 선언 (counter, gauge, histogram)"""
+        with self._lock:
+            if name in self._meta:
+                return
+            self._meta[name] = (metric_type, help_text)
+            if metric_type == 'histogram':
+                self._histograms[name] = [DEFAULT_BUCKETS, [0] * len(DEFAULT_BUCKETS), 0.0, 0]
+            else:
+                self._values.setdefault(name, {})
+
+    def inc(self, name, amount=1, labels=None):
+        """카운터 증가"""
+        key = tuple(sorted(labels.items())) if labels else ()
+        with self._lock:
+            series = self._values.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def set(self, name, value, labels=None):
+        """게이지 값 설정"""
+        key = tuple(sorted(labels.items())) if labels else ()
+        with self._lock:
+            self._values.setdefault(name, {})[key] = value
+
+    def get(self, name, labels=None, default=0):
+        """현재 값 조회"""
+        key = tuple(sorted(labels.items())) if labels else ()
+        with self._lock:
+            return self._values.get(name, {}).get(key, default)
+
+    def observe(self, name, value):
+        """히스토그램 관측값 기록"""
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                return
+            buckets, counts, _, _ = histogram
+            index = bisect.bisect_left(buckets, value)
+            if index < len(counts):
+                counts[index] += 1
+            histogram[2] += value
+            histogram[3] += 1
+
+    def register_callback(self, callback):
+        """노출 직전에 호출될 콜백 등록 (파생 게이지 갱신용)"""
+        self._callbacks.append(callback)
+
+    def render(self):
+        """Prometheus 텍스트 형식으로 변환"""
+        for callback in self._callbacks:
+            try:
+                callback(self)
+            except Exception as e:
+                print(f"메트릭 콜백 오류: {e}")
+
+        lines = []
+        with self._lock:
+            for name in sorted(self._meta):
+                metric_type, help_text = self._meta[name]
+                if help_text:
+                    lines.append(f"# HELP {name} {escape_help(help_text)}")
+                lines.append(f"# TYPE {name} {metric_type}")
+
+                if metric_type == 'histogram':
+                    buckets, counts, total, count = self._histograms[name]
+                    cumulative = 0
+                    for bound, bucket_count in zip(buckets, counts):
+                        cumulative += bucket_count
+                        lines.append(f'{name}_bucket{{le="{bound}"}} {cumulative}')
+                    lines.append(f'{name}_bucket{{le="+Inf"}} {count}')
+                    lines.append(f"{name}_sum {total}")
+                    lines.append(f"{name}_count {count}")
+                    continue
+
+                for key, value in self._values.get(name, {}).items():
+                    if key:
+                        label_text = ','.join(f'{k}="{escape_label_value(v)}"' for k, v in key)
+                        lines.append(f"{name}{{{label_text}}} {value}")
+                    else:
+                        lines.append(f"{name} {value}")
+
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,52 @@
+"""
+Prometheus 텍스트 노출 엔드포인트 (/metrics)
+
+시작 시 http.server를 불러오지 않도록 레지스트리와 분리
+"""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """/metrics 요청 처리"""
+
+    registry = None
+
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+
+        body = self.registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # 스크레이프마다 콘솔에 출력하지 않음
+        pass
+
+
+class MetricsServer:
+    """메트릭 텍스트 노출 HTTP 서버"""
+
+    def __init__(self, registry, host='127.0.0.1', port=9464):
+        handler = type('MetricsHandler', (_MetricsHandler,), {'registry': registry})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def address(self):
+        return self.httpd.server_address
+
+    def start(self):
+        """서버 시작"""
+        self.thread.start()
+
+    def stop(self):
+        """서버 종료"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,76 @@
+"""
+전송 속도 그래프 위젯 (QPainter로 직접 그림, 차트 모듈 불필요)
+"""
+import time
+
+from PySide6.QtCore import Qt, QPointF, QRectF
+from PySide6.QtGui import QColor, QPainter, QPen, QPolygonF
+from PySide6.QtWidgets import QWidget
+
+
+DOWNLOAD_COLOR = QColor('#4a90e2')
+UPLOAD_COLOR = QColor('#7ed321')
+GRID_COLOR = QColor('#555555')
+TEXT_COLOR = QColor('#ffffff')
+MARGIN = 8
+
+
+class RateGraph(QWidget):
+    """다운로드/업로드 속도 선 그래프"""
+
+    def __init__(self, format_bytes, parent=None):
+        super().__init__(parent)
+        self.format_bytes = format_bytes
+        self.step = 1
+        self.times = []
+        self.channels = [[], []]
+        self.setMinimumHeight(160)
+
+    def set_series(self, history):
+        """get_rate_history 결과 표시 (None이면 비움)"""
+        if history is None:
+            self.step, self.times, self.channels = 1, [], [[], []]
+        else:
+            self.step, self.times, self.channels = history
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        metrics = painter.fontMetrics()
+        text_height = metrics.height()
+        area = QRectF(MARGIN, MARGIN + text_height, self.width() - 2 * MARGIN,
+                      self.height() - 2 * MARGIN - 2 * text_height)
+
+        peak = max((max(values) for values in self.channels if values), default=0) or 1
+        painter.setPen(QPen(GRID_COLOR, 1, Qt.DashLine))
+        for fraction in (0.25, 0.5, 0.75, 1.0):
+            y = area.bottom() - area.height() * fraction
+            painter.drawLine(QPointF(area.left(), y), QPointF(area.right(), y))
+
+        painter.setPen(TEXT_COLOR)
+        painter.drawText(QPointF(MARGIN, MARGIN + metrics.ascent()), f"최대 {self.format_bytes(peak)}/s")
+        if self.times:
+            bottom = self.height() - MARGIN
+            time_format = '%H:%M:%S' if self.step < 60 else ('%m-%d %H:%M' if self.step >= 900 else '%H:%M')
+            start_text = time.strftime(time_format, time.localtime(self.times[0]))
+            end_text = time.strftime(time_format, time.localtime(self.times[-1]))
+            painter.drawText(QPointF(area.left(), bottom), start_text)
+            painter.drawText(QPointF(area.right() - metrics.horizontalAdvance(end_text), bottom), end_text)
+
+        legend_x = area.right()
+        for label, color in (("업로드", UPLOAD_COLOR), ("다운로드", DOWNLOAD_COLOR)):
+            legend_x -= metrics.horizontalAdvance(label) + MARGIN
+            painter.setPen(color)
+            painter.drawText(QPointF(legend_x, MARGIN + metrics.ascent()), label)
+
+        count = len(self.times)
+        if count < 2:
+            return
+        x_scale = area.width() / (count - 1)
+        y_scale = area.height() / peak
+        for values, color in zip(self.channels, (DOWNLOAD_COLOR, UPLOAD_COLOR)):
+            points = QPolygonF([QPointF(area.left() + i * x_scale, area.bottom() - value * y_scale)
+                                for i, value in enumerate(values)])
+            painter.setPen(QPen(color, 1.5))
+            painter.drawPolyline(points)
@@ -0,0 +1,219 @@
+"""
+시딩 목표: 공유 비율, 시딩 시간, 유휴 시간 한도에 닿은 토렌트의 시딩 중지 (일시정지/제거/이동)
+
+목표는 토렌트별 > 태그별 > 기본 순으로 정한다. 상태가 바뀐 토렌트만 다시 평가하고,
+시간이 지나야 닿는 한도(시딩/유휴 시간)는 마감 시각 힙에 넣어 만료된 것만 꺼내 본다.
+"""
+import heapq
+import json
+import os
+import threading
+
+
+GOAL_LIMITS = ('ratio', 'seed_time', 'idle_time')  # 공유 비율, 시딩 시간(초), 업로드 없는 시간(초)
+GOAL_ACTIONS = ('pause', 'remove', 'remove_delete', 'move')
+
+
+def normalize_goal(goal):
+    """목표 검증 후 저장 형식으로, 한도가 하나도 없으면 None"""
+    if not goal:
+        return None
+    action = goal.get('action', 'pause')
+    if action not in GOAL_ACTIONS:
+        raise ValueError(f"알 수 없는 시딩 목표 작업: {action}")
+    if action == 'move' and not goal.get('path'):
+        raise ValueError("move 작업에는 경로가 필요합니다")
+
+    normalized = {'action': action}
+    for key in GOAL_LIMITS:
+        value = goal.get(key)
+        if value is not None and value > 0:
+            normalized[key] = value
+    if len(normalized) == 1:
+        return None
+    if action == 'move':
+        normalized['path'] = goal['path']
+    return normalized
+
+
+def load_goals(path):
+    """저장된 목표 {'default': 목표 또는 None, 'tags': {태그: 목표}, 'torrents': {hash: 목표}}"""
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        data = {}
+    goals = {'default': normalize_goal(data.get('default')), 'tags': {}, 'torrents': {}}
+    for scope in ('tags', 'torrents'):
+        for key, goal in data.get(scope, {}).items():
+            goal = normalize_goal(goal)
+            if goal:
+                goals[scope][key] = goal
+    return goals
+
+
+def save_goals(path, goals):
+    """목표 저장"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(goals, f, indent=2, ensure_ascii=False)
+    os.replace(path + '.tmp', path)
+
+
+def describe_goal(goal):
+    """목표 요약 문자열 (예: '비율 2.0, 시딩 72시간 -> pause')"""
+    if not goal:
+        return "없음"
+    parts = []
+    if 'ratio' in goal:
+        parts.append(f"비율 {goal['ratio']:g}")
+    if 'seed_time' in goal:
+        parts.append(f"시딩 {goal['seed_time'] / 3600:g}시간")
+    if 'idle_time' in goal:
+        parts.append(f"유휴 {goal['idle_time'] / 3600:g}시간")
+    return f"{', '.join(parts)} -> {goal['action']}"
+
+
+class SeedingGoals:
+    """시딩 중인 토렌트의 목표 도달 판정
+
+    observe는 상태가 바뀐 토렌트마다(업데이트 스레드), due는 틱마다 호출하며
+    둘 다 도달한 토렌트의 (hash, 목표, 이유) 목록을 돌려준다. 도달한 토렌트는 추적에서 빠진다.
+    """
+
+    def __init__(self, goals, tags_for):
+        self.default = goals.get('default')
+        self.tag_goals = dict(goals.get('tags', {}))
+        self.torrent_goals = dict(goals.get('torrents', {}))
+        self.tags_for = tags_for  # hash -> 태그 집합
+        self.lock = threading.Lock()
+        # hash -> {'ratio', 'seeding_time', 'observed', 'uploaded', 'last_active'}
+        self._tracked = {}
+        self._deadlines = []  # (시각, hash) 힙, _scheduled와 시각이 다르면 지난 항목
+        self._scheduled = {}  # hash -> 힙에 넣은 마감 시각
+
+    def to_dict(self):
+        with self.lock:
+            return {'default': self.default, 'tags': dict(self.tag_goals), 'torrents': dict(self.torrent_goals)}
+
+    def set_goal(self, scope, key, goal, now):
+        """목표 변경 (scope: 'default' | 'tag' | 'torrent', goal이 None이면 제거), 바로 도달한 목록 반환"""
+        goal = normalize_goal(goal)
+        with self.lock:
+            if scope == 'default':
+                self.default = goal
+            else:
+                goals = self.tag_goals if scope == 'tag' else self.torrent_goals
+                if goal:
+                    goals[key] = goal
+                else:
+                    goals.pop(key, None)
+            # 목표가 바뀌면 추적 중인 토렌트를 모두 다시 평가 (설정 변경 때만 O(n))
+            return self._evaluate_many(list(self._tracked), now)
+
+    def goal_for(self, torrent_hash):
+        """적용할 목표 (토렌트별 > 태그별(이름순 첫 번째) > 기본)"""
+        goal = self.torrent_goals.get(torrent_hash)
+        if goal:
+            return goal
+        for tag in sorted(self.tags_for(torrent_hash)):
+            if tag in self.tag_goals:
+                return self.tag_goals[tag]
+        return self.default
+
+    def observe(self, torrent_hash, seeding, ratio, seeding_time, uploaded, now):
+        """상태가 바뀐 토렌트 반영 (seeding: 일시정지/오류 없이 시드 중인지)"""
+        with self.lock:
+            if not seeding:
+                self._untrack(torrent_hash)
+                return []
+            tracked = self._tracked.get(torrent_hash)
+            if tracked is None:
+                tracked = self._tracked[torrent_hash] = {'uploaded': uploaded, 'last_active': now}
+            elif uploaded != tracked['uploaded']:
+                tracked['uploaded'] = uploaded
+                tracked['last_active'] = now
+            tracked['ratio'] = ratio
+            tracked['seeding_time'] = seeding_time
+            tracked['observed'] = now
+            return self._evaluate_many([torrent_hash], now)
+
+    def due(self, now):
+        """마감 시각이 지난 토렌트 다시 평가"""
+        with self.lock:
+            expired = []
+            while self._deadlines and self._deadlines[0][0] <= now:
+                deadline, torrent_hash = heapq.heappop(self._deadlines)
+                if self._scheduled.get(torrent_hash) == deadline:
+                    del self._scheduled[torrent_hash]
+                    expired.append(torrent_hash)
+            return self._evaluate_many(expired, now)
+
+    def refresh(self, torrent_hashes, now):
+        """태그 변경 등으로 목표가 바뀌었을 수 있는 토렌트 다시 평가"""
+        with self.lock:
+            return self._evaluate_many([h for h in torrent_hashes if h in self._tracked], now)
+
+    def forget(self, torrent_hash):
+        """제거된 토렌트 정리"""
+        with self.lock:
+            self._untrack(torrent_hash)
+            self.torrent_goals.pop(torrent_hash, None)
+
+    def tracked_count(self):
+        with self.lock:
+            return len(self._tracked)
+
+    def _untrack(self, torrent_hash):
+        self._tracked.pop(torrent_hash, None)
+        self._scheduled.pop(torrent_hash, None)
+
+    def _evaluate_many(self, torrent_hashes, now):
+        reached = []
+        for torrent_hash in torrent_hashes:
+            result = self._evaluate(torrent_hash, now)
+            if result is not None:
+                self._untrack(torrent_hash)
+                reached.append(result)
+        return reached
+
+    def _evaluate(self, torrent_hash, now):
+        """도달했으면 (hash, 목표, 이유), 아니면 다음 마감 시각을 힙에 넣고 None"""
+        tracked = self._tracked.get(torrent_hash)
+        goal = self.goal_for(torrent_hash) if tracked else None
+        if not goal:
+            self._scheduled.pop(torrent_hash, None)
+            return None
+
+        if 'ratio' in goal and tracked['ratio'] >= goal['ratio']:
+            return torrent_hash, goal, f"공유 비율 {tracked['ratio']:.2f} 도달"
+
+        deadline = None
+        if 'seed_time' in goal:
+            seeding_time = tracked['seeding_time'] + (now - tracked['observed'])
+            if seeding_time >= goal['seed_time']:
+                return torrent_hash, goal, f"시딩 {seeding_time / 3600:.1f}시간 도달"
+            deadline = now + goal['seed_time'] - seeding_time
+        if 'idle_time' in goal:
+            idle_deadline = tracked['last_active'] + goal['idle_time']
+            if idle_deadline <= now:
+                return torrent_hash, goal, f"{(now - tracked['last_active']) / 3600:.1f}시간 동안 업로드 없음"
+            deadline = idle_deadline if deadline is None else min(deadline, idle_deadline)
+
+        self._schedule(torrent_hash, deadline)
+        return None
+
+    def _schedule(self, torrent_hash, deadline):
+        """마감 시각 예약 (이미 더 이른 시각이 예약돼 있으면 그때 다시 평가하므로 그대로 둠)"""
+        if deadline is None:
+            self._scheduled.pop(torrent_hash, None)
+            return
+        scheduled = self._scheduled.get(torrent_hash)
+        if scheduled is not None and scheduled <= deadline:
+            return
+        self._scheduled[torrent_hash] = deadline
+        heapq.heappush(self._deadlines, (deadline, torrent_hash))
+        if len(self._deadlines) > 2 * len(self._scheduled) + 1024:
+            # 지난 항목이 쌓이면 예약된 것만으로 다시 만듦
+            self._deadlines = [(d, h) for h, d in self._scheduled.items()]
+            heapq.heapify(self._deadlines)
@@ -0,0 +1,171 @@
+"""
+세션 상태 저장/복원: 설정(암호화, DHT, 익명/프록시, 속도 제한, 프로필 등)과 IP 필터를 버전 있는 한 파일에
+
+설정은 JSON, IP 필터는 정렬·병합된 주소 구간을 네트워크 바이트 순서 그대로 저장한다.
+큰 차단 목록도 시작할 때 다시 파싱하지 않고 구간 바이트를 그대로 읽어 필터에 넣는다.
+"""
+import gzip
+import ipaddress
+import json
+import os
+import socket
+import struct
+
+
+STATE_MAGIC = b'LTSS'
+STATE_VERSION = 1
+_HEADER = struct.Struct('<4sHIII')  # magic, version, 설정 JSON 길이, IPv4 구간 수, IPv6 구간 수
+
+# 주소 종류별 (주소 바이트 수, 소켓 주소 체계)
+FAMILIES = {4: (4, socket.AF_INET), 6: (16, socket.AF_INET6)}
+
+
+def _address(text):
+    """주소 문자열 -> ip_address (DAT 형식의 0으로 채운 IPv4 "001.002.003.004"도 허용)"""
+    text = text.strip()
+    if '.' in text and ':' not in text:
+        text = '.'.join(str(int(part)) for part in text.split('.'))
+    return ipaddress.ip_address(text)
+
+
+def _start_address(text):
+    """P2P 형식 구간의 왼쪽("설명:시작 주소" 또는 "시작 주소") -> 시작 주소
+
+    설명에도 ':'가 있을 수 있으므로 ':' 뒤 나머지가 주소로 읽히는 가장 긴 부분을 쓴다.
+    IPv6는 설명이 16진수 단어와 ':'로 끝나면("설명:dead:beef::1") 구분할 수 없다.
+    """
+    text = text.strip()
+    candidates = [text] + [text[i + 1:] for i, ch in enumerate(text) if ch == ':']
+    for candidate in candidates:
+        try:
+            return _address(candidate)
+        except ValueError:
+            continue
+    raise ValueError(text)
+
+
+def _parse_range(text):
+    """"[설명:]시작-끝", CIDR 또는 단일 주소 -> (시작, 끝), 읽을 수 없으면 ValueError"""
+    text = text.strip()
+    if '-' in text:
+        start, end = text.rsplit('-', 1)
+        start, end = _start_address(start), _address(end)
+        if start.version != end.version:
+            raise ValueError(text)
+        return (start, end) if start <= end else (end, start)
+    network = ipaddress.ip_network(text, strict=False)
+    return network.network_address, network.broadcast_address
+
+
+def parse_blocklist_line(line):
+    """차단 목록 한 줄 -> (시작 주소, 끝 주소) 또는 None
+
+    P2P 형식("설명:1.2.3.0-1.2.3.255", 설명에 ','나 ':'가 있어도 됨, IPv6 포함),
+    DAT 형식("1.2.3.0 - 1.2.3.255 , 000 , 설명"), CIDR("1.2.3.0/24")와 단일 주소를 읽는다.
+    DAT 형식은 등급 127 이상이면 허용으로 보고 건너뛴다.
+    """
+    line = line.strip()
+    if not line or line[0] in '#;':
+        return None
+
+    # P2P/CIDR/단일 주소를 먼저 (P2P 설명에 ','가 있어도 DAT로 잘못 읽지 않도록)
+    try:
+        return _parse_range(line)
+    except ValueError:
+        pass
+
+    if ',' in line:
+        fields = [field.strip() for field in line.split(',')]
+        if len(fields) >= 2 and fields[1].isdigit():
+            if int(fields[1]) >= 127:
+                return None
+            try:
+                return _parse_range(fields[0])
+            except ValueError:
+                return None
+    return None
+
+
+def pack_ranges(ranges):
+    """(시작, 끝) 주소 구간들을 정렬·병합해 종류별 바이트로 -> {4: bytes, 6: bytes}"""
+    by_version = {4: [], 6: []}
+    for start, end in ranges:
+        by_version[start.version].append((int(start), int(end)))
+
+    packed = {}
+    for version, items in by_version.items():
+        size = FAMILIES[version][0]
+        items.sort()
+        merged = []
+        for start, end in items:
+            if merged and start <= merged[-1][1] + 1:
+                if end > merged[-1][1]:
+                    merged[-1][1] = end
+            else:
+                merged.append([start, end])
+        packed[version] = b''.join(start.to_bytes(size, 'big') + end.to_bytes(size, 'big')
+                                   for start, end in merged)
+    return packed
+
+
+def read_blocklist(path):
+    """차단 목록 파일(.gz 가능)을 읽어 정렬·병합된 구간 바이트로"""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8', errors='replace') as f:
+        return pack_ranges(r for r in map(parse_blocklist_line, f) if r is not None)
+
+
+def range_count(packed):
+    """저장된 구간 수"""
+    return sum(len(packed.get(version, b'')) // (2 * size) for version, (size, _) in FAMILIES.items())
+
+
+def iter_ranges(packed):
+    """저장된 구간을 (시작, 끝) 주소 문자열로 (ip_filter.add_rule에 바로 넘김)"""
+    for version, (size, family) in FAMILIES.items():
+        data = memoryview(packed.get(version, b''))
+        for offset in range(0, len(data) - 2 * size + 1, 2 * size):
+            yield (socket.inet_ntop(family, data[offset:offset + size]),
+                   socket.inet_ntop(family, data[offset + size:offset + 2 * size]))
+
+
+def save_session_state(path, settings, packed_ranges):
+    """설정(JSON으로 직렬화 가능한 dict)과 IP 구간을 한 파일로 저장 (권한 0600)"""
+    settings_bytes = json.dumps(settings, ensure_ascii=False).encode()
+    v4 = packed_ranges.get(4, b'')
+    v6 = packed_ranges.get(6, b'')
+    header = _HEADER.pack(STATE_MAGIC, STATE_VERSION, len(settings_bytes),
+                          len(v4) // 8, len(v6) // 32)
+
+    # 프록시 비밀번호가 들어 있으므로 소유자만 읽을 수 있게 (이미 있던 .tmp의 권한도 바로잡음)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd = os.open(path + '.tmp', os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    if hasattr(os, 'fchmod'):
+        os.fchmod(fd, 0o600)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(header + settings_bytes + v4 + v6)
+    os.replace(path + '.tmp', path)
+
+
+def load_session_state(path):
+    """저장된 (설정, IP 구간) 로드, 없거나 버전이 다르면 None"""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+
+    if len(data) < _HEADER.size:
+        return None
+    magic, version, settings_len, v4_count, v6_count = _HEADER.unpack_from(data, 0)
+    if magic != STATE_MAGIC or version != STATE_VERSION:
+        return None
+    offset = _HEADER.size
+    settings = json.loads(data[offset:offset + settings_len])
+    offset += settings_len
+    v4 = data[offset:offset + v4_count * 8]
+    offset += v4_count * 8
+    v6 = data[offset:offset + v6_count * 32]
+    if len(v4) != v4_count * 8 or len(v6) != v6_count * 32:
+        return None
+    return settings, {4: v4, 6: v6}
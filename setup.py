@@ -25,9 +25,13 @@ OPTIONS = {
             }
         ]
     },
-          'packages': ['PySide6'],
-      'includes': ['torrent_client'],
-      'excludes': ['tkinter', 'matplotlib', 'IPython', 'pkg_resources', 'setuptools'],
+    'packages': ['PySide6'],
+    'includes': ['torrent_client', 'metrics', 'metrics_server', 'streaming', 'stream_server', 'merkle',
+                 'torrent_creator', 'fast_recheck',
+                 'completion_actions', 'sharded_engine', 'shard_worker', 'torrent_list',
+                 'timeseries', 'rate_graph', 'session_state', 'seeding_goals', 'disk_space',
+                 'lan_peers', 'sharded_window', 'torrent_keys'],
+    'excludes': ['tkinter', 'matplotlib', 'IPython', 'pkg_resources', 'setuptools'],
     'iconfile': 'icon.icns',
     'strip': False,  # 디버깅을 위해 심볼 유지
 }
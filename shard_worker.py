@@ -0,0 +1,370 @@
+"""
+샤드 워커 프로세스: 자체 libtorrent 세션을 돌리고 토렌트 상태를 공유 메모리 레코드로 기록
+
+코디네이터(sharded_engine.ShardedEngine)와는 명령/이벤트를 파이프로, 상태는 고정 크기
+바이너리 레코드로 주고받는다. 워커는 PySide6 없이 libtorrent만 불러온다.
+토렌트별 resume 데이터는 샤드 디렉터리에 저장하고 시작할 때 다시 불러온다.
+"""
+import os
+import struct
+import time
+from multiprocessing import shared_memory
+
+from torrent_keys import info_hash_candidates
+
+
+# 공유 메모리 레이아웃: [헤더: generation u64] [레코드 x capacity]
+HEADER = struct.Struct('<Q')
+SEQ = struct.Struct('<I')
+# key_len, key, state, flags, progress, down_rate, up_rate, seeds, peers, total_done, total_wanted
+RECORD_BODY = struct.Struct('<B32sBBfiiiiqq')
+RECORD_SIZE = SEQ.size + RECORD_BODY.size
+
+FLAG_PAUSED = 0x01
+FLAG_FINISHED = 0x02
+FLAG_ERROR = 0x04
+FLAG_AUTO_MANAGED = 0x08
+
+STATUS_INTERVAL = 1.0  # post_torrent_updates 주기 (초)
+ALERT_WAIT_MS = 100  # 명령 확인 간격
+RESUME_SAVE_INTERVAL = 300  # 변경된 토렌트 resume 저장 주기 (초)
+STOP_SAVE_TIMEOUT = 10  # 종료 시 resume 저장 대기 (초)
+
+
+def table_size(capacity):
+    """레코드 capacity개를 담는 공유 메모리 크기"""
+    return HEADER.size + capacity * RECORD_SIZE
+
+
+class StatusTable:
+    """공유 메모리 위의 토렌트 상태 레코드 배열 (단일 작성자, 시퀀스 번호로 찢어진 읽기 방지)"""
+
+    def __init__(self, buffer, capacity):
+        self.buffer = buffer
+        self.capacity = capacity
+
+    def generation(self):
+        """레코드가 바뀔 때마다 증가하는 값 (변경 없는 샤드 건너뛰기용)"""
+        return HEADER.unpack_from(self.buffer, 0)[0]
+
+    def bump_generation(self):
+        HEADER.pack_into(self.buffer, 0, self.generation() + 1)
+
+    def _offset(self, slot):
+        return HEADER.size + slot * RECORD_SIZE
+
+    def sequence(self, slot):
+        return SEQ.unpack_from(self.buffer, self._offset(slot))[0]
+
+    def write(self, slot, key, state, flags, progress, down_rate, up_rate, seeds, peers, total_done, total_wanted):
+        offset = self._offset(slot)
+        sequence = SEQ.unpack_from(self.buffer, offset)[0]
+        # 홀수 = 쓰는 중
+        SEQ.pack_into(self.buffer, offset, sequence + 1)
+        key_bytes = bytes.fromhex(key) if key else b''
+        RECORD_BODY.pack_into(self.buffer, offset + SEQ.size, len(key_bytes), key_bytes, state, flags,
+                              progress, down_rate, up_rate, seeds, peers, total_done, total_wanted)
+        SEQ.pack_into(self.buffer, offset, sequence + 2)
+
+    def clear(self, slot):
+        self.write(slot, '', 0, 0, 0.0, 0, 0, 0, 0, 0, 0)
+
+    def read(self, slot):
+        """레코드 읽기, 빈 슬롯이면 None"""
+        offset = self._offset(slot)
+        while True:
+            before = SEQ.unpack_from(self.buffer, offset)[0]
+            if before & 1:
+                time.sleep(0)
+                continue
+            values = RECORD_BODY.unpack_from(self.buffer, offset + SEQ.size)
+            if SEQ.unpack_from(self.buffer, offset)[0] == before:
+                break
+
+        key_len, key, state, flags, progress, down_rate, up_rate, seeds, peers, total_done, total_wanted = values
+        if key_len == 0:
+            return None
+        return {
+            'key': key[:key_len].hex(),
+            'state': state,
+            'paused': bool(flags & FLAG_PAUSED),
+            'finished': bool(flags & FLAG_FINISHED),
+            'error': bool(flags & FLAG_ERROR),
+            'auto_managed': bool(flags & FLAG_AUTO_MANAGED),
+            'progress': progress,
+            'download_rate': down_rate,
+            'upload_rate': up_rate,
+            'num_seeds': seeds,
+            'num_peers': peers,
+            'total_done': total_done,
+            'total_wanted': total_wanted,
+        }
+
+
+def status_flags(lt, status):
+    flags = 0
+    if status.flags & lt.torrent_flags.paused:
+        flags |= FLAG_PAUSED
+    if status.flags & lt.torrent_flags.auto_managed:
+        flags |= FLAG_AUTO_MANAGED
+    if status.is_finished:
+        flags |= FLAG_FINISHED
+    if status.errc.value():
+        flags |= FLAG_ERROR
+    return flags
+
+
+class ShardWorker:
+    """샤드 하나의 세션과 명령 처리"""
+
+    def __init__(self, index, conn, shm_name, capacity, listen_port, settings, resume_dir):
+        import libtorrent as lt
+        self.lt = lt
+        self.index = index
+        self.conn = conn
+        self.resume_dir = resume_dir
+        self.shm = shared_memory.SharedMemory(name=shm_name)
+        self.table = StatusTable(self.shm.buf, capacity)
+
+        session_settings = {
+            'alert_mask': (lt.alert.category_t.status_notification | lt.alert.category_t.error_notification
+                           | lt.alert.category_t.storage_notification),
+            'listen_interfaces': f"0.0.0.0:{listen_port},[::]:{listen_port}",
+        }
+        session_settings.update(settings)
+        self.session = lt.session(session_settings)
+
+        self.handles = {}  # key -> handle
+        self.slots = {}  # key -> 레코드 슬롯
+        self.hash_keys = {}  # v1/v2 해시 16진수 -> key (마그넷은 메타데이터를 받으면 v2 해시가 추가됨)
+        self.free_slots = list(range(capacity - 1, -1, -1))
+        self.running = True
+
+    def run(self):
+        self._restore()
+        last_update = 0.0
+        last_resume_save = time.monotonic()
+        while self.running:
+            while self.running and self.conn.poll():
+                self._handle_command(self.conn.recv())
+
+            now = time.monotonic()
+            if now - last_update >= STATUS_INTERVAL:
+                last_update = now
+                self.session.post_torrent_updates()
+            if now - last_resume_save >= RESUME_SAVE_INTERVAL:
+                last_resume_save = now
+                self._save_changed_resume_data()
+
+            if self.session.wait_for_alert(ALERT_WAIT_MS):
+                self._handle_alerts(self.session.pop_alerts())
+
+        self.session.pause()
+        self._save_all_resume_data()
+        self.shm.close()
+
+    def _send(self, *event):
+        self.conn.send(event)
+
+    def _handle_command(self, command):
+        lt = self.lt
+        name = command[0]
+        try:
+            if name == 'add':
+                self._add(*command[1:])
+            elif name == 'pause':
+                handle = self.handles.get(command[1])
+                if handle:
+                    handle.unset_flags(lt.torrent_flags.auto_managed)
+                    handle.pause()
+            elif name == 'resume':
+                handle = self.handles.get(command[1])
+                if handle:
+                    handle.set_flags(lt.torrent_flags.auto_managed)
+                    handle.resume()
+            elif name == 'remove':
+                self._remove(*command[1:])
+            elif name == 'settings':
+                self.session.apply_settings(command[1])
+            elif name == 'stop':
+                self.running = False
+        except Exception as e:
+            self._send('error', command[1] if len(command) > 1 and isinstance(command[1], str) else '', str(e))
+
+    def _add(self, key, source, save_path):
+        lt = self.lt
+        if key in self.handles:
+            # 이전 세션에서 복원된 토렌트를 다시 추가한 경우 슬롯만 알려줌
+            self._send('added', key, self.slots[key], self.handles[key].status().name)
+            return
+        if not self.free_slots:
+            self._send('error', key, f"샤드 {self.index}의 상태 레코드가 가득 찼습니다")
+            return
+
+        if source.get('magnet'):
+            params = lt.parse_magnet_uri(source['magnet'])
+            name = params.name or '메타데이터 수신 중...'
+        else:
+            params = lt.add_torrent_params()
+            params.ti = lt.torrent_info(lt.bdecode(source['torrent']))
+            name = params.ti.name()
+        params.save_path = save_path
+        handle = self.session.add_torrent(params)
+        slot = self._track(key, handle)
+        # 다음 시작 때 복원되도록 바로 한 번 저장
+        self._request_resume_save(handle)
+        self._send('added', key, slot, name)
+
+    def _track(self, key, handle):
+        """핸들을 등록하고 상태 레코드 슬롯 할당"""
+        slot = self.free_slots.pop()
+        self.handles[key] = handle
+        self.slots[key] = slot
+        self._register_hashes(key, handle.info_hashes())
+        self.table.write(slot, key, 0, 0, 0.0, 0, 0, 0, 0, 0, 0)
+        self.table.bump_generation()
+        return slot
+
+    def _register_hashes(self, key, info_hashes):
+        for candidate in info_hash_candidates(info_hashes):
+            self.hash_keys[candidate] = key
+
+    def _key_for(self, info_hashes):
+        """v1/v2 어느 해시로 등록되었든 key 찾기 (없으면 None)"""
+        for candidate in info_hash_candidates(info_hashes):
+            key = self.hash_keys.get(candidate)
+            if key is not None:
+                return key
+        return None
+
+    def _resume_path(self, key):
+        return os.path.join(self.resume_dir, key + '.fastresume')
+
+    def _restore(self):
+        """샤드 디렉터리의 resume 데이터로 이전 세션의 토렌트 복원"""
+        if not os.path.isdir(self.resume_dir):
+            return
+        lt = self.lt
+        for file_name in sorted(os.listdir(self.resume_dir)):
+            if not file_name.endswith('.fastresume'):
+                continue
+            key = file_name[:-len('.fastresume')]
+            if key in self.handles or not self.free_slots:
+                continue
+            try:
+                with open(os.path.join(self.resume_dir, file_name), 'rb') as f:
+                    params = lt.read_resume_data(f.read())
+                handle = self.session.add_torrent(params)
+            except Exception as e:
+                self._send('error', key, f"resume 데이터 복원 오류: {e}")
+                continue
+            slot = self._track(key, handle)
+            name = params.ti.name() if params.ti else (params.name or '메타데이터 수신 중...')
+            self._send('restored', key, slot, name, params.save_path)
+
+    def _request_resume_save(self, handle):
+        handle.save_resume_data(self.lt.torrent_handle.flush_disk_cache | self.lt.torrent_handle.save_info_dict)
+
+    def _save_changed_resume_data(self):
+        """마지막 저장 이후 바뀐 토렌트만 resume 저장 요청"""
+        for handle in list(self.handles.values()):
+            if handle.need_save_resume_data():
+                self._request_resume_save(handle)
+
+    def _write_resume_data(self, handle, params):
+        key = self._key_for(handle.info_hashes())
+        if key is None:
+            # 저장 요청 뒤에 제거됨
+            return
+        try:
+            os.makedirs(self.resume_dir, exist_ok=True)
+            path = self._resume_path(key)
+            with open(path + '.tmp', 'wb') as f:
+                f.write(self.lt.write_resume_data_buf(params))
+            os.replace(path + '.tmp', path)
+        except OSError as e:
+            self._send('error', key, f"resume 데이터 저장 오류: {e}")
+
+    def _save_all_resume_data(self):
+        """모든 토렌트의 resume 데이터를 저장하고 완료될 때까지 대기 (종료 시)"""
+        lt = self.lt
+        pending = 0
+        for handle in list(self.handles.values()):
+            try:
+                self._request_resume_save(handle)
+                pending += 1
+            except RuntimeError:
+                pass
+
+        deadline = time.monotonic() + STOP_SAVE_TIMEOUT
+        while pending > 0 and time.monotonic() < deadline:
+            if not self.session.wait_for_alert(500):
+                continue
+            for alert in self.session.pop_alerts():
+                if isinstance(alert, lt.save_resume_data_alert):
+                    pending -= 1
+                    self._write_resume_data(alert.handle, alert.params)
+                elif isinstance(alert, lt.save_resume_data_failed_alert):
+                    pending -= 1
+
+    def _remove(self, key, delete_files=False):
+        handle = self.handles.pop(key, None)
+        if handle is None:
+            return
+        if delete_files:
+            self.session.remove_torrent(handle, self.lt.options_t.delete_files)
+        else:
+            self.session.remove_torrent(handle)
+        self.hash_keys = {h: k for h, k in self.hash_keys.items() if k != key}
+        slot = self.slots.pop(key)
+        self.table.clear(slot)
+        self.table.bump_generation()
+        self.free_slots.append(slot)
+        try:
+            os.remove(self._resume_path(key))
+        except OSError:
+            pass
+        self._send('removed', key)
+
+    def _handle_alerts(self, alerts):
+        lt = self.lt
+        changed = False
+        for alert in alerts:
+            if isinstance(alert, lt.state_update_alert):
+                for status in alert.status:
+                    key = self._key_for(status.info_hashes)
+                    if key is None or key not in self.slots:
+                        continue
+                    self.table.write(
+                        self.slots[key], key, int(status.state), status_flags(lt, status),
+                        status.progress, status.download_rate, status.upload_rate,
+                        status.num_seeds, status.num_peers, status.total_wanted_done, status.total_wanted
+                    )
+                    changed = True
+            elif isinstance(alert, lt.torrent_finished_alert):
+                key = self._key_for(alert.handle.info_hashes())
+                if key:
+                    self._send('finished', key)
+            elif isinstance(alert, lt.metadata_received_alert):
+                key = self._key_for(alert.handle.info_hashes())
+                if key:
+                    # 하이브리드 토렌트를 btih 마그넷으로 추가했으면 이제 v2 해시도 알게 됨
+                    self._register_hashes(key, alert.handle.info_hashes())
+                    self._send('metadata', key, alert.handle.torrent_file().name())
+            elif isinstance(alert, lt.save_resume_data_alert):
+                self._write_resume_data(alert.handle, alert.params)
+            elif isinstance(alert, lt.torrent_error_alert):
+                key = self._key_for(alert.handle.info_hashes())
+                self._send('error', key or '', alert.message())
+        if changed:
+            self.table.bump_generation()
+
+
+def shard_main(index, conn, shm_name, capacity, listen_port, settings, resume_dir):
+    """워커 프로세스 진입점"""
+    worker = ShardWorker(index, conn, shm_name, capacity, listen_port, settings, resume_dir)
+    try:
+        worker.run()
+    except (EOFError, KeyboardInterrupt):
+        # 코디네이터가 종료됨
+        pass
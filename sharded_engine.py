@@ -0,0 +1,287 @@
+"""
+다중 프로세스 샤딩 엔진: 토렌트를 info 해시로 N개 워커 프로세스(각자 세션/수신 포트/설정)에 분산
+
+토렌트 수가 많아(수만 개) 한 프로세스의 세션과 GIL에 묶인 업데이트 루프가 한계에 닿을 때 쓰는
+선택적 모드(`main.py --shards N`). 코디네이터는 명령을 해당 샤드로 보내고, 상태는 공유 메모리
+레코드에서 직접 읽어 하나의 클라이언트처럼 보이게 한다. resume 데이터는 샤드마다
+~/.ltorrent/shards/<번호>/에 저장되어 다시 시작하면 워커가 복원한다.
+"""
+import multiprocessing
+import os
+import threading
+import time
+from multiprocessing import shared_memory
+
+import libtorrent as lt
+from PySide6.QtCore import QObject, Signal
+
+from shard_worker import STOP_SAVE_TIMEOUT, StatusTable, shard_main, table_size
+from torrent_client import CONFIG_DIR
+from torrent_keys import torrent_key
+
+
+DEFAULT_CAPACITY_PER_SHARD = 8192  # 샤드당 최대 토렌트 수 (공유 메모리 레코드 수)
+MONITOR_INTERVAL = 1.0  # 상태 변경 확인 주기 (초)
+SHARDS_DIR = os.path.join(CONFIG_DIR, "shards")  # 샤드별 resume 데이터 (하위 디렉터리 = 샤드 번호)
+
+
+def shard_for(torrent_hash, num_shards):
+    """info 해시로 샤드 번호 결정 (해시는 균등 분포이므로 앞 8자리로 충분)"""
+    return int(torrent_hash[:8], 16) % num_shards
+
+
+def saved_shard_count(shards_dir=SHARDS_DIR):
+    """resume 데이터가 남아 있는 가장 큰 샤드 번호 + 1 (없으면 0)"""
+    try:
+        names = os.listdir(shards_dir)
+    except OSError:
+        return 0
+    count = 0
+    for name in names:
+        path = os.path.join(shards_dir, name)
+        if name.isdigit() and os.path.isdir(path) and any(f.endswith('.fastresume') for f in os.listdir(path)):
+            count = max(count, int(name) + 1)
+    return count
+
+
+class ShardedEngine(QObject):
+    """여러 워커 프로세스의 세션을 하나의 클라이언트처럼 다루는 코디네이터"""
+
+    # TorrentClient와 같은 신호
+    progress_updated = Signal(str, float, float, float, int, int)  # hash, progress, down_rate, up_rate, seeds, peers
+    torrent_added = Signal(str, str)  # hash, name
+    torrent_finished = Signal(str)  # hash
+    security_alert = Signal(str, str)  # type, message
+
+    def __init__(self, num_shards=None, base_port=51413, capacity_per_shard=DEFAULT_CAPACITY_PER_SHARD,
+                 settings=None, download_path=None):
+        super().__init__()
+        # 샤드 수를 줄여도 이전 샤드에 저장된 토렌트는 그 샤드의 워커가 복원해야 함
+        self.num_shards = max(num_shards or max(1, (os.cpu_count() or 2) // 2), saved_shard_count())
+        self.capacity_per_shard = capacity_per_shard
+        self.download_path = download_path or os.path.expanduser("~/Downloads")
+        self.torrents = {}  # hash -> {'shard', 'slot', 'name', 'path'}
+        self.running = True
+
+        # 워커는 PySide6/Qt 상태를 물려받지 않도록 spawn으로 시작
+        context = multiprocessing.get_context('spawn')
+        self.shards = []
+        for index in range(self.num_shards):
+            shm = shared_memory.SharedMemory(create=True, size=table_size(capacity_per_shard))
+            shm.buf[:] = bytes(shm.size)
+            parent_conn, child_conn = context.Pipe()
+            process = context.Process(
+                target=shard_main,
+                args=(index, child_conn, shm.name, capacity_per_shard, base_port + index, settings or {},
+                      os.path.join(SHARDS_DIR, str(index))),
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+
+            shard = {
+                'index': index,
+                'process': process,
+                'conn': parent_conn,
+                'send_lock': threading.Lock(),
+                'shm': shm,
+                'table': StatusTable(shm.buf, capacity_per_shard),
+                'generation': 0,
+                'sequences': {},  # slot -> 마지막으로 본 시퀀스
+            }
+            shard['reader'] = threading.Thread(target=self._read_events, args=(shard,), daemon=True)
+            shard['reader'].start()
+            self.shards.append(shard)
+
+        self.monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
+        self.monitor_thread.start()
+
+    def _send(self, shard_index, *command):
+        shard = self.shards[shard_index]
+        with shard['send_lock']:
+            shard['conn'].send(command)
+
+    def add_torrent(self, torrent_path, download_path=None):
+        """토렌트 파일 추가 (해시로 샤드 선택)"""
+        with open(torrent_path, 'rb') as f:
+            data = f.read()
+        torrent_hash = torrent_key(lt.torrent_info(lt.bdecode(data)).info_hashes())
+        return self._route_add(torrent_hash, {'torrent': data}, download_path)
+
+    def add_magnet_link(self, magnet_uri, download_path=None):
+        """마그넷 링크 추가"""
+        torrent_hash = torrent_key(lt.parse_magnet_uri(magnet_uri).info_hashes)
+        return self._route_add(torrent_hash, {'magnet': magnet_uri}, download_path)
+
+    def _route_add(self, torrent_hash, source, download_path):
+        if torrent_hash in self.torrents:
+            return torrent_hash
+        path = download_path or self.download_path
+        shard_index = shard_for(torrent_hash, self.num_shards)
+        # 슬롯은 워커의 'added' 이벤트에서 채움
+        self.torrents[torrent_hash] = {'shard': shard_index, 'slot': None, 'name': '', 'path': path}
+        self._send(shard_index, 'add', torrent_hash, source, path)
+        return torrent_hash
+
+    def pause_torrent(self, torrent_hash):
+        if torrent_hash in self.torrents:
+            self._send(self.torrents[torrent_hash]['shard'], 'pause', torrent_hash)
+
+    def resume_torrent(self, torrent_hash):
+        if torrent_hash in self.torrents:
+            self._send(self.torrents[torrent_hash]['shard'], 'resume', torrent_hash)
+
+    def remove_torrent(self, torrent_hash, delete_files=False):
+        torrent_data = self.torrents.pop(torrent_hash, None)
+        if torrent_data:
+            self._send(torrent_data['shard'], 'remove', torrent_hash, delete_files)
+
+    def apply_settings(self, settings):
+        """모든 샤드 세션에 설정 적용"""
+        for index in range(self.num_shards):
+            self._send(index, 'settings', settings)
+
+    def get_torrent_status(self, torrent_hash):
+        """토렌트 상태 (공유 메모리에서 바로 읽음)"""
+        torrent_data = self.torrents.get(torrent_hash)
+        if not torrent_data or torrent_data['slot'] is None:
+            return None
+        record = self.shards[torrent_data['shard']]['table'].read(torrent_data['slot'])
+        if record is None or record['key'] != torrent_hash:
+            return None
+        return {
+            'name': torrent_data['name'],
+            'progress': record['progress'],
+            'download_rate': record['download_rate'],
+            'upload_rate': record['upload_rate'],
+            'num_seeds': record['num_seeds'],
+            'num_peers': record['num_peers'],
+            'state': str(lt.torrent_status.states.values.get(record['state'], record['state'])),
+            'completion_state': self._completion_state(record),
+            'total_size': record['total_wanted'],
+        }
+
+    def _completion_state(self, record):
+        """TorrentClient.completion_states와 같은 분류"""
+        if record['error']:
+            return 'error'
+        if record['finished']:
+            return 'finished'
+        if record['paused'] and not record['auto_managed']:
+            return 'paused'
+        return 'pending'
+
+    def snapshot(self):
+        """모든 샤드의 상태 레코드 병합 {hash: 레코드}"""
+        records = {}
+        for torrent_hash, torrent_data in list(self.torrents.items()):
+            if torrent_data['slot'] is None:
+                continue
+            record = self.shards[torrent_data['shard']]['table'].read(torrent_data['slot'])
+            if record is not None and record['key'] == torrent_hash:
+                records[torrent_hash] = record
+        return records
+
+    def get_active_torrent_count(self):
+        """받는 중인 토렌트 수 (사용자 일시정지/오류/완료 제외)"""
+        return sum(1 for record in self.snapshot().values() if self._is_active(record))
+
+    def are_all_torrents_completed(self):
+        """받는 중인 토렌트 없이 완료된 토렌트가 있는지"""
+        records = self.snapshot().values()
+        return (not any(self._is_active(record) for record in records)
+                and any(record['finished'] for record in records))
+
+    def _is_active(self, record):
+        return (not record['finished'] and not record['error']
+                and not (record['paused'] and not record['auto_managed']))
+
+    def get_shard_stats(self):
+        """샤드별 토렌트 수와 프로세스 상태"""
+        counts = [0] * self.num_shards
+        for torrent_data in list(self.torrents.values()):
+            counts[torrent_data['shard']] += 1
+        return [
+            {'index': shard['index'], 'pid': shard['process'].pid,
+             'alive': shard['process'].is_alive(), 'torrents': counts[shard['index']]}
+            for shard in self.shards
+        ]
+
+    def _read_events(self, shard):
+        """워커 이벤트 수신 (샤드별 스레드)"""
+        while self.running:
+            try:
+                event = shard['conn'].recv()
+            except (EOFError, OSError):
+                break
+
+            kind, torrent_hash = event[0], event[1]
+            if kind == 'added':
+                _, _, slot, name = event
+                if torrent_hash in self.torrents:
+                    self.torrents[torrent_hash]['slot'] = slot
+                    self.torrents[torrent_hash]['name'] = name
+                    self.torrent_added.emit(torrent_hash, name)
+            elif kind == 'restored':
+                # 이전 세션의 토렌트 (복원된 샤드에 그대로 둠)
+                _, _, slot, name, path = event
+                self.torrents[torrent_hash] = {'shard': shard['index'], 'slot': slot, 'name': name, 'path': path}
+                self.torrent_added.emit(torrent_hash, name)
+            elif kind == 'metadata':
+                if torrent_hash in self.torrents:
+                    self.torrents[torrent_hash]['name'] = event[2]
+            elif kind == 'finished':
+                self.torrent_finished.emit(torrent_hash)
+            elif kind == 'error':
+                if torrent_hash in self.torrents and self.torrents[torrent_hash]['slot'] is None:
+                    # 추가 실패
+                    del self.torrents[torrent_hash]
+                self.security_alert.emit("ERROR", f"샤드 {shard['index']}: {event[2]}")
+
+    def _monitor_loop(self):
+        """공유 메모리에서 바뀐 레코드만 골라 progress_updated 신호 전송"""
+        while self.running:
+            slots_by_shard = [[] for _ in self.shards]
+            for torrent_data in list(self.torrents.values()):
+                if torrent_data['slot'] is not None:
+                    slots_by_shard[torrent_data['shard']].append(torrent_data['slot'])
+
+            for shard in self.shards:
+                table = shard['table']
+                generation = table.generation()
+                if generation == shard['generation']:
+                    continue
+                shard['generation'] = generation
+
+                sequences = shard['sequences']
+                for slot in slots_by_shard[shard['index']]:
+                    sequence = table.sequence(slot)
+                    if sequences.get(slot, 0) == sequence:
+                        continue
+                    sequences[slot] = sequence
+                    record = table.read(slot)
+                    if record is None or record['key'] not in self.torrents:
+                        continue
+                    self.progress_updated.emit(
+                        record['key'], record['progress'], record['download_rate'],
+                        record['upload_rate'], record['num_seeds'], record['num_peers']
+                    )
+            time.sleep(MONITOR_INTERVAL)
+
+    def stop(self):
+        """워커 종료 및 공유 메모리 해제"""
+        self.running = False
+        for index in range(self.num_shards):
+            try:
+                self._send(index, 'stop')
+            except (BrokenPipeError, OSError):
+                pass
+        for shard in self.shards:
+            # 워커는 종료 전에 resume 데이터를 저장함
+            shard['process'].join(timeout=STOP_SAVE_TIMEOUT + 5)
+            if shard['process'].is_alive():
+                shard['process'].terminate()
+            shard['conn'].close()
+            shard['table'].buffer = None
+            shard['shm'].close()
+            shard['shm'].unlink()
@@ -0,0 +1,206 @@
+"""
+샤딩 모드 창: ShardedEngine으로 토렌트 목록/추가/일시정지/재개/제거와 샤드 상태만 제공
+
+샤드 워커는 토렌트 상태 레코드만 공유하므로 파일/피어/트래커 탭, 속도 제한, 태그,
+스트리밍, 토렌트 생성, 보안/네트워크 설정 등은 이 모드에서 쓸 수 없다.
+"""
+import os
+
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtWidgets import (QMainWindow, QVBoxLayout, QHBoxLayout, QWidget, QPushButton,
+                               QFileDialog, QInputDialog, QMessageBox, QLabel, QHeaderView,
+                               QLineEdit, QComboBox, QTableView)
+
+from sharded_engine import ShardedEngine
+from torrent_list import TorrentListModel, TorrentFilterProxy, ProgressDelegate, COLUMN_PROGRESS, STATE_LABELS
+
+
+STATS_INTERVAL = 2000  # 샤드 상태/합계 갱신 주기 (ms)
+HIDDEN_COLUMNS = (7, 8)  # 비율, 태그 (샤드 레코드에 없음)
+
+
+class ShardedMainWindow(QMainWindow):
+    def __init__(self, num_shards):
+        super().__init__()
+        self.setWindowTitle(f"Simple Torrent Client (샤드 {num_shards}개)")
+        self.setGeometry(100, 100, 1000, 600)
+
+        self.torrent_client = ShardedEngine(num_shards)
+        self.torrent_client.torrent_added.connect(self.on_torrent_added)
+        self.torrent_client.progress_updated.connect(self.on_progress_updated)
+        self.torrent_client.torrent_finished.connect(self.on_torrent_finished)
+        self.torrent_client.security_alert.connect(self.on_security_alert)
+
+        self.setup_ui()
+
+        self.stats_timer = QTimer(self)
+        self.stats_timer.timeout.connect(self.update_statistics)
+        self.stats_timer.start(STATS_INTERVAL)
+
+    def setup_ui(self):
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+        main_layout = QVBoxLayout(central_widget)
+
+        button_layout = QHBoxLayout()
+        for text, slot in (("토렌트 파일 추가", self.add_torrent_file), ("마그넷 링크 추가", self.add_magnet_link),
+                           ("일시정지", self.pause_selected), ("재개", self.resume_selected),
+                           ("제거", self.remove_selected)):
+            button = QPushButton(text)
+            button.clicked.connect(slot)
+            button_layout.addWidget(button)
+        button_layout.addStretch()
+        main_layout.addLayout(button_layout)
+
+        filter_layout = QHBoxLayout()
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("이름 검색")
+        self.search_input.textChanged.connect(self.apply_torrent_filter)
+        filter_layout.addWidget(self.search_input)
+        self.state_filter_combo = QComboBox()
+        self.state_filter_combo.addItem("모든 상태", None)
+        for state, label in STATE_LABELS.items():
+            self.state_filter_combo.addItem(label, state)
+        self.state_filter_combo.currentIndexChanged.connect(self.apply_torrent_filter)
+        filter_layout.addWidget(self.state_filter_combo)
+        self.torrent_count_label = QLabel("0 / 0")
+        filter_layout.addWidget(self.torrent_count_label)
+        main_layout.addLayout(filter_layout)
+
+        self.torrent_model = TorrentListModel(self.format_bytes, self)
+        self.torrent_proxy = TorrentFilterProxy(self.torrent_model, self)
+        self.torrent_model.rowsInserted.connect(self.update_torrent_count)
+        self.torrent_model.rowsRemoved.connect(self.update_torrent_count)
+        self.torrent_proxy.filter_refreshed.connect(self.update_torrent_count)
+
+        self.torrent_table = QTableView()
+        self.torrent_table.setModel(self.torrent_proxy)
+        self.torrent_table.setItemDelegateForColumn(COLUMN_PROGRESS, ProgressDelegate(self.torrent_table))
+        self.torrent_table.setSortingEnabled(True)
+        self.torrent_table.sortByColumn(-1, Qt.AscendingOrder)
+        self.torrent_table.setSelectionBehavior(QTableView.SelectRows)
+        self.torrent_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        for column in HIDDEN_COLUMNS:
+            self.torrent_table.setColumnHidden(column, True)
+        main_layout.addWidget(self.torrent_table)
+
+        self.shard_label = QLabel()
+        main_layout.addWidget(self.shard_label)
+        self.status_bar = self.statusBar()
+
+    def format_bytes(self, bytes_value):
+        """바이트를 읽기 쉬운 형태로 변환"""
+        if bytes_value == 0:
+            return "0 B"
+        units = ['B', 'KB', 'MB', 'GB', 'TB']
+        unit_index = 0
+        while bytes_value >= 1024 and unit_index < len(units) - 1:
+            bytes_value /= 1024
+            unit_index += 1
+        return f"{bytes_value:.1f} {units[unit_index]}"
+
+    def selected_torrent_hashes(self):
+        rows = sorted({index.row() for index in self.torrent_table.selectionModel().selectedRows()})
+        return [h for h in map(self.torrent_proxy.hash_at, rows) if h]
+
+    def add_torrent_file(self):
+        """토렌트 파일 추가"""
+        torrent_file, _ = QFileDialog.getOpenFileName(self, "토렌트 파일 선택", "", "Torrent Files (*.torrent)")
+        if not torrent_file:
+            return
+        download_path = QFileDialog.getExistingDirectory(self, "다운로드 경로 선택", os.path.expanduser("~/Downloads"))
+        if not download_path:
+            return
+        try:
+            self.torrent_client.add_torrent(torrent_file, download_path)
+        except Exception as e:
+            QMessageBox.warning(self, "오류", f"토렌트 파일을 추가할 수 없습니다.\n{e}")
+            return
+        self.status_bar.showMessage(f"토렌트가 추가되었습니다: {os.path.basename(torrent_file)}")
+
+    def add_magnet_link(self):
+        """마그넷 링크 추가"""
+        magnet_uri, ok = QInputDialog.getText(self, "마그넷 링크 추가", "마그넷 링크를 입력하세요:")
+        if not ok or not magnet_uri:
+            return
+        download_path = QFileDialog.getExistingDirectory(self, "다운로드 경로 선택", os.path.expanduser("~/Downloads"))
+        if not download_path:
+            return
+        try:
+            self.torrent_client.add_magnet_link(magnet_uri, download_path)
+        except Exception as e:
+            QMessageBox.warning(self, "오류", f"마그넷 링크를 추가할 수 없습니다.\n{e}")
+            return
+        self.status_bar.showMessage("마그넷 링크가 추가되었습니다.")
+
+    def pause_selected(self):
+        for torrent_hash in self.selected_torrent_hashes():
+            self.torrent_client.pause_torrent(torrent_hash)
+
+    def resume_selected(self):
+        for torrent_hash in self.selected_torrent_hashes():
+            self.torrent_client.resume_torrent(torrent_hash)
+
+    def remove_selected(self):
+        """선택된 토렌트 제거"""
+        torrent_hashes = self.selected_torrent_hashes()
+        if not torrent_hashes:
+            return
+        reply = QMessageBox.question(
+            self, "토렌트 제거",
+            f"토렌트 {len(torrent_hashes)}개를 제거하시겠습니까?\n\n파일도 함께 삭제하시겠습니까?",
+            QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel
+        )
+        if reply == QMessageBox.Cancel:
+            return
+        for torrent_hash in torrent_hashes:
+            self.torrent_client.remove_torrent(torrent_hash, reply == QMessageBox.Yes)
+        self.torrent_model.remove_torrents(torrent_hashes)
+        self.status_bar.showMessage(f"토렌트 {len(torrent_hashes)}개를 제거했습니다.")
+
+    def on_torrent_added(self, torrent_hash, name):
+        self.torrent_model.add_torrent(torrent_hash, name)
+        self.torrent_proxy.note_changed(self.torrent_model.search_index.FACETS)
+
+    def on_progress_updated(self, torrent_hash, progress, down_rate, up_rate, seeds, peers):
+        status = self.torrent_client.get_torrent_status(torrent_hash)
+        if status:
+            changed = self.torrent_model.update_torrent(
+                torrent_hash, name=status['name'], progress=progress, download_rate=down_rate,
+                upload_rate=up_rate, num_seeds=seeds, num_peers=peers, state=status['completion_state'],
+            )
+            if changed:
+                self.torrent_proxy.note_changed(changed)
+
+    def on_torrent_finished(self, torrent_hash):
+        changed = self.torrent_model.update_torrent(torrent_hash, state='finished')
+        self.torrent_proxy.note_changed(changed)
+        self.status_bar.showMessage("토렌트 다운로드가 완료되었습니다!")
+
+    def on_security_alert(self, event_type, message):
+        self.status_bar.showMessage(f"[{event_type}] {message}")
+
+    def apply_torrent_filter(self):
+        self.torrent_proxy.set_criteria(text=self.search_input.text(), state=self.state_filter_combo.currentData())
+
+    def update_torrent_count(self):
+        self.torrent_count_label.setText(f"{self.torrent_proxy.rowCount()} / {self.torrent_model.rowCount()}")
+
+    def update_statistics(self):
+        """샤드별 토렌트 수/프로세스 상태와 전체 속도"""
+        records = self.torrent_client.snapshot().values()
+        download = sum(record['download_rate'] for record in records)
+        upload = sum(record['upload_rate'] for record in records)
+        shards = ", ".join(
+            f"#{s['index']} {s['torrents']}개{'' if s['alive'] else ' (중지됨)'}"
+            for s in self.torrent_client.get_shard_stats()
+        )
+        self.shard_label.setText(
+            f"샤드: {shards}  |  ↓ {self.format_bytes(download)}/s  ↑ {self.format_bytes(upload)}/s"
+        )
+
+    def closeEvent(self, event):
+        """앱 종료 시 워커 정리 (워커가 resume 데이터를 저장함)"""
+        self.stats_timer.stop()
+        self.torrent_client.stop()
+        event.accept()
@@ -0,0 +1,311 @@
+"""
+다운로드 중인 토렌트 파일을 Range 요청으로 제공하는 로컬 HTTP 서버
+"""
+import asyncio
+import mimetypes
+import os
+import re
+import threading
+from urllib.parse import quote, unquote
+
+from streaming import DEFAULT_WINDOW_PIECES, file_piece_range, set_piece_deadlines
+
+
+RANGE_SPEC = re.compile(r'\s*([0-9]*)\s*-\s*([0-9]*)\s*')
+
+STATUS_TEXT = {
+    200: 'OK',
+    206: 'Partial Content',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    416: 'Range Not Satisfiable',
+}
+
+
+def parse_range(range_header, size):
+    """Range 헤더 파싱, (start, end) 또는 None(전체) 반환. 만족 불가 시 ValueError
+
+    형식이 잘못된 헤더는 RFC 7233에 따라 무시하고 전체를 응답한다.
+    """
+    if not range_header:
+        return None
+
+    unit, _, spec = range_header.partition('=')
+    if unit.strip().lower() != 'bytes' or ',' in spec:
+        # 단일 바이트 범위만 지원, 나머지는 전체 응답
+        return None
+
+    match = RANGE_SPEC.fullmatch(spec)
+    if match is None or not any(match.groups()):
+        return None
+
+    start_text, end_text = match.groups()
+    if not start_text:
+        # bytes=-N (마지막 N 바이트)
+        suffix = int(end_text)
+        if suffix == 0 or size == 0:
+            raise ValueError("빈 범위")
+        return max(0, size - suffix), size - 1
+
+    start = int(start_text)
+    end = int(end_text) if end_text else size - 1
+    if end_text and end < start:
+        # 끝이 시작보다 앞서는 범위는 잘못된 형식
+        return None
+    if start >= size:
+        raise ValueError("범위를 만족할 수 없음")
+    return start, min(end, size - 1)
+
+
+class StreamServer:
+    """단일 스레드 asyncio 기반 루프백 HTTP Range 서버"""
+
+    def __init__(self, client, host='127.0.0.1', port=0,
+                 window_pieces=DEFAULT_WINDOW_PIECES, piece_timeout=120):
+        self.client = client
+        self.host = host
+        self.port = port
+        self.window_pieces = window_pieces
+        self.piece_timeout = piece_timeout
+
+        self.loop = None
+        self._server = None
+        self._piece_events = {}  # hash -> asyncio.Event (피스 도착 시 교체)
+        self._writers = set()  # 열린 연결 (종료 시 정리)
+        self._started = threading.Event()
+        self._start_error = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        """서버 스레드 시작 (바인딩 완료까지 대기)"""
+        self.thread.start()
+        self._started.wait()
+        if self._start_error:
+            raise self._start_error
+
+    def stop(self):
+        """서버 종료"""
+        if self.loop and self.loop.is_running():
+            try:
+                asyncio.run_coroutine_threadsafe(self._shutdown(), self.loop).result(timeout=5)
+            finally:
+                self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=5)
+
+    def url_for(self, torrent_hash, file_index, file_path=''):
+        """파일 스트리밍 URL 반환"""
+        name = quote(os.path.basename(file_path)) if file_path else ''
+        return f"http://{self.host}:{self.port}/{torrent_hash}/{file_index}/{name}"
+
+    def notify_piece(self, torrent_hash, piece_index):
+        """피스 완료 알림 (알림 처리 스레드에서 호출)"""
+        if self.loop and self.loop.is_running():
+            self.loop.call_soon_threadsafe(self._wake, torrent_hash)
+
+    def _wake(self, torrent_hash):
+        event = self._piece_events.pop(torrent_hash, None)
+        if event:
+            event.set()
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            self._server = self.loop.run_until_complete(
+                asyncio.start_server(self._handle_connection, self.host, self.port)
+            )
+            self.port = self._server.sockets[0].getsockname()[1]
+        except Exception as e:
+            self._start_error = e
+            self._started.set()
+            self.loop.close()
+            return
+
+        self._started.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.close()
+
+    async def _shutdown(self):
+        self._server.close()
+        for writer in list(self._writers):
+            writer.close()
+        await self._server.wait_closed()
+
+    async def _handle_connection(self, reader, writer):
+        """연결 처리 (keep-alive 지원)"""
+        self._writers.add(writer)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+
+                method, target, version = request_line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = (version == 'HTTP/1.1' and
+                              headers.get('connection', '').lower() != 'close')
+                if not await self._serve(method, unquote(target), headers, writer, keep_alive):
+                    break
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            print(f"스트리밍 서버 오류: {e}")
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    def _write_head(self, writer, status, headers, keep_alive):
+        lines = [f"HTTP/1.1 {status} {STATUS_TEXT[status]}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+
+    def _write_error(self, writer, status, keep_alive, extra_headers=None):
+        headers = {'Content-Length': '0'}
+        headers.update(extra_headers or {})
+        self._write_head(writer, status, headers, keep_alive)
+
+    def _resolve(self, target):
+        """/<hash>/<file_index>[/이름] 경로를 (hash, handle, torrent_info, file_index) 로 변환"""
+        parts = target.split('?', 1)[0].strip('/').split('/')
+        if len(parts) < 2 or parts[0] not in self.client.torrents:
+            return None
+
+        handle = self.client.torrents[parts[0]]['handle']
+        if not handle.status().has_metadata:
+            return None
+
+        torrent_info = handle.torrent_file()
+        file_index = int(parts[1])
+        if not 0 <= file_index < torrent_info.files().num_files():
+            return None
+        return parts[0], handle, torrent_info, file_index
+
+    async def _serve(self, method, target, headers, writer, keep_alive):
+        """요청 하나 처리, 연결을 계속 쓸 수 있으면 True 반환"""
+        if method not in ('GET', 'HEAD'):
+            self._write_error(writer, 405, keep_alive, {'Allow': 'GET, HEAD'})
+            await writer.drain()
+            return True
+
+        try:
+            # handle.status()/torrent_file()은 libtorrent 스레드를 기다리므로 루프 밖에서
+            resolved = await self.loop.run_in_executor(None, self._resolve, target)
+        except ValueError:
+            resolved = None
+        if resolved is None:
+            self._write_error(writer, 404, keep_alive)
+            await writer.drain()
+            return True
+
+        torrent_hash, handle, torrent_info, file_index = resolved
+        files = torrent_info.files()
+        size = files.file_size(file_index)
+        path = os.path.join(self.client.torrents[torrent_hash]['path'], files.file_path(file_index))
+
+        try:
+            byte_range = parse_range(headers.get('range'), size)
+        except ValueError:
+            self._write_error(writer, 416, keep_alive, {'Content-Range': f"bytes */{size}"})
+            await writer.drain()
+            return True
+
+        start, end = byte_range if byte_range else (0, size - 1)
+        response_headers = {
+            'Content-Type': mimetypes.guess_type(path)[0] or 'application/octet-stream',
+            'Accept-Ranges': 'bytes',
+            'Content-Length': str(max(0, end - start + 1)),
+        }
+        if byte_range:
+            response_headers['Content-Range'] = f"bytes {start}-{end}/{size}"
+        self._write_head(writer, 206 if byte_range else 200, response_headers, keep_alive)
+        await writer.drain()
+
+        if method == 'HEAD' or size == 0:
+            return True
+
+        # 범위에 필요한 피스가 없으면 우선순위를 올려 받음
+        if handle.file_priority(file_index) == 0:
+            handle.file_priority(file_index, 4)
+        return await self._send_range(torrent_hash, handle, torrent_info, file_index,
+                                      path, start, end, writer)
+
+    async def _send_range(self, torrent_hash, handle, torrent_info, file_index, path, start, end, writer):
+        """피스가 도착하는 대로 파일 범위를 sendfile로 전송"""
+        first_piece, last_piece = file_piece_range(torrent_info, file_index, start, end - start + 1)
+        scheduled = set()
+        position = start
+        piece = first_piece
+
+        try:
+            # 파일은 첫 피스가 기록된 뒤에야 디스크에 생김
+            scheduled.update(set_piece_deadlines(
+                handle, piece, min(piece + self.window_pieces - 1, last_piece)))
+            if not await self._wait_piece(torrent_hash, handle, piece):
+                return False
+
+            with open(path, 'rb') as f:
+                while position <= end:
+                    # 현재 위치부터 윈도우 범위에 데드라인 설정
+                    window_end = min(piece + self.window_pieces - 1, last_piece)
+                    scheduled.update(set_piece_deadlines(handle, piece, window_end))
+
+                    if not await self._wait_piece(torrent_hash, handle, piece):
+                        return False
+
+                    # 이미 받은 연속 피스는 한 번에 전송
+                    available = piece
+                    while available < last_piece and handle.have_piece(available + 1):
+                        available += 1
+
+                    if available == last_piece:
+                        chunk_end = end
+                    else:
+                        next_start = torrent_info.map_file(file_index, position, 1)
+                        # 다음 미수신 피스 시작 직전까지
+                        chunk_end = position + (available - int(next_start.piece) + 1) * torrent_info.piece_length() \
+                            - next_start.start - 1
+                        chunk_end = min(chunk_end, end)
+
+                    count = chunk_end - position + 1
+                    await self.loop.sendfile(writer.transport, f, position, count)
+                    position += count
+                    piece = available + 1
+            return True
+        finally:
+            for pending in scheduled:
+                try:
+                    if not handle.have_piece(pending):
+                        handle.reset_piece_deadline(pending)
+                except Exception:
+                    pass
+
+    async def _wait_piece(self, torrent_hash, handle, piece):
+        """피스 수신 대기 (스레드를 점유하지 않음)"""
+        deadline = self.loop.time() + self.piece_timeout
+        while not handle.have_piece(piece):
+            if torrent_hash not in self.client.torrents:
+                return False
+            remaining = deadline - self.loop.time()
+            if remaining <= 0:
+                return False
+
+            event = self._piece_events.get(torrent_hash)
+            if event is None:
+                event = self._piece_events[torrent_hash] = asyncio.Event()
+            try:
+                await asyncio.wait_for(event.wait(), min(1.0, remaining))
+            except asyncio.TimeoutError:
+                pass
+        return True
@@ -0,0 +1,131 @@
+"""
+토렌트 내부 파일 스트리밍 읽기 (순차 다운로드 + 피스 데드라인)
+"""
+import io
+import os
+
+
+DEFAULT_WINDOW_PIECES = 8  # 읽기 위치 앞쪽으로 데드라인을 걸 피스 수
+DEADLINE_STEP_MS = 200  # 윈도우 내 피스 간 데드라인 간격 (ms)
+
+
+def file_piece_range(torrent_info, file_index, offset, length):
+    """파일 내 바이트 범위가 걸친 피스 범위 (first, last) 반환"""
+    file_size = torrent_info.files().file_size(file_index)
+    if length <= 0 or offset >= file_size:
+        return None
+
+    length = min(length, file_size - offset)
+    first = torrent_info.map_file(file_index, offset, 1).piece
+    last = torrent_info.map_file(file_index, offset + length - 1, 1).piece
+    return int(first), int(last)
+
+
+def set_piece_deadlines(handle, first, last, base_ms=0, step_ms=DEADLINE_STEP_MS):
+    """아직 없는 피스에 순서대로 데드라인 설정, 설정한 피스 목록 반환"""
+    scheduled = []
+    for i, piece in enumerate(range(first, last + 1)):
+        if not handle.have_piece(piece):
+            handle.set_piece_deadline(piece, base_ms + i * step_ms)
+            scheduled.append(piece)
+    return scheduled
+
+
+class TorrentFileReader(io.RawIOBase):
+    """다운로드 중인 토렌트 파일을 읽는 파일 객체 (피스 도착까지 블로킹)"""
+
+    def __init__(self, client, torrent_hash, file_index,
+                 window_pieces=DEFAULT_WINDOW_PIECES, timeout=None):
+        super().__init__()
+        torrent_data = client.torrents[torrent_hash]
+        self.client = client
+        self.torrent_hash = torrent_hash
+        self.handle = torrent_data['handle']
+        self.torrent_info = self.handle.torrent_file()
+        self.file_index = file_index
+        self.window_pieces = max(1, window_pieces)
+        self.timeout = timeout
+
+        files = self.torrent_info.files()
+        self.size = files.file_size(file_index)
+        self.path = os.path.join(torrent_data['path'], files.file_path(file_index))
+        self.piece_length = self.torrent_info.piece_length()
+
+        self._position = 0
+        self._file = None
+        self._deadline_pieces = set()
+        self._last_piece = None
+        if self.size > 0:
+            self._last_piece = file_piece_range(self.torrent_info, file_index, self.size - 1, 1)[1]
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self.size + offset
+        else:
+            raise ValueError(f"지원하지 않는 whence 값: {whence}")
+
+        if position < 0:
+            raise ValueError("음수 위치로 이동할 수 없습니다")
+        self._position = position
+        return position
+
+    def readinto(self, buffer):
+        if self.closed:
+            raise ValueError("닫힌 스트림입니다")
+        if self._position >= self.size:
+            return 0
+
+        # 한 번에 현재 피스 끝까지만 읽음 (다음 피스 대기 없이 바로 반환)
+        request = self.torrent_info.map_file(self.file_index, self._position, 1)
+        piece = int(request.piece)
+        left_in_piece = self.torrent_info.piece_size(piece) - request.start
+        length = min(len(buffer), self.size - self._position, left_in_piece)
+
+        self._slide_window(piece)
+        if not self.client.wait_for_piece(self.torrent_hash, piece, self.timeout):
+            raise TimeoutError(f"피스 {piece} 수신 대기 시간 초과")
+
+        if self._file is None:
+            self._file = open(self.path, 'rb')
+        self._file.seek(self._position)
+        read = self._file.readinto(memoryview(buffer)[:length])
+        self._position += read
+        return read
+
+    def _slide_window(self, piece):
+        """읽기 위치 기준으로 데드라인 윈도우 이동"""
+        last = min(piece + self.window_pieces - 1, self._last_piece)
+        window = set(range(piece, last + 1))
+
+        # 윈도우를 벗어난 피스의 데드라인 해제
+        for stale in self._deadline_pieces - window:
+            if not self.handle.have_piece(stale):
+                self.handle.reset_piece_deadline(stale)
+        self._deadline_pieces = set(set_piece_deadlines(self.handle, piece, last))
+
+    def close(self):
+        if not self.closed:
+            try:
+                for piece in self._deadline_pieces:
+                    if not self.handle.have_piece(piece):
+                        self.handle.reset_piece_deadline(piece)
+            except Exception as e:
+                print(f"피스 데드라인 해제 오류: {e}")
+            self._deadline_pieces.clear()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        super().close()
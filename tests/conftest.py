@@ -0,0 +1,26 @@
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+# 클라이언트 테스트가 실제 ~/.ltorrent를 건드리지 않도록 (torrent_client는 불러올 때 경로를 정함)
+os.environ['HOME'] = tempfile.mkdtemp(prefix='ltorrent-test-home-')
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def client():
+    """실제 libtorrent 세션을 쓰는 TorrentClient (테스트 HOME 아래 설정)"""
+    pytest.importorskip('libtorrent')
+    pytest.importorskip('PySide6')
+    from torrent_client import TorrentClient
+
+    client = TorrentClient()
+    yield client
+    client.stop()
+    # 다음 테스트가 이 테스트의 설정/resume 데이터를 불러오지 않도록
+    shutil.rmtree(os.path.expanduser('~/.ltorrent'), ignore_errors=True)
@@ -0,0 +1,66 @@
+import os
+import time
+
+import pytest
+
+pytest.importorskip('libtorrent')
+pytest.importorskip('PySide6')
+
+from completion_actions import ActionError
+from torrent_creator import TorrentCreator
+
+
+PIECE = 16 * 1024
+
+
+def wait_for(predicate, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def seed(client, tmp_path, pieces=4):
+    """완전한 데이터로 v1 토렌트를 추가해 시드 상태와 resume 기록까지 기다림"""
+    content = tmp_path / 'data.bin'
+    content.write_bytes(os.urandom(pieces * PIECE))
+    torrent_path = tmp_path / 'data.torrent'
+    torrent_path.write_bytes(TorrentCreator(str(content), 'v1', piece_size=PIECE).create())
+
+    torrent_hash = client.add_torrent(str(torrent_path), str(tmp_path))
+    assert wait_for(lambda: client.torrents[torrent_hash]['handle'].status().is_seeding)
+    client.request_resume_save(torrent_hash)
+    assert wait_for(lambda: client._load_resume_record(torrent_hash) is not None)
+    return torrent_hash, content
+
+
+def test_verify_passes_intact_data(client, tmp_path):
+    torrent_hash, _ = seed(client, tmp_path)
+    handle = client.torrents[torrent_hash]['handle']
+    assert client.completion_pipeline._verify(torrent_hash, handle, str(tmp_path)) == "검증 통과"
+
+
+def test_verify_failure_downloads_corrupted_piece_again(client, tmp_path):
+    torrent_hash, content = seed(client, tmp_path)
+    # 파일 식별 정보(크기)는 그대로 두고 피스 2의 내용만 바꿈
+    with open(content, 'r+b') as f:
+        f.seek(2 * PIECE + 100)
+        byte = f.read(1)
+        f.seek(-1, os.SEEK_CUR)
+        f.write(bytes([byte[0] ^ 0xff]))
+
+    handle = client.torrents[torrent_hash]['handle']
+    with pytest.raises(ActionError) as error:
+        client.completion_pipeline._verify(torrent_hash, handle, str(tmp_path))
+    assert not error.value.retry
+
+    def wants_piece_again():
+        handle = client.torrents[torrent_hash]['handle']
+        status = handle.status()
+        return (not handle.have_piece(2) and all(handle.have_piece(p) for p in (0, 1, 3))
+                and not status.is_seeding and status.progress < 1)
+
+    assert wait_for(wants_piece_again)
+    assert client.get_torrent_status(torrent_hash)['completion_state'] == 'pending'
@@ -0,0 +1,118 @@
+import ipaddress
+
+import pytest
+
+from lan_peers import DEFAULT_LAN_RANGES, LanRanges, PeerTraffic, parse_lan_ranges
+
+
+def test_range_edges():
+    ranges = LanRanges(['192.168.0.0/16', '10.1.2.3'])
+    assert ranges.contains('192.168.0.0')
+    assert ranges.contains('192.168.255.255')
+    assert not ranges.contains('192.167.255.255')
+    assert not ranges.contains('192.169.0.0')
+    assert ranges.contains('10.1.2.3')
+    assert not ranges.contains('10.1.2.2')
+    assert not ranges.contains('10.1.2.4')
+    assert not ranges.contains('0.0.0.0')
+    assert not ranges.contains('255.255.255.255')
+
+
+def test_overlapping_and_adjacent_ranges_merge():
+    ranges = LanRanges(['10.0.0.50-10.0.1.0', '10.0.0.0-10.0.0.100', '10.0.1.1-10.0.1.9', '10.0.2.0/24'])
+    assert ranges._ranges[4] == [
+        [int(ipaddress.ip_address('10.0.0.0')), int(ipaddress.ip_address('10.0.1.9'))],
+        [int(ipaddress.ip_address('10.0.2.0')), int(ipaddress.ip_address('10.0.2.255'))],
+    ]
+    for address in ('10.0.0.0', '10.0.0.75', '10.0.1.0', '10.0.1.9', '10.0.2.128'):
+        assert ranges.contains(address), address
+    for address in ('10.0.1.10', '10.0.1.255', '10.0.3.0'):
+        assert not ranges.contains(address), address
+
+
+def test_nested_range_does_not_shrink_outer():
+    ranges = LanRanges(['10.0.0.0/8', '10.5.0.0/16'])
+    assert ranges.contains('10.200.0.1')
+
+
+def test_ipv6_ranges_are_separate_from_ipv4():
+    ranges = LanRanges(DEFAULT_LAN_RANGES)
+    assert ranges.contains('fe80::1')
+    assert ranges.contains('fd12:3456::1')
+    assert ranges.contains(ipaddress.ip_address('febf:ffff:ffff:ffff:ffff:ffff:ffff:ffff'))
+    assert not ranges.contains('fec0::')
+    assert not ranges.contains('2001:db8::1')
+    assert ranges.contains('172.31.255.255')
+    assert not ranges.contains('172.32.0.0')
+
+    # IPv4 구간만 있으면 IPv6 주소는 없음 (같은 정수라도)
+    only_v4 = LanRanges(['0.0.0.0-0.0.0.255'])
+    assert only_v4.contains('0.0.0.1')
+    assert not only_v4.contains('::1')
+
+
+def test_invalid_addresses_and_empty_ranges():
+    ranges = LanRanges([])
+    assert not ranges
+    assert not ranges.contains('10.0.0.1')
+    assert not LanRanges(['10.0.0.0/8']).contains('not an address')
+
+
+def test_parse_lan_ranges():
+    assert parse_lan_ranges([' 10.0.0.0/8 ', '', 'fe80::/10']) == ['10.0.0.0/8', 'fe80::/10']
+    with pytest.raises(ValueError):
+        parse_lan_ranges(['10.0.0.0/33'])
+
+
+def is_local(ip):
+    return ip.startswith('10.')
+
+
+def test_peer_traffic_counts_deltas_of_local_peers():
+    traffic = PeerTraffic()
+    # 처음 보는 피어는 누적값 전체
+    assert traffic.sample('t', [('10.0.0.1', 1, 100, 50), ('8.8.8.8', 1, 999, 999)], is_local) == 1
+    assert traffic.totals() == (100, 50)
+
+    traffic.sample('t', [('10.0.0.1', 1, 180, 50), ('10.0.0.2', 2, 30, 5)], is_local)
+    assert traffic.totals() == (210, 55)
+    assert traffic.peer_count() == 2
+
+
+def test_peer_traffic_reconnect_with_lower_counters():
+    traffic = PeerTraffic()
+    traffic.sample('t', [('10.0.0.1', 1, 1000, 1000)], is_local)
+    # 다시 연결돼 누적값이 처음부터: 차이가 아닌 새 누적값 전체를 더함
+    traffic.sample('t', [('10.0.0.1', 1, 40, 1200)], is_local)
+    assert traffic.totals() == (1040, 1200)
+
+
+def test_peer_traffic_same_ip_different_port_is_separate_peer():
+    traffic = PeerTraffic()
+    traffic.sample('t', [('10.0.0.1', 1, 100, 0)], is_local)
+    traffic.sample('t', [('10.0.0.1', 1, 100, 0), ('10.0.0.1', 2, 100, 0)], is_local)
+    assert traffic.totals() == (200, 0)
+
+
+def test_peer_traffic_retain_and_forget():
+    traffic = PeerTraffic()
+    traffic.sample('a', [('10.0.0.1', 1, 100, 0)], is_local)
+    traffic.sample('b', [('10.0.0.2', 1, 100, 0), ('10.0.0.3', 1, 0, 0)], is_local)
+    assert traffic.peer_count() == 3
+
+    # 멈춘 토렌트는 피어 수에서 빠지지만 누적값은 남아 재개 후 차이만 더함
+    traffic.retain(['b'])
+    assert traffic.peer_count() == 2
+    traffic.sample('a', [('10.0.0.1', 1, 150, 0)], is_local)
+    assert traffic.totals() == (250, 0)
+    assert traffic.peer_count() == 3
+
+    # 제거한 토렌트는 다시 보면 처음부터
+    traffic.forget('a')
+    assert traffic.peer_count() == 2
+    traffic.sample('a', [('10.0.0.1', 1, 150, 0)], is_local)
+    assert traffic.totals() == (400, 0)
+
+    # LAN 피어가 없어지면 기록도 정리
+    traffic.sample('b', [('8.8.8.8', 1, 10, 10)], is_local)
+    assert traffic.peer_count() == 1
@@ -0,0 +1,118 @@
+import hashlib
+
+import pytest
+
+from merkle import BLOCK_SIZE, ZERO_HASH, MerkleBuilder, block_hashes, file_pieces_root, merkle_root, pad_hash
+
+
+PIECE = 32 * 1024
+
+# libtorrent(create_torrent, v2, 32 KiB 피스)가 같은 입력으로 만든 pieces root
+KNOWN_ROOTS = {
+    BLOCK_SIZE: '4348e3b98e8a327b34ced39c1da9e67cdb4cd5e48e4d7960607a3ae403d35f0c',
+    1000: '4e4c294b331f7a2099a379bec34b9f9fc03dc46ab465d998f4d683da53487e6d',
+    PIECE + 1000: '3c0be9d7d78f54b8f7b38dd2083c6ef8b6f788d53fb1cafeb71bcf016a018b9a',
+    100000: '505fc9a922f60ae071450b07256a4ba760612bffc38c27584ed03fd96c69841b',
+}
+
+
+def sha256(data):
+    return hashlib.sha256(data).digest()
+
+
+def pattern(size):
+    return bytes(i % 251 for i in range(size))
+
+
+def write(tmp_path, size):
+    path = tmp_path / 'data.bin'
+    path.write_bytes(pattern(size))
+    return str(path)
+
+
+def test_single_block_root_is_block_hash(tmp_path):
+    data = pattern(BLOCK_SIZE)
+    assert file_pieces_root(write(tmp_path, BLOCK_SIZE), BLOCK_SIZE) == sha256(data)
+    assert sha256(data).hex() == KNOWN_ROOTS[BLOCK_SIZE]
+
+
+def test_short_block_is_hashed_without_padding(tmp_path):
+    # 마지막 블록은 0으로 채우지 않고 있는 그대로 해싱
+    assert file_pieces_root(write(tmp_path, 1000), 1000) == sha256(pattern(1000))
+    assert sha256(pattern(1000)).hex() == KNOWN_ROOTS[1000]
+
+
+def test_partial_last_piece(tmp_path):
+    size = PIECE + 1000
+    data = pattern(size)
+    h0, h1, h2 = (sha256(data[i:i + BLOCK_SIZE]) for i in range(0, size, BLOCK_SIZE))
+    # 블록 3개 -> 리프 4개로 채움 (빈 리프는 0 해시)
+    expected = sha256(sha256(h0 + h1) + sha256(h2 + ZERO_HASH))
+    assert file_pieces_root(write(tmp_path, size), size) == expected
+    assert expected.hex() == KNOWN_ROOTS[size]
+
+
+def test_file_larger_than_one_piece(tmp_path):
+    size = 100000
+    assert file_pieces_root(write(tmp_path, size), size).hex() == KNOWN_ROOTS[size]
+    assert merkle_root(block_hashes(pattern(size))).hex() == KNOWN_ROOTS[size]
+
+
+def test_empty_file_has_no_root(tmp_path):
+    assert file_pieces_root(write(tmp_path, 0), 0) is None
+
+
+def test_pad_hash_levels():
+    assert pad_hash(0) == ZERO_HASH
+    assert pad_hash(2) == sha256(sha256(ZERO_HASH * 2) * 2)
+
+
+def test_builder_matches_explicit_tree_for_every_leaf_count():
+    leaves = [sha256(bytes([i])) for i in range(9)]
+    for count in range(1, len(leaves) + 1):
+        layer = leaves[:count]
+        width = 1 << (count - 1).bit_length()
+        layer = layer + [ZERO_HASH] * (width - count)
+        level = 0
+        while len(layer) > 1:
+            layer = [sha256(layer[i] + layer[i + 1]) for i in range(0, len(layer), 2)]
+            level += 1
+        assert merkle_root(leaves[:count]) == layer[0], count
+
+
+def test_root_pads_up_to_requested_leaf_count():
+    builder = MerkleBuilder()
+    leaf = sha256(b'leaf')
+    builder.add_leaf(leaf)
+    assert builder.root() == leaf
+    assert builder.root(4) == sha256(sha256(leaf + ZERO_HASH) + pad_hash(1))
+    assert MerkleBuilder().root() is None
+
+
+def test_hybrid_pads_align_files_and_hash_zeros(tmp_path):
+    lt = pytest.importorskip('libtorrent')
+    from torrent_creator import TorrentCreator, is_pad_file, read_torrent_range
+
+    content = tmp_path / 'content'
+    content.mkdir()
+    sizes = {'a.bin': 20000, 'b.bin': 50000, 'c.bin': 3000}
+    for name, size in sizes.items():
+        (content / name).write_bytes(pattern(size))
+
+    info = lt.torrent_info(lt.bdecode(TorrentCreator(str(content), 'hybrid', piece_size=PIECE).create()))
+    files = info.files()
+    real = [i for i in range(files.num_files()) if not is_pad_file(files, i)]
+    pads = [i for i in range(files.num_files()) if is_pad_file(files, i)]
+    assert sorted(files.file_name(i) for i in real) == sorted(sizes)
+    assert pads
+
+    # 모든 실제 파일은 피스 경계에서 시작하고 v2 루트가 파일 내용과 일치
+    for i in real:
+        assert files.file_offset(i) % PIECE == 0
+        path = tmp_path / files.file_path(i)
+        assert file_pieces_root(str(path), files.file_size(i)) == files.root(i).to_bytes()
+
+    # v1 피스 해시는 패딩을 0으로 채운 데이터 기준
+    for piece in range(info.num_pieces()):
+        data = read_torrent_range(files, str(tmp_path), piece, info.piece_size(piece))
+        assert hashlib.sha1(data).digest() == bytes(info.hash_for_piece(piece))
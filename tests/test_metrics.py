@@ -0,0 +1,54 @@
+from metrics import MetricsRegistry
+
+
+def test_render_exposition_format():
+    registry = MetricsRegistry()
+    registry.declare('ltorrent_peers', 'gauge', 'Connected peers')
+    registry.declare('ltorrent_alerts_total', 'counter')
+    registry.set('ltorrent_peers', 12)
+    registry.inc('ltorrent_alerts_total', labels={'type': 'error'})
+    registry.inc('ltorrent_alerts_total', 2, labels={'type': 'error'})
+
+    lines = registry.render().splitlines()
+    assert lines == [
+        '# TYPE ltorrent_alerts_total counter',
+        'ltorrent_alerts_total{type="error"} 3',
+        '# HELP ltorrent_peers Connected peers',
+        '# TYPE ltorrent_peers gauge',
+        'ltorrent_peers 12',
+    ]
+
+
+def test_render_escapes_labels_and_help():
+    registry = MetricsRegistry()
+    registry.declare('ltorrent_torrent_ratio', 'gauge', 'Ratio per torrent\nback\\slash')
+    registry.set('ltorrent_torrent_ratio', 1.5, labels={'name': 'a "b"\\c\nd', 'hash': 'ab'})
+
+    text = registry.render()
+    assert '# HELP ltorrent_torrent_ratio Ratio per torrent\\nback\\\\slash\n' in text
+    # 라벨은 이름순, 값의 역슬래시/큰따옴표/줄바꿈은 이스케이프
+    assert 'ltorrent_torrent_ratio{hash="ab",name="a \\"b\\"\\\\c\\nd"} 1.5\n' in text
+    assert len(text.splitlines()) == 3
+
+
+def test_render_histogram_is_cumulative():
+    registry = MetricsRegistry()
+    registry.declare('ltorrent_tick_seconds', 'histogram', 'Tick duration')
+    for value in (0.0005, 0.003, 0.003, 5.0):
+        registry.observe('ltorrent_tick_seconds', value)
+
+    lines = registry.render().splitlines()
+    assert 'ltorrent_tick_seconds_bucket{le="0.001"} 1' in lines
+    assert 'ltorrent_tick_seconds_bucket{le="0.005"} 3' in lines
+    assert 'ltorrent_tick_seconds_bucket{le="2.5"} 3' in lines
+    assert 'ltorrent_tick_seconds_bucket{le="+Inf"} 4' in lines
+    assert 'ltorrent_tick_seconds_count 4' in lines
+    assert lines[-2] == 'ltorrent_tick_seconds_sum 5.0065'
+
+
+def test_render_runs_callbacks_first():
+    registry = MetricsRegistry()
+    registry.declare('ltorrent_torrents', 'gauge')
+    registry.register_callback(lambda r: r.set('ltorrent_torrents', 7))
+    registry.register_callback(lambda r: 1 / 0)
+    assert 'ltorrent_torrents 7' in registry.render().splitlines()
@@ -0,0 +1,135 @@
+import pytest
+
+from seeding_goals import SeedingGoals, normalize_goal
+
+
+def make_goals(default=None, tags=None, torrents=None, tag_map=None, calls=None):
+    tag_map = tag_map or {}
+
+    def tags_for(torrent_hash):
+        if calls is not None:
+            calls.append(torrent_hash)
+        return tag_map.get(torrent_hash, set())
+
+    return SeedingGoals({'default': normalize_goal(default), 'tags': tags or {}, 'torrents': torrents or {}},
+                        tags_for)
+
+
+def hashes(reached):
+    return [torrent_hash for torrent_hash, _, _ in reached]
+
+
+def test_normalize_goal_drops_empty_limits_and_checks_action():
+    assert normalize_goal(None) is None
+    assert normalize_goal({'action': 'pause', 'ratio': 0}) is None
+    assert normalize_goal({'ratio': 2, 'seed_time': None}) == {'action': 'pause', 'ratio': 2}
+    with pytest.raises(ValueError):
+        normalize_goal({'action': 'explode', 'ratio': 1})
+    with pytest.raises(ValueError):
+        normalize_goal({'action': 'move', 'ratio': 1})
+
+
+def test_ratio_goal_reached_on_observe():
+    goals = make_goals(default={'ratio': 2.0})
+    assert goals.observe('a', True, 1.5, 0, 100, now=0) == []
+    reached = goals.observe('a', True, 2.0, 10, 200, now=10)
+    assert hashes(reached) == ['a']
+    assert reached[0][1]['action'] == 'pause'
+    assert goals.tracked_count() == 0
+
+
+def test_seed_time_goal_reached_through_deadline():
+    goals = make_goals(default={'seed_time': 3600})
+    assert goals.observe('a', True, 0.0, 600, 0, now=1000) == []
+    # 남은 3000초 전에는 만료되지 않음
+    assert goals.due(3999) == []
+    assert hashes(goals.due(4000)) == ['a']
+    assert goals.due(10 ** 6) == []
+
+
+def test_idle_goal_restarts_after_upload():
+    goals = make_goals(default={'idle_time': 100})
+    goals.observe('a', True, 0.0, 0, 10, now=0)
+    # 50초에 업로드가 늘어 유휴 시간이 다시 시작
+    goals.observe('a', True, 0.0, 50, 20, now=50)
+    assert goals.due(100) == []
+    assert hashes(goals.due(150)) == ['a']
+
+
+def test_earliest_limit_wins():
+    goals = make_goals(default={'seed_time': 1000, 'idle_time': 200})
+    goals.observe('a', True, 0.0, 0, 0, now=0)
+    reached = goals.due(200)
+    assert hashes(reached) == ['a']
+    assert '업로드 없음' in reached[0][2]
+
+
+def test_stop_seeding_untracks():
+    goals = make_goals(default={'seed_time': 100})
+    goals.observe('a', True, 0.0, 0, 0, now=0)
+    goals.observe('a', False, 0.0, 0, 0, now=10)
+    assert goals.tracked_count() == 0
+    assert goals.due(1000) == []
+
+
+def test_tightened_goal_reaches_immediately():
+    goals = make_goals(default={'ratio': 5.0})
+    goals.observe('a', True, 1.0, 0, 0, now=0)
+    goals.observe('b', True, 3.0, 0, 0, now=0)
+    reached = goals.set_goal('default', None, {'ratio': 2.0}, now=1)
+    assert hashes(reached) == ['b']
+    assert goals.tracked_count() == 1
+
+
+def test_heap_after_goal_changes():
+    goals = make_goals(default={'seed_time': 1000})
+    goals.observe('a', True, 0.0, 0, 0, now=0)
+
+    # 한도를 늘리면 먼저 예약된 1000초에 다시 평가해 새 마감으로 옮김
+    goals.set_goal('default', None, {'seed_time': 5000}, now=10)
+    assert goals.due(1000) == []
+    assert goals.due(4999) == []
+    assert hashes(goals.due(5000)) == ['a']
+
+    # 한도를 줄이면 더 이른 마감이 새로 들어감
+    goals = make_goals(default={'seed_time': 5000})
+    goals.observe('a', True, 0.0, 0, 0, now=0)
+    goals.set_goal('default', None, {'seed_time': 1000}, now=10)
+    assert hashes(goals.due(1000)) == ['a']
+    assert goals.due(5000) == []
+
+    # 시간 한도를 없애면 예약도 사라짐
+    goals = make_goals(default={'seed_time': 1000})
+    goals.observe('a', True, 0.0, 0, 0, now=0)
+    goals.set_goal('default', None, {'ratio': 10.0}, now=10)
+    assert goals.due(10 ** 6) == []
+    assert goals.tracked_count() == 1
+
+
+def test_torrent_goal_overrides_tag_and_default():
+    goals = make_goals(default={'ratio': 1.0}, tags={'keep': {'action': 'pause', 'ratio': 3.0}},
+                       tag_map={'a': {'keep'}, 'b': {'keep'}})
+    assert goals.observe('a', True, 2.0, 0, 0, now=0) == []
+    goals.set_goal('torrent', 'b', {'ratio': 1.5, 'action': 'remove'}, now=0)
+    reached = goals.observe('b', True, 2.0, 0, 0, now=0)
+    assert hashes(reached) == ['b']
+    assert reached[0][1]['action'] == 'remove'
+
+
+def test_observe_only_evaluates_changed_torrent():
+    calls = []
+    goals = make_goals(default={'seed_time': 10 ** 6}, calls=calls)
+    for i in range(500):
+        goals.observe(f'h{i}', True, 0.0, 0, 0, now=0)
+    calls.clear()
+
+    for now in range(1, 101):
+        goals.observe('h7', True, 0.0, now, 0, now=now)
+    assert set(calls) == {'h7'}
+    assert len(calls) == 100
+    # 같은 마감 시각은 다시 넣지 않아 힙이 자라지 않음
+    assert len(goals._deadlines) == 500
+
+    calls.clear()
+    assert goals.due(10) == []
+    assert calls == []
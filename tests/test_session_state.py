@@ -0,0 +1,48 @@
+import ipaddress
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from session_state import parse_blocklist_line
+
+
+def addresses(start, end):
+    return ipaddress.ip_address(start), ipaddress.ip_address(end)
+
+
+def test_p2p_line():
+    assert parse_blocklist_line('Some Org:1.2.3.0-1.2.3.255') == addresses('1.2.3.0', '1.2.3.255')
+
+
+def test_p2p_description_with_comma_and_colon():
+    assert parse_blocklist_line('Microsoft Corp, Inc:1.2.3.0-1.2.3.255') == addresses('1.2.3.0', '1.2.3.255')
+    assert parse_blocklist_line('Foo: bar, baz:5.6.7.8-5.6.7.9') == addresses('5.6.7.8', '5.6.7.9')
+
+
+def test_p2p_ipv6_range():
+    assert parse_blocklist_line('Example Net:2001:db8::-2001:db8::ffff') == addresses('2001:db8::', '2001:db8::ffff')
+
+
+def test_dat_line():
+    assert parse_blocklist_line('001.002.003.000 - 001.002.003.255 , 000 , Some Org') == \
+        addresses('1.2.3.0', '1.2.3.255')
+
+
+def test_dat_allowed_level_is_skipped():
+    assert parse_blocklist_line('1.2.3.0 - 1.2.3.255 , 200 , Allowed') is None
+
+
+def test_dat_description_with_dash():
+    assert parse_blocklist_line('1.2.3.0 - 1.2.3.255 , 000 , some-org') == addresses('1.2.3.0', '1.2.3.255')
+
+
+def test_cidr_and_single_address():
+    assert parse_blocklist_line('10.0.0.0/8') == addresses('10.0.0.0', '10.255.255.255')
+    assert parse_blocklist_line('192.0.2.7') == addresses('192.0.2.7', '192.0.2.7')
+
+
+def test_comments_and_garbage():
+    assert parse_blocklist_line('# comment') is None
+    assert parse_blocklist_line('') is None
+    assert parse_blocklist_line('not an address') is None
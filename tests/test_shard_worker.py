@@ -0,0 +1,78 @@
+import multiprocessing
+import os
+import time
+from multiprocessing import shared_memory
+
+import pytest
+
+lt = pytest.importorskip('libtorrent')
+
+from shard_worker import ShardWorker, StatusTable, table_size
+from torrent_creator import TorrentCreator
+
+OFFLINE = {'enable_dht': False, 'enable_lsd': False, 'enable_upnp': False, 'enable_natpmp': False}
+
+
+@pytest.fixture
+def worker(tmp_path):
+    shm = shared_memory.SharedMemory(create=True, size=table_size(4))
+    shm.buf[:] = bytes(shm.size)
+    conn, child_conn = multiprocessing.Pipe()
+    worker = ShardWorker(0, child_conn, shm.name, 4, 0, dict(OFFLINE, listen_interfaces='127.0.0.1:0'),
+                         str(tmp_path / 'resume'))
+    yield worker, conn
+    worker.session.pause()
+    worker.table.buffer = None
+    worker.shm.close()
+    shm.close()
+    shm.unlink()
+
+
+def test_status_table_round_trip():
+    table = StatusTable(bytearray(table_size(2)), 2)
+    key = 'ab' * 20
+    table.write(1, key, 3, 0x08, 0.5, 100, 50, 2, 7, 1024, 2048)
+    record = table.read(1)
+    assert record['key'] == key and record['auto_managed'] and not record['paused']
+    assert (record['progress'], record['num_peers'], record['total_wanted']) == (0.5, 7, 2048)
+    assert table.read(0) is None
+    table.clear(1)
+    assert table.read(1) is None
+
+
+def test_hybrid_magnet_keeps_reporting_after_metadata(worker, tmp_path):
+    worker, conn = worker
+    seed_dir = tmp_path / 'seed'
+    seed_dir.mkdir()
+    (seed_dir / 'data.bin').write_bytes(os.urandom(5 * 16384 + 100))
+    torrent_info = lt.torrent_info(TorrentCreator(str(seed_dir / 'data.bin'), 'hybrid', piece_size=16384).create())
+    info_hashes = torrent_info.info_hashes()
+    assert str(info_hashes.get_best()) != str(info_hashes.v1)
+
+    seeder = lt.session(dict(OFFLINE, listen_interfaces='127.0.0.1:0'))
+    seeder.add_torrent({'ti': torrent_info, 'save_path': str(seed_dir), 'flags': lt.torrent_flags.seed_mode})
+
+    # btih만 있는 마그넷 -> v1 해시로 등록되고, 메타데이터를 받으면 get_best()가 v2 해시가 됨
+    key = str(info_hashes.v1)
+    worker._add(key, {'magnet': f'magnet:?xt=urn:btih:{key}'}, str(tmp_path / 'download'))
+    assert conn.recv()[:2] == ('added', key)
+    worker.handles[key].connect_peer(('127.0.0.1', seeder.listen_port()))
+
+    events = []
+    record = None
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        worker.session.post_torrent_updates()
+        if worker.session.wait_for_alert(100):
+            worker._handle_alerts(worker.session.pop_alerts())
+        while conn.poll():
+            events.append(conn.recv())
+        record = worker.table.read(worker.slots[key])
+        if record['finished'] and ('finished', key) in events:
+            break
+
+    assert ('metadata', key, 'data.bin') in events
+    assert ('finished', key) in events
+    assert record['key'] == key and record['progress'] == 1.0
+    assert worker._key_for(info_hashes) == key
+    assert worker.hash_keys[str(info_hashes.v2)] == key
@@ -0,0 +1,81 @@
+import pytest
+
+from stream_server import parse_range
+
+
+SIZE = 1000
+
+
+@pytest.mark.parametrize('header, expected', [
+    ('bytes=0-99', (0, 99)),
+    ('bytes=100-100', (100, 100)),
+    ('bytes=900-5000', (900, SIZE - 1)),  # 끝이 크기를 넘으면 마지막 바이트까지
+    ('bytes=500-', (500, SIZE - 1)),
+    ('bytes=0-', (0, SIZE - 1)),
+    ('bytes=-100', (900, SIZE - 1)),
+    ('bytes=-5000', (0, SIZE - 1)),  # 크기보다 긴 접미사는 전체
+    ('Bytes = 10 - 19', (10, 19)),
+])
+def test_single_ranges(header, expected):
+    assert parse_range(header, SIZE) == expected
+
+
+@pytest.mark.parametrize('header', [
+    'bytes=1000-',
+    'bytes=1000-1100',
+    'bytes=-0',
+])
+def test_unsatisfiable_ranges(header):
+    with pytest.raises(ValueError):
+        parse_range(header, SIZE)
+
+
+def test_empty_file_is_unsatisfiable():
+    with pytest.raises(ValueError):
+        parse_range('bytes=0-', 0)
+    with pytest.raises(ValueError):
+        parse_range('bytes=-10', 0)
+
+
+@pytest.mark.parametrize('header', [
+    None,
+    '',
+    'bytes=0-9,20-29',  # 다중 범위는 전체 응답
+    'items=0-9',
+    'bytes',
+    'bytes=',
+    'bytes=-',
+    'bytes=abc-',
+    'bytes=5',
+    'bytes=--5',
+    'bytes=1-2-3',
+    'bytes=20-10',
+    'bytes=٣-',  # 아라비아 숫자 (ASCII 숫자만 허용)
+])
+def test_missing_multi_and_malformed_ranges_serve_whole_file(header):
+    assert parse_range(header, SIZE) is None
+
+
+def test_serves_range_of_seeded_file(client, tmp_path):
+    import os
+    import time
+    import urllib.request
+
+    from torrent_creator import TorrentCreator
+
+    data = os.urandom(64 * 1024)
+    (tmp_path / 'movie.bin').write_bytes(data)
+    torrent_path = tmp_path / 'movie.torrent'
+    torrent_path.write_bytes(TorrentCreator(str(tmp_path / 'movie.bin'), 'v1', piece_size=16 * 1024).create())
+    torrent_hash = client.add_torrent(str(torrent_path), str(tmp_path))
+
+    deadline = time.monotonic() + 30
+    while client.get_completion_counts()['finished'] != 1 and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    url = client.get_stream_url(torrent_hash, 0)
+    request = urllib.request.Request(url, headers={'Range': 'bytes=20000-40000'})
+    with urllib.request.urlopen(request, timeout=10) as response:
+        assert response.status == 206
+        assert response.headers['Content-Range'] == f"bytes 20000-40000/{len(data)}"
+        assert response.read() == data[20000:40001]
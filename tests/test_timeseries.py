@@ -0,0 +1,100 @@
+import struct
+
+from timeseries import FILE_MAGIC, MultiResolutionSeries, RingSeries, ThroughputRecorder
+
+
+def test_ring_series_wraps_and_forgets_overwritten_buckets():
+    ring = RingSeries(1, 4)
+    for t in range(6):
+        ring.put(t, [t, t * 10])
+
+    # 칸 4개: 0, 1은 4, 5로 덮어씀
+    times, (down, up) = ring.read(0, 5)
+    assert times == [2, 3, 4, 5]
+    assert down == [2, 3, 4, 5]
+    assert up == [20, 30, 40, 50]
+
+    # 덮어쓴 칸의 옛 시각을 읽으면 0
+    times, (down, _) = ring.read(0, 1)
+    assert times == [0, 1]
+    assert down == [0.0, 0.0]
+
+
+def test_ring_series_reads_gaps_as_zero():
+    ring = RingSeries(10, 8)
+    ring.put(3, [1, 2])
+    ring.put(6, [3, 4])
+    times, (down, up) = ring.read(30, 69)
+    assert times == [30, 40, 50, 60]
+    assert down == [1, 0, 0, 3]
+    assert up == [2, 0, 0, 4]
+
+
+def test_coarse_levels_average_samples():
+    series = MultiResolutionSeries(((1, 120), (60, 10)))
+    for t in range(60, 120):
+        series.add(t, [t - 60, 1])
+    step, times, (down, up) = series.read(60, 119)
+    assert step == 1
+    assert down[-1] == 59
+
+    # 1분 칸은 0..59의 평균
+    step, times, (down, up) = series.read(600, 119)
+    assert step == 60
+    assert times[-1] == 60
+    assert down[-1] == sum(range(60)) / 60
+    assert up[-1] == 1
+
+
+def test_partial_coarse_bucket_counts_missing_seconds_as_zero():
+    series = MultiResolutionSeries(((1, 120), (60, 10)))
+    series.add(60, [6, 0])
+    series.add(62, [6, 0])  # 61초는 샘플 없음
+    _, times, (down, _) = series.read(600, 62)
+    assert times[-1] == 60
+    assert down[-1] == 4
+
+
+def test_level_for_picks_finest_covering_level():
+    series = MultiResolutionSeries()
+    assert series.level_for(600).step == 1
+    assert series.level_for(3600).step == 1
+    assert series.level_for(3601).step == 60
+    assert series.level_for(10 ** 9).step == 900
+
+
+def test_save_load_round_trip(tmp_path):
+    path = str(tmp_path / 'history' / 'throughput.bin')
+    recorder = ThroughputRecorder()
+    recorder.set_rate('a' * 40, 1000, 10)
+    recorder.set_rate('b' * 40, 500, 0)
+    for t in range(5000, 5200):
+        recorder.tick(t)
+    recorder.save(path)
+
+    restored = ThroughputRecorder()
+    assert restored.load(path)
+    for span in (600, 86400, 30 * 86400):
+        assert restored.read_session(span, 5199) == recorder.read_session(span, 5199)
+        for torrent_hash in ('a' * 40, 'b' * 40):
+            assert restored.read_torrent(torrent_hash, span, 5199) == recorder.read_torrent(torrent_hash, span, 5199)
+    _, _, (down, up) = restored.read_session(600, 5199)
+    assert down[-1] == 1500 and up[-1] == 10
+
+
+def test_load_rejects_other_formats_and_truncated_files(tmp_path):
+    path = str(tmp_path / 'throughput.bin')
+    recorder = ThroughputRecorder()
+    recorder.set_rate('a' * 40, 1, 1)
+    recorder.tick(100)
+    recorder.save(path)
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    with open(path, 'wb') as f:
+        f.write(data[:len(data) // 2])
+    assert not ThroughputRecorder().load(path)
+
+    with open(path, 'wb') as f:
+        f.write(struct.pack('<4sHH', FILE_MAGIC, 99, 0))
+    assert not ThroughputRecorder().load(path)
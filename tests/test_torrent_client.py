@@ -0,0 +1,107 @@
+import os
+import time
+
+import pytest
+
+pytest.importorskip('libtorrent')
+pytest.importorskip('PySide6')
+
+from torrent_creator import TorrentCreator
+
+
+PIECE = 16 * 1024
+
+
+def wait_for(predicate, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def make_torrent(directory, name, pieces=4):
+    """directory/name 데이터와 v1 토렌트 파일 경로"""
+    content = directory / name
+    content.write_bytes(os.urandom(pieces * PIECE))
+    torrent_path = directory / (name + '.torrent')
+    torrent_path.write_bytes(TorrentCreator(str(content), 'v1', piece_size=PIECE).create())
+    return str(torrent_path)
+
+
+def test_torrents_waiting_for_disk_space_are_not_user_paused(client, tmp_path):
+    completed = []
+    client.all_torrents_completed.connect(lambda: completed.append(True))
+
+    seed_hash = client.add_torrent(make_torrent(tmp_path, 'seed.bin'), str(tmp_path))
+    assert wait_for(lambda: client.get_completion_counts()['finished'] == 1)
+    completed.clear()
+
+    # 여유 공간이 절대 모자라도록 -> 새 토렌트는 공간 대기열로
+    client.set_disk_space_limits(min_free=1 << 60)
+    empty = tmp_path / 'empty'
+    empty.mkdir()
+    queued_hash = client.add_torrent(make_torrent(tmp_path, 'queued.bin'), str(empty))
+    assert queued_hash in client.disk_queue
+    assert wait_for(lambda: queued_hash in client.status_snapshot)
+    time.sleep(0.5)
+
+    # 자동 관리 없이 멈춰 있지만 받는 중으로 셈
+    assert client.completion_states[queued_hash] == 'pending'
+    assert not client.are_all_torrents_completed()
+    assert completed == []
+
+    # 사용자가 멈추면 대기열에서 빠지고 일시정지로 바뀜
+    client.pause_many([queued_hash])
+    assert queued_hash not in client.disk_queue
+    assert wait_for(lambda: client.completion_states[queued_hash] == 'paused')
+    assert client.are_all_torrents_completed()
+    assert completed == [True]
+    assert client.completion_states[seed_hash] == 'finished'
+
+
+def test_stop_restores_auto_managed_for_cancelled_recheck(tmp_path):
+    import shutil
+    import threading
+
+    import libtorrent as lt
+    from torrent_client import TorrentClient
+
+    client = TorrentClient()
+    blocker = threading.Event()
+    try:
+        torrent_hash = client.add_torrent(make_torrent(tmp_path, 'recheck.bin'), str(tmp_path))
+        assert wait_for(lambda: client.get_completion_counts()['finished'] == 1)
+        client.request_resume_save(torrent_hash)
+        assert wait_for(lambda: client._load_resume_record(torrent_hash) is not None)
+
+        # 작업자 하나를 막아 두어 재검사가 대기열에 남게 함
+        client.set_recheck_limits(max_parallel=1)
+        client.recheck_scheduler.submit(blocker.wait)
+        assert client.fast_recheck(torrent_hash)
+        handle = client.torrents[torrent_hash]['handle']
+        assert not handle.status().flags & lt.torrent_flags.auto_managed
+
+        client.stop()
+        assert handle.status().flags & lt.torrent_flags.auto_managed
+    finally:
+        blocker.set()
+        shutil.rmtree(os.path.expanduser('~/.ltorrent'), ignore_errors=True)
+
+
+@pytest.mark.parametrize('interfaces, expected', [
+    (['0.0.0.0'], '0.0.0.0:6881'),
+    (['eth0'], 'eth0:6881'),
+    (['::'], '[::]:6881'),
+    (['fe80::1%eth0'], '[fe80::1%eth0]:6881'),
+    (['[::1]'], '[::1]:6881'),
+    (['[::1]:7000'], '[::1]:7000'),
+    (['10.0.0.5:7000', 'eth1'], '10.0.0.5:7000,eth1:6881'),
+    ([' 0.0.0.0 ', '', '  ', '::'], '0.0.0.0:6881,[::]:6881'),
+    ([], ''),
+])
+def test_format_listen_interfaces(interfaces, expected):
+    from torrent_client import format_listen_interfaces
+
+    assert format_listen_interfaces(interfaces, 6881) == expected
@@ -0,0 +1,229 @@
+"""
+전송 속도 기록: 여러 해상도의 고정 크기 링 버퍼 (1초 x 1시간, 1분 x 1일, 15분 x 30일)
+
+가동 시간과 관계없이 메모리는 일정하고, 그래프는 필요한 해상도 하나만 읽는다.
+값은 array('f')에 채널(다운로드, 업로드) 순으로 저장하고 디스크에 바이너리로 저장한다.
+"""
+import heapq
+import os
+import struct
+import threading
+from array import array
+from collections import OrderedDict
+
+
+# (간격 초, 칸 수)
+RESOLUTIONS = ((1, 3600), (60, 1440), (900, 2880))
+CHANNELS = 2  # 다운로드, 업로드 (바이트/초)
+MAX_TORRENT_SERIES = 64  # 토렌트별 기록 최대 수 (최근 활동 순으로 유지)
+
+FILE_MAGIC = b'LTTS'
+FILE_VERSION = 1
+_HEADER = struct.Struct('<4sHH')  # magic, version, 시계열 수
+_SERIES_HEADER = struct.Struct('<H')  # 키 길이
+_LEVEL_HEADER = struct.Struct('<II')  # step, capacity
+
+
+class RingSeries:
+    """한 해상도의 링 버퍼 (칸마다 시각 인덱스를 함께 저장해 기록 없는 구간은 0으로 읽힘)"""
+
+    def __init__(self, step, capacity, channels=CHANNELS):
+        self.step = step
+        self.capacity = capacity
+        self.channels = channels
+        self.stamps = array('q', [-1]) * capacity  # 칸의 시각 인덱스 (t // step)
+        self.values = array('f', [0.0]) * (capacity * channels)
+
+    @property
+    def span(self):
+        """담을 수 있는 기간 (초)"""
+        return self.step * self.capacity
+
+    def put(self, bucket, values):
+        slot = bucket % self.capacity
+        self.stamps[slot] = bucket
+        offset = slot * self.channels
+        for channel, value in enumerate(values):
+            self.values[offset + channel] = value
+
+    def read(self, start, end):
+        """[start, end] 구간의 (시각 목록, 채널별 값 목록)"""
+        first = max(int(start // self.step), int(end // self.step) - self.capacity + 1)
+        last = int(end // self.step)
+        times = []
+        channels = [[] for _ in range(self.channels)]
+        stamps = self.stamps
+        values = self.values
+        for bucket in range(first, last + 1):
+            slot = bucket % self.capacity
+            times.append(bucket * self.step)
+            if stamps[slot] == bucket:
+                offset = slot * self.channels
+                for channel in range(self.channels):
+                    channels[channel].append(values[offset + channel])
+            else:
+                for channel in range(self.channels):
+                    channels[channel].append(0.0)
+        return times, channels
+
+
+class MultiResolutionSeries:
+    """여러 해상도에 동시에 기록하는 시계열 (거친 해상도는 칸 평균)"""
+
+    def __init__(self, resolutions=RESOLUTIONS, channels=CHANNELS):
+        self.levels = [RingSeries(step, capacity, channels) for step, capacity in resolutions]
+        # 해상도별 현재 칸의 (시각 인덱스, 채널별 합)
+        self._sums = [[-1, [0.0] * channels] for _ in self.levels]
+
+    def add(self, t, values):
+        """1초 간격 샘플 추가 (샘플이 없는 초는 0으로 간주)"""
+        for level, current in zip(self.levels, self._sums):
+            bucket = int(t // level.step)
+            if current[0] != bucket:
+                current[0] = bucket
+                current[1] = [0.0] * level.channels
+            sums = current[1]
+            for channel, value in enumerate(values):
+                sums[channel] += value
+            # 진행 중인 칸도 그래프에 보이도록 지금까지의 평균을 기록
+            elapsed = min(level.step, int(t - bucket * level.step) + 1)
+            level.put(bucket, [total / elapsed for total in sums])
+
+    def level_for(self, span):
+        """span(초)을 담을 수 있는 가장 촘촘한 해상도"""
+        for level in self.levels:
+            if level.span >= span:
+                return level
+        return self.levels[-1]
+
+    def read(self, span, end):
+        """최근 span초를 알맞은 해상도 하나에서 읽음 -> (간격, 시각 목록, 채널별 값 목록)"""
+        level = self.level_for(span)
+        times, channels = level.read(end - span, end)
+        return level.step, times, channels
+
+
+class ThroughputRecorder:
+    """세션 전체와 토렌트별 전송 속도 기록
+
+    토렌트 상태 갱신에서 set_rate로 현재 속도만 바꾸고(O(1), 합계도 증분 갱신),
+    업데이트 루프가 초마다 tick으로 한 번 기록한다.
+    """
+
+    def __init__(self, max_torrents=MAX_TORRENT_SERIES):
+        self.max_torrents = max_torrents
+        self.session = MultiResolutionSeries()
+        self.torrents = OrderedDict()  # hash -> MultiResolutionSeries (최근 기록 순)
+        self.current = {}  # hash -> (down, up), 0이 아닌 토렌트만
+        self.totals = [0, 0]
+        self.lock = threading.Lock()
+
+    def set_rate(self, torrent_hash, down, up):
+        """토렌트의 현재 속도 갱신 (제거 시 0, 0)"""
+        with self.lock:
+            previous = self.current.pop(torrent_hash, (0, 0))
+            self.totals[0] += down - previous[0]
+            self.totals[1] += up - previous[1]
+            if down or up:
+                self.current[torrent_hash] = (down, up)
+
+    def remove(self, torrent_hash):
+        self.set_rate(torrent_hash, 0, 0)
+        with self.lock:
+            self.torrents.pop(torrent_hash, None)
+
+    def tick(self, now):
+        """현재 속도를 한 샘플로 기록"""
+        with self.lock:
+            self.session.add(now, self.totals)
+
+            # 활동 중인 토렌트가 많으면 속도가 큰 것만 토렌트별로 기록
+            active = self.current
+            if len(active) > self.max_torrents:
+                active = {h: active[h] for h in heapq.nlargest(self.max_torrents, active, key=lambda h: sum(active[h]))}
+            for torrent_hash, rates in active.items():
+                series = self.torrents.get(torrent_hash)
+                if series is None:
+                    series = self.torrents[torrent_hash] = MultiResolutionSeries()
+                    while len(self.torrents) > self.max_torrents:
+                        self.torrents.popitem(last=False)
+                else:
+                    self.torrents.move_to_end(torrent_hash)
+                series.add(now, rates)
+
+    def read_session(self, span, end):
+        with self.lock:
+            return self.session.read(span, end)
+
+    def read_torrent(self, torrent_hash, span, end):
+        """토렌트 기록 (없으면 None)"""
+        with self.lock:
+            series = self.torrents.get(torrent_hash)
+            return series.read(span, end) if series else None
+
+    def save(self, path):
+        """모든 시계열을 바이너리 파일로 저장"""
+        with self.lock:
+            items = [('', self.session)] + list(self.torrents.items())
+            chunks = [_HEADER.pack(FILE_MAGIC, FILE_VERSION, len(items))]
+            for key, series in items:
+                key_bytes = key.encode()
+                chunks.append(_SERIES_HEADER.pack(len(key_bytes)))
+                chunks.append(key_bytes)
+                for level in series.levels:
+                    chunks.append(_LEVEL_HEADER.pack(level.step, level.capacity))
+                    chunks.append(level.stamps.tobytes())
+                    chunks.append(level.values.tobytes())
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + '.tmp', 'wb') as f:
+            f.write(b''.join(chunks))
+        os.replace(path + '.tmp', path)
+
+    def load(self, path):
+        """저장된 시계열 로드 (해상도 구성이 다르면 무시), 로드했으면 True"""
+        with open(path, 'rb') as f:
+            data = memoryview(f.read())
+
+        try:
+            magic, version, count = _HEADER.unpack_from(data, 0)
+            if magic != FILE_MAGIC or version != FILE_VERSION:
+                return False
+            offset = _HEADER.size
+            loaded = []
+            for _ in range(count):
+                (key_len,) = _SERIES_HEADER.unpack_from(data, offset)
+                offset += _SERIES_HEADER.size
+                key = bytes(data[offset:offset + key_len]).decode()
+                offset += key_len
+
+                series = MultiResolutionSeries()
+                for level in series.levels:
+                    step, capacity = _LEVEL_HEADER.unpack_from(data, offset)
+                    offset += _LEVEL_HEADER.size
+                    if (step, capacity) != (level.step, level.capacity):
+                        return False
+                    stamps_size = capacity * level.stamps.itemsize
+                    values_size = capacity * level.channels * level.values.itemsize
+                    if offset + stamps_size + values_size > len(data):
+                        return False
+                    level.stamps = array('q')
+                    level.stamps.frombytes(data[offset:offset + stamps_size])
+                    offset += stamps_size
+                    level.values = array('f')
+                    level.values.frombytes(data[offset:offset + values_size])
+                    offset += values_size
+                loaded.append((key, series))
+        except struct.error:
+            # 저장 도중 잘린 파일
+            return False
+
+        with self.lock:
+            for key, series in loaded:
+                if key:
+                    self.torrents[key] = series
+                else:
+                    self.session = series
+            while len(self.torrents) > self.max_torrents:
+                self.torrents.popitem(last=False)
+        return True
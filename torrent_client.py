@@ -3,9 +3,277 @@ import time
 import os
 import hashlib
 import random
-import requests
-from threading import Thread
+import io
+import fnmatch
+import json
+import errno
+from urllib.parse import urlsplit
+from collections import deque, OrderedDict
+from threading import Thread, Condition, Lock
 from PySide6.QtCore import QObject, Signal
+from metrics import MetricsRegistry
+from streaming import TorrentFileReader, DEFAULT_WINDOW_PIECES
+from merkle import file_pieces_root
+from torrent_creator import TorrentCreator
+from torrent_keys import info_hash_candidates, torrent_key
+from completion_actions import CompletionPipeline, ACTION_TYPES, load_actions, save_actions
+from timeseries import ThroughputRecorder
+from disk_space import VolumeAccounting, DiskSpaceError, DISK_FULL_POLICIES
+from seeding_goals import SeedingGoals, load_goals, save_goals, normalize_goal, describe_goal
+from lan_peers import (LanRanges, PeerTraffic, parse_lan_ranges, DEFAULT_LAN_RANGES, LAN_PEER_CLASS_INFO,
+                       LAN_SAMPLE_INTERVAL, LAN_SAMPLE_TORRENTS)
+from session_state import load_session_state, save_session_state, read_blocklist, iter_ranges, range_count
+from fast_recheck import (RecheckScheduler, snapshot_identities, changed_files,
+                          pieces_for_files, verify_pieces)
+
+
+# 설정/캐시 디렉터리
+CONFIG_DIR = os.path.expanduser("~/.ltorrent")
+METADATA_CACHE_DIR = os.path.join(CONFIG_DIR, "metadata")
+METADATA_TEMP_DIR = os.path.join(CONFIG_DIR, "metadata_tmp")
+RESUME_DIR = os.path.join(CONFIG_DIR, "resume")
+NETWORK_CONFIG_PATH = os.path.join(CONFIG_DIR, "network.json")
+COMPLETION_ACTIONS_PATH = os.path.join(CONFIG_DIR, "completion_actions.json")
+TAGS_PATH = os.path.join(CONFIG_DIR, "tags.json")
+COMPLETED_PATH = os.path.join(CONFIG_DIR, "completed.json")  # 완료 후 작업을 이미 처리한 토렌트
+HISTORY_PATH = os.path.join(CONFIG_DIR, "history.bin")
+DHT_STATE_PATH = os.path.join(CONFIG_DIR, "dht.state")
+SESSION_STATE_PATH = os.path.join(CONFIG_DIR, "session.state")
+SEEDING_GOALS_PATH = os.path.join(CONFIG_DIR, "seeding_goals.json")
+DEFAULT_LISTEN_INTERFACES = ['0.0.0.0', '[::]']  # 모든 IPv4 + IPv6 인터페이스
+DEFAULT_DHT_BOOTSTRAP_NODES = [
+    'dht.libtorrent.org:25401',
+    'router.bittorrent.com:6881',
+    'router.utorrent.com:6881',
+    'dht.transmissionbt.com:6881',
+]
+
+
+# 세션 성능 프로필 (기본값 위에 덮어쓰는 설정)
+SESSION_PROFILES = {
+    'default': {},
+    # 10 Gbit 시드박스, 수천 개 토렌트 시딩용
+    'seedbox': {
+        'connections_limit': 8000,
+        'unchoke_slots_limit': 2000,
+        'choking_algorithm': int(lt.choking_algorithm_t.rate_based_choker),
+        'seed_choking_algorithm': int(lt.seed_choking_algorithm_t.fastest_upload),
+        'max_peerlist_size': 10000,
+        'max_paused_peerlist_size': 4000,
+        # libtorrent 2.0에는 half-open 제한이 없으므로 초당 연결 시도 수로 조절
+        'connection_speed': 500,
+        'listen_queue_size': 3000,
+        'suggest_mode': int(lt.suggest_mode_t.suggest_read_cache),
+        'active_seeds': 2000,
+        'active_limit': 4000,
+        'max_allowed_in_request_queue': 2000,
+        'max_out_request_queue': 1500,
+        'send_buffer_watermark': 3 * 1024 * 1024,
+        'send_buffer_watermark_factor': 150,
+        'max_queued_disk_bytes': 8 * 1024 * 1024,
+        'aio_threads': 16,
+        'file_pool_size': 500,
+    },
+}
+
+
+# 트래커 알림 주기 기본값 (비공개 트래커 하나에 토렌트가 많을 때 조절)
+DEFAULT_TRACKER_SETTINGS = {
+    'min_announce_interval': 300,  # 트래커가 더 짧게 요구해도 이 간격 이상으로 알림 (초)
+    'max_concurrent_http_announces': 50,  # 동시에 진행하는 HTTP 알림 수
+    'tracker_backoff': 250,  # 실패 시 재시도 간격 증가율 (%)
+    'auto_scrape_interval': 1800,
+    'auto_scrape_min_interval': 300,
+    'announce_to_all_tiers': False,
+    'announce_to_all_trackers': False,
+}
+
+
+# 프록시 종류 (세션 상태에는 이름으로 저장)
+PROXY_TYPES = {
+    'http': lt.proxy_type_t.http,
+    'socks4': lt.proxy_type_t.socks4,
+    'socks5': lt.proxy_type_t.socks5,
+    'http_pw': lt.proxy_type_t.http_pw,
+    'socks5_pw': lt.proxy_type_t.socks5_pw,
+}
+
+
+# 항상 차단하는 IP 범위
+DEFAULT_BLOCKED_RANGES = [
+    ('0.0.0.0', '0.255.255.255'),  # 예약된 주소
+    ('127.0.0.0', '127.255.255.255'),  # 로컬호스트
+    ('169.254.0.0', '169.254.255.255'),  # 링크 로컬
+    ('224.0.0.0', '239.255.255.255'),  # 멀티캐스트
+    ('240.0.0.0', '255.255.255.255'),  # 예약된 클래스 E
+]
+
+
+# 웹 시드 (BEP 19 URL 시드 / BEP 17 HTTP 시드) 연결 기본값
+DEFAULT_WEB_SEED_SETTINGS = {
+    'max_web_seed_connections': 4,  # 웹 시드 하나(원본 서버)에 동시에 여는 연결 수
+    'urlseed_pipeline_size': 8,  # keep-alive 연결 하나에 미리 보내 두는 요청 수
+    'urlseed_max_request_bytes': 16 * 1024 * 1024,  # 요청 하나의 최대 크기 (연속 피스를 한 번에)
+    'urlseed_timeout': 20,  # 응답 없는 연결을 끊기까지 (초)
+    'urlseed_wait_retry': 30,  # 실패한 웹 시드 재시도 간격 (초)
+}
+
+
+# libtorrent 기본 전역 피어 클래스 (session::global_peer_class_id, 전역 속도 제한이 걸림)
+GLOBAL_PEER_CLASS_ID = 0
+ALL_ADDRESSES = [('0.0.0.0', '255.255.255.255'), ('::', 'ffff:ffff:ffff:ffff:ffff:ffff:ffff:ffff')]
+
+
+COMPLETION_STATES = ('pending', 'finished', 'paused', 'error')
+
+
+def completion_state(status):
+    """torrent_status의 완료 추적 상태 (오류 > 완료 > 사용자 일시정지 > 받는 중)"""
+    if status.errc.value():
+        return 'error'
+    if status.is_finished:
+        return 'finished'
+    # 자동 관리로 대기 중인 토렌트는 곧 다시 시작하므로 받는 중으로 취급
+    if status.flags & lt.torrent_flags.paused and not status.flags & lt.torrent_flags.auto_managed:
+        return 'paused'
+    return 'pending'
+
+
+def share_ratio(status):
+    """공유 비율 (업로드 / 다운로드, 받은 적 없이 시드 중이면 보유 데이터 기준)"""
+    downloaded = status.all_time_download or status.total_done
+    if downloaded <= 0:
+        return 0.0
+    return status.all_time_upload / downloaded
+
+
+def wanted_bytes(torrent_info, file_priorities=None):
+    """받을 바이트 (우선순위 0인 파일 제외)"""
+    files = torrent_info.files()
+    if not file_priorities:
+        return files.total_size()
+    return sum(files.file_size(i) for i, priority in enumerate(file_priorities) if priority > 0)
+
+
+def seeding_seconds(status):
+    """시딩한 시간 (초, 바인딩에 따라 timedelta 또는 정수)"""
+    value = status.seeding_duration
+    return value.total_seconds() if hasattr(value, 'total_seconds') else float(value)
+
+
+def tracker_host(url):
+    """트래커 URL의 호스트 이름 (집계 키)"""
+    return urlsplit(url).hostname or url
+
+
+def peer_flags_text(peer):
+    """피어 상태 플래그 문자열 (D/d 다운로드, U/u 업로드, O 낙관적 언초크, S 스너브, I 수신 연결,
+    H/X/L DHT/PEX/LSD 출처, E/e 암호화, P uTP)"""
+    flags = peer.flags
+    source = peer.source
+    letters = []
+    if flags & lt.peer_info.interesting:
+        letters.append('d' if flags & lt.peer_info.remote_choked else 'D')
+    if flags & lt.peer_info.remote_interested:
+        letters.append('u' if flags & lt.peer_info.choked else 'U')
+    if flags & lt.peer_info.optimistic_unchoke:
+        letters.append('O')
+    if flags & lt.peer_info.snubbed:
+        letters.append('S')
+    if not flags & lt.peer_info.local_connection:
+        letters.append('I')
+    if source & lt.peer_info.dht:
+        letters.append('H')
+    if source & lt.peer_info.pex:
+        letters.append('X')
+    if source & lt.peer_info.lsd:
+        letters.append('L')
+    if flags & lt.peer_info.rc4_encrypted:
+        letters.append('E')
+    elif flags & lt.peer_info.plaintext_encrypted:
+        letters.append('e')
+    if flags & lt.peer_info.utp_socket:
+        letters.append('P')
+    return ' '.join(letters)
+
+
+def process_rss():
+    """현재 프로세스의 상주 메모리 (바이트, 알 수 없으면 None)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        # Linux 외(macOS)에서는 최대 RSS(바이트)만 제공
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except ImportError:
+        return None
+
+
+def format_listen_interfaces(interfaces, port):
+    """인터페이스 목록을 listen_interfaces 설정 문자열로 변환
+
+    항목은 IP, [IPv6], 장치 이름(eth0) 또는 포트가 붙은 'IP:포트' 형식.
+    """
+    endpoints = []
+    for interface in interfaces:
+        interface = interface.strip()
+        if not interface:
+            continue
+        if interface.startswith('['):
+            # [IPv6] 또는 [IPv6]:포트
+            endpoints.append(interface if ']:' in interface else f"{interface}:{port}")
+        elif interface.count(':') > 1:
+            # 대괄호 없는 IPv6
+            endpoints.append(f"[{interface}]:{port}")
+        elif ':' in interface:
+            # 포트가 지정된 IPv4/장치
+            endpoints.append(interface)
+        else:
+            endpoints.append(f"{interface}:{port}")
+    return ','.join(endpoints)
+
+
+def load_dht_state(path):
+    """저장된 DHT 상태(노드 ID, 라우팅 테이블)의 session_params, 없거나 읽을 수 없으면 기본값"""
+    try:
+        with open(path, 'rb') as f:
+            return lt.read_session_params(f.read(), lt.save_state_flags_t.save_dht_state)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"DHT 상태 로드 오류: {e}")
+    return lt.session_params()
+
+
+# 파일 우선순위 (libtorrent download_priority 값)
+FILE_PRIORITIES = {
+    'skip': 0,
+    'low': 1,
+    'normal': 4,
+    'high': 7,
+}
+
+
+def resolve_file_priorities(file_paths, file_priorities=None, selection_rules=None, base=None):
+    """파일별 우선순위 목록 계산 (규칙은 순서대로 적용, 뒤 규칙이 우선, 개별 지정이 최우선)"""
+    priorities = list(base) if base is not None else [FILE_PRIORITIES['normal']] * len(file_paths)
+    
+    for pattern, level in selection_rules or []:
+        value = FILE_PRIORITIES[level]
+        for index, path in enumerate(file_paths):
+            # 경로 전체 또는 파일 이름에 대해 매칭
+            if fnmatch.fnmatch(path, pattern) or fnmatch.fnmatch(os.path.basename(path), pattern):
+                priorities[index] = value
+    
+    if file_priorities:
+        items = file_priorities.items() if isinstance(file_priorities, dict) else enumerate(file_priorities)
+        for index, level in items:
+            priorities[index] = FILE_PRIORITIES[level] if isinstance(level, str) else int(level)
+    
+    return priorities
 
 
 class TorrentClient(QObject):
@@ -14,10 +282,18 @@ class TorrentClient(QObject):
     torrent_added = Signal(str, str)  # hash, name
     torrent_finished = Signal(str)  # hash
     security_alert = Signal(str, str)  # type, message
+    metadata_resolved = Signal(str, bool)  # hash, success (메타데이터만 받기)
+    torrent_creation_progress = Signal(object, object)  # done_bytes, total_bytes
+    torrent_created = Signal(str, str)  # output_path, hash (실패 시 빈 문자열)
+    completion_action_finished = Signal(str, str, bool, str)  # hash, action, success, message
+    all_torrents_completed = Signal()  # 받는 중인 토렌트가 없어졌을 때 (완료된 토렌트가 있을 때만)
+    torrent_updated = Signal(str)  # hash (태그/트래커 변경)
+    seeding_goal_reached = Signal(str, str, str)  # hash, action, reason (remove면 이미 제거됨)
     
     def __init__(self):
         super().__init__()
-        self.session = lt.session()
+        # 이전 실행의 DHT 라우팅 테이블/노드 ID로 시작 (재시작 직후 마그넷이 바로 피어를 찾도록)
+        self.session = lt.session(load_dht_state(DHT_STATE_PATH))
         
         # 보안 설정
         self.blocked_ips = set()
@@ -36,19 +312,139 @@ class TorrentClient(QObject):
         self.proxy_username = ""
         self.proxy_password = ""
         
-        # 랜덤 포트 사용 (보안 강화)
-        random_port = random.randint(49152, 65535)
-        self.session.listen_on(random_port, random_port + 10)
+        # 속도 제한 (KB/s, 0 = 무제한)
+        self.upload_limit_kbps = 0
+        self.download_limit_kbps = 0
+        
+        # 디스크 공간 (볼륨별 남은 바이트, 모자라면 새 토렌트 대기/거부, 최소 여유 공간 아래면 일시정지)
+        self.disk_space = VolumeAccounting()
+        self.disk_full_policy = 'queue'
+        self.disk_queue = OrderedDict()  # hash -> (경로, 받을 바이트), 공간이 생기면 순서대로 시작
+        self.disk_paused = {}  # hash -> (장치 번호, 자동 관리 여부), 여유 공간 부족으로 일시정지
+        self.disk_full_volumes = set()
+        # 저장된 대기열/공간 부족 일시정지 (토렌트를 복원할 때 다시 만듦)
+        self._saved_disk_queue = []  # [[hash, 경로, 받을 바이트], ...] 순서대로
+        self._saved_disk_paused = {}  # hash -> 자동 관리 여부
+        
+        # 가져온 차단 목록 (정렬·병합된 구간 바이트, 세션 상태 파일에 그대로 저장)
+        self.ip_blocklist = {4: b'', 6: b''}
+        self.ip_blocklist_source = ''
+        
+        # LAN 피어 (지정 구간의 피어는 전역 속도 제한 밖의 피어 클래스, 로컬/원격 전송량 집계)
+        self.lan_ranges = LanRanges(DEFAULT_LAN_RANGES)
+        self.lan_unthrottled = True
+        self.lan_peer_class = None
+        self.lan_traffic = PeerTraffic()
+        self.lan_peer_count = 0  # 마지막 확인에서 연결된 LAN 피어 수
+        self._last_lan_sample = time.monotonic()
+        self._lan_sample_cursor = 0  # 다음에 피어 목록을 읽을 전송 중인 토렌트 위치
+        
+        # 로컬 서비스 검색 (LSD, 같은 네트워크의 피어를 멀티캐스트로 찾음)
+        self.lsd_enabled = True
+        self.lsd_interval = 300  # LSD 알림 주기 (초)
+        
+        # 수신 인터페이스/포트 (무작위 포트는 처음 한 번만 정하고 저장)
+        self.listen_interfaces = list(DEFAULT_LISTEN_INTERFACES)
+        self.listen_port = 0
+        self.listen_port_retries = 10  # 포트 사용 중일 때 다음 포트로 재시도할 횟수
+        self.outgoing_interfaces = []  # 비어 있으면 OS 라우팅에 맡김
+        self.listen_endpoints = set()  # 실제로 수신 중인 (주소, 포트, 종류)
+        self.dht_bootstrap_nodes = list(DEFAULT_DHT_BOOTSTRAP_NODES)  # host:port
+        self.dht_state_save_interval = 600  # DHT 상태 저장 주기 (초)
+        self._last_dht_state_save = time.monotonic()
+        self._load_network_config()
+        
+        # 성능 프로필 (되돌릴 수 있도록 적용 전 기본값 보관)
+        self.session_profile = 'default'
+        profile_keys = {key for profile in SESSION_PROFILES.values() for key in profile}
+        current_settings = self.session.get_settings()
+        self._profile_baseline = {key: current_settings[key] for key in profile_keys if key in current_settings}
+        self._baseline_rss = process_rss()
+        self.last_session_stats = {}
+        
+        # 트래커 (호스트별 알림 집계, 스크레이프 결과)
+        self.tracker_settings = dict(DEFAULT_TRACKER_SETTINGS)
+        self.web_seed_settings = dict(DEFAULT_WEB_SEED_SETTINGS)
+        self.tracker_host_stats = {}  # host -> 알림/응답/오류 집계
+        self.scrape_results = {}  # hash -> {url: {'seeders', 'leechers', 'completed'}}
+        self._announce_started = {}  # (hash, url) -> 알림 시작 시각 (응답 시간 측정)
+        
+        # 완료 후 작업 (이동/하드링크/검증/훅)
+        try:
+            completion_actions = load_actions(COMPLETION_ACTIONS_PATH)
+        except Exception as e:
+            print(f"완료 후 작업 설정 로드 오류: {e}")
+            completion_actions = []
+        self.completion_pipeline = CompletionPipeline(self, completion_actions)
+        # 완료를 이미 처리한 토렌트 (재시작/재검사로 완료 알림이 다시 와도 작업을 반복하지 않음)
+        self.completed_hashes = self._load_completed()
+        
+        # 태그 (hash -> 태그 집합)
+        self.torrent_tags = self._load_tags()
+        
+        # 시딩 목표 (토렌트별 > 태그별 > 기본)
+        try:
+            seeding_goals = load_goals(SEEDING_GOALS_PATH)
+        except Exception as e:
+            print(f"시딩 목표 로드 오류: {e}")
+            seeding_goals = {}
+        self.seeding_goals = SeedingGoals(seeding_goals, self.get_torrent_tags)
+        
+        # 피어 목록 (보고 있는 토렌트만, 주기 제한)
+        self.peer_info_interval = 2  # 같은 토렌트의 get_peer_info 최소 간격 (초)
+        self._peer_info_cache = {}  # hash -> (조회 시각, 피어 목록)
         
         self.torrents = {}
+        self.last_add_error = ''  # 마지막 추가 실패 이유 (UI 표시용)
+        self.last_create_error = ''  # 마지막 토렌트 생성 실패 이유 (UI 표시용)
         self.running = True
         self.completed_torrents = set()  # 완료된 토렌트 추적
         
-        # 보안 강화된 세션 설정
-        self._apply_session_settings()
+        # 완료 추적 (알림으로 갱신하는 상태별 카운터, 조회는 O(1))
+        self.status_snapshot = {}  # hash -> 마지막 torrent_status (state_update_alert)
+        self.completion_states = {}  # hash -> 'pending' | 'finished' | 'paused' | 'error'
+        self.completion_counts = {state: 0 for state in COMPLETION_STATES}
+        self._all_completed_notified = False
+        self.completion_lock = Lock()  # UI 스레드(추가/제거)와 업데이트 스레드에서 갱신
+        self.torrents_lock = Lock()  # self.torrents 항목 제거와 핸들 교체 (UI/재검사/완료 작업 스레드)
+        self.verified_files = {}  # hash -> 머클 트리로 검증된 파일 인덱스
+        self.piece_condition = Condition()  # 피스 완료 대기 (스트리밍)
+        self.piece_listeners = []  # 피스 완료 콜백 (hash, piece)
+        self.stream_server = None
+        
+        # 메타데이터만 받기 작업
+        self.metadata_lock = Lock()
+        self.metadata_queue = deque()  # 대기 중인 add_torrent_params
+        self.metadata_jobs = {}  # hash -> {'handle', 'started'}
+        self.metadata_max_concurrent = 50
+        self.metadata_timeout = 300  # 초
+        
+        # resume 데이터 / 빠른 재검사
+        self.resume_save_interval = 300  # 변경된 토렌트 resume 저장 주기 (초)
+        self._last_resume_save = time.monotonic()
+        self.recheck_max_parallel = 2
+        self.recheck_io_budget_mbps = 200
+        self.recheck_scheduler = RecheckScheduler(self.recheck_max_parallel, self.recheck_io_budget_mbps)
+        
+        # 계측 (메트릭 레지스트리)
+        self.metrics = MetricsRegistry()
+        self.metrics_server = None
+        self.session_stats_interval = 5  # post_session_stats 요청 주기 (초)
+        self._last_stats_request = 0
+        self._session_metric_types = {}
+        self._setup_metrics()
+        
+        # 전송 속도 기록 (파일 로드는 업데이트 스레드에서)
+        self.throughput = ThroughputRecorder()
+        self.history_save_interval = 300  # 속도 기록 저장 주기 (초)
+        self._last_history_save = time.monotonic()
         
-        # IP 필터 로드
+        # 저장된 세션 상태(설정, 제한, IP 필터)를 읽어 토렌트 추가 전에 한 번에 적용
+        self.session_state_dirty = False
+        self._load_session_state()
+        self._apply_session_settings()
         self.load_ip_filter()
+        self._apply_peer_class_filter()
         
         # 상태 업데이트 스레드 시작
         self.update_thread = Thread(target=self._update_loop, daemon=True)
@@ -59,8 +455,14 @@ class TorrentClient(QObject):
         settings = {
             'user_agent': 'libtorrent/1.2.0' if self.anonymous_mode else 'Simple Torrent Client',
             'alert_mask': lt.alert.category_t.all_categories,
-            'upload_rate_limit': 0,  # 0 = 무제한
-            'download_rate_limit': 0,  # 0 = 무제한
+            'upload_rate_limit': int(self.upload_limit_kbps * 1024),  # 0 = 무제한
+            'download_rate_limit': int(self.download_limit_kbps * 1024),  # 0 = 무제한
+            'active_checking': self.recheck_max_parallel,  # 동시에 전체 검사할 토렌트 수
+            
+            # 수신/발신 인터페이스
+            'listen_interfaces': format_listen_interfaces(self.listen_interfaces, self.listen_port),
+            'max_retry_port_bind': self.listen_port_retries,
+            'outgoing_interfaces': ','.join(self.outgoing_interfaces),
             
             # 보안 설정
             'enable_outgoing_utp': True,
@@ -75,7 +477,9 @@ class TorrentClient(QObject):
             
             # DHT 및 PEX 설정
             'enable_dht': self.dht_enabled and not self.anonymous_mode,
-            'enable_lsd': not self.anonymous_mode,
+            'dht_bootstrap_nodes': ','.join(self.dht_bootstrap_nodes),
+            'enable_lsd': self.lsd_enabled and not self.anonymous_mode,
+            'local_service_announce_interval': self.lsd_interval,
             'enable_upnp': False,  # 보안상 비활성화
             'enable_natpmp': False,  # 보안상 비활성화
             
@@ -91,6 +495,10 @@ class TorrentClient(QObject):
             'proxy_password': self.proxy_password if self.proxy_enabled else '',
         }
         
+        # 트래커 알림 주기, 웹 시드 연결
+        settings.update(self.tracker_settings)
+        settings.update(self.web_seed_settings)
+        
         # 익명 모드일 때 추가 설정
         if self.anonymous_mode:
             settings.update({
@@ -102,13 +510,18 @@ class TorrentClient(QObject):
                 'auto_scrape_min_interval': 900
             })
         
+        # 성능 프로필 (기본값으로 되돌린 뒤 덮어써서 한 번에 적용)
+        settings.update(self._profile_baseline)
+        settings.update(SESSION_PROFILES[self.session_profile])
+        
         self.session.apply_settings(settings)
         
         if self.proxy_enabled and self.proxy_type:
             self.log_security_event("프록시", f"프록시 설정됨: {self.proxy_host}:{self.proxy_port}")
     
-    def add_torrent(self, torrent_path, download_path=None):
-        """토렌트 파일 추가"""
+    def add_torrent(self, torrent_path, download_path=None, file_priorities=None, selection_rules=None,
+                    seed_mode=False, url_seeds=None, http_seeds=None):
+        """토렌트 파일 추가 (url_seeds/http_seeds: 토렌트에 없는 웹 시드 추가)"""
         try:
             if download_path is None:
                 download_path = os.path.expanduser("~/Downloads")
@@ -126,13 +539,52 @@ class TorrentClient(QObject):
                 'save_path': download_path,
                 'storage_mode': lt.storage_mode_t.storage_mode_sparse,
             }
+            if url_seeds:
+                params['url_seeds'] = list(url_seeds)
+            if http_seeds:
+                params['http_seeds'] = list(http_seeds)
+            
+            # 직접 만든 토렌트처럼 데이터가 온전한 경우 검사 없이 바로 시드
+            if seed_mode:
+                params['flags'] = lt.torrent_flags.default_flags | lt.torrent_flags.seed_mode
+            
+            # 파일 선택 (건너뛴 파일은 대역폭/디스크를 쓰지 않음)
+            if file_priorities or selection_rules:
+                files = torrent_info.files()
+                file_paths = [files.file_path(i) for i in range(files.num_files())]
+                params['file_priorities'] = resolve_file_priorities(file_paths, file_priorities, selection_rules)
+            
+            torrent_hash = torrent_key(torrent_info.info_hashes())
+            
+            # 이전에 받던 데이터면 저장된 비트필드를 쓰고 바뀐 파일의 피스만 다시 해싱
+            resume_params = None if seed_mode else self._load_resume_params(torrent_hash)
+            
+            # 디스크 공간 확인 (이어받기는 재검사 후 상태 갱신에서 남은 바이트가 반영됨)
+            wanted = 0
+            queued = False
+            if resume_params is None and not seed_mode:
+                wanted = wanted_bytes(torrent_info, params.get('file_priorities'))
+                queued = not self._admit(download_path, wanted)
+                if queued:
+                    params['flags'] = ((lt.torrent_flags.default_flags | lt.torrent_flags.paused)
+                                       & ~lt.torrent_flags.auto_managed)
+            if resume_params is not None:
+                resume_params.ti = torrent_info
+                resume_params.save_path = download_path
+                resume_params.url_seeds = list(dict.fromkeys(list(resume_params.url_seeds) + list(url_seeds or [])))
+                resume_params.http_seeds = list(dict.fromkeys(list(resume_params.http_seeds) + list(http_seeds or [])))
+                if 'file_priorities' in params:
+                    resume_params.file_priorities = params['file_priorities']
+                resume_params.flags |= lt.torrent_flags.paused
+                resume_params.flags &= ~lt.torrent_flags.auto_managed
+                params = resume_params
             
             # 토렌트 핸들 추가
             handle = self.session.add_torrent(params)
-            handle.resume()
+            if resume_params is None and not queued:
+                handle.resume()
             
             # 토렌트 정보 저장
-            torrent_hash = str(torrent_info.info_hash())
             self.torrents[torrent_hash] = {
                 'handle': handle,
                 'name': torrent_info.name(),
@@ -140,68 +592,641 @@ class TorrentClient(QObject):
                 'path': download_path
             }
             
+            self._set_completion_state(torrent_hash, 'pending')
+            self._reserve_or_queue(torrent_hash, download_path, wanted, queued)
+            
             self.torrent_added.emit(torrent_hash, torrent_info.name())
+            if resume_params is not None:
+                self.fast_recheck(torrent_hash, resume=True)
             return torrent_hash
             
         except Exception as e:
             print(f"토렌트 추가 오류: {e}")
+            self.last_add_error = str(e)
             return None
     
-    def add_magnet_link(self, magnet_uri, download_path=None):
-        """마그넷 링크 추가"""
+    def add_magnet_link(self, magnet_uri, download_path=None, file_priorities=None, selection_rules=None,
+                        url_seeds=None, http_seeds=None):
+        """마그넷 링크 추가 (마그넷의 ws= 웹 시드는 그대로 사용, url_seeds/http_seeds는 추가)"""
         try:
             if download_path is None:
                 download_path = os.path.expanduser("~/Downloads")
             
             # 마그넷 링크 파싱
             params = lt.parse_magnet_uri(magnet_uri)
-            params['save_path'] = download_path
+            params.save_path = download_path
+            if url_seeds:
+                params.url_seeds = list(dict.fromkeys(list(params.url_seeds) + list(url_seeds)))
+            if http_seeds:
+                params.http_seeds = list(dict.fromkeys(list(params.http_seeds) + list(http_seeds)))
+            magnet_hash = torrent_key(params.info_hashes)
+            
+            # 메타데이터만 받는 중이면 그 작업을 정리하고 일반 다운로드로 추가
+            self._cancel_metadata_job(magnet_hash)
+            
+            # 캐시에 메타데이터가 있으면 스웜에서 다시 받지 않음
+            torrent_info = self.load_cached_metadata(magnet_hash)
+            wanted = 0
+            queued = False
+            if torrent_info is not None:
+                params.ti = torrent_info
+                if file_priorities or selection_rules:
+                    files = torrent_info.files()
+                    file_paths = [files.file_path(i) for i in range(files.num_files())]
+                    params.file_priorities = resolve_file_priorities(file_paths, file_priorities, selection_rules)
+                # 디스크 공간 확인 (메타데이터가 없으면 받은 뒤에 확인)
+                wanted = wanted_bytes(torrent_info, params.file_priorities)
+                queued = not self._admit(download_path, wanted)
+                if queued:
+                    params.flags |= lt.torrent_flags.paused
+                    params.flags &= ~lt.torrent_flags.auto_managed
             
             # 토렌트 핸들 추가
             handle = self.session.add_torrent(params)
-            handle.resume()
+            if not queued:
+                handle.resume()
+            
+            if torrent_info is not None:
+                torrent_hash = torrent_key(torrent_info.info_hashes())
+                self.torrents[torrent_hash] = {
+                    'handle': handle,
+                    'name': torrent_info.name(),
+                    'size': torrent_info.total_size(),
+                    'path': download_path
+                }
+                self._set_completion_state(torrent_hash, 'pending')
+                self._reserve_or_queue(torrent_hash, download_path, wanted, queued)
+                self.torrent_added.emit(torrent_hash, torrent_info.name())
+                return torrent_hash
             
             # 임시 해시 생성 (메타데이터를 받을 때까지)
-            temp_hash = str(handle.info_hash())
+            temp_hash = magnet_hash
             self.torrents[temp_hash] = {
                 'handle': handle,
                 'name': '메타데이터 수신 중...',
                 'size': 0,
-                'path': download_path
+                'path': download_path,
+                # 메타데이터 수신 후 적용할 파일 선택
+                'pending_file_selection': (file_priorities, selection_rules) if (file_priorities or selection_rules) else None
             }
             
+            self._set_completion_state(temp_hash, 'pending')
+            
             self.torrent_added.emit(temp_hash, '메타데이터 수신 중...')
             return temp_hash
             
         except Exception as e:
             print(f"마그넷 링크 추가 오류: {e}")
+            self.last_add_error = str(e)
+            return None
+    
+    def create_torrent(self, source_path, output_path, torrent_type='hybrid', piece_size=None,
+                       trackers=None, seed=True, url_seeds=None, http_seeds=None):
+        """디렉터리/파일로 토렌트 생성 (백그라운드), 완료 후 바로 시드
+        
+        url_seeds: 콘텐츠를 같은 구조로 제공하는 HTTP 원본 (BEP 19), http_seeds: BEP 17 HTTP 시드
+        """
+        def progress(done_bytes, total_bytes):
+            self.torrent_creation_progress.emit(done_bytes, total_bytes)
+        
+        def run():
+            torrent_hash = ''
+            try:
+                creator = TorrentCreator(source_path, torrent_type, piece_size, trackers,
+                                         url_seeds=url_seeds, http_seeds=http_seeds,
+                                         progress_callback=progress)
+                torrent_data = creator.create()
+                with open(output_path, 'wb') as f:
+                    f.write(torrent_data)
+                self.log_security_event("CREATE", f"토렌트 생성 완료: {os.path.basename(output_path)}")
+                
+                if seed:
+                    # 방금 해싱한 데이터이므로 재검사 없이 시드 모드로 추가
+                    torrent_hash = self.add_torrent(
+                        output_path, os.path.dirname(os.path.abspath(source_path)), seed_mode=True
+                    ) or ''
+                else:
+                    torrent_hash = torrent_key(lt.torrent_info(torrent_data).info_hashes())
+            except Exception as e:
+                # 파일을 읽지 못하면 생성 실패 (0으로 채워 해싱한 깨진 토렌트를 시드하지 않음)
+                self.last_create_error = str(e)
+                self.log_security_event("ERROR", f"토렌트 생성 실패: {e}")
+            self.torrent_created.emit(output_path, torrent_hash)
+        
+        Thread(target=run, daemon=True).start()
+    
+    def _metadata_cache_path(self, torrent_hash):
+        """메타데이터 캐시 파일 경로"""
+        return os.path.join(METADATA_CACHE_DIR, f"{torrent_hash}.torrent")
+    
+    def save_metadata_to_cache(self, torrent_info):
+        """info 사전을 디스크 캐시에 저장 (v1/v2 info 해시 각각을 키로)"""
+        try:
+            # info 섹션 원본 바이트를 그대로 감싸서 info 해시가 바뀌지 않게 함
+            data = b'd4:info' + bytes(torrent_info.info_section()) + b'e'
+            os.makedirs(METADATA_CACHE_DIR, exist_ok=True)
+            
+            for torrent_hash in info_hash_candidates(torrent_info.info_hashes()):
+                path = self._metadata_cache_path(torrent_hash)
+                if os.path.exists(path):
+                    continue
+                temp_path = path + '.tmp'
+                with open(temp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(temp_path, path)
+            return True
+        except Exception as e:
+            print(f"메타데이터 캐시 저장 오류: {e}")
+            return False
+    
+    def load_cached_metadata(self, torrent_hash):
+        """캐시된 메타데이터 반환 (없거나 손상되었으면 None)"""
+        path = self._metadata_cache_path(torrent_hash)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                torrent_info = lt.torrent_info(f.read())
+            if torrent_hash not in info_hash_candidates(torrent_info.info_hashes()):
+                raise ValueError("info 해시 불일치")
+            return torrent_info
+        except Exception as e:
+            print(f"메타데이터 캐시 로드 오류: {e}")
+            # 손상된 캐시 정리 (이미 없거나 지울 수 없어도 추가는 계속)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
             return None
     
+    def resolve_metadata(self, magnet_uris, max_concurrent=None):
+        """여러 마그넷의 메타데이터만 동시에 받아 캐시 (페이로드는 받지 않음)"""
+        queued = 0
+        with self.metadata_lock:
+            if max_concurrent:
+                self.metadata_max_concurrent = max_concurrent
+            for magnet_uri in magnet_uris:
+                try:
+                    params = lt.parse_magnet_uri(magnet_uri.strip())
+                except Exception as e:
+                    print(f"마그넷 링크 파싱 오류: {e}")
+                    continue
+                self.metadata_queue.append(params)
+                queued += 1
+        self._start_metadata_jobs()
+        return queued
+    
+    def _start_metadata_jobs(self):
+        """동시 작업 한도까지 메타데이터 작업 시작"""
+        resolved = []
+        with self.metadata_lock:
+            while self.metadata_queue and len(self.metadata_jobs) < self.metadata_max_concurrent:
+                params = self.metadata_queue.popleft()
+                torrent_hash = torrent_key(params.info_hashes)
+                if torrent_hash in self.metadata_jobs:
+                    continue
+                if os.path.exists(self._metadata_cache_path(torrent_hash)):
+                    resolved.append(torrent_hash)
+                    continue
+                if torrent_hash in self.torrents:
+                    # 이미 로드된 토렌트는 메타데이터가 오면 캐시됨
+                    continue
+                
+                try:
+                    os.makedirs(METADATA_TEMP_DIR, exist_ok=True)
+                    params.save_path = METADATA_TEMP_DIR
+                    # upload_mode: 페이로드 다운로드 없이 메타데이터 교환만 수행
+                    params.flags |= lt.torrent_flags.upload_mode
+                    params.flags &= ~(lt.torrent_flags.paused | lt.torrent_flags.auto_managed)
+                    handle = self.session.add_torrent(params)
+                    self.metadata_jobs[torrent_hash] = {'handle': handle, 'started': time.monotonic()}
+                except Exception as e:
+                    print(f"메타데이터 작업 시작 오류: {e}")
+        
+        for torrent_hash in resolved:
+            self.metadata_resolved.emit(torrent_hash, True)
+    
+    def _finish_metadata_job(self, torrent_hash, success):
+        """메타데이터 작업 종료 (토렌트 제거)"""
+        with self.metadata_lock:
+            job = self.metadata_jobs.pop(torrent_hash, None)
+        if job is None:
+            return
+        self.session.remove_torrent(job['handle'])
+        self.metadata_resolved.emit(torrent_hash, success)
+    
+    def _cancel_metadata_job(self, torrent_hash):
+        """진행 중인 메타데이터 작업 취소"""
+        with self.metadata_lock:
+            job = self.metadata_jobs.pop(torrent_hash, None)
+        if job is not None:
+            self.session.remove_torrent(job['handle'])
+    
+    def _check_metadata_jobs(self):
+        """시간 초과된 메타데이터 작업 정리 후 대기 작업 시작"""
+        if not self.metadata_jobs and not self.metadata_queue:
+            return
+        now = time.monotonic()
+        with self.metadata_lock:
+            expired = [h for h, job in self.metadata_jobs.items()
+                       if now - job['started'] > self.metadata_timeout]
+        for torrent_hash in expired:
+            self._finish_metadata_job(torrent_hash, False)
+        self._start_metadata_jobs()
+    
+    def get_metadata_job_count(self):
+        """진행 중/대기 중인 메타데이터 작업 수"""
+        with self.metadata_lock:
+            return len(self.metadata_jobs), len(self.metadata_queue)
+    
+    def _handle_key(self, handle):
+        """핸들에 해당하는 self.torrents 키 (v1/v2 어느 해시로 등록되었든 찾음)"""
+        candidates = info_hash_candidates(handle.info_hashes())
+        for candidate in candidates:
+            if candidate in self.torrents or candidate in self.metadata_jobs:
+                return candidate
+        # 제거된(다시 추가되기 전) 핸들은 해시가 비어 있음
+        return candidates[0] if candidates else ''
+    
     def pause_torrent(self, torrent_hash):
         """토렌트 일시정지"""
-        if torrent_hash in self.torrents:
-            self.torrents[torrent_hash]['handle'].pause()
+        self.pause_many([torrent_hash])
     
     def resume_torrent(self, torrent_hash):
         """토렌트 재개"""
-        if torrent_hash in self.torrents:
-            self.torrents[torrent_hash]['handle'].resume()
+        self.resume_many([torrent_hash])
     
     def remove_torrent(self, torrent_hash, delete_files=False):
         """토렌트 제거"""
+        self.remove_many([torrent_hash], delete_files)
+    
+    def pause_many(self, torrent_hashes):
+        """여러 토렌트 한 번에 일시정지, 처리한 수 반환"""
+        count = 0
+        for torrent_hash in torrent_hashes:
+            torrent_data = self.torrents.get(torrent_hash)
+            if torrent_data:
+                # 자동 관리 대기열이 다시 시작하지 않고, 완료 추적에서 사용자 일시정지로 보이도록
+                torrent_data['handle'].unset_flags(lt.torrent_flags.auto_managed)
+                torrent_data['handle'].pause()
+                # 사용자가 멈춘 토렌트는 공간이 생겨도 자동으로 시작하지 않음
+                queued = self.disk_queue.pop(torrent_hash, None)
+                disk_paused = self.disk_paused.pop(torrent_hash, None)
+                if queued or disk_paused:
+                    self.session_state_dirty = True
+                    self._refresh_completion_state(torrent_hash)
+                count += 1
+        return count
+    
+    def resume_many(self, torrent_hashes):
+        """여러 토렌트 한 번에 재개, 처리한 수 반환"""
+        count = 0
+        for torrent_hash in torrent_hashes:
+            torrent_data = self.torrents.get(torrent_hash)
+            if torrent_data:
+                # 대기열/공간 부족 일시정지보다 사용자 재개가 우선
+                queued = self.disk_queue.pop(torrent_hash, None)
+                disk_paused = self.disk_paused.pop(torrent_hash, None)
+                if queued or disk_paused:
+                    self.session_state_dirty = True
+                torrent_data['handle'].set_flags(lt.torrent_flags.auto_managed)
+                torrent_data['handle'].resume()
+                count += 1
+        return count
+    
+    def remove_many(self, torrent_hashes, delete_files=False):
+        """여러 토렌트 한 번에 제거, 제거한 해시 목록 반환"""
+        options = lt.options_t.delete_files if delete_files else None
+        removed = []
+        for torrent_hash in torrent_hashes:
+            with self.torrents_lock:
+                torrent_data = self.torrents.pop(torrent_hash, None)
+                if torrent_data is None:
+                    continue
+                if options is not None:
+                    self.session.remove_torrent(torrent_data['handle'], options)
+                else:
+                    self.session.remove_torrent(torrent_data['handle'])
+            self._set_completion_state(torrent_hash, None)
+            self.status_snapshot.pop(torrent_hash, None)
+            self.verified_files.pop(torrent_hash, None)
+            self.scrape_results.pop(torrent_hash, None)
+            self._delete_resume_record(torrent_hash)
+            self.throughput.remove(torrent_hash)
+            self.disk_space.remove(torrent_hash)
+            queued = self.disk_queue.pop(torrent_hash, None)
+            disk_paused = self.disk_paused.pop(torrent_hash, None)
+            if queued or disk_paused:
+                self.session_state_dirty = True
+            self.lan_traffic.forget(torrent_hash)
+            removed.append(torrent_hash)
+        
+        if any(self.torrent_tags.pop(torrent_hash, None) for torrent_hash in removed):
+            self._save_tags()
+        if self.completed_hashes & set(removed):
+            self.completed_hashes -= set(removed)
+            self._save_completed()
+        had_goals = any(torrent_hash in self.seeding_goals.torrent_goals for torrent_hash in removed)
+        for torrent_hash in removed:
+            self.seeding_goals.forget(torrent_hash)
+        if had_goals:
+            self._save_seeding_goals()
+        return removed
+    
+    def _resume_paths(self, torrent_hash):
+        """resume 데이터와 파일 식별 정보 경로"""
+        base = os.path.join(RESUME_DIR, torrent_hash)
+        return base + '.fastresume', base + '.files.json'
+    
+    def _write_resume_record(self, torrent_hash, handle, params):
+        """resume 비트필드와 파일별 (size, mtime_ns, inode) 함께 저장"""
+        try:
+            resume_path, identity_path = self._resume_paths(torrent_hash)
+            identities = {}
+            if handle.status().has_metadata:
+                identities = snapshot_identities(handle.torrent_file().files(), params.save_path)
+            
+            os.makedirs(RESUME_DIR, exist_ok=True)
+            with open(resume_path + '.tmp', 'wb') as f:
+                f.write(lt.write_resume_data_buf(params))
+            with open(identity_path + '.tmp', 'w') as f:
+                json.dump(identities, f)
+            os.replace(resume_path + '.tmp', resume_path)
+            os.replace(identity_path + '.tmp', identity_path)
+        except Exception as e:
+            print(f"resume 데이터 저장 오류: {e}")
+    
+    def _load_resume_record(self, torrent_hash):
+        """(resume 데이터 바이트, 파일 식별 정보) 반환, 없으면 None"""
+        resume_path, identity_path = self._resume_paths(torrent_hash)
+        try:
+            with open(resume_path, 'rb') as f:
+                resume_data = f.read()
+            identities = {}
+            if os.path.exists(identity_path):
+                with open(identity_path) as f:
+                    identities = json.load(f)
+            return resume_data, identities
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"resume 데이터 로드 오류: {e}")
+            return None
+    
+    def _load_resume_params(self, torrent_hash):
+        """저장된 resume 데이터의 add_torrent_params (없으면 None)"""
+        record = self._load_resume_record(torrent_hash)
+        if record is None:
+            return None
+        try:
+            return lt.read_resume_data(record[0])
+        except Exception as e:
+            print(f"resume 데이터 파싱 오류: {e}")
+            return None
+    
+    def _delete_resume_record(self, torrent_hash):
+        """resume 데이터 삭제"""
+        for path in self._resume_paths(torrent_hash):
+            if os.path.exists(path):
+                os.remove(path)
+    
+    def request_resume_save(self, torrent_hash):
+        """resume 데이터 저장 요청 (결과는 save_resume_data_alert로 도착)"""
         if torrent_hash in self.torrents:
-            handle = self.torrents[torrent_hash]['handle']
-            if delete_files:
-                self.session.remove_torrent(handle, lt.options_t.delete_files)
-            else:
-                self.session.remove_torrent(handle)
-            del self.torrents[torrent_hash]
+            self.torrents[torrent_hash]['handle'].save_resume_data(
+                lt.torrent_handle.flush_disk_cache | lt.torrent_handle.save_info_dict
+            )
+    
+    def _save_all_resume_data(self, timeout=10):
+        """모든 토렌트의 resume 데이터를 저장하고 완료될 때까지 대기 (종료 시)"""
+        pending = 0
+        for torrent_hash in list(self.torrents):
+            try:
+                self.request_resume_save(torrent_hash)
+                pending += 1
+            except Exception as e:
+                print(f"resume 저장 요청 오류: {e}")
+        
+        deadline = time.monotonic() + timeout
+        while pending > 0 and time.monotonic() < deadline:
+            if not self.session.wait_for_alert(500):
+                continue
+            for alert in self.session.pop_alerts():
+                if isinstance(alert, lt.save_resume_data_alert):
+                    pending -= 1
+                    torrent_hash = self._handle_key(alert.handle)
+                    if torrent_hash in self.torrents:
+                        self._write_resume_record(torrent_hash, alert.handle, alert.params)
+                elif isinstance(alert, lt.save_resume_data_failed_alert):
+                    pending -= 1
+    
+    def restore_torrents(self):
+        """저장된 resume 데이터로 이전 세션의 토렌트 복원"""
+        if not os.path.isdir(RESUME_DIR):
+            return 0
+        
+        restored = 0
+        for file_name in sorted(os.listdir(RESUME_DIR)):
+            if not file_name.endswith('.fastresume'):
+                continue
+            torrent_hash = file_name[:-len('.fastresume')]
+            if torrent_hash in self.torrents:
+                continue
+            
+            try:
+                resume_data, identities = self._load_resume_record(torrent_hash)
+                params = lt.read_resume_data(resume_data)
+                handle = self.session.add_torrent(params)
+                
+                torrent_info = params.ti
+                name = torrent_info.name() if torrent_info else (params.name or '메타데이터 수신 중...')
+                self.torrents[torrent_hash] = {
+                    'handle': handle,
+                    'name': name,
+                    'size': torrent_info.total_size() if torrent_info else 0,
+                    'path': params.save_path
+                }
+                self._set_completion_state(torrent_hash, 'pending')
+                self.torrent_added.emit(torrent_hash, name)
+                restored += 1
+                
+                # 마지막 저장 이후 바뀐 파일이 있으면 그 파일의 피스만 재검사
+                if torrent_info and changed_files(torrent_info.files(), params.save_path, identities):
+                    self.fast_recheck(torrent_hash)
+            except Exception as e:
+                print(f"토렌트 복원 오류 ({torrent_hash}): {e}")
+        
+        self._restore_disk_marks()
+        if restored:
+            self.log_security_event("RESUME", f"이전 세션 토렌트 {restored}개 복원")
+        return restored
+    
+    def _restore_disk_marks(self):
+        """복원한 토렌트의 대기열/공간 부족 일시정지 표시를 다시 만듦
+        
+        이런 토렌트는 자동 관리 없이 일시정지된 채 저장되므로, 표시가 없으면 사용자가 멈춘 것처럼 보여
+        다시 시작되지 않는다. 장치 번호는 재부팅하면 바뀔 수 있어 경로로 다시 구한다.
+        """
+        for torrent_hash, download_path, wanted in self._saved_disk_queue:
+            if torrent_hash in self.torrents and torrent_hash not in self.disk_queue:
+                self.disk_queue[torrent_hash] = (download_path, wanted)
+                self._refresh_completion_state(torrent_hash)
+        for torrent_hash, auto_managed in self._saved_disk_paused.items():
+            torrent_data = self.torrents.get(torrent_hash)
+            if torrent_data is None or torrent_hash in self.disk_paused:
+                continue
+            dev = self.disk_space.volume(torrent_data['path'])
+            self.disk_paused[torrent_hash] = (dev, auto_managed)
+            self._refresh_completion_state(torrent_hash)
+            # 재개 기준 이상으로 확보됐는지 다음 확인에서 판단
+            self.disk_full_volumes.add(dev)
+        self._saved_disk_queue = []
+        self._saved_disk_paused = {}
+        self._check_disk_space(force=True)
+    
+    def set_recheck_limits(self, max_parallel=None, io_budget_mbps=None):
+        """재검사 동시 작업 수와 디스크 읽기 예산(MB/s, 0 = 무제한) 설정"""
+        if max_parallel is not None:
+            self.recheck_max_parallel = max_parallel
+        if io_budget_mbps is not None:
+            self.recheck_io_budget_mbps = io_budget_mbps
+        self.recheck_scheduler.set_limits(max_parallel, io_budget_mbps)
+        self._apply_session_settings()
+    
+    def fast_recheck(self, torrent_hash, resume=None):
+        """빠른 재검사 (식별 정보가 바뀐 파일에 걸친 피스만 해싱)"""
+        if torrent_hash not in self.torrents:
+            return False
+        torrent_data = self.torrents[torrent_hash]
+        if torrent_data.get('rechecking'):
+            return True
+        
+        handle = torrent_data['handle']
+        status = handle.status()
+        record = self._load_resume_record(torrent_hash)
+        if not status.has_metadata or record is None or not handle.info_hashes().has_v1():
+            # 기록이 없거나 v2 전용이면 libtorrent 전체 재검사
+            handle.force_recheck()
+            self.log_security_event("RECHECK", f"전체 재검사: {torrent_data['name']}")
+            return True
+        
+        if resume is None:
+            resume = not (status.flags & lt.torrent_flags.paused)
+        # 해싱하는 동안 해당 피스를 다시 받지 않도록 정지
+        handle.unset_flags(lt.torrent_flags.auto_managed)
+        handle.pause()
+        
+        torrent_data['rechecking'] = True
+        torrent_data['recheck_resume'] = resume
+        self.recheck_scheduler.submit(
+            self._run_fast_recheck, torrent_hash, handle.torrent_file(), torrent_data['path'], record, resume
+        )
+        return True
+    
+    def _run_fast_recheck(self, torrent_hash, torrent_info, save_path, record, resume):
+        """빠른 재검사 작업 (재검사 워커 스레드)"""
+        try:
+            resume_data, identities = record
+            file_storage = torrent_info.files()
+            changed = changed_files(file_storage, save_path, identities)
+            
+            if changed:
+                suspect = pieces_for_files(file_storage, torrent_info.piece_length(), changed)
+                passed = verify_pieces(torrent_info, save_path, suspect, self.recheck_scheduler.budget)
+                
+                params = lt.read_resume_data(resume_data)
+                have = list(params.have_pieces)
+                have += [False] * (torrent_info.num_pieces() - len(have))
+                for piece in suspect:
+                    have[piece] = piece in passed
+                if not self._readd_with_pieces(torrent_hash, params, torrent_info, save_path, have):
+                    return
+                
+                self.log_security_event(
+                    "RECHECK",
+                    f"빠른 재검사 완료: {torrent_info.name()} "
+                    f"(변경 파일 {len(changed)}개, 피스 {len(suspect)}개 해싱, {len(passed)}개 통과)"
+                )
+            
+            # 검사 중 제거될 수 있으므로 항목을 한 번만 꺼내 씀
+            torrent_data = self.torrents.get(torrent_hash)
+            if torrent_data is not None:
+                handle = torrent_data['handle']
+                if resume:
+                    handle.set_flags(lt.torrent_flags.auto_managed)
+                    handle.resume()
+                # 현재 파일 식별 정보로 다시 기록
+                self.request_resume_save(torrent_hash)
+        except Exception as e:
+            self.log_security_event("ERROR", f"빠른 재검사 실패, 전체 재검사로 전환: {e}")
+            torrent_data = self.torrents.get(torrent_hash)
+            if torrent_data is not None:
+                torrent_data['handle'].force_recheck()
+        finally:
+            torrent_data = self.torrents.get(torrent_hash)
+            if torrent_data is not None:
+                torrent_data.pop('rechecking', None)
+                torrent_data.pop('recheck_resume', None)
+    
+    def _readd_with_pieces(self, torrent_hash, params, torrent_info, save_path, have):
+        """비트필드를 바꿔 정지 상태로 다시 추가, 토렌트가 이미 제거됐으면 False
+        
+        libtorrent에는 비트필드만 바꾸는 API가 없으므로 새 비트필드로 다시 추가한다.
+        """
+        params.have_pieces = have
+        params.ti = torrent_info
+        params.save_path = save_path
+        params.flags |= lt.torrent_flags.paused
+        params.flags &= ~lt.torrent_flags.auto_managed
+        
+        # 다른 스레드의 제거와 겹치지 않도록 확인부터 교체까지 잠금 안에서
+        with self.torrents_lock:
+            torrent_data = self.torrents.get(torrent_hash)
+            if torrent_data is None:
+                return False
+            self.session.remove_torrent(torrent_data['handle'])
+            torrent_data['handle'] = self.session.add_torrent(params)
+        return True
+    
+    def mark_pieces_missing(self, torrent_hash, pieces):
+        """검증에 실패한 피스를 받지 않은 것으로 표시해 다시 받게 함"""
+        if torrent_hash not in self.torrents:
+            return False
+        torrent_data = self.torrents[torrent_hash]
+        handle = torrent_data['handle']
+        record = self._load_resume_record(torrent_hash)
+        if record is None:
+            # 다시 추가할 resume 데이터가 없으면 libtorrent 전체 재검사
+            handle.force_recheck()
+            self.log_security_event("RECHECK", f"전체 재검사: {torrent_data['name']}")
+            return True
+        
+        torrent_info = handle.torrent_file()
+        paused = handle.status().flags & lt.torrent_flags.paused
+        # 저장된 비트필드는 오래됐을 수 있으므로 현재 핸들 기준
+        have = [handle.have_piece(piece) for piece in range(torrent_info.num_pieces())]
+        for piece in pieces:
+            have[piece] = False
+        if not self._readd_with_pieces(torrent_hash, lt.read_resume_data(record[0]), torrent_info,
+                                       torrent_data['path'], have):
+            return False
+        
+        handle = self.torrents[torrent_hash]['handle']
+        if not paused:
+            handle.set_flags(lt.torrent_flags.auto_managed)
+            handle.resume()
+        self._set_completion_state(torrent_hash, 'pending')
+        self.request_resume_save(torrent_hash)
+        self.log_security_event("RECHECK", f"손상된 피스 {len(pieces)}개를 다시 받습니다: {torrent_data['name']}")
+        return True
     
     def get_torrent_status(self, torrent_hash):
         """토렌트 상태 정보 반환"""
         if torrent_hash in self.torrents:
-            handle = self.torrents[torrent_hash]['handle']
-            status = handle.status()
+            # 업데이트 루프가 받은 최신 상태 사용 (없을 때만 직접 조회)
+            status = self.status_snapshot.get(torrent_hash)
+            if status is None:
+                status = self.status_snapshot[torrent_hash] = self.torrents[torrent_hash]['handle'].status()
             return {
                 'name': self.torrents[torrent_hash]['name'],
                 'progress': status.progress,
@@ -210,35 +1235,815 @@ class TorrentClient(QObject):
                 'num_seeds': status.num_seeds,
                 'num_peers': status.num_peers,
                 'state': str(status.state),
+                'completion_state': self.completion_states.get(torrent_hash, 'pending'),
+                'ratio': share_ratio(status),
                 'total_size': self.torrents[torrent_hash]['size']
             }
         return None
     
-    def set_upload_limit(self, limit_kbps):
-        """업로드 속도 제한 설정 (KB/s)"""
+    def get_torrent_files(self, torrent_hash):
+        """토렌트 내부 파일 목록 반환 (메타데이터가 없으면 빈 목록)"""
+        if torrent_hash not in self.torrents:
+            return []
+        torrent_data = self.torrents[torrent_hash]
+        if 'files' not in torrent_data:
+            handle = torrent_data['handle']
+            if not handle.status().has_metadata:
+                return []
+            # 파일 목록은 변하지 않으므로 한 번만 만들어 둠
+            files = handle.torrent_file().files()
+            torrent_data['files'] = [
+                {'index': i, 'path': files.file_path(i), 'size': files.file_size(i)}
+                for i in range(files.num_files())
+            ]
+        return torrent_data['files']
+    
+    def _apply_file_selection(self, torrent_hash, file_priorities=None, selection_rules=None):
+        """우선순위/규칙을 계산해 한 번에 적용"""
+        files = self.get_torrent_files(torrent_hash)
+        if not files:
+            return False
+        handle = self.torrents[torrent_hash]['handle']
+        
+        # 지정하지 않은 파일은 현재 우선순위 유지
+        priorities = resolve_file_priorities(
+            [f['path'] for f in files], file_priorities, selection_rules,
+            base=[int(p) for p in handle.get_file_priorities()]
+        )
+        handle.prioritize_files(priorities)
+        return True
+    
+    def set_file_priorities(self, torrent_hash, file_priorities):
+        """파일 우선순위 설정 ({파일 인덱스: 'skip'|'low'|'normal'|'high'})"""
+        try:
+            return self._apply_file_selection(torrent_hash, file_priorities=file_priorities)
+        except Exception as e:
+            print(f"파일 우선순위 설정 오류: {e}")
+            return False
+    
+    def apply_selection_rules(self, torrent_hash, selection_rules):
+        """글롭 규칙으로 파일 선택 ([(패턴, 우선순위), ...], 뒤 규칙이 우선)"""
+        try:
+            return self._apply_file_selection(torrent_hash, selection_rules=selection_rules)
+        except Exception as e:
+            print(f"파일 선택 규칙 적용 오류: {e}")
+            return False
+    
+    def get_file_status(self, torrent_hash):
+        """파일별 진행 상황을 한 번에 반환"""
+        files = self.get_torrent_files(torrent_hash)
+        if not files:
+            return []
+        handle = self.torrents[torrent_hash]['handle']
+        
+        # 파일 수와 관계없이 libtorrent 호출은 두 번뿐
+        downloaded = handle.file_progress(flags=lt.file_progress_flags_t.piece_granularity)
+        priorities = handle.get_file_priorities()
+        return [
+            {
+                'index': f['index'],
+                'path': f['path'],
+                'size': f['size'],
+                'downloaded': downloaded[f['index']],
+                'progress': downloaded[f['index']] / f['size'] if f['size'] else 1.0,
+                'priority': priorities[f['index']],
+            }
+            for f in files
+        ]
+    
+    def get_peer_info(self, torrent_hash, max_age=None):
+        """토렌트의 피어 목록 (max_age초 안에 조회한 결과가 있으면 재사용)"""
+        if torrent_hash not in self.torrents:
+            return []
+        if max_age is None:
+            max_age = self.peer_info_interval
+        
+        cached = self._peer_info_cache.get(torrent_hash)
+        now = time.monotonic()
+        if cached and now - cached[0] < max_age:
+            return cached[1]
+        
         try:
-            if limit_kbps <= 0:
-                # 0 또는 음수면 무제한
-                self.session.set_upload_rate_limit(0)
+            peers = [
+                {
+                    'ip': peer.ip[0],
+                    'port': peer.ip[1],
+                    'client': self._peer_text(peer.client),
+                    'down_rate': peer.down_speed,
+                    'up_rate': peer.up_speed,
+                    'total_download': peer.total_download,
+                    'total_upload': peer.total_upload,
+                    'progress': peer.progress,
+                    'flags': peer_flags_text(peer),
+                    # libtorrent 2.0은 국가 정보를 제공하지 않음 (1.x에서만 채워짐)
+                    'country': self._peer_text(getattr(peer, 'country', '')).strip('\x00'),
+                }
+                for peer in self.torrents[torrent_hash]['handle'].get_peer_info()
+            ]
+        except Exception as e:
+            print(f"피어 정보 조회 오류: {e}")
+            peers = []
+        
+        # 보고 있는 토렌트 하나만 캐시
+        self._peer_info_cache = {torrent_hash: (now, peers)}
+        return peers
+    
+    def get_trackers(self, torrent_hash):
+        """토렌트의 트래커 목록과 상태/스크레이프 결과"""
+        if torrent_hash not in self.torrents:
+            return []
+        
+        scraped = self.scrape_results.get(torrent_hash, {})
+        trackers = []
+        for entry in self.torrents[torrent_hash]['handle'].trackers():
+            url = entry['url']
+            # 엔드포인트(로컬 주소 x v1/v2)별 결과 중 가장 최근/큰 값 사용
+            seeders = leechers = completed = -1
+            message = ''
+            next_announce = None
+            fails = 0
+            updating = False
+            for endpoint in entry.get('endpoints', []):
+                for info in endpoint.get('info_hashes', [endpoint]):
+                    seeders = max(seeders, info.get('scrape_complete', -1))
+                    leechers = max(leechers, info.get('scrape_incomplete', -1))
+                    completed = max(completed, info.get('scrape_downloaded', -1))
+                    fails = max(fails, info.get('fails', 0))
+                    updating = updating or info.get('updating', False)
+                    message = info.get('message') or message
+                    if info.get('last_error') and info['last_error'].value():
+                        message = info['last_error'].message()
+                    if info.get('next_announce') is not None:
+                        next_announce = info['next_announce'] if next_announce is None else min(next_announce, info['next_announce'])
+            
+            # 스크레이프 응답 알림으로 받은 값이 있으면 보완
+            result = scraped.get(url, {})
+            trackers.append({
+                'url': url,
+                'tier': entry['tier'],
+                'seeders': seeders if seeders >= 0 else result.get('seeders', -1),
+                'leechers': leechers if leechers >= 0 else result.get('leechers', -1),
+                'completed': completed,
+                'message': message,
+                'fails': fails,
+                'updating': updating,
+                'next_announce': next_announce,
+            })
+        return trackers
+    
+    def set_trackers(self, torrent_hash, trackers):
+        """트래커 목록 교체, trackers는 (url, tier) 목록"""
+        if torrent_hash not in self.torrents:
+            return False
+        handle = self.torrents[torrent_hash]['handle']
+        handle.replace_trackers([{'url': url, 'tier': tier} for url, tier in trackers])
+        self.scrape_results.pop(torrent_hash, None)
+        self.request_resume_save(torrent_hash)
+        self.torrent_updated.emit(torrent_hash)
+        return True
+    
+    def get_tracker_hosts(self, torrent_hash):
+        """토렌트 트래커의 호스트 이름 집합"""
+        if torrent_hash not in self.torrents:
+            return set()
+        return {tracker_host(entry['url']) for entry in self.torrents[torrent_hash]['handle'].trackers()}
+    
+    def add_tracker(self, torrent_hash, url, tier=0):
+        """트래커 추가 (이미 있으면 티어만 변경)"""
+        trackers = [(t['url'], t['tier']) for t in self.get_trackers(torrent_hash) if t['url'] != url]
+        trackers.append((url, tier))
+        return self.set_trackers(torrent_hash, sorted(trackers, key=lambda t: t[1]))
+    
+    def remove_tracker(self, torrent_hash, url):
+        """트래커 제거"""
+        trackers = [(t['url'], t['tier']) for t in self.get_trackers(torrent_hash) if t['url'] != url]
+        return self.set_trackers(torrent_hash, trackers)
+    
+    def replace_tracker_bulk(self, old, new_url, torrent_hashes=None):
+        """여러 토렌트의 트래커 일괄 교체, 교체한 토렌트 수 반환
+        
+        old는 전체 URL 또는 호스트 이름 (호스트가 같은 모든 URL을 교체)
+        """
+        replaced = 0
+        for torrent_hash in list(torrent_hashes if torrent_hashes is not None else self.torrents):
+            if torrent_hash not in self.torrents:
+                continue
+            trackers = []
+            changed = False
+            for entry in self.torrents[torrent_hash]['handle'].trackers():
+                url = entry['url']
+                if url == old or tracker_host(url) == old:
+                    changed = True
+                    # 같은 티어에 새 URL이 이미 있으면 중복 추가하지 않음
+                    if (new_url, entry['tier']) not in trackers:
+                        trackers.append((new_url, entry['tier']))
+                else:
+                    trackers.append((url, entry['tier']))
+            if changed:
+                self.set_trackers(torrent_hash, trackers)
+                replaced += 1
+        
+        if replaced:
+            self.log_security_event("TRACKER", f"트래커 일괄 교체: {old} -> {new_url} ({replaced}개 토렌트)")
+        return replaced
+    
+    def scrape_trackers(self, torrent_hash):
+        """트래커 스크레이프 요청 (결과는 scrape_reply_alert로 도착)"""
+        if torrent_hash in self.torrents:
+            self.torrents[torrent_hash]['handle'].scrape_tracker()
+    
+    def set_tracker_settings(self, **tracker_settings):
+        """트래커 알림 주기/동시 알림 수 등 변경"""
+        unknown = set(tracker_settings) - set(DEFAULT_TRACKER_SETTINGS)
+        if unknown:
+            raise ValueError(f"알 수 없는 트래커 설정: {', '.join(sorted(unknown))}")
+        self.tracker_settings.update(tracker_settings)
+        self._apply_session_settings()
+        self.session_state_dirty = True
+    
+    def add_web_seeds(self, torrent_hash, url_seeds=(), http_seeds=()):
+        """받는 중인 토렌트에 웹 시드 추가 (원본 서버에서 피어와 병렬로 피스를 받음)"""
+        torrent_data = self.torrents.get(torrent_hash)
+        if not torrent_data:
+            return False
+        handle = torrent_data['handle']
+        for url in url_seeds:
+            handle.add_url_seed(url)
+        for url in http_seeds:
+            handle.add_http_seed(url)
+        self.request_resume_save(torrent_hash)
+        self.log_security_event("WEB_SEED", f"{torrent_data['name']}: 웹 시드 {len(url_seeds) + len(http_seeds)}개 추가")
+        return True
+    
+    def remove_web_seed(self, torrent_hash, url):
+        """웹 시드 제거 (URL 시드/HTTP 시드 모두에서)"""
+        torrent_data = self.torrents.get(torrent_hash)
+        if not torrent_data:
+            return False
+        handle = torrent_data['handle']
+        handle.remove_url_seed(url)
+        handle.remove_http_seed(url)
+        self.request_resume_save(torrent_hash)
+        return True
+    
+    def get_web_seeds(self, torrent_hash):
+        """토렌트의 웹 시드 {'url_seeds': [...], 'http_seeds': [...]}"""
+        torrent_data = self.torrents.get(torrent_hash)
+        if not torrent_data:
+            return {'url_seeds': [], 'http_seeds': []}
+        handle = torrent_data['handle']
+        return {'url_seeds': sorted(handle.url_seeds()), 'http_seeds': sorted(handle.http_seeds())}
+    
+    def set_web_seed_settings(self, **web_seed_settings):
+        """웹 시드 연결 수/파이프라인/요청 크기 등 변경"""
+        unknown = set(web_seed_settings) - set(DEFAULT_WEB_SEED_SETTINGS)
+        if unknown:
+            raise ValueError(f"알 수 없는 웹 시드 설정: {', '.join(sorted(unknown))}")
+        self.web_seed_settings.update(web_seed_settings)
+        self._apply_session_settings()
+        self.session_state_dirty = True
+    
+    def get_tracker_host_stats(self):
+        """트래커 호스트별 알림/응답/오류 집계"""
+        return {host: dict(stats) for host, stats in self.tracker_host_stats.items()}
+    
+    def _tracker_stats(self, url):
+        host = tracker_host(url)
+        stats = self.tracker_host_stats.get(host)
+        if stats is None:
+            stats = self.tracker_host_stats[host] = {
+                'announces': 0, 'replies': 0, 'errors': 0, 'warnings': 0,
+                'response_time_total': 0.0, 'last_error': '', 'last_reply': None,
+            }
+        return stats
+    
+    def _record_tracker_alert(self, alert):
+        """트래커 알림을 호스트별로 집계"""
+        url = alert.tracker_url()
+        torrent_hash = self._handle_key(alert.handle)
+        stats = self._tracker_stats(url)
+        
+        if isinstance(alert, lt.tracker_announce_alert):
+            stats['announces'] += 1
+            self._announce_started[(torrent_hash, url)] = time.monotonic()
+        elif isinstance(alert, lt.tracker_reply_alert):
+            stats['replies'] += 1
+            stats['last_reply'] = time.time()
+            started = self._announce_started.pop((torrent_hash, url), None)
+            if started is not None:
+                stats['response_time_total'] += time.monotonic() - started
+        elif isinstance(alert, lt.tracker_error_alert):
+            stats['errors'] += 1
+            stats['last_error'] = alert.error.message() if alert.error.value() else alert.error_message()
+            self._announce_started.pop((torrent_hash, url), None)
+        elif isinstance(alert, lt.tracker_warning_alert):
+            stats['warnings'] += 1
+        elif isinstance(alert, lt.scrape_reply_alert):
+            self.scrape_results.setdefault(torrent_hash, {})[url] = {
+                'seeders': alert.complete,
+                'leechers': alert.incomplete,
+            }
+    
+    def _peer_text(self, value):
+        return value.decode('utf-8', 'replace') if isinstance(value, bytes) else (value or '')
+    
+    def set_streaming_mode(self, torrent_hash, enabled):
+        """순차 다운로드(스트리밍) 모드 설정"""
+        if torrent_hash not in self.torrents:
+            return False
+        handle = self.torrents[torrent_hash]['handle']
+        if enabled:
+            handle.set_flags(lt.torrent_flags.sequential_download)
+        else:
+            handle.unset_flags(lt.torrent_flags.sequential_download)
+        self.torrents[torrent_hash]['streaming'] = enabled
+        return True
+    
+    def is_streaming(self, torrent_hash):
+        """순차 다운로드 모드 여부"""
+        return self.torrents.get(torrent_hash, {}).get('streaming', False)
+    
+    def open_file_stream(self, torrent_hash, file_index, window_pieces=DEFAULT_WINDOW_PIECES, timeout=None):
+        """토렌트 내부 파일을 스트리밍으로 여는 파일 객체 반환"""
+        try:
+            if torrent_hash not in self.torrents:
+                return None
+            handle = self.torrents[torrent_hash]['handle']
+            if not handle.status().has_metadata:
+                return None
+            
+            self.set_streaming_mode(torrent_hash, True)
+            # 건너뛰기 상태인 파일은 다시 받도록 설정
+            if handle.file_priority(file_index) == 0:
+                handle.file_priority(file_index, 4)
+            
+            reader = TorrentFileReader(self, torrent_hash, file_index, window_pieces, timeout)
+            return io.BufferedReader(reader, buffer_size=reader.piece_length)
+        except Exception as e:
+            print(f"스트림 열기 오류: {e}")
+            return None
+    
+    def wait_for_piece(self, torrent_hash, piece_index, timeout=None):
+        """피스가 다운로드되어 검증될 때까지 대기"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.running and torrent_hash in self.torrents:
+            if self.torrents[torrent_hash]['handle'].have_piece(piece_index):
+                return True
+            
+            wait_time = 0.5
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait_time = min(wait_time, remaining)
+            
+            with self.piece_condition:
+                self.piece_condition.wait(wait_time)
+        return False
+    
+    def start_stream_server(self, host='127.0.0.1', port=0):
+        """로컬 HTTP 스트리밍 서버 시작"""
+        if self.stream_server:
+            return True
+        try:
+            # asyncio/mimetypes는 서버를 켤 때만 불러옴 (시작 시간 단축)
+            from stream_server import StreamServer
+            server = StreamServer(self, host, port)
+            server.start()
+            self.stream_server = server
+            self.piece_listeners.append(server.notify_piece)
+            self.log_security_event("STREAM", f"스트리밍 서버 시작: http://{host}:{server.port}/")
+            return True
+        except Exception as e:
+            self.log_security_event("ERROR", f"스트리밍 서버 시작 실패: {e}")
+            return False
+    
+    def stop_stream_server(self):
+        """로컬 HTTP 스트리밍 서버 종료"""
+        if self.stream_server:
+            server = self.stream_server
+            self.stream_server = None
+            if server.notify_piece in self.piece_listeners:
+                self.piece_listeners.remove(server.notify_piece)
+            server.stop()
+            self.log_security_event("STREAM", "스트리밍 서버 종료")
+    
+    def get_stream_url(self, torrent_hash, file_index):
+        """토렌트 내부 파일의 스트리밍 URL 반환 (서버가 없으면 시작)"""
+        if torrent_hash not in self.torrents or not self.start_stream_server():
+            return None
+        files = self.get_torrent_files(torrent_hash)
+        if not 0 <= file_index < len(files):
+            return None
+        self.set_streaming_mode(torrent_hash, True)
+        return self.stream_server.url_for(torrent_hash, file_index, files[file_index]['path'])
+    
+    def _load_network_config(self):
+        """저장된 수신/발신 인터페이스 설정 로드 (없으면 무작위 포트를 정해 저장)"""
+        try:
+            with open(NETWORK_CONFIG_PATH) as f:
+                config = json.load(f)
+            self.listen_interfaces = config.get('listen_interfaces') or list(DEFAULT_LISTEN_INTERFACES)
+            self.listen_port = int(config.get('listen_port', 0))
+            self.listen_port_retries = int(config.get('listen_port_retries', self.listen_port_retries))
+            self.outgoing_interfaces = config.get('outgoing_interfaces', [])
+            self.dht_bootstrap_nodes = config.get('dht_bootstrap_nodes') or list(DEFAULT_DHT_BOOTSTRAP_NODES)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"네트워크 설정 로드 오류: {e}")
+        
+        if not self.listen_port:
+            # 실행마다 바뀌면 포트 포워딩이 깨지므로 한 번만 정함
+            self.listen_port = random.randint(49152, 65535 - self.listen_port_retries)
+            self._save_network_config()
+    
+    def _save_network_config(self):
+        """수신/발신 인터페이스 설정 저장"""
+        try:
+            os.makedirs(CONFIG_DIR, exist_ok=True)
+            with open(NETWORK_CONFIG_PATH + '.tmp', 'w') as f:
+                json.dump({
+                    'listen_interfaces': self.listen_interfaces,
+                    'listen_port': self.listen_port,
+                    'listen_port_retries': self.listen_port_retries,
+                    'outgoing_interfaces': self.outgoing_interfaces,
+                    'dht_bootstrap_nodes': self.dht_bootstrap_nodes,
+                }, f, indent=2)
+            os.replace(NETWORK_CONFIG_PATH + '.tmp', NETWORK_CONFIG_PATH)
+        except Exception as e:
+            print(f"네트워크 설정 저장 오류: {e}")
+    
+    def set_listen_interfaces(self, interfaces=None, port=None, port_retries=None, outgoing_interfaces=None):
+        """수신 인터페이스/포트와 발신 인터페이스 변경 (저장 후 바로 적용)
+        
+        port=0이면 새 무작위 포트를 정함
+        """
+        if interfaces is not None:
+            self.listen_interfaces = [i.strip() for i in interfaces if i.strip()] or list(DEFAULT_LISTEN_INTERFACES)
+        if port_retries is not None:
+            self.listen_port_retries = port_retries
+        if port is not None:
+            self.listen_port = port or random.randint(49152, 65535 - self.listen_port_retries)
+        if outgoing_interfaces is not None:
+            self.outgoing_interfaces = [i.strip() for i in outgoing_interfaces if i.strip()]
+        
+        self._save_network_config()
+        self.listen_endpoints.clear()
+        self._apply_session_settings()
+        self.log_security_event(
+            "NETWORK",
+            f"수신 인터페이스: {format_listen_interfaces(self.listen_interfaces, self.listen_port)}"
+            + (f", 발신 인터페이스: {','.join(self.outgoing_interfaces)}" if self.outgoing_interfaces else "")
+        )
+    
+    def set_dht_bootstrap_nodes(self, nodes):
+        """DHT 부트스트랩 노드(host:port) 변경, 빈 목록이면 기본값 (저장 후 바로 적용)"""
+        self.dht_bootstrap_nodes = [n.strip() for n in nodes if n.strip()] or list(DEFAULT_DHT_BOOTSTRAP_NODES)
+        self._save_network_config()
+        self._apply_session_settings()
+        self.log_security_event("DHT", f"부트스트랩 노드: {', '.join(self.dht_bootstrap_nodes)}")
+    
+    def save_dht_state(self):
+        """DHT 노드 ID와 라우팅 테이블 저장 (DHT가 꺼져 있으면 이전 상태 유지)"""
+        if not self.dht_enabled or self.anonymous_mode or not self.session.is_dht_running():
+            return False
+        try:
+            # 파이썬 바인딩에는 session_state()가 없으므로 save_state 엔트리를 bencode
+            # (read_session_params가 읽는 'dht state' 키와 같은 형식)
+            data = lt.bencode(self.session.save_state(lt.save_state_flags_t.save_dht_state))
+            os.makedirs(CONFIG_DIR, exist_ok=True)
+            with open(DHT_STATE_PATH + '.tmp', 'wb') as f:
+                f.write(data)
+            os.replace(DHT_STATE_PATH + '.tmp', DHT_STATE_PATH)
+            return True
+        except Exception as e:
+            print(f"DHT 상태 저장 오류: {e}")
+            return False
+    
+    def get_listen_status(self):
+        """수신 설정과 실제 수신 중인 엔드포인트 반환"""
+        return {
+            'interfaces': list(self.listen_interfaces),
+            'port': self.listen_port,
+            'port_retries': self.listen_port_retries,
+            'outgoing_interfaces': list(self.outgoing_interfaces),
+            'listening': sorted(self.listen_endpoints),
+            'is_listening': self.session.is_listening(),
+        }
+    
+    def set_completion_actions(self, actions):
+        """완료 후 작업 목록 설정/저장 (예: [{'type': 'move', 'path': '/archive'}, {'type': 'hook', 'command': '...'}])"""
+        for action in actions:
+            if action.get('type') not in ACTION_TYPES:
+                raise ValueError(f"알 수 없는 완료 후 작업: {action.get('type')}")
+            if action['type'] in ('move', 'hardlink') and not action.get('path'):
+                raise ValueError(f"{action['type']} 작업에는 경로가 필요합니다")
+            if action['type'] == 'hook' and not action.get('command'):
+                raise ValueError("hook 작업에는 명령이 필요합니다")
+        
+        self.completion_pipeline.actions = list(actions)
+        save_actions(COMPLETION_ACTIONS_PATH, self.completion_pipeline.actions)
+        self.log_security_event("COMPLETION", f"완료 후 작업: {', '.join(a['type'] for a in actions) or '없음'}")
+    
+    def get_completion_actions(self):
+        """완료 후 작업 목록"""
+        return list(self.completion_pipeline.actions)
+    
+    def _load_tags(self):
+        """저장된 토렌트 태그 로드"""
+        try:
+            with open(TAGS_PATH) as f:
+                return {torrent_hash: set(tags) for torrent_hash, tags in json.load(f).items() if tags}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"태그 로드 오류: {e}")
+            return {}
+    
+    def _save_tags(self):
+        """토렌트 태그 저장"""
+        try:
+            os.makedirs(CONFIG_DIR, exist_ok=True)
+            with open(TAGS_PATH + '.tmp', 'w') as f:
+                json.dump({h: sorted(tags) for h, tags in self.torrent_tags.items()}, f, ensure_ascii=False)
+            os.replace(TAGS_PATH + '.tmp', TAGS_PATH)
+        except Exception as e:
+            print(f"태그 저장 오류: {e}")
+    
+    def _load_completed(self):
+        """완료를 처리한 토렌트 해시 로드"""
+        try:
+            with open(COMPLETED_PATH) as f:
+                return set(json.load(f))
+        except FileNotFoundError:
+            return set()
+        except Exception as e:
+            print(f"완료 기록 로드 오류: {e}")
+            return set()
+    
+    def _save_completed(self):
+        """완료를 처리한 토렌트 해시 저장"""
+        try:
+            os.makedirs(CONFIG_DIR, exist_ok=True)
+            with open(COMPLETED_PATH + '.tmp', 'w') as f:
+                json.dump(sorted(self.completed_hashes), f)
+            os.replace(COMPLETED_PATH + '.tmp', COMPLETED_PATH)
+        except Exception as e:
+            print(f"완료 기록 저장 오류: {e}")
+    
+    def _mark_completed(self, torrent_hash, handle):
+        """완료 알림이 실제 받기 -> 완료 전환인지 (완료 후 작업을 실행할지)
+        
+        libtorrent는 이미 완료된 토렌트를 다시 추가해도(세션 복원, 빠른 재검사) 완료 알림을 보낸다.
+        이미 처리했거나 이번 세션에 받은 것이 없으면 새 완료가 아니다.
+        """
+        if torrent_hash in self.completed_hashes:
+            return False
+        self.completed_hashes.add(torrent_hash)
+        self._save_completed()
+        try:
+            return handle.status().total_payload_download > 0
+        except Exception:
+            return True
+    
+    def get_torrent_tags(self, torrent_hash):
+        """토렌트의 태그 집합"""
+        return set(self.torrent_tags.get(torrent_hash, ()))
+    
+    def get_all_tags(self):
+        """사용 중인 모든 태그"""
+        return sorted(set().union(*self.torrent_tags.values())) if self.torrent_tags else []
+    
+    def set_tags_many(self, torrent_hashes, tags):
+        """여러 토렌트의 태그를 한 번에 교체 (빈 목록이면 태그 제거)"""
+        tags = {tag.strip() for tag in tags if tag.strip()}
+        changed = []
+        for torrent_hash in torrent_hashes:
+            if torrent_hash not in self.torrents or self.torrent_tags.get(torrent_hash, set()) == tags:
+                continue
+            if tags:
+                self.torrent_tags[torrent_hash] = set(tags)
+            else:
+                self.torrent_tags.pop(torrent_hash, None)
+            changed.append(torrent_hash)
+        
+        if changed:
+            self._save_tags()
+            for torrent_hash in changed:
+                self.torrent_updated.emit(torrent_hash)
+            # 태그별 목표가 바뀌었을 수 있음
+            reached = self.seeding_goals.refresh(changed, time.monotonic())
+            if reached:
+                self._apply_seeding_goals(reached)
+        return len(changed)
+    
+    def _admit(self, download_path, size):
+        """새 토렌트를 바로 받을 수 있는지 (대기 중인 토렌트가 있으면 그 뒤로)
+        
+        공간이 모자라면 정책이 'reject'일 때 DiskSpaceError, 'queue'일 때 False
+        """
+        if not self.disk_queue and self.disk_space.fits(download_path, size):
+            return True
+        if self.disk_full_policy == 'reject':
+            raise DiskSpaceError(f"디스크 공간 부족: {size / 1024 ** 3:.1f} GiB를 받을 공간이 없습니다 ({download_path})")
+        return False
+    
+    def _reserve_or_queue(self, torrent_hash, download_path, wanted, queued):
+        """추가한 토렌트의 받을 바이트를 바로 예약하거나 (상태 갱신 전 연속 추가 대비) 대기열에 넣음"""
+        if queued:
+            self.disk_queue[torrent_hash] = (download_path, wanted)
+            self.session_state_dirty = True
+            self._refresh_completion_state(torrent_hash)
+            self.log_security_event("DISK", f"공간이 생길 때까지 대기: {self.torrents[torrent_hash]['name']}")
+        elif wanted:
+            self.disk_space.set_remaining(torrent_hash, download_path, wanted)
+    
+    def _check_magnet_space(self, torrent_hash, handle, torrent_info):
+        """메타데이터를 받은 마그넷의 공간 확인 (이미 받아들인 토렌트이므로 모자라면 거부 대신 대기열)"""
+        torrent_data = self.torrents[torrent_hash]
+        wanted = wanted_bytes(torrent_info, handle.get_file_priorities())
+        if not self.disk_queue and self.disk_space.fits(torrent_data['path'], wanted):
+            self.disk_space.set_remaining(torrent_hash, torrent_data['path'], wanted)
+            return
+        handle.unset_flags(lt.torrent_flags.auto_managed)
+        handle.pause()
+        self.disk_space.remove(torrent_hash)
+        self._reserve_or_queue(torrent_hash, torrent_data['path'], wanted, True)
+    
+    def _check_disk_space(self, force=False, full_hashes=()):
+        """최소 여유 공간 아래인 볼륨의 받기를 일시정지, 재개 기준 이상이면 재개하고 대기열 시작"""
+        free = self.disk_space.refresh(force)
+        if free is None:
+            return
+        
+        for torrent_hash in full_hashes:
+            # 쓰기 실패(ENOSPC)한 토렌트의 볼륨은 여유 공간 값과 관계없이 가득 찬 것으로 봄
+            if torrent_hash in self.torrents:
+                dev = self.disk_space.volume(self.torrents[torrent_hash]['path'])
+                free[dev] = min(free.get(dev, 0), self.disk_space.min_free - 1)
+        
+        for dev, available in free.items():
+            if available < self.disk_space.min_free and dev not in self.disk_full_volumes:
+                self.disk_full_volumes.add(dev)
+                paused = []
+                for torrent_hash in self.disk_space.downloading(dev):
+                    torrent_data = self.torrents.get(torrent_hash)
+                    status = self.status_snapshot.get(torrent_hash)
+                    if torrent_data is None or torrent_hash in self.disk_paused:
+                        continue
+                    if status is not None and completion_state(status) == 'paused':
+                        continue  # 사용자가 멈춘 토렌트
+                    auto_managed = bool(status.flags & lt.torrent_flags.auto_managed) if status is not None else True
+                    self.disk_paused[torrent_hash] = (dev, auto_managed)
+                    torrent_data['handle'].unset_flags(lt.torrent_flags.auto_managed)
+                    torrent_data['handle'].pause()
+                    self._refresh_completion_state(torrent_hash)
+                    paused.append(torrent_hash)
+                self.session_state_dirty = True
+                self.log_security_event(
+                    "DISK", f"여유 공간 {available / 1024 ** 3:.1f} GiB, 받기 {len(paused)}개 일시정지"
+                )
+            elif dev in self.disk_full_volumes and available >= self.disk_space.resume_free:
+                self.disk_full_volumes.discard(dev)
+                resumed = [h for h, (paused_dev, _) in list(self.disk_paused.items()) if paused_dev == dev]
+                for torrent_hash in resumed:
+                    _, auto_managed = self.disk_paused.pop(torrent_hash)
+                    torrent_data = self.torrents.get(torrent_hash)
+                    if torrent_data is None:
+                        continue
+                    handle = torrent_data['handle']
+                    handle.clear_error()  # 쓰기 실패로 오류 상태가 된 토렌트
+                    if auto_managed:
+                        handle.set_flags(lt.torrent_flags.auto_managed)
+                    handle.resume()
+                self.session_state_dirty = True
+                self.log_security_event(
+                    "DISK", f"여유 공간 {available / 1024 ** 3:.1f} GiB 확보, 받기 {len(resumed)}개 재개"
+                )
+        
+        self._start_queued()
+    
+    def _start_queued(self):
+        """대기열의 토렌트를 공간이 되는 만큼 순서대로 시작 (볼륨마다 앞 토렌트가 안 되면 멈춤)"""
+        blocked = set()
+        for torrent_hash, (download_path, wanted) in list(self.disk_queue.items()):
+            torrent_data = self.torrents.get(torrent_hash)
+            if torrent_data is None:
+                self.disk_queue.pop(torrent_hash, None)
+                continue
+            dev = self.disk_space.volume(download_path)
+            if dev in blocked or dev in self.disk_full_volumes or not self.disk_space.fits(download_path, wanted):
+                blocked.add(dev)
+                continue
+            self.disk_queue.pop(torrent_hash, None)
+            self.session_state_dirty = True
+            self.disk_space.set_remaining(torrent_hash, download_path, wanted)
+            handle = torrent_data['handle']
+            handle.set_flags(lt.torrent_flags.auto_managed)
+            handle.resume()
+            self.log_security_event("DISK", f"대기열에서 시작: {torrent_data['name']}")
+    
+    def set_disk_space_limits(self, min_free=None, resume_free=None, policy=None):
+        """최소 여유 공간/재개 기준(바이트)과 공간 부족 정책('queue' | 'reject') 변경"""
+        if policy is not None:
+            if policy not in DISK_FULL_POLICIES:
+                raise ValueError(f"알 수 없는 디스크 공간 정책: {policy}")
+            self.disk_full_policy = policy
+        if min_free is not None:
+            self.disk_space.min_free = max(0, int(min_free))
+        if resume_free is not None:
+            self.disk_space.resume_free = max(0, int(resume_free))
+        # 재개 기준이 더 낮으면 일시정지/재개를 반복하므로 최소 여유 공간 이상으로
+        self.disk_space.resume_free = max(self.disk_space.resume_free, self.disk_space.min_free)
+        self.session_state_dirty = True
+        self._check_disk_space(force=True)
+    
+    def get_disk_status(self):
+        """볼륨별 여유 공간/남은 바이트와 대기열, 공간 부족 일시정지 수"""
+        return {
+            'volumes': list(self.disk_space.status().values()),
+            'queued': len(self.disk_queue),
+            'paused': len(self.disk_paused),
+            'min_free': self.disk_space.min_free,
+            'resume_free': self.disk_space.resume_free,
+            'policy': self.disk_full_policy,
+        }
+    
+    def set_seeding_goal(self, goal, tag=None, torrent_hashes=None):
+        """시딩 목표 설정/저장 (goal이 None이면 제거)
+        
+        goal 예: {'ratio': 2.0, 'seed_time': 72 * 3600, 'idle_time': 24 * 3600, 'action': 'pause'}
+        action: 'pause' | 'remove' | 'remove_delete' | 'move' (move는 'path' 필요)
+        tag와 torrent_hashes를 모두 비우면 기본 목표
+        """
+        now = time.monotonic()
+        if torrent_hashes:
+            reached = []
+            for torrent_hash in torrent_hashes:
+                reached.extend(self.seeding_goals.set_goal('torrent', torrent_hash, goal, now))
+        elif tag:
+            reached = self.seeding_goals.set_goal('tag', tag, goal, now)
+        else:
+            reached = self.seeding_goals.set_goal('default', None, goal, now)
+        self._save_seeding_goals()
+        
+        target = f"토렌트 {len(torrent_hashes)}개" if torrent_hashes else (f"태그 {tag}" if tag else "기본")
+        self.log_security_event("SEEDING", f"시딩 목표 ({target}): {describe_goal(normalize_goal(goal))}")
+        if reached:
+            self._apply_seeding_goals(reached)
+    
+    def get_seeding_goals(self):
+        """시딩 목표 {'default', 'tags', 'torrents'}"""
+        return self.seeding_goals.to_dict()
+    
+    def _save_seeding_goals(self):
+        try:
+            save_goals(SEEDING_GOALS_PATH, self.seeding_goals.to_dict())
+        except Exception as e:
+            print(f"시딩 목표 저장 오류: {e}")
+    
+    def _apply_seeding_goals(self, reached):
+        """목표에 닿은 토렌트를 작업별로 모아 한 번에 처리 (일시정지/제거로 연결과 파일 핸들 해제)"""
+        by_action = {}
+        for torrent_hash, goal, reason in reached:
+            torrent_data = self.torrents.get(torrent_hash)
+            if torrent_data:
+                by_action.setdefault(goal['action'], []).append((torrent_hash, goal, reason, torrent_data['name']))
+        
+        for action, items in by_action.items():
+            torrent_hashes = [item[0] for item in items]
+            if action in ('pause', 'move'):
+                for torrent_hash, goal, _, _ in items:
+                    if action == 'move':
+                        target = os.path.expanduser(goal['path'])
+                        os.makedirs(target, exist_ok=True)
+                        self.torrents[torrent_hash]['handle'].move_storage(target)
+                self.pause_many(torrent_hashes)
             else:
-                # KB/s를 B/s로 변환
-                limit_bytes = int(limit_kbps * 1024)
-                self.session.set_upload_rate_limit(limit_bytes)
+                self.remove_many(torrent_hashes, delete_files=(action == 'remove_delete'))
+            
+            for torrent_hash, _, reason, name in items:
+                self.log_security_event("SEEDING", f"{name}: {reason} -> {action}")
+                self.seeding_goal_reached.emit(torrent_hash, action, reason)
+    
+    def set_upload_limit(self, limit_kbps):
+        """업로드 속도 제한 설정 (KB/s, 0 또는 음수면 무제한)"""
+        self.upload_limit_kbps = max(0, limit_kbps)
+        try:
+            self.session.apply_settings({'upload_rate_limit': int(self.upload_limit_kbps * 1024)})
         except Exception as e:
             print(f"업로드 속도 제한 설정 오류: {e}")
+        self.session_state_dirty = True
     
     def set_download_limit(self, limit_kbps):
-        """다운로드 속도 제한 설정 (KB/s)"""
+        """다운로드 속도 제한 설정 (KB/s, 0 또는 음수면 무제한)"""
+        self.download_limit_kbps = max(0, limit_kbps)
         try:
-            if limit_kbps <= 0:
-                # 0 또는 음수면 무제한
-                self.session.set_download_rate_limit(0)
-            else:
-                # KB/s를 B/s로 변환
-                limit_bytes = int(limit_kbps * 1024)
-                self.session.set_download_rate_limit(limit_bytes)
+            self.session.apply_settings({'download_rate_limit': int(self.download_limit_kbps * 1024)})
         except Exception as e:
             print(f"다운로드 속도 제한 설정 오류: {e}")
+        self.session_state_dirty = True
     
     def get_session_stats(self):
         """세션 통계 반환"""
@@ -258,92 +2063,598 @@ class TorrentClient(QObject):
                 'total_download': 0
             }
     
+    def set_session_profile(self, profile):
+        """성능 프로필 적용 ('default'면 기본값으로 되돌림), 실패 시 이전 프로필 유지"""
+        if profile not in SESSION_PROFILES:
+            raise ValueError(f"알 수 없는 프로필: {profile}")
+        
+        previous = self.session_profile
+        self.session_profile = profile
+        try:
+            self._apply_session_settings()
+        except Exception as e:
+            self.session_profile = previous
+            self._apply_session_settings()
+            self.log_security_event("ERROR", f"프로필 적용 실패 ({profile}): {e}")
+            return False
+        
+        self.session_state_dirty = True
+        self.log_security_event("PROFILE", f"성능 프로필 적용: {profile}")
+        return True
+    
+    def get_peer_memory_report(self):
+        """피어당 메모리 사용량 보고 (프로필 크기 산정용)"""
+        settings = self.session.get_settings()
+        peers = self.last_session_stats.get('peer.num_peers_connected', 0)
+        rss = process_rss()
+        
+        # 시작 이후 늘어난 메모리를 연결된 피어 수로 나눈 값 (피어 외 사용량 포함한 상한)
+        measured_per_peer = None
+        if peers and rss is not None and self._baseline_rss is not None:
+            measured_per_peer = max(0, rss - self._baseline_rss) // peers
+        
+        # 설정상 피어 하나가 잡을 수 있는 송수신 버퍼 최대치
+        buffer_per_peer = settings.get('send_buffer_watermark', 0) + settings.get('max_peer_recv_buffer_size', 0)
+        return {
+            'profile': self.session_profile,
+            'connected_peers': peers,
+            'connections_limit': settings.get('connections_limit', 0),
+            'rss': rss,
+            'measured_per_peer': measured_per_peer,
+            'buffer_per_peer': buffer_per_peer,
+            'buffer_at_limit': buffer_per_peer * settings.get('connections_limit', 0),
+        }
+    
+    def _setup_metrics(self):
+        """기본 메트릭 선언"""
+        self.metrics.declare('ltorrent_update_tick_seconds', 'histogram', '_update_loop 한 틱 처리 시간')
+        self.metrics.declare('ltorrent_alerts_total', 'counter', '처리한 libtorrent 알림 수')
+        self.metrics.declare('ltorrent_alerts_last_tick', 'gauge', '직전 틱에서 처리한 알림 수')
+        self.metrics.declare('ltorrent_alerts_by_type_total', 'counter', '알림 종류별 처리 수')
+        self.metrics.declare('ltorrent_signals_emitted_total', 'counter', 'UI 스레드로 보낸 신호 수')
+        self.metrics.declare('ltorrent_signals_delivered_total', 'counter', 'UI 스레드에서 처리된 신호 수')
+        self.metrics.declare('ltorrent_signal_queue_depth', 'gauge', '아직 처리되지 않은 스레드 간 신호 수')
+        self.metrics.declare('ltorrent_torrents', 'gauge', '로드된 토렌트 수')
+        self.metrics.declare('ltorrent_peer_payload_bytes_total', 'counter', 'LAN(local)/원격(remote) 피어와 주고받은 페이로드 바이트')
+        self.metrics.declare('ltorrent_lan_peers', 'gauge', '연결된 LAN 피어 수')
+        
+        # libtorrent 세션 카운터 타입 (counter / gauge)
+        try:
+            for metric in lt.session_stats_metrics():
+                self._session_metric_types[metric.name] = (
+                    'counter' if metric.type == lt.metric_type_t.counter else 'gauge'
+                )
+        except Exception as e:
+            print(f"세션 메트릭 목록 조회 오류: {e}")
+        
+        self.metrics.register_callback(self._refresh_derived_metrics)
+    
+    def _refresh_derived_metrics(self, registry):
+        """노출 시점에 계산되는 파생 메트릭 갱신"""
+        emitted = registry.get('ltorrent_signals_emitted_total')
+        delivered = registry.get('ltorrent_signals_delivered_total')
+        registry.set('ltorrent_signal_queue_depth', max(0, emitted - delivered))
+        registry.set('ltorrent_torrents', len(self.torrents))
+        lan = self.get_lan_status()
+        for scope in ('local', 'remote'):
+            registry.set('ltorrent_peer_payload_bytes_total', lan[f'{scope}_download'],
+                         labels={'scope': scope, 'direction': 'download'})
+            registry.set('ltorrent_peer_payload_bytes_total', lan[f'{scope}_upload'],
+                         labels={'scope': scope, 'direction': 'upload'})
+        registry.set('ltorrent_lan_peers', lan['local_peers'])
+    
+    def _record_session_stats(self, alert):
+        """session_stats_alert 값을 메트릭으로 기록 (디스크 큐/캐시 포함)"""
+        self.last_session_stats = dict(alert.values)
+        for name, value in alert.values.items():
+            metric_name = 'ltorrent_lt_' + name.replace('.', '_')
+            self.metrics.declare(metric_name, self._session_metric_types.get(name, 'gauge'))
+            self.metrics.set(metric_name, value)
+    
+    def start_metrics_server(self, host='127.0.0.1', port=9464):
+        """메트릭 텍스트 노출 엔드포인트 시작"""
+        if self.metrics_server:
+            return True
+        try:
+            from metrics_server import MetricsServer
+            self.metrics_server = MetricsServer(self.metrics, host, port)
+            self.metrics_server.start()
+            self.log_security_event("METRICS", f"메트릭 엔드포인트 시작: http://{host}:{port}/metrics")
+            return True
+        except Exception as e:
+            self.metrics_server = None
+            self.log_security_event("ERROR", f"메트릭 엔드포인트 시작 실패: {e}")
+            return False
+    
+    def stop_metrics_server(self):
+        """메트릭 엔드포인트 종료"""
+        if self.metrics_server:
+            self.metrics_server.stop()
+            self.metrics_server = None
+            self.log_security_event("METRICS", "메트릭 엔드포인트 종료")
+    
+    def _load_history(self):
+        """저장된 전송 속도 기록 로드"""
+        try:
+            self.throughput.load(HISTORY_PATH)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"속도 기록 로드 오류: {e}")
+    
+    def _save_history(self):
+        """전송 속도 기록 저장"""
+        try:
+            self.throughput.save(HISTORY_PATH)
+        except Exception as e:
+            print(f"속도 기록 저장 오류: {e}")
+    
+    def get_rate_history(self, span, torrent_hash=None):
+        """최근 span초의 (간격, 시각 목록, [다운로드, 업로드] 값 목록), 토렌트 기록이 없으면 None
+        
+        span에 맞는 해상도(1초/1분/15분) 하나만 읽음
+        """
+        if torrent_hash is None:
+            return self.throughput.read_session(span, time.time())
+        return self.throughput.read_torrent(torrent_hash, span, time.time())
+    
     def _update_loop(self):
         """상태 업데이트 루프"""
+        self._load_history()
         while self.running:
             try:
+                tick_start = time.perf_counter()
+                
+                # 세션 카운터 요청 (결과는 session_stats_alert로 도착)
+                if tick_start - self._last_stats_request >= self.session_stats_interval:
+                    self.session.post_session_stats()
+                    self._last_stats_request = tick_start
+                
                 # 알림 처리
                 alerts = self.session.pop_alerts()
+                self.metrics.inc('ltorrent_alerts_total', len(alerts))
+                self.metrics.set('ltorrent_alerts_last_tick', len(alerts))
                 for alert in alerts:
-                    if isinstance(alert, lt.metadata_received_alert):
+                    self.metrics.inc('ltorrent_alerts_by_type_total', labels={'type': alert.what()})
+                    
+                    if isinstance(alert, lt.session_stats_alert):
+                        self._record_session_stats(alert)
+                    
+                    elif isinstance(alert, lt.piece_finished_alert):
+                        # 스트리밍 리더 깨우기
+                        with self.piece_condition:
+                            self.piece_condition.notify_all()
+                        if self.piece_listeners:
+                            torrent_hash = self._handle_key(alert.handle)
+                            for listener in self.piece_listeners:
+                                listener(torrent_hash, alert.piece_index)
+                    
+                    elif isinstance(alert, lt.metadata_received_alert):
                         # 메타데이터 수신 완료
                         handle = alert.handle
-                        torrent_hash = str(handle.info_hash())
-                        if torrent_hash in self.torrents:
-                            torrent_info = handle.torrent_file()
+                        torrent_hash = self._handle_key(handle)
+                        torrent_info = handle.torrent_file()
+                        self.save_metadata_to_cache(torrent_info)
+                        
+                        if torrent_hash in self.metadata_jobs:
+                            self._finish_metadata_job(torrent_hash, True)
+                        
+                        elif torrent_hash in self.torrents:
                             self.torrents[torrent_hash]['name'] = torrent_info.name()
                             self.torrents[torrent_hash]['size'] = torrent_info.total_size()
+                            
+                            pending = self.torrents[torrent_hash].pop('pending_file_selection', None)
+                            if pending:
+                                self._apply_file_selection(torrent_hash, *pending)
+                            self._check_magnet_space(torrent_hash, handle, torrent_info)
                     
                     elif isinstance(alert, lt.torrent_finished_alert):
                         # 다운로드 완료
-                        torrent_hash = str(alert.handle.info_hash())
-                        self.completed_torrents.add(torrent_hash)
+                        torrent_hash = self._handle_key(alert.handle)
+                        self._set_completion_state(torrent_hash, 'finished')
                         self.torrent_finished.emit(torrent_hash)
+                        self.request_resume_save(torrent_hash)
+                        if torrent_hash in self.torrents and self._mark_completed(torrent_hash, alert.handle):
+                            self.completion_pipeline.submit(torrent_hash)
+                    
+                    elif isinstance(alert, lt.state_update_alert):
+                        self._apply_status_updates(alert.status)
+                    
+                    elif isinstance(alert, lt.file_error_alert):
+                        # 디스크가 가득 차 쓰기가 실패하면 주기를 기다리지 않고 바로 확인
+                        if alert.error.value() == errno.ENOSPC:
+                            torrent_hash = self._handle_key(alert.handle)
+                            self.log_security_event("DISK", f"디스크 공간 부족 ({torrent_hash[:8]}): {alert.message()}")
+                            self._check_disk_space(force=True, full_hashes=[torrent_hash])
+                    
+                    elif isinstance(alert, lt.torrent_error_alert):
+                        torrent_hash = self._handle_key(alert.handle)
+                        self._set_completion_state(torrent_hash, 'error')
+                        self.log_security_event("ERROR", f"토렌트 오류 ({torrent_hash[:8]}): {alert.message()}")
+                    
+                    elif isinstance(alert, lt.storage_moved_alert):
+                        torrent_hash = self._handle_key(alert.handle)
+                        if torrent_hash in self.torrents:
+                            self.torrents[torrent_hash]['path'] = alert.storage_path()
+                            self.request_resume_save(torrent_hash)
+                        self.completion_pipeline.on_storage_moved(torrent_hash, True, f"이동 완료: {alert.storage_path()}")
+                    
+                    elif isinstance(alert, lt.storage_moved_failed_alert):
+                        torrent_hash = self._handle_key(alert.handle)
+                        self.completion_pipeline.on_storage_moved(torrent_hash, False, alert.message())
+                    
+                    elif isinstance(alert, lt.listen_succeeded_alert):
+                        endpoint = (str(alert.address), alert.port, str(alert.socket_type))
+                        self.listen_endpoints.add(endpoint)
+                        if alert.port != self.listen_port:
+                            # 지정 포트가 사용 중이라 다음 포트에 바인딩됨
+                            self.log_security_event("NETWORK", f"포트 {self.listen_port} 사용 중, {alert.address}:{alert.port}에서 수신")
+                    
+                    elif isinstance(alert, (lt.tracker_announce_alert, lt.tracker_reply_alert, lt.tracker_error_alert,
+                                            lt.tracker_warning_alert, lt.scrape_reply_alert)):
+                        self._record_tracker_alert(alert)
+                    
+                    elif isinstance(alert, lt.listen_failed_alert):
+                        self.log_security_event("NETWORK", f"수신 실패 ({alert.listen_interface()}): {alert.message()}")
+                    
+                    elif isinstance(alert, lt.save_resume_data_alert):
+                        torrent_hash = self._handle_key(alert.handle)
+                        if torrent_hash in self.torrents:
+                            self._write_resume_record(torrent_hash, alert.handle, alert.params)
+                    
+                    elif isinstance(alert, lt.file_completed_alert):
+                        # v2 토렌트는 피스마다 머클 트리로 검증되므로 파일 완료 = 검증 완료
+                        torrent_hash = self._handle_key(alert.handle)
+                        if torrent_hash in self.torrents and alert.handle.info_hashes().has_v2():
+                            self.verified_files.setdefault(torrent_hash, set()).add(int(alert.index))
+                
+                # 메타데이터만 받기 작업 관리
+                self._check_metadata_jobs()
+                self.completion_pipeline.check_timeouts()
+                
+                # 변경된 토렌트의 resume 데이터를 주기적으로 저장
+                if time.monotonic() - self._last_resume_save >= self.resume_save_interval:
+                    self._last_resume_save = time.monotonic()
+                    for torrent_hash, status in list(self.status_snapshot.items()):
+                        if status.need_save_resume:
+                            self.request_resume_save(torrent_hash)
+                
+                # 상태가 바뀐 토렌트만 state_update_alert로 받음 (토렌트마다 status() 호출 없음)
+                self.session.post_torrent_updates()
+                
+                # 볼륨별 여유 공간 확인 (주기 제한), 부족하면 일시정지 / 확보되면 재개와 대기열 시작
+                self._check_disk_space()
+                
+                # 시딩/유휴 시간 한도는 마감 시각이 지난 토렌트만 평가
+                reached = self.seeding_goals.due(time.monotonic())
+                if reached:
+                    self._apply_seeding_goals(reached)
                 
-                # 각 토렌트의 상태 업데이트
-                for torrent_hash, torrent_data in self.torrents.items():
-                    try:
-                        status = torrent_data['handle'].status()
-                        self.progress_updated.emit(
-                            torrent_hash,
-                            status.progress,
-                            status.download_rate,
-                            status.upload_rate,
-                            status.num_seeds,
-                            status.num_peers
-                        )
-                    except:
-                        pass
+                # DHT 라우팅 테이블 주기적 저장 (비정상 종료 대비)
+                if time.monotonic() - self._last_dht_state_save >= self.dht_state_save_interval:
+                    self._last_dht_state_save = time.monotonic()
+                    self.save_dht_state()
                 
+                # LAN/원격 전송량 (전송 중인 토렌트의 피어만 주기적으로 확인)
+                if time.monotonic() - self._last_lan_sample >= LAN_SAMPLE_INTERVAL:
+                    self._last_lan_sample = time.monotonic()
+                    self._sample_lan_traffic()
+                
+                # 바뀐 설정 저장 (속도 제한 스핀박스처럼 연속으로 바뀌어도 초당 한 번)
+                if self.session_state_dirty:
+                    self._save_session_state()
+                
+                # 전송 속도 기록 (직전 상태 갱신까지 반영된 속도)
+                self.throughput.tick(time.time())
+                if time.monotonic() - self._last_history_save >= self.history_save_interval:
+                    self._last_history_save = time.monotonic()
+                    self._save_history()
+                
+                self.metrics.observe('ltorrent_update_tick_seconds', time.perf_counter() - tick_start)
                 time.sleep(1)  # 1초마다 업데이트
                 
             except Exception as e:
                 print(f"업데이트 루프 오류: {e}")
                 time.sleep(1)
     
-    def are_all_torrents_completed(self):
-        """모든 토렌트가 완료되었는지 확인"""
-        if not self.torrents:
-            return False
+    def _apply_status_updates(self, statuses):
+        """state_update_alert의 상태 목록 반영 (진행률 신호, 완료 추적, 시딩 목표)"""
+        now = time.monotonic()
+        reached = []
+        for status in statuses:
+            torrent_hash = self._status_key(status)
+            if torrent_hash is None:
+                continue
+            self.status_snapshot[torrent_hash] = status
+            state = completion_state(status)
+            self._set_completion_state(torrent_hash, state)
+            if torrent_hash not in self.disk_queue:
+                remaining = 0 if state == 'finished' else status.total_wanted - status.total_wanted_done
+                self.disk_space.set_remaining(torrent_hash, self.torrents[torrent_hash]['path'], remaining)
+            # 받기가 끝나고 일시정지되지 않은 토렌트만 시딩 목표 추적
+            seeding = state == 'finished' and not status.flags & lt.torrent_flags.paused
+            reached.extend(self.seeding_goals.observe(
+                torrent_hash, seeding, share_ratio(status), seeding_seconds(status), status.all_time_upload, now
+            ))
+            self.throughput.set_rate(torrent_hash, status.download_rate, status.upload_rate)
+            self.progress_updated.emit(
+                torrent_hash,
+                status.progress,
+                status.download_rate,
+                status.upload_rate,
+                status.num_seeds,
+                status.num_peers
+            )
+            self.metrics.inc('ltorrent_signals_emitted_total')
+        if reached:
+            self._apply_seeding_goals(reached)
+    
+    def _status_key(self, status):
+        """torrent_status에 해당하는 self.torrents 키 (없으면 None)"""
+        for candidate in info_hash_candidates(status.info_hashes):
+            if candidate in self.torrents:
+                return candidate
+        return None
+    
+    def _set_completion_state(self, torrent_hash, state):
+        """토렌트의 완료 추적 상태 변경 (None이면 제거), 카운터를 증분 갱신"""
+        if state == 'paused' and (torrent_hash in self.disk_queue or torrent_hash in self.disk_paused):
+            # 공간을 기다리느라 자동 관리 없이 멈춘 토렌트는 사용자 일시정지가 아니라 받는 중
+            state = 'pending'
+        with self.completion_lock:
+            previous = self.completion_states.get(torrent_hash)
+            if previous == state or (state is not None and torrent_hash not in self.torrents):
+                return
+            
+            if previous is not None:
+                self.completion_counts[previous] -= 1
+            if state is None:
+                self.completion_states.pop(torrent_hash, None)
+            else:
+                self.completion_states[torrent_hash] = state
+                self.completion_counts[state] += 1
+            if state == 'finished':
+                self.completed_torrents.add(torrent_hash)
+            else:
+                self.completed_torrents.discard(torrent_hash)
+            
+            # 받는 중 -> 모두 완료로 바뀌는 순간에 한 번만 알림
+            all_completed = self.are_all_torrents_completed()
+            notify_completed = all_completed and not self._all_completed_notified
+            self._all_completed_notified = all_completed
         
-        active_torrents = set(self.torrents.keys())
-        return active_torrents.issubset(self.completed_torrents)
+        # 연결된 슬롯이 같은 스레드에서 바로 실행될 수 있으므로 잠금 밖에서 신호 전송
+        if notify_completed:
+            self.all_torrents_completed.emit()
+    
+    def _refresh_completion_state(self, torrent_hash):
+        """대기열/공간 부족 일시정지 표시가 바뀐 토렌트의 완료 추적 상태를 마지막 상태로 다시 계산"""
+        status = self.status_snapshot.get(torrent_hash)
+        if status is not None:
+            self._set_completion_state(torrent_hash, completion_state(status))
+    
+    def are_all_torrents_completed(self):
+        """받는 중인 토렌트 없이 완료된 토렌트가 있는지 (일시정지/오류 토렌트는 기다리지 않음)"""
+        return self.completion_counts['pending'] == 0 and self.completion_counts['finished'] > 0
     
     def get_active_torrent_count(self):
-        """활성 토렌트 수 반환"""
-        active_count = 0
-        for torrent_hash in self.torrents.keys():
-            if torrent_hash not in self.completed_torrents:
-                status = self.get_torrent_status(torrent_hash)
-                if status and (status['download_rate'] > 0 or status['progress'] < 1.0):
-                    active_count += 1
-        return active_count
+        """받는 중인 토렌트 수 반환"""
+        return self.completion_counts['pending']
+    
+    def get_completion_counts(self):
+        """상태별 토렌트 수"""
+        return dict(self.completion_counts)
     
     def load_ip_filter(self):
-        """악성 IP 필터 로드"""
-        try:
-            # 기본 차단 IP 범위 (예시)
-            known_bad_ranges = [
-                # 예시: 악성으로 알려진 IP 범위들
-                ('0.0.0.0', '0.255.255.255'),  # 예약된 주소
-                ('127.0.0.0', '127.255.255.255'),  # 로컬호스트
-                ('169.254.0.0', '169.254.255.255'),  # 링크 로컬
-                ('224.0.0.0', '239.255.255.255'),  # 멀티캐스트
-                ('240.0.0.0', '255.255.255.255'),  # 예약된 클래스 E
-            ]
-            
+        """기본 차단 범위, 가져온 차단 목록, 개별 차단 IP로 IP 필터를 만들어 한 번에 적용"""
+        try:
             ip_filter = lt.ip_filter()
-            for start_ip, end_ip in known_bad_ranges:
+            for start_ip, end_ip in DEFAULT_BLOCKED_RANGES:
+                ip_filter.add_rule(start_ip, end_ip, 1)  # 1 = 차단
+            for start_ip, end_ip in iter_ranges(self.ip_blocklist):
+                ip_filter.add_rule(start_ip, end_ip, 1)
+            for ip_address in self.blocked_ips:
                 try:
-                    ip_filter.add_rule(start_ip, end_ip, 1)  # 1 = 차단
-                except:
+                    ip_filter.add_rule(ip_address, ip_address, 1)
+                except Exception:
                     pass
             
             self.session.set_ip_filter(ip_filter)
-            self.log_security_event("IP_FILTER", f"IP 필터 로드 완료: {len(known_bad_ranges)}개 범위 차단")
+            self.log_security_event(
+                "IP_FILTER",
+                f"IP 필터 로드 완료: {len(DEFAULT_BLOCKED_RANGES) + range_count(self.ip_blocklist) + len(self.blocked_ips)}개 범위 차단"
+            )
         except Exception as e:
             self.log_security_event("ERROR", f"IP 필터 로드 실패: {e}")
     
+    def _apply_peer_class_filter(self):
+        """LAN 구간 피어를 전역 클래스 대신 LAN 피어 클래스로 (전역 속도 제한 제외, 항상 언초크)"""
+        try:
+            if self.lan_peer_class is None:
+                self.lan_peer_class = self.session.create_peer_class('lan')
+                self.session.set_peer_class(self.lan_peer_class, LAN_PEER_CLASS_INFO)
+            
+            # 기본 필터(사설 주소 -> 로컬 클래스)를 대신해 설정한 구간만 LAN 클래스로
+            peer_class_filter = lt.ip_filter()
+            for start_ip, end_ip in ALL_ADDRESSES:
+                peer_class_filter.add_rule(start_ip, end_ip, 1 << GLOBAL_PEER_CLASS_ID)
+            if self.lan_unthrottled:
+                for start_ip, end_ip in self.lan_ranges.rules():
+                    peer_class_filter.add_rule(start_ip, end_ip, 1 << int(self.lan_peer_class))
+            self.session.set_peer_class_filter(peer_class_filter)
+        except Exception as e:
+            self.log_security_event("ERROR", f"LAN 피어 클래스 적용 실패: {e}")
+    
+    def set_lan_settings(self, ranges=None, unthrottled=None, lsd_enabled=None, lsd_interval=None):
+        """LAN 주소 구간(CIDR/구간/주소 목록), 속도 제한 제외 여부, 로컬 서비스 검색(LSD) 변경"""
+        if ranges is not None:
+            self.lan_ranges = LanRanges(parse_lan_ranges(ranges))
+        if unthrottled is not None:
+            self.lan_unthrottled = unthrottled
+        if lsd_enabled is not None:
+            self.lsd_enabled = lsd_enabled
+        if lsd_interval is not None:
+            self.lsd_interval = max(1, int(lsd_interval))
+        self._apply_session_settings()
+        self._apply_peer_class_filter()
+        self.session_state_dirty = True
+        self.log_security_event(
+            "LAN",
+            f"LAN 구간 {len(self.lan_ranges.entries)}개, "
+            f"속도 제한 {'제외' if self.lan_unthrottled else '적용'}, LSD {'켜짐' if self.lsd_enabled else '꺼짐'}"
+        )
+    
+    def _sample_lan_traffic(self):
+        """전송 중인 토렌트 일부(LAN_SAMPLE_TORRENTS개씩 돌아가며)의 피어 목록에서 LAN 피어 전송량 집계
+        
+        get_peer_info는 피어 수만큼 비싸므로 한 번에 모든 토렌트를 읽지 않는다.
+        """
+        if not self.lan_ranges:
+            self.lan_traffic.retain(())
+            self.lan_peer_count = 0
+            return
+        active = [torrent_hash for torrent_hash, status in list(self.status_snapshot.items())
+                  if torrent_hash in self.torrents and (status.download_rate or status.upload_rate)]
+        self.lan_traffic.retain(active)
+        if active:
+            start = self._lan_sample_cursor % len(active)
+            batch = (active[start:] + active[:start])[:LAN_SAMPLE_TORRENTS]
+            self._lan_sample_cursor = start + len(batch)
+            for torrent_hash in batch:
+                try:
+                    peers = self.torrents[torrent_hash]['handle'].get_peer_info()
+                except Exception:
+                    continue
+                self.lan_traffic.sample(
+                    torrent_hash,
+                    ((peer.ip[0], peer.ip[1], peer.total_download, peer.total_upload) for peer in peers),
+                    self.lan_ranges.contains
+                )
+        self.lan_peer_count = self.lan_traffic.peer_count()
+    
+    def get_lan_status(self):
+        """LAN 설정과 로컬/원격 누적 전송량 (페이로드 바이트, 원격 = 세션 전체 - LAN)"""
+        local_download, local_upload = self.lan_traffic.totals()
+        total_download = self.last_session_stats.get('net.recv_payload_bytes', 0)
+        total_upload = self.last_session_stats.get('net.sent_payload_bytes', 0)
+        return {
+            'ranges': list(self.lan_ranges.entries),
+            'unthrottled': self.lan_unthrottled,
+            'lsd_enabled': self.lsd_enabled,
+            'lsd_interval': self.lsd_interval,
+            'local_peers': self.lan_peer_count,
+            'local_download': local_download,
+            'local_upload': local_upload,
+            'remote_download': max(0, total_download - local_download),
+            'remote_upload': max(0, total_upload - local_upload),
+        }
+    
+    def import_ip_blocklist(self, path):
+        """차단 목록 파일(P2P/DAT/CIDR, .gz 가능)을 가져와 IP 필터에 적용, 구간 수 반환
+        
+        파싱은 가져올 때 한 번만 하고, 이후 실행에서는 세션 상태의 구간 바이트를 바로 쓴다.
+        """
+        self.ip_blocklist = read_blocklist(path)
+        self.ip_blocklist_source = os.path.abspath(path)
+        self.load_ip_filter()
+        self._save_session_state()
+        return range_count(self.ip_blocklist)
+    
+    def clear_ip_blocklist(self):
+        """가져온 차단 목록 제거 (기본 범위와 개별 차단 IP는 유지)"""
+        self.ip_blocklist = {4: b'', 6: b''}
+        self.ip_blocklist_source = ''
+        self.load_ip_filter()
+        self._save_session_state()
+    
+    def _session_state(self):
+        """저장할 세션 설정 (JSON)"""
+        return {
+            'encryption_enabled': self.encryption_enabled,
+            'dht_enabled': self.dht_enabled,
+            'pex_enabled': self.pex_enabled,
+            'anonymous_mode': self.anonymous_mode,
+            'proxy': {
+                'type': self._proxy_type_name(),
+                'host': self.proxy_host,
+                'port': self.proxy_port,
+                'username': self.proxy_username,
+                'password': self.proxy_password,
+            },
+            'upload_limit_kbps': self.upload_limit_kbps,
+            'download_limit_kbps': self.download_limit_kbps,
+            'session_profile': self.session_profile,
+            'tracker_settings': self.tracker_settings,
+            'web_seed_settings': self.web_seed_settings,
+            'disk_min_free': self.disk_space.min_free,
+            'disk_resume_free': self.disk_space.resume_free,
+            'disk_full_policy': self.disk_full_policy,
+            'disk_queue': [[h, path, wanted] for h, (path, wanted) in self.disk_queue.items()] + self._saved_disk_queue,
+            'disk_paused': dict(self._saved_disk_paused,
+                                **{h: auto_managed for h, (_, auto_managed) in self.disk_paused.items()}),
+            'blocked_ips': sorted(self.blocked_ips),
+            'ip_blocklist_source': self.ip_blocklist_source,
+            'lan_ranges': self.lan_ranges.entries,
+            'lan_unthrottled': self.lan_unthrottled,
+            'lsd_enabled': self.lsd_enabled,
+            'lsd_interval': self.lsd_interval,
+        }
+    
+    def _load_session_state(self):
+        """저장된 세션 상태를 속성에 반영 (세션에는 아직 적용하지 않음)"""
+        try:
+            loaded = load_session_state(SESSION_STATE_PATH)
+        except Exception as e:
+            print(f"세션 상태 로드 오류: {e}")
+            return
+        if loaded is None:
+            return
+        
+        state, self.ip_blocklist = loaded
+        self.encryption_enabled = state.get('encryption_enabled', self.encryption_enabled)
+        self.dht_enabled = state.get('dht_enabled', self.dht_enabled)
+        self.pex_enabled = state.get('pex_enabled', self.pex_enabled)
+        self.anonymous_mode = state.get('anonymous_mode', self.anonymous_mode)
+        
+        proxy = state.get('proxy') or {}
+        if proxy.get('type') in PROXY_TYPES:
+            self.proxy_enabled = True
+            self.proxy_type = PROXY_TYPES[proxy['type']]
+            self.proxy_host = proxy.get('host', '')
+            self.proxy_port = int(proxy.get('port', 0))
+            self.proxy_username = proxy.get('username', '')
+            self.proxy_password = proxy.get('password', '')
+        
+        self.upload_limit_kbps = state.get('upload_limit_kbps', 0)
+        self.download_limit_kbps = state.get('download_limit_kbps', 0)
+        if state.get('session_profile') in SESSION_PROFILES:
+            self.session_profile = state['session_profile']
+        self.tracker_settings.update({key: value for key, value in state.get('tracker_settings', {}).items()
+                                      if key in DEFAULT_TRACKER_SETTINGS})
+        self.web_seed_settings.update({key: value for key, value in state.get('web_seed_settings', {}).items()
+                                       if key in DEFAULT_WEB_SEED_SETTINGS})
+        self.disk_space.min_free = state.get('disk_min_free', self.disk_space.min_free)
+        self.disk_space.resume_free = state.get('disk_resume_free', self.disk_space.resume_free)
+        if state.get('disk_full_policy') in DISK_FULL_POLICIES:
+            self.disk_full_policy = state['disk_full_policy']
+        self._saved_disk_queue = [list(item) for item in state.get('disk_queue', [])]
+        self._saved_disk_paused = dict(state.get('disk_paused', {}))
+        self.blocked_ips = set(state.get('blocked_ips', []))
+        self.ip_blocklist_source = state.get('ip_blocklist_source', '')
+        if 'lan_ranges' in state:
+            self.lan_ranges = LanRanges(state['lan_ranges'])
+        self.lan_unthrottled = state.get('lan_unthrottled', self.lan_unthrottled)
+        self.lsd_enabled = state.get('lsd_enabled', self.lsd_enabled)
+        self.lsd_interval = state.get('lsd_interval', self.lsd_interval)
+    
+    def _save_session_state(self):
+        """세션 상태 저장 (설정 변경 후 업데이트 루프와 종료 시 호출)"""
+        self.session_state_dirty = False
+        try:
+            save_session_state(SESSION_STATE_PATH, self._session_state(), self.ip_blocklist)
+        except Exception as e:
+            print(f"세션 상태 저장 오류: {e}")
+    
     def log_security_event(self, event_type, message):
         """보안 이벤트 로그"""
         timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
@@ -377,10 +2688,54 @@ class TorrentClient(QObject):
             self.log_security_event("HASH_ERROR", f"해시 검증 오류: {e}")
             return False
     
+    def get_file_merkle_roots(self, torrent_hash):
+        """파일별 v2 머클 루트(pieces root) 16진수 목록 (v1 전용 파일/빈 파일은 None)"""
+        files = self.get_torrent_files(torrent_hash)
+        if not files:
+            return []
+        file_storage = self.torrents[torrent_hash]['handle'].torrent_file().files()
+        roots = []
+        for f in files:
+            root = str(file_storage.root(f['index']))
+            roots.append(None if root.strip('0') == '' else root)
+        return roots
+    
+    def verify_torrent_file(self, torrent_hash, file_index, full=False):
+        """토렌트 내부 파일 검증 (v2 머클 루트 사용)"""
+        try:
+            files = self.get_torrent_files(torrent_hash)
+            if not 0 <= file_index < len(files):
+                return False
+            file_name = os.path.basename(files[file_index]['path'])
+            
+            # 완료 시점에 이미 머클 트리로 검증된 파일은 다시 읽지 않음
+            if not full and file_index in self.verified_files.get(torrent_hash, ()):
+                return True
+            
+            expected_root = self.get_file_merkle_roots(torrent_hash)[file_index]
+            if expected_root is None:
+                self.log_security_event("HASH_ERROR", f"머클 루트가 없는 파일입니다 (v1 토렌트): {file_name}")
+                return False
+            
+            path = os.path.join(self.torrents[torrent_hash]['path'], files[file_index]['path'])
+            actual_root = file_pieces_root(path, files[file_index]['size'])
+            if actual_root.hex() == expected_root:
+                self.verified_files.setdefault(torrent_hash, set()).add(file_index)
+                self.log_security_event("HASH_VERIFY", f"머클 루트 검증 성공: {file_name}")
+                return True
+            else:
+                self.verified_files.get(torrent_hash, set()).discard(file_index)
+                self.log_security_event("HASH_MISMATCH", f"머클 루트 불일치: {file_name}")
+                return False
+        except Exception as e:
+            self.log_security_event("HASH_ERROR", f"머클 검증 오류: {e}")
+            return False
+    
     def set_encryption_enabled(self, enabled):
         """암호화 설정 변경"""
         self.encryption_enabled = enabled
         self._apply_session_settings()
+        self.session_state_dirty = True
         if enabled:
             self.log_security_event("ENCRYPTION", "피어 간 암호화 활성화")
         else:
@@ -390,6 +2745,7 @@ class TorrentClient(QObject):
         """DHT 설정 변경"""
         self.dht_enabled = enabled
         self._apply_session_settings()
+        self.session_state_dirty = True
         
         if enabled:
             self.log_security_event("DHT", "DHT 활성화")
@@ -403,6 +2759,7 @@ class TorrentClient(QObject):
             ip_filter = self.session.get_ip_filter()
             ip_filter.add_rule(ip_address, ip_address, 1)  # 1 = 차단
             self.session.set_ip_filter(ip_filter)
+            self.session_state_dirty = True
             self.log_security_event("IP_BLOCK", f"IP 주소 차단: {ip_address}")
         except Exception as e:
             self.log_security_event("ERROR", f"IP 차단 실패: {e}")
@@ -417,6 +2774,7 @@ class TorrentClient(QObject):
             'encryption_enabled': self.encryption_enabled,
             'dht_enabled': self.dht_enabled,
             'blocked_ips_count': len(self.blocked_ips),
+            'blocklist_ranges': range_count(self.ip_blocklist),
             'security_events_count': len(self.security_log)
         }
     
@@ -424,12 +2782,32 @@ class TorrentClient(QObject):
         """클라이언트 종료"""
         self.log_security_event("SHUTDOWN", "토렌트 클라이언트 종료")
         self.running = False
+        with self.piece_condition:
+            self.piece_condition.notify_all()
+        self.stop_metrics_server()
+        self.stop_stream_server()
+        self.recheck_scheduler.shutdown()
+        for torrent_data in list(self.torrents.values()):
+            if torrent_data.get('rechecking') and torrent_data.get('recheck_resume'):
+                # 취소된 재검사가 멈춰 둔 토렌트는 다음 실행에서 다시 시작되도록 자동 관리 복원
+                # (바뀐 파일은 복원할 때 다시 검사)
+                torrent_data['handle'].set_flags(lt.torrent_flags.auto_managed)
+        self.completion_pipeline.stop()
+        self.save_dht_state()
         self.session.pause()
+        
+        # 업데이트 스레드가 멈춘 뒤 resume 데이터 저장 (알림을 직접 처리)
+        self.update_thread.join(timeout=3)
+        self._save_all_resume_data()
+        self._save_history()
+        if self.session_state_dirty:
+            self._save_session_state()
     
     def set_anonymous_mode(self, enabled):
         """익명 모드 설정"""
         self.anonymous_mode = enabled
         self._apply_session_settings()
+        self.session_state_dirty = True
         if enabled:
             self.log_security_event("익명성", "익명 모드 활성화됨")
         else:
@@ -438,24 +2816,16 @@ class TorrentClient(QObject):
     def set_proxy(self, proxy_type, host, port, username="", password=""):
         """프록시 설정"""
         try:
-            # 프록시 타입 매핑
-            proxy_types = {
-                'http': lt.proxy_type_t.http,
-                'socks4': lt.proxy_type_t.socks4,
-                'socks5': lt.proxy_type_t.socks5,
-                'http_pw': lt.proxy_type_t.http_pw,
-                'socks5_pw': lt.proxy_type_t.socks5_pw
-            }
-            
-            if proxy_type in proxy_types:
+            if proxy_type in PROXY_TYPES:
                 self.proxy_enabled = True
-                self.proxy_type = proxy_types[proxy_type]
+                self.proxy_type = PROXY_TYPES[proxy_type]
                 self.proxy_host = host
                 self.proxy_port = port
                 self.proxy_username = username
                 self.proxy_password = password
                 
                 self._apply_session_settings()
+                self.session_state_dirty = True
                 self.log_security_event("프록시", f"{proxy_type.upper()} 프록시 설정: {host}:{port}")
                 return True
             else:
@@ -471,15 +2841,24 @@ class TorrentClient(QObject):
         self.proxy_enabled = False
         self.proxy_type = None
         self._apply_session_settings()
+        self.session_state_dirty = True
         self.log_security_event("프록시", "프록시 비활성화됨")
     
+    def _proxy_type_name(self):
+        """사용 중인 프록시 종류 이름 (PROXY_TYPES 키), 프록시를 안 쓰면 None"""
+        if not self.proxy_enabled:
+            return None
+        return next((name for name, value in PROXY_TYPES.items() if value == self.proxy_type), None)
+    
     def get_anonymity_status(self):
         """익명성 상태 반환"""
         return {
             'anonymous_mode': self.anonymous_mode,
             'proxy_enabled': self.proxy_enabled,
+            'proxy_type': self._proxy_type_name(),
             'proxy_host': self.proxy_host if self.proxy_enabled else None,
             'proxy_port': self.proxy_port if self.proxy_enabled else None,
             'dht_disabled': not self.dht_enabled,
+            'lsd_enabled': self.lsd_enabled and not self.anonymous_mode,
             'encryption_enabled': self.encryption_enabled
         } 
\ No newline at end of file
@@ -0,0 +1,212 @@
+"""
+토렌트 생성 (v1 / v2 / 하이브리드) - v1은 병렬 피스 해싱, v2/하이브리드는 libtorrent가 해싱
+
+파이썬 바인딩의 create_torrent에는 set_hash2가 없어 v2 머클 루트를 직접 넣을 수 없으므로
+v2/하이브리드는 set_piece_hashes로 머클 트리와 (하이브리드면) 패딩을 포함한 v1 피스 해시를 함께 계산한다.
+"""
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import libtorrent as lt
+
+
+MIN_PIECE_SIZE = 16 * 1024
+MAX_PIECE_SIZE = 16 * 1024 * 1024
+TARGET_PIECE_COUNT = 1500
+BATCH_BYTES = 32 * 1024 * 1024  # 작업 하나가 순차로 읽는 크기
+
+
+def torrent_type_flags(torrent_type):
+    """토렌트 종류별 create_torrent 플래그"""
+    return {
+        'v1': lt.create_torrent.v1_only,
+        'v2': lt.create_torrent.v2_only,
+        'hybrid': 0,
+    }[torrent_type]
+
+
+def auto_piece_size(total_size):
+    """콘텐츠 크기에 맞는 피스 크기 (피스 수가 TARGET_PIECE_COUNT 근처가 되도록)"""
+    piece_size = MIN_PIECE_SIZE
+    while piece_size < MAX_PIECE_SIZE and total_size / piece_size > TARGET_PIECE_COUNT:
+        piece_size *= 2
+    return piece_size
+
+
+def is_pad_file(file_storage, file_index):
+    """패딩 파일 여부"""
+    return bool(file_storage.file_flags(file_index) & lt.file_storage.flag_pad_file)
+
+
+def map_range(file_storage, offset, length):
+    """토렌트 전체 오프셋 구간을 (파일 번호, 파일 내 오프셋, 크기) 조각으로 나눔
+
+    파이썬 바인딩의 file_storage에는 map_block이 없으므로 파일 오프셋으로 직접 계산한다.
+    """
+    index = file_storage.file_index_at_offset(offset)
+    while length > 0 and index < file_storage.num_files():
+        file_offset = offset - file_storage.file_offset(index)
+        size = min(length, file_storage.file_size(index) - file_offset)
+        if size > 0:
+            yield index, file_offset, size
+            offset += size
+            length -= size
+        index += 1
+
+
+def read_torrent_range(file_storage, base_path, piece, length, allow_missing=False):
+    """피스 시작부터 length 바이트를 파일들에서 읽음 (패딩 파일은 0)
+
+    allow_missing이면 없거나 짧은 파일의 나머지를 0으로 채운다 (재검사처럼 해시 불일치로 드러나는 경우).
+    아니면 OSError: 토렌트 생성에서 0을 해싱하면 처음부터 깨진 토렌트를 완료된 것처럼 시드하게 된다.
+    """
+    buffer = bytearray(length)
+    position = 0
+    for file_index, file_offset, size in map_range(file_storage, piece * file_storage.piece_length(), length):
+        if not is_pad_file(file_storage, file_index):
+            path = os.path.join(base_path, file_storage.file_path(file_index))
+            try:
+                with open(path, 'rb') as f:
+                    f.seek(file_offset)
+                    read = f.readinto(memoryview(buffer)[position:position + size])
+            except FileNotFoundError:
+                if not allow_missing:
+                    raise
+                read = size
+            if read != size and not allow_missing:
+                raise OSError(f"파일이 예상보다 짧습니다: {path} ({file_offset + read}바이트에서 끝남)")
+        position += size
+    return bytes(buffer)
+
+
+class TorrentCreator:
+    """디렉터리/파일로부터 토렌트 생성"""
+
+    def __init__(self, source_path, torrent_type='hybrid', piece_size=None, trackers=None,
+                 url_seeds=None, comment='', private=False, workers=None, progress_callback=None,
+                 http_seeds=None):
+        self.source_path = os.path.abspath(source_path)
+        self.base_path = os.path.dirname(self.source_path)
+        self.torrent_type = torrent_type
+        self.trackers = trackers or []
+        self.url_seeds = url_seeds or []  # BEP 19 (GetRight) 웹 시드
+        self.http_seeds = http_seeds or []  # BEP 17 (Hoffman) HTTP 시드
+        self.comment = comment
+        self.private = private
+        self.workers = workers or os.cpu_count() or 1
+        self.progress_callback = progress_callback
+        self.cancelled = False
+
+        # create_torrent는 file_storage를 참조로만 들고 있으므로 객체 수명 동안 유지
+        self.file_storage = lt.file_storage()
+        lt.add_files(self.file_storage, self.source_path)
+        if self.file_storage.num_files() == 0:
+            raise ValueError(f"토렌트로 만들 파일이 없습니다: {source_path}")
+
+        self.piece_size = piece_size or auto_piece_size(self.file_storage.total_size())
+        self.creator = lt.create_torrent(self.file_storage, self.piece_size, torrent_type_flags(torrent_type))
+        # create_torrent가 v2 정렬용 패딩 파일을 넣은 레이아웃 기준으로 해싱
+        self.files = self.creator.files()
+
+    def cancel(self):
+        """생성 취소"""
+        self.cancelled = True
+
+    def create(self):
+        """피스를 해싱하고 bencode된 토렌트 반환"""
+        if self.torrent_type == 'v1':
+            self._hash_v1_parallel()
+        else:
+            self._hash_with_libtorrent()
+
+        creator = self.creator
+        creator.set_creator('Ltorrent')
+        if self.comment:
+            creator.set_comment(self.comment)
+        if self.private:
+            creator.set_priv(True)
+        for tier, url in enumerate(self.trackers):
+            creator.add_tracker(url, tier)
+        for url in self.url_seeds:
+            creator.add_url_seed(url)
+        for url in self.http_seeds:
+            creator.add_http_seed(url)
+        return lt.bencode(creator.generate())
+
+    def _hash_with_libtorrent(self):
+        """v2/하이브리드: libtorrent가 파일을 읽어 머클 트리와 v1 피스 해시 계산"""
+        total_bytes = self.files.total_size()
+
+        def on_piece(piece):
+            if self.cancelled:
+                raise RuntimeError("토렌트 생성이 취소되었습니다")
+            if self.progress_callback:
+                self.progress_callback(min(total_bytes, (piece + 1) * self.piece_size), total_bytes)
+
+        # 파일이 없거나 짧으면 RuntimeError (0으로 채워 해싱하지 않음)
+        lt.set_piece_hashes(self.creator, self.base_path, on_piece)
+
+    def _hash_v1_parallel(self):
+        """v1: 피스 구간을 여러 스레드에서 순차 읽기로 해싱"""
+        jobs = self._v1_jobs()
+        total_bytes = sum(job[-1] for job in jobs)
+        done_bytes = 0
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pending = set()
+            job_iter = iter(jobs)
+            while True:
+                # 메모리를 제한하기 위해 동시에 읽는 작업 수를 워커 수의 2배로 제한
+                while len(pending) < self.workers * 2:
+                    job = next(job_iter, None)
+                    if job is None:
+                        break
+                    pending.add(executor.submit(self._run_job, job))
+                if not pending:
+                    break
+
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    done_bytes += self._apply_hashes(future.result())
+                if self.cancelled:
+                    for future in pending:
+                        future.cancel()
+                    raise RuntimeError("토렌트 생성이 취소되었습니다")
+                if self.progress_callback:
+                    self.progress_callback(done_bytes, total_bytes)
+
+    def _v1_jobs(self):
+        """피스 구간 단위 작업 (파일 경계를 넘어 순차 읽기)"""
+        num_pieces = self.creator.num_pieces()
+        batch = max(1, BATCH_BYTES // self.piece_size)
+        jobs = []
+        for first in range(0, num_pieces, batch):
+            last = min(first + batch, num_pieces) - 1
+            length = (last - first) * self.piece_size + self.creator.piece_size(last)
+            jobs.append((first, last - first + 1, length))
+        return jobs
+
+    def _run_job(self, job):
+        """작업 하나 실행 (워커 스레드, hashlib은 GIL을 놓고 해싱)"""
+        if self.cancelled:
+            return []
+        return self._hash_v1(*job)
+
+    def _hash_v1(self, first_piece, count, length):
+        data = memoryview(read_torrent_range(self.files, self.base_path, first_piece, length))
+        results = []
+        for i in range(count):
+            piece = first_piece + i
+            start = i * self.piece_size
+            digest = hashlib.sha1(data[start:start + self.creator.piece_size(piece)]).digest()
+            results.append((piece, digest, self.creator.piece_size(piece)))
+        return results
+
+    def _apply_hashes(self, results):
+        """해시 결과를 create_torrent에 기록, 처리한 바이트 수 반환"""
+        processed = 0
+        for piece, digest, length in results:
+            self.creator.set_hash(piece, digest)
+            processed += length
+        return processed
@@ -0,0 +1,20 @@
+"""
+토렌트 식별 키: info 해시(v1 SHA-1 / v2 SHA-256)의 16진수 문자열
+
+libtorrent 객체만 다루고 PySide6를 불러오지 않으므로 샤드 워커에서도 쓴다.
+"""
+
+
+def info_hash_candidates(info_hashes):
+    """info_hashes에 들어 있는 v1/v2 해시의 16진수 목록"""
+    candidates = []
+    if info_hashes.has_v1():
+        candidates.append(str(info_hashes.v1))
+    if info_hashes.has_v2():
+        candidates.append(str(info_hashes.v2))
+    return candidates
+
+
+def torrent_key(info_hashes):
+    """토렌트 식별 키 (v1/하이브리드는 SHA-1, v2 전용은 잘리지 않은 SHA-256)"""
+    return info_hash_candidates(info_hashes)[0]
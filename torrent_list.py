@@ -0,0 +1,346 @@
+"""
+토렌트 목록 모델: 이름 토큰/상태/태그/트래커 인덱스로 필터링하고 프록시 모델로 정렬
+
+행 위치 대신 해시로 토렌트를 식별하므로 정렬/필터와 무관하게 갱신할 수 있고,
+필터로 숨겨진 행은 포맷/그리기 비용이 들지 않는다.
+"""
+import re
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel, QTimer, Signal
+from PySide6.QtWidgets import QApplication, QStyle, QStyledItemDelegate, QStyleOptionProgressBar
+
+
+COLUMNS = ("이름", "진행률", "다운로드 속도", "업로드 속도", "시드", "피어", "상태", "비율", "태그")
+COLUMN_PROGRESS = 1
+# 컬럼별 레코드 키 (정렬 키)
+COLUMN_KEYS = ('name', 'progress', 'download_rate', 'upload_rate', 'num_seeds', 'num_peers', 'state', 'ratio', 'tags')
+NUMERIC_COLUMNS = (2, 3, 4, 5, 7)
+SORT_ROLE = Qt.UserRole  # 정렬 키 (숫자 컬럼은 원래 값)
+
+# 완료 추적 상태 표시 이름 (필터 목록 순서)
+STATE_LABELS = {
+    'pending': "받는 중",
+    'finished': "완료",
+    'paused': "일시정지",
+    'error': "오류",
+}
+
+FILTER_REFRESH_DELAY = 200  # 인덱스 변경 후 필터 재계산까지 대기 (ms, 변경을 모아 한 번에)
+
+_TOKEN_RE = re.compile(r'\w+')
+
+
+def name_tokens(name):
+    """이름을 검색 토큰으로 분리 (소문자)"""
+    return set(_TOKEN_RE.findall(name.lower()))
+
+
+class TorrentIndex:
+    """토렌트 필터용 역색인 (이름 토큰, 상태, 태그, 트래커 호스트) 및 비율"""
+
+    FACETS = ('tokens', 'state', 'tags', 'trackers')
+
+    def __init__(self):
+        self.postings = {facet: {} for facet in self.FACETS}  # facet -> 키 -> 해시 집합
+        self.entries = {}  # hash -> {facet: 키 집합}
+        self.ratios = {}  # hash -> 공유 비율
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _set(self, torrent_hash, facet, keys):
+        """facet의 키 집합 교체, 바뀌었으면 True"""
+        entry = self.entries.setdefault(torrent_hash, {f: set() for f in self.FACETS})
+        old_keys = entry[facet]
+        if old_keys == keys:
+            return False
+
+        postings = self.postings[facet]
+        for key in old_keys - keys:
+            bucket = postings[key]
+            bucket.discard(torrent_hash)
+            if not bucket:
+                del postings[key]
+        for key in keys - old_keys:
+            postings.setdefault(key, set()).add(torrent_hash)
+        entry[facet] = set(keys)
+        return True
+
+    def set_name(self, torrent_hash, name):
+        return self._set(torrent_hash, 'tokens', name_tokens(name))
+
+    def set_state(self, torrent_hash, state):
+        return self._set(torrent_hash, 'state', {state})
+
+    def set_tags(self, torrent_hash, tags):
+        return self._set(torrent_hash, 'tags', set(tags))
+
+    def set_trackers(self, torrent_hash, hosts):
+        return self._set(torrent_hash, 'trackers', set(hosts))
+
+    def set_ratio(self, torrent_hash, ratio):
+        changed = self.ratios.get(torrent_hash) != ratio
+        self.ratios[torrent_hash] = ratio
+        return changed
+
+    def remove(self, torrent_hash):
+        if torrent_hash not in self.entries:
+            return
+        for facet in self.FACETS:
+            self._set(torrent_hash, facet, set())
+        del self.entries[torrent_hash]
+        self.ratios.pop(torrent_hash, None)
+
+    def keys(self, facet):
+        """facet에 있는 모든 키 (필터 선택 목록용)"""
+        return sorted(self.postings[facet])
+
+    def _match_text(self, text):
+        """검색어의 모든 토큰을 (부분 문자열로) 포함하는 토렌트"""
+        result = None
+        postings = self.postings['tokens']
+        for query_token in name_tokens(text):
+            # 토큰 어휘는 토렌트 수보다 훨씬 작으므로 어휘만 훑음
+            matched = set()
+            for token, hashes in postings.items():
+                if query_token in token:
+                    matched |= hashes
+            result = matched if result is None else result & matched
+            if not result:
+                return set()
+        return result
+
+    def query(self, text='', state=None, tag=None, tracker=None, min_ratio=0.0):
+        """조건에 맞는 해시 집합 (조건이 없으면 None = 전체)"""
+        candidates = []
+        if text.strip():
+            candidates.append(self._match_text(text))
+        for facet, key in (('state', state), ('tags', tag), ('trackers', tracker)):
+            if key is not None:
+                candidates.append(self.postings[facet].get(key, set()))
+
+        if not candidates and not min_ratio:
+            return None
+
+        if candidates:
+            # 가장 작은 집합부터 교집합
+            candidates.sort(key=len)
+            result = set(candidates[0])
+            for other in candidates[1:]:
+                result &= other
+        else:
+            result = set(self.entries)
+
+        if min_ratio:
+            ratios = self.ratios
+            result = {h for h in result if ratios.get(h, 0.0) >= min_ratio}
+        return result
+
+
+class TorrentListModel(QAbstractTableModel):
+    """해시로 식별되는 토렌트 목록 (표시 문자열은 보이는 행에 대해서만 만듦)"""
+
+    def __init__(self, format_bytes, parent=None):
+        super().__init__(parent)
+        self.format_bytes = format_bytes
+        self.hashes = []  # row -> hash
+        self.rows = {}  # hash -> row
+        self.records = {}  # hash -> 표시 값
+        self.search_index = TorrentIndex()
+
+    def rowCount(self, parent=None):
+        return 0 if parent is not None and parent.isValid() else len(self.hashes)
+
+    def columnCount(self, parent=None):
+        return 0 if parent is not None and parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        record = self.records[self.hashes[index.row()]]
+        column = index.column()
+
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return record['name']
+            if column == 1:
+                return f"{record['progress'] * 100:.1f}%"
+            if column == 2:
+                return f"{self.format_bytes(record['download_rate'])}/s"
+            if column == 3:
+                return f"{self.format_bytes(record['upload_rate'])}/s"
+            if column == 4:
+                return str(record['num_seeds'])
+            if column == 5:
+                return str(record['num_peers'])
+            if column == 6:
+                return self.state_text(record)
+            if column == 7:
+                return f"{record['ratio']:.2f}"
+            if column == 8:
+                return ", ".join(sorted(record['tags']))
+        elif role == SORT_ROLE:
+            if column == 0:
+                return record['name'].lower()
+            if column == 6:
+                return self.state_text(record)
+            if column == 8:
+                return ", ".join(sorted(record['tags']))
+            return record[COLUMN_KEYS[column]]
+        elif role == Qt.TextAlignmentRole and column in NUMERIC_COLUMNS:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def state_text(self, record):
+        state = record['state']
+        if state == 'pending':
+            return "다운로드중" if record['download_rate'] > 0 else "대기중"
+        return STATE_LABELS[state]
+
+    def hash_at(self, row):
+        return self.hashes[row] if 0 <= row < len(self.hashes) else None
+
+    def add_torrent(self, torrent_hash, name, tags=(), trackers=()):
+        """토렌트 행 추가 (이미 있으면 이름만 갱신)"""
+        if torrent_hash in self.rows:
+            self.update_torrent(torrent_hash, name=name)
+            return
+        row = len(self.hashes)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.hashes.append(torrent_hash)
+        self.rows[torrent_hash] = row
+        self.records[torrent_hash] = {
+            'name': name, 'progress': 0.0, 'download_rate': 0, 'upload_rate': 0,
+            'num_seeds': 0, 'num_peers': 0, 'state': 'pending', 'ratio': 0.0, 'tags': set(tags),
+        }
+        self.endInsertRows()
+
+        self.search_index.set_name(torrent_hash, name)
+        self.search_index.set_state(torrent_hash, 'pending')
+        self.search_index.set_tags(torrent_hash, tags)
+        self.search_index.set_trackers(torrent_hash, trackers)
+        self.search_index.set_ratio(torrent_hash, 0.0)
+
+    def update_torrent(self, torrent_hash, **fields):
+        """행 값 갱신, 인덱스 facet이 바뀌었으면 그 이름 집합 반환"""
+        row = self.rows.get(torrent_hash)
+        if row is None:
+            return set()
+        record = self.records[torrent_hash]
+        record.update(fields)
+
+        changed = set()
+        if 'name' in fields and self.search_index.set_name(torrent_hash, fields['name']):
+            changed.add('tokens')
+        if 'state' in fields and self.search_index.set_state(torrent_hash, fields['state']):
+            changed.add('state')
+        if 'tags' in fields and self.search_index.set_tags(torrent_hash, fields['tags']):
+            changed.add('tags')
+        if 'ratio' in fields and self.search_index.set_ratio(torrent_hash, fields['ratio']):
+            changed.add('ratio')
+
+        self.dataChanged.emit(self.createIndex(row, 0), self.createIndex(row, len(COLUMNS) - 1))
+        return changed
+
+    def set_trackers(self, torrent_hash, hosts):
+        """트래커 호스트 인덱스 갱신 (표시 컬럼 없음)"""
+        if torrent_hash in self.rows:
+            return self.search_index.set_trackers(torrent_hash, hosts)
+        return False
+
+    def remove_torrents(self, torrent_hashes):
+        """여러 행 제거 (연속된 행은 한 번에), 행 매핑은 한 번만 다시 만듦"""
+        rows = sorted((self.rows[h] for h in torrent_hashes if h in self.rows), reverse=True)
+        if not rows:
+            return
+
+        # 뒤에서부터 연속 구간 단위로 제거
+        start = end = rows[0]
+        for row in rows[1:] + [None]:
+            if row is not None and row == start - 1:
+                start = row
+                continue
+            self.beginRemoveRows(QModelIndex(), start, end)
+            for torrent_hash in self.hashes[start:end + 1]:
+                self.records.pop(torrent_hash, None)
+                self.search_index.remove(torrent_hash)
+            del self.hashes[start:end + 1]
+            self.endRemoveRows()
+            if row is not None:
+                start = end = row
+
+        self.rows = {torrent_hash: row for row, torrent_hash in enumerate(self.hashes)}
+
+
+class TorrentFilterProxy(QSortFilterProxyModel):
+    """인덱스 조회 결과(해시 집합)로 행을 거르는 정렬/필터 프록시"""
+
+    filter_refreshed = Signal()  # 필터 재계산 후
+
+    def __init__(self, source_model, parent=None):
+        super().__init__(parent)
+        self.setSourceModel(source_model)
+        self.setSortRole(SORT_ROLE)
+        self.setSortCaseSensitivity(Qt.CaseInsensitive)
+        self.criteria = {}  # TorrentIndex.query 인자
+        self.allowed = None  # 보이는 해시 집합 (None = 전체)
+
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.timeout.connect(self.refresh)
+
+    def set_criteria(self, **criteria):
+        """필터 조건 변경 (바로 적용)"""
+        self.criteria = {key: value for key, value in criteria.items() if value not in (None, '', 0, 0.0)}
+        self.refresh()
+
+    def uses(self, facets):
+        """바뀐 facet이 현재 필터 조건에 영향을 주는지"""
+        used = {'tokens' if key == 'text' else {'tag': 'tags', 'tracker': 'trackers', 'min_ratio': 'ratio'}.get(key, key)
+                for key in self.criteria}
+        return bool(used & set(facets))
+
+    def note_changed(self, facets):
+        """인덱스가 바뀌었을 때 필요하면 필터 재계산 예약 (여러 변경을 모아 한 번에)"""
+        if self.allowed is not None and self.uses(facets) and not self._refresh_timer.isActive():
+            self._refresh_timer.start(FILTER_REFRESH_DELAY)
+
+    def refresh(self):
+        self._refresh_timer.stop()
+        self.allowed = self.sourceModel().search_index.query(**self.criteria)
+        self.invalidateFilter()
+        self.filter_refreshed.emit()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self.allowed is None:
+            return True
+        return self.sourceModel().hashes[source_row] in self.allowed
+
+    def hash_at(self, proxy_row):
+        """프록시 행 번호의 토렌트 해시"""
+        source_index = self.mapToSource(self.index(proxy_row, 0))
+        return self.sourceModel().hash_at(source_index.row()) if source_index.isValid() else None
+
+
+class ProgressDelegate(QStyledItemDelegate):
+    """진행률 컬럼을 행 위젯 없이 진행률 막대로 그림"""
+
+    def paint(self, painter, option, index):
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+
+        progress = index.data(SORT_ROLE) or 0.0
+        bar = QStyleOptionProgressBar()
+        bar.rect = option.rect.adjusted(2, 2, -2, -2)
+        bar.minimum = 0
+        bar.maximum = 100
+        bar.progress = int(progress * 100)
+        bar.text = index.data(Qt.DisplayRole)
+        bar.textVisible = True
+        bar.state = option.state | QStyle.State_Horizontal
+        QApplication.style().drawControl(QStyle.CE_ProgressBar, bar, painter)